@@ -3,38 +3,102 @@ r"""Root package."""
 from __future__ import annotations
 
 __all__ = [
+    "ArrayRecord",
     "BaseComparator",
     "BaseRecord",
     "ComparableRecord",
     "EmptyRecordError",
+    "KeyComparator",
+    "LexicographicComparator",
     "MaxScalarComparator",
     "MaxScalarRecord",
     "MinScalarComparator",
     "MinScalarRecord",
     "NotAComparableRecordError",
+    "ParetoComparator",
+    "ParetoRecord",
+    "RateRecord",
     "Record",
     "RecordManager",
+    "RecordRule",
+    "SQLiteRecordManager",
     "get_best_values",
     "get_last_values",
     "get_max_size",
     "set_max_size",
 ]
 
-from importlib.metadata import PackageNotFoundError, version
-
-from minrecord.base import BaseRecord, EmptyRecordError, NotAComparableRecordError
-from minrecord.comparable import ComparableRecord, MaxScalarRecord, MinScalarRecord
-from minrecord.comparator import (
-    BaseComparator,
-    MaxScalarComparator,
-    MinScalarComparator,
-)
-from minrecord.functional import get_best_values, get_last_values
-from minrecord.generic import Record
-from minrecord.manager import RecordManager
-
-try:
-    __version__ = version(__name__)
-except PackageNotFoundError:  # pragma: no cover
-    # Package is not installed, fallback if needed
-    __version__ = "0.0.0"
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from minrecord.base import BaseRecord, EmptyRecordError, NotAComparableRecordError
+    from minrecord.comparable import ComparableRecord, MaxScalarRecord, MinScalarRecord
+    from minrecord.comparator import (
+        BaseComparator,
+        KeyComparator,
+        LexicographicComparator,
+        MaxScalarComparator,
+        MinScalarComparator,
+        ParetoComparator,
+    )
+    from minrecord.config import get_max_size, set_max_size
+    from minrecord.functional import get_best_values, get_last_values
+    from minrecord.generic import Record
+    from minrecord.manager import RecordManager
+    from minrecord.ndarray import ArrayRecord
+    from minrecord.pareto import ParetoRecord
+    from minrecord.rate import RateRecord
+    from minrecord.rule import RecordRule
+    from minrecord.sqlite import SQLiteRecordManager
+
+# The public attributes are only loaded on first access, so
+# ``import minrecord`` does not import the modules that are not used.
+_LAZY_ATTRIBUTES = {
+    "ArrayRecord": "minrecord.ndarray",
+    "BaseComparator": "minrecord.comparator",
+    "BaseRecord": "minrecord.base",
+    "ComparableRecord": "minrecord.comparable",
+    "EmptyRecordError": "minrecord.base",
+    "KeyComparator": "minrecord.comparator",
+    "LexicographicComparator": "minrecord.comparator",
+    "MaxScalarComparator": "minrecord.comparator",
+    "MaxScalarRecord": "minrecord.comparable",
+    "MinScalarComparator": "minrecord.comparator",
+    "MinScalarRecord": "minrecord.comparable",
+    "NotAComparableRecordError": "minrecord.base",
+    "ParetoComparator": "minrecord.comparator",
+    "ParetoRecord": "minrecord.pareto",
+    "RateRecord": "minrecord.rate",
+    "Record": "minrecord.generic",
+    "RecordManager": "minrecord.manager",
+    "RecordRule": "minrecord.rule",
+    "SQLiteRecordManager": "minrecord.sqlite",
+    "get_best_values": "minrecord.functional",
+    "get_last_values": "minrecord.functional",
+    "get_max_size": "minrecord.config",
+    "set_max_size": "minrecord.config",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name == "__version__":
+        from importlib.metadata import PackageNotFoundError, version  # noqa: PLC0415
+
+        try:
+            value = version(__name__)
+        except PackageNotFoundError:  # pragma: no cover
+            # Package is not installed, fallback if needed
+            value = "0.0.0"
+    elif name in _LAZY_ATTRIBUTES:
+        import importlib  # noqa: PLC0415
+
+        value = getattr(importlib.import_module(_LAZY_ATTRIBUTES[name]), name)
+    else:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *_LAZY_ATTRIBUTES, "__version__"])
@@ -0,0 +1,482 @@
+r"""Contain functions to export/import records to/from Apache Arrow
+tables and Parquet files.
+
+Two layouts are supported:
+
+    - ``"long"``: one row per ``(key, step, value)``.
+    - ``"wide"``: one ``step`` column and one column per key. The
+        rows are aligned on the step.
+
+The config and the state of each record (except the values) are
+stored in the schema metadata, so a manager can be re-created
+without loss of information. They are encoded in JSON if they can be
+encoded without loss, for example for ``Record``,
+``MinScalarRecord`` and ``MaxScalarRecord``, otherwise they are
+pickled. Unpickling can execute arbitrary code, so the pickled
+metadata is loaded only with ``trusted=True``.
+
+In the long layout, the values of all the records are stored in a
+single column. If the records have values of different types, for
+example strings and floats, or integers and floats, the values are
+encoded in JSON so that they keep their type.
+"""
+
+from __future__ import annotations
+
+__all__ = ["from_arrow_table", "from_parquet", "to_arrow_table", "to_parquet"]
+
+import functools
+import json
+import pickle
+from typing import TYPE_CHECKING, Any
+
+from minrecord.base import BaseRecord
+from minrecord.generic import Record
+from minrecord.manager import RecordManager
+from minrecord.storage import PackedStorage
+from minrecord.utils.imports import check_pyarrow, is_pyarrow_available
+
+if is_pyarrow_available():
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+
+if TYPE_CHECKING:
+    from array import array
+    from collections.abc import Collection, Mapping
+    from pathlib import Path
+
+LONG = "long"
+WIDE = "wide"
+
+_METADATA_KEY = b"minrecord"
+_PICKLE_METADATA_KEY = b"minrecord.pickle"
+_LONG_COLUMNS = ("key", "step", "value")
+
+
+def to_arrow_table(
+    records: RecordManager | Mapping[str, BaseRecord[Any]], layout: str = LONG
+) -> pa.Table:
+    r"""Export records to an Apache Arrow table.
+
+    Args:
+        records: The record manager or the records and their
+            associated keys.
+        layout: The layout of the table. ``"long"`` creates one row
+            per ``(key, step, value)`` and ``"wide"`` creates one
+            column per key where the rows are aligned on the step.
+
+    Returns:
+        The table with the values of the records.
+
+    Raises:
+        RuntimeError: if ``pyarrow`` is not installed.
+        ValueError: if the layout is not supported, if the values of a
+            record cannot be converted to an Arrow array, if a record
+            has missing or duplicate steps with the ``"wide"``
+            layout, or if the records have values of different types
+            that cannot be encoded in JSON with the ``"long"`` layout.
+
+    Example:
+        ```pycon
+        >>> from minrecord import MinScalarRecord, RecordManager
+        >>> from minrecord.arrow import to_arrow_table
+        >>> manager = RecordManager()
+        >>> manager.add_record(MinScalarRecord.from_elements("loss", [(0, 2.0), (1, 1.0)]))
+        >>> table = to_arrow_table(manager)
+        >>> table.column_names
+        ['key', 'step', 'value']
+        >>> table["value"].to_pylist()
+        [2.0, 1.0]
+
+        ```
+    """
+    check_pyarrow()
+    if isinstance(records, RecordManager):
+        records = records.get_records()
+    if layout not in (LONG, WIDE):
+        msg = f"Incorrect layout: {layout}. The valid layouts are: {LONG!r} and {WIDE!r}"
+        raise ValueError(msg)
+    columns = {key: _get_columns(key, record) for key, record in records.items()}
+    metadata = {"layout": layout, "records": {}}
+    if layout == LONG:
+        table, metadata["encoded"] = _to_long_table(columns)
+    else:
+        table = _to_wide_table(columns)
+    pickled = {}
+    for key, record in records.items():
+        header = _get_header(record)
+        if _is_json_encodable(header):
+            metadata["records"][key] = header
+        else:
+            # The position of the record is kept in the JSON metadata.
+            metadata["records"][key] = None
+            pickled[key] = header
+    schema_metadata = {_METADATA_KEY: json.dumps(metadata)}
+    if pickled:
+        schema_metadata[_PICKLE_METADATA_KEY] = pickle.dumps(pickled)
+    return table.replace_schema_metadata(schema_metadata)
+
+
+def from_arrow_table(table: pa.Table, trusted: bool = False) -> RecordManager:
+    r"""Import records from an Apache Arrow table.
+
+    The table is expected to use one of the layouts created by
+    ``to_arrow_table``. If the table does not have the ``minrecord``
+    metadata, a ``Record`` is created for each key and the layout is
+    inferred from the column names.
+
+    Args:
+        table: The table to import.
+        trusted: If ``True``, the pickled metadata of the records is
+            loaded. Unpickling can execute arbitrary code, so it
+            should be set to ``True`` only for the tables from
+            trusted sources.
+
+    Returns:
+        A record manager with the imported records.
+
+    Raises:
+        RuntimeError: if ``pyarrow`` is not installed.
+        ValueError: if the table has pickled metadata and
+            ``trusted=False``.
+
+    Example:
+        ```pycon
+        >>> from minrecord import MinScalarRecord, RecordManager
+        >>> from minrecord.arrow import from_arrow_table, to_arrow_table
+        >>> manager = RecordManager()
+        >>> manager.add_record(MinScalarRecord.from_elements("loss", [(0, 2.0), (1, 1.0)]))
+        >>> manager = from_arrow_table(to_arrow_table(manager, layout="wide"))
+        >>> manager.get_record("loss")
+        MinScalarRecord(name=loss, max_size=10, size=2)
+
+        ```
+    """
+    check_pyarrow()
+    schema_metadata = table.schema.metadata or {}
+    metadata = {}
+    if _METADATA_KEY in schema_metadata:
+        metadata = json.loads(schema_metadata[_METADATA_KEY])
+    headers = metadata.get("records", {})
+    if _PICKLE_METADATA_KEY in schema_metadata:
+        if not trusted:
+            msg = (
+                "The table has pickled metadata, which can execute arbitrary code when it is "
+                "loaded. Use trusted=True to load it if the table is from a trusted source"
+            )
+            raise ValueError(msg)
+        headers |= pickle.loads(schema_metadata[_PICKLE_METADATA_KEY])  # noqa: S301
+    layout = metadata.get("layout")
+    if layout is None:
+        layout = LONG if tuple(table.column_names) == _LONG_COLUMNS else WIDE
+    if layout == LONG:
+        columns = _from_long_table(table, encoded=metadata.get("encoded", ()))
+    else:
+        columns = _from_wide_table(table)
+
+    manager = RecordManager()
+    for key in {**dict.fromkeys(headers), **dict.fromkeys(columns)}:
+        elements = tuple(zip(*columns.get(key, ((), ()))))
+        header = headers.get(key)
+        if header is None:
+            record = Record(name=key)
+            record.update(elements)
+        else:
+            record = BaseRecord.from_dict(
+                {"config": header["config"], "state": header["state"] | {"record": elements}}
+            )
+        manager.add_record(record, key=key)
+    return manager
+
+
+def to_parquet(
+    records: RecordManager | Mapping[str, BaseRecord[Any]],
+    path: Path | str,
+    layout: str = LONG,
+    **kwargs: Any,
+) -> None:
+    r"""Export records to a Parquet file.
+
+    Args:
+        records: The record manager or the records and their
+            associated keys.
+        path: The path to the Parquet file.
+        layout: The layout of the table. See ``to_arrow_table`` for
+            more information.
+        **kwargs: Additional keyword arguments passed to
+            ``pyarrow.parquet.write_table``.
+
+    Raises:
+        RuntimeError: if ``pyarrow`` is not installed.
+
+    Example:
+        ```pycon
+        >>> import tempfile
+        >>> from pathlib import Path
+        >>> from minrecord import MinScalarRecord, RecordManager
+        >>> from minrecord.arrow import from_parquet, to_parquet
+        >>> manager = RecordManager()
+        >>> manager.add_record(MinScalarRecord.from_elements("loss", [(0, 2.0), (1, 1.0)]))
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     path = Path(tmpdir).joinpath("records.parquet")
+        ...     to_parquet(manager, path)
+        ...     manager = from_parquet(path)
+        ...
+        >>> manager.get_best_values()
+        {'loss': 1.0}
+
+        ```
+    """
+    pq.write_table(to_arrow_table(records, layout=layout), path, **kwargs)
+
+
+def from_parquet(path: Path | str, trusted: bool = False, **kwargs: Any) -> RecordManager:
+    r"""Import records from a Parquet file.
+
+    Args:
+        path: The path to the Parquet file.
+        trusted: If ``True``, the pickled metadata of the records is
+            loaded. See ``from_arrow_table`` for more information.
+        **kwargs: Additional keyword arguments passed to
+            ``pyarrow.parquet.read_table``.
+
+    Returns:
+        A record manager with the imported records.
+
+    Raises:
+        RuntimeError: if ``pyarrow`` is not installed.
+        ValueError: if the file has pickled metadata and
+            ``trusted=False``.
+
+    Example:
+        ```pycon
+        >>> import tempfile
+        >>> from pathlib import Path
+        >>> from minrecord import MinScalarRecord, RecordManager
+        >>> from minrecord.arrow import from_parquet, to_parquet
+        >>> manager = RecordManager()
+        >>> manager.add_record(MinScalarRecord.from_elements("loss", [(0, 2.0), (1, 1.0)]))
+        >>> with tempfile.TemporaryDirectory() as tmpdir:
+        ...     path = Path(tmpdir).joinpath("records.parquet")
+        ...     to_parquet(manager, path)
+        ...     manager = from_parquet(path)
+        ...
+        >>> manager.get_record("loss").get_most_recent()
+        ((0, 2.0), (1, 1.0))
+
+        ```
+    """
+    check_pyarrow()
+    return from_arrow_table(pq.read_table(path, **kwargs), trusted=trusted)
+
+
+def _get_columns(key: str, record: BaseRecord[Any]) -> tuple[pa.Array, pa.Array]:
+    r"""Get the steps and the values of a record.
+
+    Args:
+        key: The key of the record.
+        record: The record.
+
+    Returns:
+        A tuple with the steps and the values.
+
+    Raises:
+        ValueError: if the values cannot be converted to an Arrow
+            array.
+    """
+    storage = getattr(record, "_record", None)
+    if isinstance(storage, PackedStorage) and len(storage):
+        # The arrays of the packed records are exported without copy.
+        steps, values = storage.buffers()
+        if steps is None:
+            return pa.nulls(len(values)), _from_buffer(values)
+        return _from_buffer(steps), _from_buffer(values)
+    try:
+        return pa.array(record.get_steps()), pa.array(record.get_values())
+    except (pa.ArrowInvalid, pa.ArrowTypeError) as exc:
+        msg = f"The values of the '{key}' record cannot be converted to an Arrow array"
+        raise ValueError(msg) from exc
+
+
+def _from_buffer(data: array) -> pa.Array:
+    r"""Create an Arrow array from the buffer of an ``array``, without
+    copy.
+
+    Args:
+        data: The ``array`` of ``int``s (``"q"``) or ``float``s
+            (``"d"``).
+
+    Returns:
+        The Arrow array.
+    """
+    arrow_type = pa.int64() if data.typecode == "q" else pa.float64()
+    return pa.Array.from_buffers(arrow_type, len(data), [None, pa.py_buffer(data)])
+
+
+def _get_header(record: BaseRecord[Any]) -> dict[str, Any]:
+    r"""Get the config and the state of a record without the values.
+
+    Args:
+        record: The record.
+
+    Returns:
+        The config and the state of the record without the values.
+    """
+    if isinstance(record, Record):
+        # The elements are not copied and their fingerprint is not
+        # computed because they are stored in the columns.
+        state = record._get_state_without_elements()
+    else:
+        state = record.state_dict()
+        state.pop("record", None)
+    return {"config": record.config_dict(), "state": state}
+
+
+def _is_json_encodable(obj: Any) -> bool:
+    r"""Indicate if an object can be encoded in JSON without loss.
+
+    Args:
+        obj: The object to encode.
+
+    Returns:
+        ``True`` if the object is equal to its decoded JSON encoding,
+            otherwise ``False``. For example, a tuple is decoded as a
+            list so it is not encodable without loss.
+    """
+    try:
+        return json.loads(json.dumps(obj)) == obj
+    except (TypeError, ValueError):
+        return False
+
+
+def _concat_chunks(name: str, chunks: list[pa.Array]) -> tuple[pa.ChunkedArray, bool]:
+    r"""Concatenate the arrays of the records in a single column.
+
+    The arrays are not copied if they have the same type. Otherwise,
+    the values are encoded in JSON so they keep their type.
+
+    Args:
+        name: The name of the column.
+        chunks: The arrays of the records.
+
+    Returns:
+        The column and a flag which indicates if the values are
+            encoded in JSON.
+
+    Raises:
+        ValueError: if the values cannot be encoded in JSON.
+    """
+    types = {chunk.type for chunk in chunks if len(chunk) and chunk.type != pa.null()}
+    if len(types) <= 1:
+        dtype = types.pop() if types else pa.null()
+        return pa.chunked_array([chunk.cast(dtype) for chunk in chunks], type=dtype), False
+    try:
+        encoded = [json.dumps(item) for chunk in chunks for item in chunk.to_pylist()]
+    except (TypeError, ValueError) as exc:
+        msg = (
+            f"The {name}s of the records have different types ({', '.join(sorted(map(str, types)))}) "
+            "that cannot be encoded in JSON. Use the wide layout"
+        )
+        raise ValueError(msg) from exc
+    return pa.chunked_array([pa.array(encoded, type=pa.string())]), True
+
+
+def _to_long_table(columns: Mapping[str, tuple[pa.Array, pa.Array]]) -> tuple[pa.Table, list[str]]:
+    r"""Create a table with one row per ``(key, step, value)``.
+
+    Args:
+        columns: The steps and the values of each record.
+
+    Returns:
+        The table and the names of the columns encoded in JSON.
+
+    Raises:
+        ValueError: if the records have steps or values of different
+            types that cannot be encoded in JSON.
+    """
+    keys = [pa.repeat(key, len(steps)) for key, (steps, _) in columns.items()]
+    key = pa.concat_arrays(keys) if keys else pa.array([], type=pa.string())
+    step, step_encoded = _concat_chunks("step", [steps for steps, _ in columns.values()])
+    value, value_encoded = _concat_chunks("value", [values for _, values in columns.values()])
+    table = pa.table({"key": key.dictionary_encode(), "step": step, "value": value})
+    encoded = [name for name, flag in (("step", step_encoded), ("value", value_encoded)) if flag]
+    return table, encoded
+
+
+def _to_wide_table(columns: Mapping[str, tuple[pa.Array, pa.Array]]) -> pa.Table:
+    r"""Create a table with one column per key where the rows are
+    aligned on the step.
+
+    Args:
+        columns: The steps and the values of each record.
+
+    Returns:
+        The table.
+
+    Raises:
+        ValueError: if a record has missing or duplicate steps.
+    """
+    tables = []
+    for key, (steps, values) in columns.items():
+        if not len(steps):
+            continue
+        if steps.null_count or pc.count_distinct(steps).as_py() != len(steps):
+            msg = f"The wide layout requires unique and not-null steps ('{key}' record)"
+            raise ValueError(msg)
+        tables.append(pa.table({"step": steps, key: values}))
+    if not tables:
+        return pa.table({"step": pa.array([], type=pa.int64())})
+    if len({table.schema.field("step").type for table in tables}) > 1:
+        tables = [table.set_column(0, "step", table["step"].cast(pa.float64())) for table in tables]
+    table = functools.reduce(
+        lambda left, right: left.join(right, keys="step", join_type="full outer"), tables
+    )
+    return table.sort_by("step")
+
+
+def _from_long_table(
+    table: pa.Table, encoded: Collection[str] = ()
+) -> dict[str, tuple[list[Any], list[Any]]]:
+    r"""Get the steps and the values of each key from a table with one
+    row per ``(key, step, value)``.
+
+    Args:
+        table: The table.
+        encoded: The names of the columns encoded in JSON.
+
+    Returns:
+        The steps and the values of each key.
+    """
+    grouped = table.group_by("key", use_threads=False).aggregate(
+        [("step", "list"), ("value", "list")]
+    )
+    steps = grouped["step_list"].to_pylist()
+    values = grouped["value_list"].to_pylist()
+    if "step" in encoded:
+        steps = [list(map(json.loads, items)) for items in steps]
+    if "value" in encoded:
+        values = [list(map(json.loads, items)) for items in values]
+    return dict(zip(grouped["key"].to_pylist(), zip(steps, values)))
+
+
+def _from_wide_table(table: pa.Table) -> dict[str, tuple[list[Any], list[Any]]]:
+    r"""Get the steps and the values of each key from a table with one
+    column per key.
+
+    The null values are ignored.
+
+    Args:
+        table: The table.
+
+    Returns:
+        The steps and the values of each key.
+    """
+    step = table["step"]
+    columns = {}
+    for key in table.column_names:
+        if key == "step":
+            continue
+        mask = pc.is_valid(table[key])
+        columns[key] = (step.filter(mask).to_pylist(), table[key].filter(mask).to_pylist())
+    return columns
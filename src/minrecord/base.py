@@ -12,19 +12,11 @@ import logging
 from abc import ABC, abstractmethod
 from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
-from coola.equality.tester import EqualEqualityTester, get_default_registry
-from coola.utils.introspection import get_fully_qualified_name
-
-from minrecord.utils.imports import check_objectory, is_objectory_available
-
-if is_objectory_available():
-    from objectory import OBJECT_TARGET, AbstractFactory
-else:  # pragma: no cover
-    from minrecord.utils.fallback.objectory import OBJECT_TARGET, AbstractFactory
-
+from minrecord.registry import OBJECT_TARGET, RecordFactory, register_record_class
+from minrecord.utils.imports import when_imported
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Iterator, Sequence
 
 
 T = TypeVar("T")
@@ -32,7 +24,7 @@ T = TypeVar("T")
 logger: logging.Logger = logging.getLogger(__name__)
 
 
-class BaseRecord(ABC, Generic[T], metaclass=AbstractFactory):
+class BaseRecord(ABC, Generic[T], metaclass=RecordFactory):
     r"""Define the base class to implement a record.
 
     The record tracks the value added as well as the step
@@ -76,6 +68,10 @@ class BaseRecord(ABC, Generic[T], metaclass=AbstractFactory):
         ```
     """
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        register_record_class(cls)
+
     @property
     @abstractmethod
     def name(self) -> str:
@@ -191,6 +187,35 @@ class BaseRecord(ABC, Generic[T], metaclass=AbstractFactory):
         msg = "_get_best_value method is not implemented"
         raise NotImplementedError(msg)
 
+    def get_fingerprint(self) -> int:
+        r"""Get the fingerprint of the state of this record.
+
+        Two records with the same state have the same fingerprint,
+        even in different processes, so the fingerprint can be used
+        to check cheaply if the state changed. By default, it is
+        computed from the state dict, so you should override this
+        method if the record can maintain it incrementally.
+
+        Returns:
+            The fingerprint of the state of this record.
+
+        Example:
+            ```pycon
+            >>> from minrecord import Record
+            >>> record1 = Record("loss", elements=[(0, 1.0), (1, 0.5)])
+            >>> record2 = Record("loss", elements=[(0, 1.0), (1, 0.5)])
+            >>> record1.get_fingerprint() == record2.get_fingerprint()
+            True
+            >>> record2.add_value(0.2, step=2)
+            >>> record1.get_fingerprint() == record2.get_fingerprint()
+            False
+
+            ```
+        """
+        from minrecord.utils.fingerprint import hash_object  # noqa: PLC0415
+
+        return hash_object(self.state_dict())
+
     @abstractmethod
     def get_last_value(self) -> T:
         r"""Get the last value.
@@ -214,16 +239,23 @@ class BaseRecord(ABC, Generic[T], metaclass=AbstractFactory):
         """
 
     @abstractmethod
-    def get_most_recent(self) -> tuple[tuple[float | None, T], ...]:
+    def get_most_recent(self, n: int | None = None) -> tuple[tuple[float | None, T], ...]:
         r"""Get the tuple of recent values and their associated steps.
 
         The last value in the tuple is the last value added to the
         record. The length of the recent record depends on the
         concrete implementation.
 
+        Args:
+            n: The number of recent values to return. ``None`` means
+                all the recent values.
+
         Returns:
             A tuple of the recent values in the record.
 
+        Raises:
+            ValueError: if ``n`` is negative.
+
         Example:
             ```pycon
             >>> from minrecord import Record
@@ -233,10 +265,183 @@ class BaseRecord(ABC, Generic[T], metaclass=AbstractFactory):
             >>> record.add_value(value=0.8, step=2)
             >>> record.get_most_recent()
             ((None, 2), (1, 1.2), (2, 0.8))
+            >>> record.get_most_recent(2)
+            ((1, 1.2), (2, 0.8))
 
             ```
         """
 
+    def get_most_recent_view(self) -> Sequence[tuple[float | None, T]]:
+        r"""Get a read-only view of the recent values and their
+        associated steps.
+
+        By default, the view is the tuple returned by
+        ``get_most_recent``, so you should override this method if the
+        record can create a view without copying the values.
+
+        Returns:
+            A read-only sequence of the recent values in the record.
+
+        Example:
+            ```pycon
+            >>> from minrecord import Record
+            >>> record = Record("loss", elements=[(0, 2.0), (1, 1.2), (2, 0.8)])
+            >>> view = record.get_most_recent_view()
+            >>> len(view)
+            3
+            >>> view[-1]
+            (2, 0.8)
+
+            ```
+        """
+        return self.get_most_recent()
+
+    def get_steps(self, n: int | None = None) -> tuple[float | None, ...]:
+        r"""Get the steps of the recent values.
+
+        Args:
+            n: The number of recent steps to return. ``None`` means
+                all the recent steps.
+
+        Returns:
+            The steps of the recent values.
+
+        Raises:
+            ValueError: if ``n`` is negative.
+
+        Example:
+            ```pycon
+            >>> from minrecord import Record
+            >>> record = Record("loss", elements=[(0, 2.0), (1, 1.2), (2, 0.8)])
+            >>> record.get_steps()
+            (0, 1, 2)
+            >>> record.get_steps(2)
+            (1, 2)
+
+            ```
+        """
+        return tuple(step for step, _ in self.get_most_recent(n))
+
+    def get_values(self, n: int | None = None) -> tuple[T, ...]:
+        r"""Get the recent values.
+
+        Args:
+            n: The number of recent values to return. ``None`` means
+                all the recent values.
+
+        Returns:
+            The recent values.
+
+        Raises:
+            ValueError: if ``n`` is negative.
+
+        Example:
+            ```pycon
+            >>> from minrecord import Record
+            >>> record = Record("loss", elements=[(0, 2.0), (1, 1.2), (2, 0.8)])
+            >>> record.get_values()
+            (2.0, 1.2, 0.8)
+            >>> record.get_values(1)
+            (0.8,)
+
+            ```
+        """
+        return tuple(value for _, value in self.get_most_recent(n))
+
+    def iter_most_recent(self) -> Iterator[tuple[float | None, T]]:
+        r"""Iterate over the recent values and their associated steps.
+
+        The values are iterated from the oldest to the most recent.
+        The record should not be modified during the iteration.
+
+        Returns:
+            An iterator over the recent values in the record.
+
+        Example:
+            ```pycon
+            >>> from minrecord import Record
+            >>> record = Record("loss", elements=[(0, 2.0), (1, 1.2), (2, 0.8)])
+            >>> for step, value in record.iter_most_recent():
+            ...     print(step, value)
+            ...
+            0 2.0
+            1 1.2
+            2 0.8
+
+            ```
+        """
+        return iter(self.get_most_recent())
+
+    def get_range(
+        self, start_step: float | None = None, end_step: float | None = None
+    ) -> tuple[tuple[float | None, T], ...]:
+        r"""Get the recent values whose step is in a range.
+
+        The elements without step are ignored. By default, the recent
+        values are scanned, so you should override this method if the
+        record can find the values faster.
+
+        Args:
+            start_step: The first step of the range (included).
+                ``None`` means there is no lower bound.
+            end_step: The last step of the range (included). ``None``
+                means there is no upper bound.
+
+        Returns:
+            The recent values and their associated steps whose step is
+                in the range, in the order they were added.
+
+        Example:
+            ```pycon
+            >>> from minrecord import Record
+            >>> record = Record("loss", elements=[(0, 2.0), (1, 1.2), (2, 0.8), (3, 0.5)])
+            >>> record.get_range(1, 2)
+            ((1, 1.2), (2, 0.8))
+            >>> record.get_range(start_step=2)
+            ((2, 0.8), (3, 0.5))
+
+            ```
+        """
+        return tuple(
+            (step, value)
+            for step, value in self.get_most_recent()
+            if step is not None
+            and (start_step is None or start_step <= step)
+            and (end_step is None or step <= end_step)
+        )
+
+    def get_value_at_step(self, step: float) -> T:
+        r"""Get the recent value associated to a step.
+
+        If several values are associated to the step, the last one is
+        returned. By default, the recent values are scanned, so you
+        should override this method if the record can find the value
+        faster.
+
+        Args:
+            step: The step.
+
+        Returns:
+            The value associated to the step.
+
+        Raises:
+            KeyError: if no recent value is associated to the step.
+
+        Example:
+            ```pycon
+            >>> from minrecord import Record
+            >>> record = Record("loss", elements=[(0, 2.0), (1, 1.2), (2, 0.8)])
+            >>> record.get_value_at_step(1)
+            1.2
+
+            ```
+        """
+        for element_step, value in reversed(self.get_most_recent()):
+            if element_step is not None and element_step == step:
+                return value
+        msg = f"'{self.name}' record does not have a value at step {step}"
+        raise KeyError(msg)
+
     def has_improved(self) -> bool:
         r"""Indicate if the last value is the best value.
 
@@ -325,6 +530,33 @@ class BaseRecord(ABC, Generic[T], metaclass=AbstractFactory):
             ```
         """
 
+    def memory_usage(self) -> dict[str, int]:
+        r"""Get the approximate number of bytes used by the record.
+
+        By default, the memory is measured with
+        ``minrecord.utils.memory.get_deep_size``, so you should override
+        this method to add a breakdown by component.
+
+        Returns:
+            The number of bytes used by each component of the record.
+                The ``"total"`` key is the number of bytes used by the
+                record.
+
+        Example:
+            ```pycon
+            >>> from minrecord import Record
+            >>> usage = Record("loss", elements=[(0, 1.0), (1, 0.5)]).memory_usage()
+            >>> sorted(usage)
+            ['other', 'steps', 'storage', 'timestamps', 'total', 'values']
+            >>> usage["total"] == sum(size for key, size in usage.items() if key != "total")
+            True
+
+            ```
+        """
+        from minrecord.utils.memory import get_deep_size  # noqa: PLC0415
+
+        return {"total": get_deep_size(self)}
+
     @abstractmethod
     def update(self, elements: Iterable[tuple[float | None, T]]) -> None:
         r"""Update the record by adding the elements.
@@ -369,7 +601,8 @@ class BaseRecord(ABC, Generic[T], metaclass=AbstractFactory):
 
             ```
         """
-        return {OBJECT_TARGET: get_fully_qualified_name(self.__class__), "name": self.name}
+        cls = self.__class__
+        return {OBJECT_TARGET: f"{cls.__module__}.{cls.__qualname__}", "name": self.name}
 
     @abstractmethod
     def load_state_dict(self, state_dict: dict[str, Any]) -> None:
@@ -403,8 +636,8 @@ class BaseRecord(ABC, Generic[T], metaclass=AbstractFactory):
             >>> record = Record("loss")
             >>> record.add_value(42.0, step=0)
             >>> state = record.state_dict()
-            >>> state
-            {'record': ((0, 42.0),)}
+            >>> state["record"]
+            ((0, 42.0),)
 
             ```
         """
@@ -413,6 +646,10 @@ class BaseRecord(ABC, Generic[T], metaclass=AbstractFactory):
     def from_dict(cls, data: dict[str, Any]) -> BaseRecord[T]:
         r"""Instantiate a record from a dictionary.
 
+        The record class is resolved with the record class registry
+        (see ``minrecord.registry``), so ``objectory`` is only needed
+        if the target cannot be resolved by the registry.
+
         Args:
             data: The dictionary that is used to instantiate the
                 record. The dictionary is expected to contain the
@@ -425,11 +662,10 @@ class BaseRecord(ABC, Generic[T], metaclass=AbstractFactory):
         Example:
             ```pycon
             >>> from minrecord import BaseRecord
-            >>> from objectory import OBJECT_TARGET
             >>> record = BaseRecord.from_dict(
             ...     {
             ...         "config": {
-            ...             OBJECT_TARGET: "minrecord.Record",
+            ...             "_target_": "minrecord.Record",
             ...             "name": "loss",
             ...             "max_size": 7,
             ...         },
@@ -441,7 +677,6 @@ class BaseRecord(ABC, Generic[T], metaclass=AbstractFactory):
 
             ```
         """
-        check_objectory()
         obj = cls.factory(**data["config"])
         obj.load_state_dict(data["state"])
         return obj
@@ -480,4 +715,14 @@ class NotAComparableRecordError(Exception):
     the record."""
 
 
-get_default_registry().register(BaseRecord, EqualEqualityTester(), exist_ok=True)
+def _register_equality_tester() -> None:
+    r"""Register the equality tester of the records in ``coola``."""
+    from coola.equality.tester import (  # noqa: PLC0415
+        EqualEqualityTester,
+        get_default_registry,
+    )
+
+    get_default_registry().register(BaseRecord, EqualEqualityTester(), exist_ok=True)
+
+
+when_imported("coola.equality", _register_equality_tester)
@@ -7,15 +7,14 @@ __all__ = ["ComparableRecord", "MaxScalarRecord", "MinScalarRecord"]
 from numbers import Number
 from typing import TYPE_CHECKING, Any, TypeVar
 
-from coola.utils.format import str_indent, str_mapping
-
 from minrecord.base import EmptyRecordError
 from minrecord.comparator import (
     BaseComparator,
     MaxScalarComparator,
     MinScalarComparator,
 )
-from minrecord.generic import Record
+from minrecord.generic import Record, elements_are_equal
+from minrecord.utils.fingerprint import append_fingerprint, hash_object
 
 if TYPE_CHECKING:
     import sys
@@ -38,9 +37,15 @@ class ComparableRecord(Record[T]):
         elements: The initial elements. Each element is a tuple with
             the step and its associated value.
         max_size: The maximum number of elements to store in the record.
+            If ``None``, the default maximum size of the config is
+            used.
         best_value: The initial best value. If ``None``, the initial
             best value of the ``comparator`` is used.
         improved: Indicate if the last value is the best value or not.
+        clock: The clock used to timestamp the values. See ``Record``
+            for more information.
+        storage: The storage mode of the values. See ``Record`` for
+            more information.
 
     Example:
         ```pycon
@@ -64,16 +69,23 @@ class ComparableRecord(Record[T]):
         name: str,
         comparator: BaseComparator[T],
         elements: Iterable[tuple[int | None, T]] = (),
-        max_size: int = 10,
+        max_size: int | None = None,
         best_value: T | None = None,
         improved: bool = False,
+        *,
+        clock: str | None = None,
+        storage: str = "object",
     ) -> None:
-        super().__init__(name=name, elements=elements, max_size=max_size)
+        super().__init__(
+            name=name, elements=elements, max_size=max_size, clock=clock, storage=storage
+        )
         self._comparator = comparator
         self._best_value = best_value or self._comparator.get_initial_best_value()
         self._improved = bool(improved)
 
     def __str__(self) -> str:
+        from coola.utils.format import str_indent, str_mapping  # noqa: PLC0415
+
         args = str_indent(
             str_mapping(
                 {
@@ -94,15 +106,45 @@ class ComparableRecord(Record[T]):
             self._best_value = value
         super().add_value(value, step)
 
+    def update(self, elements: Iterable[tuple[float | None, T]]) -> None:
+        if type(self).add_value is not ComparableRecord.add_value:
+            # A subclass changes how the values are added, so the
+            # values are added one by one.
+            super().update(elements)
+            return
+        self._add_elements(elements)
+
     def clone(self) -> ComparableRecord[T]:
-        return self.__class__(
+        record = self.__class__(
             name=self.name,
             elements=self._record,
             max_size=self.max_size,
             comparator=self._comparator,
             best_value=self._best_value,
             improved=self._improved,
+            clock=self.clock,
+            storage=self.storage,
         )
+        record._copy_storage(self)
+        return record
+
+    def equal(self, other: Any) -> bool:
+        if self is other:
+            return True
+        if (
+            type(other) is not type(self)
+            or len(self) != len(other)
+            or not self._comparator.equal(other._comparator)
+            or not elements_are_equal(
+                ((self._best_value, self._improved),), ((other._best_value, other._improved),)
+            )
+        ):
+            return False
+        return super().equal(other)
+
+    def get_fingerprint(self) -> int:
+        fingerprint = append_fingerprint(super().get_fingerprint(), hash_object(self._best_value))
+        return append_fingerprint(fingerprint, hash_object(self._improved))
 
     def is_better(self, old_value: T, new_value: T) -> bool:
         r"""Indicate if the new value is better than the old value.
@@ -129,6 +171,18 @@ class ComparableRecord(Record[T]):
         """
         return self._comparator.is_better(new_value=new_value, old_value=old_value)
 
+    def _add_elements(self, elements: Iterable[tuple[float | None, T]]) -> None:
+        elements = list(elements)
+        if not elements:
+            return
+        # The values are compared in batch by the comparator.
+        self._best_value, self._improved = self._comparator.find_best(
+            self._best_value, [value for _, value in elements]
+        )
+        add_value = super().add_value
+        for step, value in elements:
+            add_value(value, step)
+
     def _get_best_value(self) -> T:
         if self.is_empty():
             msg = "The record is empty so it is not possible to get the best value."
@@ -155,11 +209,6 @@ class ComparableRecord(Record[T]):
         self._improved = state_dict["improved"]
         self._best_value = state_dict["best_value"]
 
-    def state_dict(self) -> dict[str, Any]:
-        state = super().state_dict()
-        state.update({"improved": self._improved, "best_value": self._best_value})
-        return state
-
     @classmethod
     def from_elements(
         cls, name: str, comparator: BaseComparator[T], elements: Iterable[tuple[float | None, T]]
@@ -168,6 +217,11 @@ class ComparableRecord(Record[T]):
         record.update(elements)
         return record
 
+    def _get_state_without_elements(self) -> dict[str, Any]:
+        state = super()._get_state_without_elements()
+        state.update({"improved": self._improved, "best_value": self._best_value})
+        return state
+
 
 class MaxScalarRecord(ComparableRecord[Number]):
     r"""A specific implementation to track the max value of a scalar
@@ -181,9 +235,15 @@ class MaxScalarRecord(ComparableRecord[Number]):
         elements: The initial elements. Each element is a tuple with
             the step and its associated value.
         max_size: The maximum number of elements to store inthe record.
+            If ``None``, the default maximum size of the config is
+            used.
         best_value: The initial best value. If ``None``, the initial
             best value of the ``comparator`` is used.
         improved: Indicate if the last value is the best value or not.
+        clock: The clock used to timestamp the values. See ``Record``
+            for more information.
+        storage: The storage mode of the values. See ``Record`` for
+            more information.
 
     Example:
         ```pycon
@@ -205,9 +265,12 @@ class MaxScalarRecord(ComparableRecord[Number]):
         self,
         name: str,
         elements: Iterable[tuple[int | None, T]] = (),
-        max_size: int = 10,
+        max_size: int | None = None,
         best_value: T | None = None,
         improved: bool = False,
+        *,
+        clock: str | None = None,
+        storage: str = "object",
     ) -> None:
         super().__init__(
             name=name,
@@ -216,6 +279,8 @@ class MaxScalarRecord(ComparableRecord[Number]):
             max_size=max_size,
             best_value=best_value,
             improved=improved,
+            clock=clock,
+            storage=storage,
         )
 
     def config_dict(self) -> dict[str, Any]:
@@ -265,9 +330,15 @@ class MinScalarRecord(ComparableRecord[Number]):
         elements: The initial elements. Each element is a tuple with
             the step and its associated value.
         max_size: The maximum number of elements to store inthe record.
+            If ``None``, the default maximum size of the config is
+            used.
         best_value: The initial best value. If ``None``, the initial
             best  value of the ``comparator`` is used.
         improved: Indicate if the last value is the best value or not.
+        clock: The clock used to timestamp the values. See ``Record``
+            for more information.
+        storage: The storage mode of the values. See ``Record`` for
+            more information.
 
     Example:
         ```pycon
@@ -289,9 +360,12 @@ class MinScalarRecord(ComparableRecord[Number]):
         self,
         name: str,
         elements: Iterable[tuple[int | None, T]] = (),
-        max_size: int = 10,
+        max_size: int | None = None,
         best_value: T | None = None,
         improved: bool = False,
+        *,
+        clock: str | None = None,
+        storage: str = "object",
     ) -> None:
         super().__init__(
             name=name,
@@ -300,6 +374,8 @@ class MinScalarRecord(ComparableRecord[Number]):
             max_size=max_size,
             best_value=best_value,
             improved=improved,
+            clock=clock,
+            storage=storage,
         )
 
     def config_dict(self) -> dict[str, Any]:
@@ -3,19 +3,31 @@ r"""Contain the comparator base class and some implementations."""
 from __future__ import annotations
 
 __all__ = [
+    "MODES",
     "BaseComparator",
+    "KeyComparator",
+    "LexicographicComparator",
     "MaxScalarComparator",
     "MinScalarComparator",
+    "ParetoComparator",
 ]
 
 import logging
+import pickle
 from abc import ABC, abstractmethod
-from typing import Any, Generic, TypeVar
+from typing import TYPE_CHECKING, Any, Generic, TypeVar
 
-from coola.equality.tester import EqualEqualityTester, get_default_registry
+from minrecord.utils.imports import when_imported
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Hashable, Iterable, Sequence
 
 T = TypeVar("T")
 
+# The modes of the comparators with several objectives, and the sign
+# of the comparison of each mode.
+MODES = {"max": 1, "min": -1}
+
 logger: logging.Logger = logging.getLogger(__name__)
 
 
@@ -95,6 +107,228 @@ class BaseComparator(ABC, Generic[T]):
             ```
         """
 
+    def find_best(self, best_value: T, values: Sequence[T]) -> tuple[T, bool]:
+        r"""Find the best value after adding several values.
+
+        The result is the same as comparing the values one by one with
+        ``is_better``. The comparators can override this method to
+        compare the values in batch, for example to compute the
+        sort keys of all the values at once.
+
+        Args:
+            best_value: The current best value.
+            values: The values to compare, from the oldest to the most
+                recent. It must not be empty.
+
+        Returns:
+            The new best value, and ``True`` if the last value is
+                better than the best value of the previous values,
+                otherwise ``False``.
+
+        Example:
+            ```pycon
+            >>> from minrecord import MinScalarComparator
+            >>> comparator = MinScalarComparator()
+            >>> comparator.find_best(1.0, [0.5, 0.8, 0.2, 0.3])
+            (0.2, False)
+
+            ```
+        """
+        improved = False
+        for value in values:
+            improved = self.is_better(old_value=best_value, new_value=value)
+            if improved:
+                best_value = value
+        return best_value, improved
+
+
+class KeyComparator(BaseComparator[T]):
+    r"""Implement a comparator that compares the sort keys of the
+    values.
+
+    The sort key of a value is computed by a function, for example
+    ``operator.itemgetter("accuracy")``. ``find_best`` computes the
+    keys of all the values at once.
+
+    The comparator can be pickled only if the key function can be
+    pickled, for example a function defined at the top level of a
+    module or ``operator.itemgetter``, but not a lambda. A record
+    must be pickled to be stored in SQLite, evicted to disk by a
+    memory budget, or exported to Arrow or Parquet.
+
+    The initial best value is ``None``, which is worse than any value.
+
+    Args:
+        key: The function that computes the sort key of a value. The
+            keys must be comparable, for example numbers or tuples.
+        mode: ``"max"`` if the highest key is the best, ``"min"`` if
+            the lowest key is the best.
+
+    Raises:
+        ValueError: if the mode is not valid.
+
+    Example:
+        ```pycon
+        >>> from minrecord.comparator import KeyComparator
+        >>> comparator = KeyComparator(key=len, mode="min")
+        >>> comparator.is_better(old_value="abc", new_value="ab")
+        True
+        >>> comparator.is_better(old_value=None, new_value="abcd")
+        True
+        >>> comparator.find_best(None, ["abc", "a", "ab"])
+        ('a', False)
+
+        ```
+    """
+
+    def __init__(self, key: Callable[[T], Any], mode: str = "max") -> None:
+        _check_mode(mode)
+        self._key = key
+        self._mode = mode
+
+    def __getstate__(self) -> dict[str, Any]:
+        try:
+            pickle.dumps(self._key)
+        except (AttributeError, TypeError, pickle.PicklingError) as exc:
+            msg = (
+                f"The key function {self._key!r} cannot be pickled, so the comparator cannot "
+                "be pickled. Use a function defined at the top level of a module or "
+                "operator.itemgetter instead of a lambda"
+            )
+            raise TypeError(msg) from exc
+        return self.__dict__
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}(key={self._key!r}, mode={self._mode!r})"
+
+    @property
+    def mode(self) -> str:
+        r"""The mode of the comparator: ``"max"`` or ``"min"``."""
+        return self._mode
+
+    def equal(self, other: Any) -> bool:
+        return type(other) is type(self) and self._key == other._key and self._mode == other._mode
+
+    def get_initial_best_value(self) -> T | None:
+        return None
+
+    def get_key(self, value: T) -> Any:
+        r"""Get the sort key of a value.
+
+        Args:
+            value: The value.
+
+        Returns:
+            The sort key of the value.
+
+        Example:
+            ```pycon
+            >>> from minrecord.comparator import KeyComparator
+            >>> KeyComparator(key=len).get_key("abc")
+            3
+
+            ```
+        """
+        return self._key(value)
+
+    def is_better(self, old_value: T | None, new_value: T) -> bool:
+        if old_value is None:
+            return True
+        return self._is_better_key(self._key(old_value), self._key(new_value))
+
+    def find_best(self, best_value: T | None, values: Sequence[T]) -> tuple[T, bool]:
+        best_key = None if best_value is None else self._key(best_value)
+        keys = list(map(self._key, values))
+        is_better_key = self._is_better_key
+        improved = False
+        for value, key in zip(values, keys):
+            improved = best_value is None or is_better_key(best_key, key)
+            if improved:
+                best_value, best_key = value, key
+        return best_value, improved
+
+    def _is_better_key(self, old_key: Any, new_key: Any) -> bool:
+        r"""Indicate if a new sort key is better than an old sort key.
+
+        Args:
+            old_key: The old sort key.
+            new_key: The new sort key.
+
+        Returns:
+            ``True`` if the new sort key is better than the old sort
+                key, otherwise ``False``.
+        """
+        return old_key <= new_key if self._mode == "max" else new_key <= old_key
+
+
+class LexicographicComparator(KeyComparator[T]):
+    r"""Implement a comparator that compares the items of the values in
+    lexicographic order.
+
+    The first items of the values are compared first, and the next
+    items are only compared if the previous items are equal. For
+    example, ``LexicographicComparator(["max", "min"])`` maximizes the
+    first item, then minimizes the second item. The items must be
+    numbers. The sort key of a value is the tuple of its items, where
+    the items to minimize are negated.
+
+    Args:
+        modes: The mode of each item: ``"max"`` if higher is better,
+            ``"min"`` if lower is better.
+        keys: The keys of the items in the values, for example the
+            keys of a ``dict``. If ``None``, the items are the first
+            items of the sequence values.
+
+    Raises:
+        ValueError: if ``modes`` is empty, a mode is not valid, or
+            ``keys`` and ``modes`` do not have the same length.
+
+    Example:
+        ```pycon
+        >>> from minrecord.comparator import LexicographicComparator
+        >>> comparator = LexicographicComparator(["max", "min"])
+        >>> comparator.is_better(old_value=(0.9, 0.5), new_value=(0.9, 0.4))
+        True
+        >>> comparator.is_better(old_value=(0.9, 0.5), new_value=(0.8, 0.1))
+        False
+        >>> comparator = LexicographicComparator(["max", "min"], keys=["accuracy", "loss"])
+        >>> comparator.is_better(
+        ...     old_value={"accuracy": 0.9, "loss": 0.5},
+        ...     new_value={"accuracy": 0.9, "loss": 0.4},
+        ... )
+        True
+
+        ```
+    """
+
+    def __init__(self, modes: Sequence[str], keys: Sequence[Hashable] | None = None) -> None:
+        modes = tuple(modes)
+        if not modes:
+            msg = "modes cannot be empty"
+            raise ValueError(msg)
+        for mode in modes:
+            _check_mode(mode)
+        keys = tuple(range(len(modes)) if keys is None else keys)
+        if len(keys) != len(modes):
+            msg = f"keys and modes must have the same length ({len(keys)} vs {len(modes)})"
+            raise ValueError(msg)
+        super().__init__(key=_ItemsKey(zip(keys, (MODES[mode] for mode in modes))), mode="max")
+        self._modes = modes
+        self._keys = keys
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}(modes={self._modes}, keys={self._keys})"
+
+    @property
+    def modes(self) -> tuple[str, ...]:
+        r"""The mode of each item."""
+        return self._modes
+
+    def equal(self, other: Any) -> bool:
+        return (
+            type(other) is type(self) and self._modes == other._modes and self._keys == other._keys
+        )
+
 
 class MaxScalarComparator(BaseComparator[float]):
     r"""Implement a max comparator for scalar value.
@@ -152,4 +386,161 @@ class MinScalarComparator(BaseComparator[float]):
         return new_value <= old_value
 
 
-get_default_registry().register(BaseComparator, EqualEqualityTester(), exist_ok=True)
+class ParetoComparator(BaseComparator[tuple[float, ...]]):
+    r"""Implement a comparator for values with several objectives.
+
+    The values are sequences with one number per objective. A value
+    dominates another value if it is at least as good for all the
+    objectives and strictly better for at least one objective. There
+    is not a single best value, but a set of non-dominated values
+    called the Pareto front, see ``ParetoRecord``.
+
+    ``is_better`` follows the scalar comparators: the new value is
+    better if it is at least as good as the old value for all the
+    objectives.
+
+    Args:
+        modes: The mode of each objective: ``"max"`` if higher is
+            better, ``"min"`` if lower is better.
+
+    Raises:
+        ValueError: if ``modes`` is empty or a mode is not valid.
+
+    Example:
+        ```pycon
+        >>> from minrecord.comparator import ParetoComparator
+        >>> comparator = ParetoComparator(["max", "min"])
+        >>> comparator.dominates((0.9, 10.0), (0.8, 12.0))
+        True
+        >>> comparator.dominates((0.9, 10.0), (0.95, 12.0))
+        False
+        >>> comparator.is_better(old_value=(0.8, 12.0), new_value=(0.9, 12.0))
+        True
+        >>> comparator.get_initial_best_value()
+        (-inf, inf)
+
+        ```
+    """
+
+    def __init__(self, modes: Sequence[str]) -> None:
+        modes = tuple(modes)
+        if not modes:
+            msg = "modes cannot be empty"
+            raise ValueError(msg)
+        for mode in modes:
+            _check_mode(mode)
+        self._modes = modes
+        self._signs = tuple(MODES[mode] for mode in modes)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}(modes={self._modes})"
+
+    @property
+    def modes(self) -> tuple[str, ...]:
+        r"""The mode of each objective."""
+        return self._modes
+
+    @property
+    def num_objectives(self) -> int:
+        r"""The number of objectives."""
+        return len(self._modes)
+
+    def dominates(self, value1: Sequence[float], value2: Sequence[float]) -> bool:
+        r"""Indicate if a value dominates another value.
+
+        Args:
+            value1: The first value.
+            value2: The second value.
+
+        Returns:
+            ``True`` if the first value is at least as good as the
+                second value for all the objectives and strictly
+                better for at least one objective, otherwise
+                ``False``.
+
+        Example:
+            ```pycon
+            >>> from minrecord.comparator import ParetoComparator
+            >>> comparator = ParetoComparator(["max", "min"])
+            >>> comparator.dominates((0.9, 10.0), (0.9, 12.0))
+            True
+            >>> comparator.dominates((0.9, 10.0), (0.9, 10.0))
+            False
+
+            ```
+        """
+        strict = False
+        for sign, item1, item2 in zip(self._signs, value1, value2):
+            difference = (item1 - item2) * sign
+            if difference < 0:
+                return False
+            if difference > 0:
+                strict = True
+        return strict
+
+    def equal(self, other: Any) -> bool:
+        return isinstance(other, ParetoComparator) and self._modes == other._modes
+
+    def get_initial_best_value(self) -> tuple[float, ...]:
+        return tuple(-sign * float("inf") for sign in self._signs)
+
+    def is_better(self, old_value: Sequence[float], new_value: Sequence[float]) -> bool:
+        return all(
+            (new - old) * sign >= 0 for sign, old, new in zip(self._signs, old_value, new_value)
+        )
+
+
+class _ItemsKey:
+    r"""Implement the sort key of a ``LexicographicComparator``.
+
+    A class is used instead of a ``lambda`` so the comparator can be
+    pickled.
+
+    Args:
+        items: The key and the sign of each item.
+    """
+
+    __slots__ = ("_items",)
+
+    def __init__(self, items: Iterable[tuple[Hashable, int]]) -> None:
+        self._items = tuple(items)
+
+    def __call__(self, value: Any) -> tuple[Any, ...]:
+        return tuple(value[key] * sign for key, sign in self._items)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, _ItemsKey):
+            return NotImplemented
+        return self._items == other._items
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}(items={self._items})"
+
+
+def _check_mode(mode: str) -> None:
+    r"""Check if a mode is valid.
+
+    Args:
+        mode: The mode to check.
+
+    Raises:
+        ValueError: if the mode is not valid.
+    """
+    if mode not in MODES:
+        msg = f"Incorrect mode: {mode}. The valid modes are: {list(MODES)}"
+        raise ValueError(msg)
+
+
+def _register_equality_tester() -> None:
+    r"""Register the equality tester of the comparators in ``coola``."""
+    from coola.equality.tester import (  # noqa: PLC0415
+        EqualEqualityTester,
+        get_default_registry,
+    )
+
+    get_default_registry().register(BaseComparator, EqualEqualityTester(), exist_ok=True)
+
+
+when_imported("coola.equality", _register_equality_tester)
@@ -1,13 +1,47 @@
-r"""Contain functionalities to configure the records."""
+r"""Contain functionalities to configure the records.
+
+The default values are stored in a global config (see
+``get_default_config``). They can be overridden in the current
+context with ``config_scope``, for example in a thread or an
+``asyncio`` task, without changing the global config.
+"""
 
 from __future__ import annotations
 
-__all__ = ["Config", "get_default_config", "get_max_size", "reset_max_size", "set_max_size"]
+__all__ = [
+    "Config",
+    "config_scope",
+    "get_default_config",
+    "get_max_size",
+    "get_memory_budget",
+    "reset_max_size",
+    "reset_memory_budget",
+    "set_max_size",
+    "set_memory_budget",
+]
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+# The sentinel used for the values that are not overridden.
+_MISSING: Any = object()
+# The values of the config that are overridden in the current context.
+# Each thread and each asyncio task has its own context.
+_MAX_SIZE: ContextVar[int | None] = ContextVar("minrecord_max_size", default=None)
+_MEMORY_BUDGET: ContextVar[Any] = ContextVar("minrecord_memory_budget", default=_MISSING)
 
 
 class Config:
     r"""Config class to configure the records.
 
+    The memory budget is the approximate number of bytes that the
+    records of a ``RecordManager`` can use. ``None`` means there is no
+    limit. See ``RecordManager`` for more information.
+
     Example:
         ```pycon
         >>> from minrecord.config import Config
@@ -22,9 +56,11 @@ class Config:
     """
 
     DEFAULT_MAX_SIZE = 10
+    DEFAULT_MEMORY_BUDGET = None
 
     def __init__(self) -> None:
         self._max_size = self.DEFAULT_MAX_SIZE
+        self._memory_budget = self.DEFAULT_MEMORY_BUDGET
 
     def get_max_size(self) -> int:
         r"""Get the current default maximum size of values to track in
@@ -95,6 +131,68 @@ class Config:
         """
         self._max_size = self.DEFAULT_MAX_SIZE
 
+    def get_memory_budget(self) -> int | None:
+        r"""Get the default memory budget of the record managers.
+
+        Returns:
+            The default memory budget in bytes, or ``None`` if there
+                is no limit.
+
+        Example:
+            ```pycon
+            >>> from minrecord.config import Config
+            >>> c = Config()
+            >>> c.get_memory_budget()
+
+            ```
+        """
+        return self._memory_budget
+
+    def set_memory_budget(self, memory_budget: int | None) -> None:
+        r"""Set the default memory budget of the record managers.
+
+        This function does not change the memory budget of record
+        managers that are already created.
+
+        Args:
+            memory_budget: The new default memory budget in bytes.
+                Must be a positive integer or ``None`` to remove the
+                limit.
+
+        Raises:
+            ValueError: If memory_budget is not a positive integer or
+                ``None``.
+
+        Example:
+            ```pycon
+            >>> from minrecord.config import Config
+            >>> c = Config()
+            >>> c.set_memory_budget(2**20)
+            >>> c.get_memory_budget()
+            1048576
+
+            ```
+        """
+        if memory_budget is not None and (not isinstance(memory_budget, int) or memory_budget <= 0):
+            msg = f"memory_budget must be a positive integer or None, got {memory_budget}"
+            raise ValueError(msg)
+        self._memory_budget = memory_budget
+
+    def reset_memory_budget(self) -> None:
+        r"""Reset memory_budget to its default value.
+
+        Example:
+            ```pycon
+            >>> from minrecord.config import Config
+            >>> c = Config()
+            >>> c.set_memory_budget(2**20)
+            >>> c.reset_memory_budget()
+            >>> c.get_memory_budget()
+
+            ```
+        """
+        self._memory_budget = self.DEFAULT_MEMORY_BUDGET
+
 
 def get_default_config() -> Config:
     r"""Get the default global config instance.
@@ -135,16 +233,74 @@ def get_default_config() -> Config:
     return get_default_config._config
 
 
+@contextmanager
+def config_scope(
+    max_size: int = _MISSING, memory_budget: int | None = _MISSING
+) -> Generator[None, None, None]:
+    r"""Context manager to override the default values of the config
+    in the current context.
+
+    The values are stored in context variables, so they only apply to
+    the current thread or ``asyncio`` task, and to the tasks created
+    in the scope. The records and the record managers created in the
+    scope use these values. The global config is not modified, and
+    the previous values are restored when the scope exits. The scopes
+    can be nested.
+
+    Args:
+        max_size: The default maximum size of values to track in each
+            record. If it is not given, the current value is used.
+        memory_budget: The default memory budget of the record
+            managers in bytes, or ``None`` to remove the limit. If it
+            is not given, the current value is used.
+
+    Raises:
+        ValueError: If max_size is not a positive integer, or
+            memory_budget is not a positive integer or ``None``.
+
+    Example:
+        ```pycon
+        >>> from minrecord import Record
+        >>> from minrecord.config import config_scope, get_max_size
+        >>> with config_scope(max_size=5):
+        ...     Record("loss")
+        ...
+        Record(name=loss, max_size=5, size=0)
+        >>> get_max_size()
+        10
+
+        ```
+    """
+    # Validate the values before changing the context.
+    config = Config()
+    tokens = []
+    if max_size is not _MISSING:
+        config.set_max_size(max_size)
+    if memory_budget is not _MISSING:
+        config.set_memory_budget(memory_budget)
+    if max_size is not _MISSING:
+        tokens.append((_MAX_SIZE, _MAX_SIZE.set(max_size)))
+    if memory_budget is not _MISSING:
+        tokens.append((_MEMORY_BUDGET, _MEMORY_BUDGET.set(memory_budget)))
+    try:
+        yield
+    finally:
+        for variable, token in reversed(tokens):
+            variable.reset(token)
+
+
 def get_max_size() -> int:
     r"""Get the current default maximum size of values to track in each
     record.
 
+    The value of the current ``config_scope`` is used if any, otherwise
+    the value of the global config. This value can be changed by using
+    ``set_max_size``.
+
     Returns:
         The current default maximum size of values to track in each
             record.
 
-    This value can be changed by using ``set_max_size``.
-
     Example:
         ```pycon
         >>> from minrecord.config import get_max_size
@@ -153,7 +309,8 @@ def get_max_size() -> int:
 
         ```
     """
-    return get_default_config().get_max_size()
+    max_size = _MAX_SIZE.get()
+    return get_default_config().get_max_size() if max_size is None else max_size
 
 
 def set_max_size(max_size: int) -> None:
@@ -197,3 +354,65 @@ def reset_max_size() -> None:
         ```
     """
     get_default_config().reset_max_size()
+
+
+def get_memory_budget() -> int | None:
+    r"""Get the current default memory budget of the record managers.
+
+    The value of the current ``config_scope`` is used if any,
+    otherwise the value of the global config. This value can be
+    changed by using ``set_memory_budget``.
+
+    Returns:
+        The current default memory budget in bytes, or ``None`` if
+            there is no limit.
+
+    Example:
+        ```pycon
+        >>> from minrecord.config import get_memory_budget
+        >>> get_memory_budget()
+
+        ```
+    """
+    memory_budget = _MEMORY_BUDGET.get()
+    if memory_budget is _MISSING:
+        return get_default_config().get_memory_budget()
+    return memory_budget
+
+
+def set_memory_budget(memory_budget: int | None) -> None:
+    r"""Set the default memory budget of the record managers.
+
+    This function does not change the memory budget of record managers
+    that are already created.
+
+    Args:
+        memory_budget: The new default memory budget in bytes, or
+            ``None`` to remove the limit.
+
+    Example:
+        ```pycon
+        >>> from minrecord.config import get_memory_budget, set_memory_budget
+        >>> set_memory_budget(2**20)
+        >>> get_memory_budget()
+        1048576
+        >>> set_memory_budget(None)
+
+        ```
+    """
+    get_default_config().set_memory_budget(memory_budget)
+
+
+def reset_memory_budget() -> None:
+    """Reset memory budget to its default value.
+
+    Example:
+        ```pycon
+        >>> from minrecord.config import get_memory_budget, set_memory_budget, reset_memory_budget
+        >>> set_memory_budget(2**20)
+        >>> reset_memory_budget()
+        >>> get_memory_budget()
+
+        ```
+    """
+    get_default_config().reset_memory_budget()
@@ -2,19 +2,24 @@ r"""Contain functions to manipulate records."""
 
 from __future__ import annotations
 
-__all__ = ["get_best_values", "get_last_values"]
+__all__ = ["get_best_values", "get_last_values", "select_records"]
 
 import contextlib
 from typing import TYPE_CHECKING, Any
 
 from minrecord.base import BaseRecord, EmptyRecordError
+from minrecord.utils.pattern import compile_pattern
 
 if TYPE_CHECKING:
+    import re
     from collections.abc import Mapping
 
 
 def get_best_values(
-    records: Mapping[str, BaseRecord[Any]], prefix: str = "", suffix: str = ""
+    records: Mapping[str, BaseRecord[Any]],
+    prefix: str = "",
+    suffix: str = "",
+    pattern: str | re.Pattern[str] | None = None,
 ) -> dict[str, Any]:
     r"""Get the best value of each record.
 
@@ -32,6 +37,9 @@ def get_best_values(
             different from the record name to avoid confusion.
             By default, the returned dict uses the same name as the
             record.
+        pattern: If not ``None``, only the records whose key matches
+            this glob pattern or regular expression are used. See
+            ``select_records`` for more information.
 
     Returns:
         The dict with the best value of each record.
@@ -51,9 +59,13 @@ def get_best_values(
         {'best/loss': 1.2, 'best/accuracy': 42}
         >>> get_best_values({"loss": record1, "accuracy": record2}, suffix="/best")
         {'loss/best': 1.2, 'accuracy/best': 42}
+        >>> get_best_values({"loss": record1, "accuracy": record2}, pattern="l*")
+        {'loss': 1.2}
 
         ```
     """
+    if pattern is not None:
+        records = select_records(records, pattern)
     values = {}
     for key, record in records.items():
         if record.is_comparable():
@@ -63,7 +75,10 @@ def get_best_values(
 
 
 def get_last_values(
-    records: Mapping[str, BaseRecord[Any]], prefix: str = "", suffix: str = ""
+    records: Mapping[str, BaseRecord[Any]],
+    prefix: str = "",
+    suffix: str = "",
+    pattern: str | re.Pattern[str] | None = None,
 ) -> dict[str, Any]:
     r"""Get the last value of each record.
 
@@ -81,6 +96,9 @@ def get_last_values(
             different from the record name to avoid confusion.
             By default, the returned dict uses the same name as the
             record.
+        pattern: If not ``None``, only the records whose key matches
+            this glob pattern or regular expression are used. See
+            ``select_records`` for more information.
 
     Returns:
         The dict with the best value of each record.
@@ -100,11 +118,47 @@ def get_last_values(
         {'last/loss': 1.2, 'last/accuracy': 35}
         >>> get_last_values({"loss": record1, "accuracy": record2}, suffix="/last")
         {'loss/last': 1.2, 'accuracy/last': 35}
+        >>> get_last_values({"loss": record1, "accuracy": record2}, pattern="acc*")
+        {'accuracy': 35}
 
         ```
     """
+    if pattern is not None:
+        records = select_records(records, pattern)
     values = {}
     for key, record in records.items():
         with contextlib.suppress(EmptyRecordError):
             values[f"{prefix}{key}{suffix}"] = record.get_last_value()
     return values
+
+
+def select_records(
+    records: Mapping[str, BaseRecord[Any]], pattern: str | re.Pattern[str]
+) -> dict[str, BaseRecord[Any]]:
+    r"""Select the records whose key matches a pattern.
+
+    Args:
+        records: The records and their associated keys.
+        pattern: The glob pattern, for example ``"*/loss"``, or the
+            compiled regular expression. The whole key must match
+            the pattern. ``*`` also matches ``/`` in a glob pattern.
+            The compiled patterns are cached.
+
+    Returns:
+        The selected records and their associated keys.
+
+    Example:
+        ```pycon
+        >>> import re
+        >>> from minrecord import Record
+        >>> from minrecord.functional import select_records
+        >>> records = {key: Record(key) for key in ["train/loss", "val/loss", "val/acc"]}
+        >>> list(select_records(records, "*/loss"))
+        ['train/loss', 'val/loss']
+        >>> list(select_records(records, re.compile(r"val/(acc|f1)")))
+        ['val/acc']
+
+        ```
+    """
+    match = compile_pattern(pattern).fullmatch
+    return {key: record for key, record in records.items() if match(key)}
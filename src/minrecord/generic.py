@@ -2,38 +2,98 @@ r"""Contain the generic record implementation."""
 
 from __future__ import annotations
 
-__all__ = ["Record"]
+__all__ = [
+    "CLOCKS",
+    "REDUCTIONS",
+    "ElementsView",
+    "Record",
+    "TimestampBuffer",
+    "elements_are_equal",
+]
 
+import heapq
+import math
+import sys
+import time
+from array import array
+from bisect import bisect_left, bisect_right
 from collections import deque
+from collections.abc import Sequence
+from itertools import chain, groupby, islice, pairwise, repeat
+from operator import itemgetter
 from typing import TYPE_CHECKING, Any, TypeVar
 
-from coola.equality import objects_are_equal
-from coola.utils.format import str_indent, str_mapping
-
 from minrecord.base import BaseRecord, EmptyRecordError
 from minrecord.config import get_max_size
+from minrecord.storage import (
+    AUTO,
+    OBJECT,
+    PACKED,
+    STORAGES,
+    PackedStorage,
+    create_storage,
+    get_backend,
+)
+from minrecord.utils.fingerprint import BASE, MODULUS, append_fingerprint, hash_element
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Callable, Collection, Iterable, Iterator
 
 T = TypeVar("T")
 
+# The names of the supported clocks and their functions in ``time``.
+CLOCKS = {"monotonic": "monotonic", "wall": "time"}
+
+# The last step of a record that has no consecutive elements to compare.
+_NO_STEP: Any = object()
+
 
 class Record(BaseRecord[T]):
     r"""Implement a generic record to store the recent values.
 
     Internally, this class uses a ``deque`` to keep the most recent
-    values added in the record. Note that this class does not allow
+    values added in the record. With ``storage="auto"``, the ``int``
+    and ``float`` steps and values are packed in ``array``s while it
+    is possible, see ``minrecord.storage``. Packing uses about 8x less
+    memory per value but makes ``add_value`` about 2.5x slower, so it
+    is opt-in, or done by the memory budget of a ``RecordManager``.
+    The fingerprint of the values is computed when it is requested,
+    then it is updated from the values added since, see
+    ``minrecord.utils.fingerprint``. The values at a step or in a step
+    range are found with a binary search if the steps are
+    non-decreasing, otherwise with an index of the steps that is
+    created on demand. Note that this class does not allow
     to get the best value because it is not possible to define a
     generic rule to know the best object. Please see
     ``ScalarRecord`` that can compute the best value for
     scalars.
 
+    The record can also store the time when each value is added, so
+    the values can be queried by time. The timestamps are stored in
+    a ring buffer of ``float`` and they are non-decreasing: a
+    timestamp lower than the previous one, for example after an
+    adjustment of the wall clock, is replaced by the previous one.
+    The initial elements do not have a timestamp, so their timestamp
+    is ``-inf``.
+
     Args:
         name: The name of the record.
         elements: The initial elements in the record. Each element is a
             tuple with the step and its associated value.
-        max_size: The maximum size of the record.
+        max_size: The maximum size of the record. If ``None``, the
+            default maximum size of the config is used when the record
+            is created, see ``minrecord.config.config_scope``.
+        clock: The clock used to timestamp the values. ``"monotonic"``
+            uses ``time.monotonic`` and ``"wall"`` uses ``time.time``.
+            ``None`` means the values are not timestamped.
+        storage: The storage mode of the elements. ``"object"`` uses
+            a ``deque``. ``"auto"`` packs the ``int`` and ``float``
+            steps and values, and moves the elements to a ``deque``
+            the first time a value cannot be packed.
+
+    Raises:
+        ValueError: if ``max_size`` is not positive, or the clock or
+            the storage mode is not supported.
 
     Example:
         ```pycon
@@ -53,14 +113,48 @@ class Record(BaseRecord[T]):
         self,
         name: str,
         elements: Iterable[tuple[int | None, T]] = (),
-        max_size: int = get_max_size(),
+        max_size: int | None = None,
+        *,
+        clock: str | None = None,
+        storage: str = OBJECT,
     ) -> None:
         super().__init__()
         self._name = name
+        if max_size is None:
+            max_size = get_max_size()
         if max_size <= 0:
             msg = f"Record size must be greater than 0 (received: {max_size})"
             raise ValueError(msg)
-        self._record = deque(elements, maxlen=max_size)
+        if clock is not None and clock not in CLOCKS:
+            msg = f"Incorrect clock: {clock}. The valid clocks are: {sorted(CLOCKS)}"
+            raise ValueError(msg)
+        if storage not in STORAGES:
+            msg = f"Incorrect storage: {storage}. The valid storages are: {list(STORAGES)}"
+            raise ValueError(msg)
+        self._storage = storage
+        self._record = self._create_storage(elements, max_size, storage)
+        self._clock = clock
+        self._get_time: Callable[[], float] | None = None
+        self._timestamps: TimestampBuffer | None = None
+        if clock is not None:
+            self._get_time = getattr(time, CLOCKS[clock])
+            self._timestamps = TimestampBuffer(max_size, repeat(-math.inf, len(self._record)))
+        # The fingerprint of the elements. It is computed on demand and
+        # updated from the elements added since it was computed.
+        self._fingerprint: int | None = None
+        # The number of elements added since the fingerprint was
+        # computed, and the elements that they evicted.
+        self._num_added = 0
+        self._evicted_elements: list[tuple[Any, T]] = []
+        # The number of consecutive elements whose steps are not
+        # non-decreasing. The steps are sorted if it is 0.
+        self._num_unsorted = 0
+        # The step of the last element, to count the unsorted steps
+        # without reading the storage.
+        self._last_step: Any = _NO_STEP
+        # The sorted steps and their positions, for the unsorted steps.
+        self._step_index: tuple[list[Any], list[int]] | None = None
+        self._reset_steps()
 
     def __len__(self) -> int:
         return len(self._record)
@@ -72,6 +166,8 @@ class Record(BaseRecord[T]):
         )
 
     def __str__(self) -> str:
+        from coola.utils.format import str_indent, str_mapping  # noqa: PLC0415
+
         args = str_indent(
             str_mapping(
                 {"name": self.name, "max_size": self.max_size, "record": self.get_most_recent()}
@@ -83,21 +179,136 @@ class Record(BaseRecord[T]):
     def name(self) -> str:
         return self._name
 
+    @property
+    def backend(self) -> str:
+        r"""The backend used to store the elements: ``"packed"``,
+        ``"object"`` or ``"array"``."""
+        return get_backend(self._record)
+
+    @property
+    def clock(self) -> str | None:
+        r"""The clock used to timestamp the values or ``None`` if the
+        values are not timestamped."""
+        return self._clock
+
     @property
     def max_size(self) -> int:
         r"""The maximum size of the record."""
         return self._record.maxlen
 
+    @property
+    def storage(self) -> str:
+        r"""The storage mode of the elements: ``"auto"`` or
+        ``"object"``."""
+        return self._storage
+
     def add_value(self, value: T, step: int | None = None) -> None:
-        self._record.append((step, value))
+        record = self._record
+        element = (step, value)
+        last_step = self._last_step
+        if last_step is not _NO_STEP:
+            try:
+                if step is None or last_step is None or step < last_step:
+                    self._num_unsorted += 1
+            except TypeError:
+                # The steps cannot be compared, for example a string
+                # and an int, so they are considered as unsorted.
+                self._num_unsorted += 1
+            if self._num_unsorted and len(record) == record.maxlen:
+                # The oldest element is removed, so the pair of the
+                # oldest element and the next one is not counted.
+                next_step = record[1][0] if len(record) > 1 else step
+                self._num_unsorted -= _is_unsorted(record[0][0], next_step)
+        self._last_step = step
+        if self._fingerprint is not None:
+            if len(record) == record.maxlen:
+                self._evicted_elements.append(record[0])
+            self._num_added += 1
+            if self._num_added > record.maxlen // 4:
+                # It is faster to compute the fingerprint again than
+                # to keep the evicted elements.
+                self._reset_fingerprint()
+        self._step_index = None
+        try:
+            record.append(element)
+        except TypeError:
+            # The element cannot be packed, so the elements are moved
+            # to a deque.
+            self._record = deque(record, maxlen=record.maxlen)
+            self._record.append(element)
+        if self._timestamps is not None:
+            self._timestamps.append(self._get_time())
 
     def clone(self) -> Record[T]:
-        return self.__class__(name=self.name, elements=self._record, max_size=self.max_size)
+        record = self.__class__(
+            name=self.name,
+            elements=self._record,
+            max_size=self.max_size,
+            clock=self.clock,
+            storage=self.storage,
+        )
+        record._copy_storage(self)
+        return record
+
+    def compact(self) -> bool:
+        r"""Pack the elements if they are stored in a ``deque`` but can
+        be packed, for example to fit in a memory budget.
+
+        The storage mode of the record becomes ``"auto"``, so the next
+        values are packed while it is possible.
+
+        Returns:
+            ``True`` if the elements were packed, otherwise ``False``.
+
+        Example:
+            ```pycon
+            >>> from minrecord import Record
+            >>> record = Record("loss", max_size=2)
+            >>> record.update([(0, "abc"), (1, 2.0), (2, 1.0)])
+            >>> record.backend
+            'object'
+            >>> record.compact()
+            True
+            >>> record.backend
+            'packed'
+            >>> record.storage
+            'auto'
+
+            ```
+        """
+        if self.backend != OBJECT:
+            return False
+        record = create_storage(self._record, self.max_size, AUTO)
+        if get_backend(record) == OBJECT:
+            return False
+        self._record = record
+        self._storage = AUTO
+        return True
 
     def equal(self, other: Any) -> bool:
-        if not isinstance(other, Record):
+        if self is other:
+            return True
+        if (
+            type(other) is not type(self)
+            or self.name != other.name
+            or self.max_size != other.max_size
+            or self.clock != other.clock
+            or self.storage != other.storage
+            or len(self) != len(other)
+        ):
+            return False
+        if self._timestamps is not None and self._timestamps != other._timestamps:
             return False
-        return objects_are_equal(self.to_dict(), other.to_dict())
+        return elements_are_equal(self._record, other._record)
+
+    def get_fingerprint(self) -> int:
+        if self._fingerprint is None:
+            self._fingerprint = self._compute_fingerprint()
+        elif self._num_added:
+            self._fingerprint = self._update_fingerprint()
+        self._num_added = 0
+        self._evicted_elements.clear()
+        return self._fingerprint
 
     def get_last_value(self) -> Any:
         if self.is_empty():
@@ -105,15 +316,334 @@ class Record(BaseRecord[T]):
             raise EmptyRecordError(msg)
         return self._record[-1][1]
 
-    def get_most_recent(self) -> tuple[tuple[int | None, T], ...]:
-        return tuple(self._record)
+    def get_most_recent(self, n: int | None = None) -> tuple[tuple[int | None, T], ...]:
+        return tuple(self._iter_last(n))[:: 1 if n is None else -1]
+
+    def get_most_recent_view(self) -> ElementsView[T]:
+        return ElementsView(self)
+
+    def get_range(
+        self, start_step: float | None = None, end_step: float | None = None
+    ) -> tuple[tuple[float | None, T], ...]:
+        if self._has_sorted_steps():
+            start = 0 if start_step is None else bisect_left(self._record, start_step, key=_STEP)
+            end = (
+                len(self._record)
+                if end_step is None
+                else bisect_right(self._record, end_step, key=_STEP)
+            )
+            return _slice(self._record, start, end)
+        steps, positions = self._get_step_index()
+        start = 0 if start_step is None else bisect_left(steps, start_step)
+        end = len(steps) if end_step is None else bisect_right(steps, end_step)
+        return tuple(self._record[position] for position in sorted(positions[start:end]))
+
+    def get_range_by_time(
+        self, start_time: float | None = None, end_time: float | None = None
+    ) -> tuple[tuple[float | None, T], ...]:
+        r"""Get the elements whose timestamp is in a time range.
+
+        The elements are found with a binary search on the
+        timestamps.
+
+        Args:
+            start_time: The first time of the range (included).
+                ``None`` means there is no lower bound.
+            end_time: The last time of the range (included). ``None``
+                means there is no upper bound.
+
+        Returns:
+            The elements in the time range, from the oldest to the
+                most recent.
+
+        Raises:
+            RuntimeError: if the values are not timestamped.
+
+        Example:
+            ```pycon
+            >>> from minrecord import Record
+            >>> record = Record("loss", clock="monotonic")
+            >>> record.load_state_dict(
+            ...     {"record": [(0, 3.0), (1, 2.0), (2, 1.0)], "timestamps": [10.0, 20.0, 30.0]}
+            ... )
+            >>> record.get_range_by_time(15.0, 30.0)
+            ((1, 2.0), (2, 1.0))
+
+            ```
+        """
+        timestamps = self._check_timestamps()
+        start = 0 if start_time is None else timestamps.bisect_left(start_time)
+        end = len(timestamps) if end_time is None else timestamps.bisect_right(end_time)
+        return _slice(self._record, start, max(start, end))
+
+    def get_steps(self, n: int | None = None) -> tuple[float | None, ...]:
+        return tuple(map(_STEP, self._iter_last(n)))[:: 1 if n is None else -1]
+
+    def get_values(self, n: int | None = None) -> tuple[T, ...]:
+        return tuple(map(_VALUE, self._iter_last(n)))[:: 1 if n is None else -1]
+
+    def get_time_window(self, duration: float) -> tuple[tuple[float | None, T], ...]:
+        r"""Get the elements added during the last ``duration``
+        seconds.
+
+        Args:
+            duration: The duration of the window in seconds.
+
+        Returns:
+            The elements added during the window, from the oldest to
+                the most recent.
+
+        Raises:
+            RuntimeError: if the values are not timestamped.
+
+        Example:
+            ```pycon
+            >>> from minrecord import Record
+            >>> record = Record("loss", clock="monotonic")
+            >>> record.add_value(2.0, step=0)
+            >>> record.add_value(1.0, step=1)
+            >>> record.get_time_window(60.0)
+            ((0, 2.0), (1, 1.0))
+
+            ```
+        """
+        self._check_timestamps()
+        return self.get_range_by_time(start_time=self._get_time() - duration)
+
+    def get_timestamps(self, n: int | None = None) -> tuple[float, ...]:
+        r"""Get the timestamps of the recent values.
+
+        Args:
+            n: The number of recent timestamps to return. ``None``
+                means all the recent timestamps.
+
+        Returns:
+            The timestamps of the recent values.
+
+        Raises:
+            RuntimeError: if the values are not timestamped.
+            ValueError: if ``n`` is negative.
+
+        Example:
+            ```pycon
+            >>> from minrecord import Record
+            >>> record = Record("loss", clock="monotonic")
+            >>> record.load_state_dict({"record": [(0, 2.0), (1, 1.0)], "timestamps": [1.5, 2.5]})
+            >>> record.get_timestamps()
+            (1.5, 2.5)
+
+            ```
+        """
+        timestamps = self._check_timestamps()
+        if n is None:
+            return tuple(timestamps)
+        if n < 0:
+            msg = f"n must be greater than or equal to 0 (received: {n})"
+            raise ValueError(msg)
+        return tuple(islice(timestamps, max(len(timestamps) - n, 0), None))
+
+    def get_value_at_time(self, timestamp: float) -> T:
+        r"""Get the value of the record at a given time.
+
+        The value at a given time is the last value added at or before
+        this time.
+
+        Args:
+            timestamp: The time.
+
+        Returns:
+            The value at the given time.
+
+        Raises:
+            KeyError: if no value was added at or before this time.
+            RuntimeError: if the values are not timestamped.
+
+        Example:
+            ```pycon
+            >>> from minrecord import Record
+            >>> record = Record("loss", clock="monotonic")
+            >>> record.load_state_dict({"record": [(0, 2.0), (1, 1.0)], "timestamps": [1.5, 2.5]})
+            >>> record.get_value_at_time(2.0)
+            2.0
+
+            ```
+        """
+        position = self._check_timestamps().bisect_right(timestamp) - 1
+        if position < 0:
+            msg = f"'{self.name}' record does not have a value at time {timestamp}"
+            raise KeyError(msg)
+        return self._record[position][1]
+
+    def get_value_at_step(self, step: float) -> T:
+        if self._has_sorted_steps():
+            position = bisect_right(self._record, step, key=_STEP) - 1
+            if position >= 0 and self._record[position][0] == step:
+                return self._record[position][1]
+        else:
+            steps, positions = self._get_step_index()
+            index = bisect_right(steps, step) - 1
+            if index >= 0 and steps[index] == step:
+                return self._record[positions[index]][1]
+        msg = f"'{self.name}' record does not have a value at step {step}"
+        raise KeyError(msg)
 
     def is_comparable(self) -> bool:
         return False
 
+    def iter_most_recent(self) -> Iterator[tuple[float | None, T]]:
+        return iter(self._record)
+
     def is_empty(self) -> bool:
         return not self._record
 
+    def memory_usage(self) -> dict[str, int]:
+        r"""Get the approximate number of bytes used by the record.
+
+        Returns:
+            The number of bytes used by the container of the elements
+                (``"storage"``), the steps (``"steps"``), the values
+                (``"values"``), the timestamps (``"timestamps"``), and
+                the other attributes of the record (``"other"``), for
+                example its comparator. The ``"total"`` key is the
+                number of bytes used by the record. The objects
+                referenced several times are counted once.
+
+        Example:
+            ```pycon
+            >>> import sys
+            >>> from minrecord import Record
+            >>> record = Record("loss", elements=[(0, "abc"), (1, "abc")])
+            >>> usage = record.memory_usage()
+            >>> usage["values"] == sys.getsizeof("abc")
+            True
+
+            ```
+        """
+        from minrecord.utils.memory import get_deep_size  # noqa: PLC0415
+
+        storage = self._record
+        seen = {id(storage)}
+        if not isinstance(storage, deque):
+            usage = storage.memory_usage()
+        else:
+            # The tuples of the elements are in the storage.
+            usage = {
+                "storage": sys.getsizeof(storage) + sum(map(sys.getsizeof, storage)),
+                "steps": 0,
+                "values": 0,
+            }
+            for step, value in storage:
+                usage["steps"] += get_deep_size(step, seen)
+                usage["values"] += get_deep_size(value, seen)
+        usage["timestamps"] = get_deep_size(self._timestamps, seen)
+        usage["other"] = get_deep_size(self, seen)
+        usage["total"] = sum(usage.values())
+        return usage
+
+    def merge(
+        self,
+        others: Iterable[BaseRecord[T]],
+        reduce: str | Callable[[list[T]], T] = "mean",
+    ) -> Record[T]:
+        r"""Merge the elements of the record with the elements of other
+        records, for example the records of several workers.
+
+        The elements are merged by step with a k-way merge, so the
+        cost is ``O(N log k)`` where ``N`` is the number of elements
+        and ``k`` the number of records, if the steps of each record
+        are non-decreasing. The elements of a record are sorted
+        otherwise. The values at the same step are reduced to one
+        value, and a value that is alone at its step is kept as it
+        is. The records are not modified.
+
+        The merged record is a new record created with the config of
+        this record, and the merged values are added to it like with
+        ``update``, so the best value of a comparable record is the
+        best merged value, and the record has improved if the last
+        merged value is the best value. The values of the merged
+        record are the values stored in the records, for example the
+        rates of a ``RateRecord``, and the merged values are
+        timestamped at the merge time.
+
+        Args:
+            others: The other records.
+            reduce: The reduction of the values at the same step:
+                ``"mean"``, ``"sum"``, ``"min"``, ``"max"``,
+                ``"first"`` (the value of the first record in the
+                order ``self``, ``*others``), or a function that
+                takes the list of values and returns the reduced
+                value.
+
+        Returns:
+            The merged record.
+
+        Raises:
+            ValueError: if the reduction is not supported, or a
+                record has a value without step.
+
+        Example:
+            ```pycon
+            >>> from minrecord import MinScalarRecord
+            >>> record1 = MinScalarRecord.from_elements("loss", [(0, 4.0), (1, 2.0)])
+            >>> record2 = MinScalarRecord.from_elements("loss", [(0, 2.0), (1, 1.0), (2, 3.0)])
+            >>> record = record1.merge([record2])
+            >>> record.get_most_recent()
+            ((0, 3.0), (1, 1.5), (2, 3.0))
+            >>> record.get_best_value()
+            1.5
+            >>> record1.merge([record2], reduce="max").get_most_recent()
+            ((0, 4.0), (1, 2.0), (2, 3.0))
+
+            ```
+        """
+        if not callable(reduce):
+            if reduce not in REDUCTIONS:
+                msg = f"Incorrect reduction: {reduce}. The valid reductions are: {list(REDUCTIONS)}"
+                raise ValueError(msg)
+            reduce = REDUCTIONS[reduce]
+        elements = heapq.merge(*map(_get_sorted_elements, (self, *others)), key=_STEP)
+        merged = BaseRecord.factory(**self.config_dict())
+        groups = ((step, [value for _, value in group]) for step, group in groupby(elements, _STEP))
+        merged._add_elements(
+            (step, values[0] if len(values) == 1 else reduce(values)) for step, values in groups
+        )
+        return merged
+
+    def resize(self, max_size: int) -> None:
+        r"""Change the maximum size of the record.
+
+        The oldest elements are removed if the record has more than
+        ``max_size`` elements.
+
+        Args:
+            max_size: The new maximum size of the record.
+
+        Raises:
+            ValueError: if ``max_size`` is not positive.
+
+        Example:
+            ```pycon
+            >>> from minrecord import Record
+            >>> record = Record("loss", elements=[(0, 3.0), (1, 2.0), (2, 1.0)])
+            >>> record.resize(2)
+            >>> record
+            Record(name=loss, max_size=2, size=2)
+            >>> record.get_most_recent()
+            ((1, 2.0), (2, 1.0))
+
+            ```
+        """
+        if max_size <= 0:
+            msg = f"Record size must be greater than 0 (received: {max_size})"
+            raise ValueError(msg)
+        storage = OBJECT if self.backend == OBJECT else self.storage
+        record = self._create_storage(self.get_most_recent(max_size), max_size, storage)
+        if self._timestamps is not None:
+            self._timestamps = TimestampBuffer(max_size, self.get_timestamps(max_size))
+        self._record = record
+        self._reset_fingerprint()
+        self._reset_steps()
+
     def update(self, elements: Iterable[tuple[float | None, T]]) -> None:
         for step, value in elements:
             self.add_value(value, step)
@@ -121,10 +651,523 @@ class Record(BaseRecord[T]):
     def config_dict(self) -> dict[str, Any]:
         config = super().config_dict()
         config["max_size"] = self.max_size
+        if self.clock is not None:
+            config["clock"] = self.clock
+        if self.storage != OBJECT:
+            config["storage"] = self.storage
         return config
 
     def load_state_dict(self, state_dict: dict[str, Any]) -> None:
-        self._record = deque(state_dict["record"], maxlen=self.max_size)
+        # A record that was moved to a deque keeps its deque.
+        storage = OBJECT if state_dict.get("backend") == OBJECT else self.storage
+        record = self._create_storage(state_dict["record"], self.max_size, storage)
+        if self.clock is not None:
+            timestamps = state_dict.get("timestamps")
+            if timestamps is None:
+                timestamps = repeat(-math.inf, len(record))
+            timestamps = TimestampBuffer(self.max_size, timestamps)
+            if len(timestamps) != len(record):
+                msg = (
+                    f"The number of timestamps ({len(timestamps):,}) does not match "
+                    f"the number of elements ({len(record):,})"
+                )
+                raise ValueError(msg)
+            self._timestamps = timestamps
+        self._record = record
+        self._reset_fingerprint()
+        self._reset_steps()
 
     def state_dict(self) -> dict[str, Any]:
-        return {"record": self.get_most_recent()}
+        state = {"record": self.get_most_recent(), "fingerprint": self.get_fingerprint()}
+        state.update(self._get_state_without_elements())
+        return state
+
+    def _add_elements(self, elements: Iterable[tuple[Any, T]]) -> None:
+        r"""Add elements whose values are stored as they are, and update
+        the best value if the record is comparable.
+
+        It is used to add the merged elements, so the values are not
+        transformed, for example the rates of a ``RateRecord`` are not
+        considered as counter values.
+
+        Args:
+            elements: The elements to add.
+        """
+        self.update(elements)
+
+    def _check_timestamps(self) -> TimestampBuffer:
+        r"""Check the values are timestamped.
+
+        Returns:
+            The timestamps of the values.
+
+        Raises:
+            RuntimeError: if the values are not timestamped.
+        """
+        if self._timestamps is None:
+            msg = f"'{self.name}' record does not timestamp its values (clock=None)"
+            raise RuntimeError(msg)
+        return self._timestamps
+
+    def _compute_fingerprint(self) -> int:
+        r"""Compute the fingerprint of the values in the record.
+
+        Returns:
+            The fingerprint of the values in the record.
+        """
+        fingerprint = 0
+        for element in self._record:
+            fingerprint = append_fingerprint(fingerprint, hash_element(element))
+        return fingerprint
+
+    def _update_fingerprint(self) -> int:
+        r"""Update the fingerprint with the elements added since it was
+        computed.
+
+        The rolling hash is updated in ``O(1)`` per added element, and
+        per evicted element.
+
+        Returns:
+            The fingerprint of the values in the record.
+        """
+        record = self._record
+        fingerprint = self._fingerprint
+        for i in range(len(record) - self._num_added, len(record)):
+            fingerprint = (fingerprint * BASE + hash_element(record[i])) % MODULUS
+        if self._evicted_elements:
+            # The record is full when an element is evicted, so the
+            # term of each evicted element was shifted by ``max_size``
+            # more positions than the term of the element that evicted it.
+            evicted = 0
+            for element in self._evicted_elements:
+                evicted = (evicted * BASE + hash_element(element)) % MODULUS
+            fingerprint = (fingerprint - evicted * pow(BASE, self.max_size, MODULUS)) % MODULUS
+        return fingerprint
+
+    def _create_storage(
+        self, elements: Iterable[tuple[Any, T]], max_size: int, storage: str
+    ) -> PackedStorage | deque[tuple[Any, T]]:
+        r"""Create the storage of the elements.
+
+        The subclasses can override this method to use another
+        storage, for example ``ArrayRecord``.
+
+        Args:
+            elements: The elements.
+            max_size: The maximum number of elements.
+            storage: The storage mode of the elements.
+
+        Returns:
+            The storage with the elements.
+        """
+        return create_storage(elements, max_size, storage)
+
+    def _copy_storage(self, other: Record[Any]) -> None:
+        r"""Copy the backend and the timestamps of another record with
+        the same elements.
+
+        Args:
+            other: The record to copy the backend and the timestamps
+                from.
+        """
+        if self.backend == PACKED and other.backend == OBJECT:
+            self._record = deque(self._record, maxlen=self.max_size)
+        if self._timestamps is not None and other._timestamps is not None:
+            self._timestamps = other._timestamps.copy()
+
+    def _reset_fingerprint(self) -> None:
+        r"""Reset the fingerprint, so it is computed again when it is
+        requested."""
+        self._fingerprint = None
+        self._num_added = 0
+        self._evicted_elements.clear()
+
+    def _count_unsorted(self) -> int:
+        r"""Count the consecutive elements whose steps are not
+        non-decreasing.
+
+        Returns:
+            The number of consecutive elements whose steps are not
+                non-decreasing.
+        """
+        steps = [step for step, _ in self._record]
+        return sum(_is_unsorted(step1, step2) for step1, step2 in pairwise(steps))
+
+    def _reset_steps(self) -> None:
+        r"""Reset the information about the steps after the elements
+        were replaced."""
+        self._num_unsorted = self._count_unsorted()
+        self._last_step = self._record[-1][0] if self._record else _NO_STEP
+        self._step_index = None
+
+    def _get_step_index(self) -> tuple[list[Any], list[int]]:
+        r"""Get the index of the steps.
+
+        The index is created the first time it is used after the
+        record is modified. The elements without step are ignored.
+
+        Returns:
+            The sorted steps and the positions of the associated
+                elements in the record. The positions of the equal
+                steps are sorted.
+        """
+        if self._step_index is None:
+            pairs = sorted(
+                (step, position)
+                for position, (step, _) in enumerate(self._record)
+                if step is not None
+            )
+            self._step_index = ([step for step, _ in pairs], [position for _, position in pairs])
+        return self._step_index
+
+    def _iter_last(self, n: int | None) -> Iterator[tuple[float | None, T]]:
+        r"""Iterate over the last elements.
+
+        Args:
+            n: The number of elements. ``None`` means all the
+                elements.
+
+        Returns:
+            An iterator over all the elements from the oldest to the
+                most recent if ``n`` is ``None``, otherwise an
+                iterator over the last ``n`` elements from the most
+                recent to the oldest.
+
+        Raises:
+            ValueError: if ``n`` is negative.
+        """
+        if n is None:
+            return iter(self._record)
+        if n < 0:
+            msg = f"n must be greater than or equal to 0 (received: {n})"
+            raise ValueError(msg)
+        return islice(reversed(self._record), n)
+
+    def _get_state_without_elements(self) -> dict[str, Any]:
+        r"""Get the state values of the record, except the elements and
+        their fingerprint.
+
+        It is used to export the records without copying the
+        elements, for example to Arrow tables. The child classes
+        should extend this method instead of ``state_dict``.
+
+        Returns:
+            The state values without the elements.
+        """
+        state = {"backend": self.backend}
+        if self._timestamps is not None:
+            state["timestamps"] = tuple(self._timestamps)
+        return state
+
+    def _has_sorted_steps(self) -> bool:
+        r"""Indicate if the steps are non-decreasing and not ``None``.
+
+        Returns:
+            ``True`` if the steps are non-decreasing and not ``None``,
+                otherwise ``False``.
+        """
+        return self._num_unsorted == 0 and (not self._record or self._record[0][0] is not None)
+
+
+class ElementsView(Sequence[tuple[Any, T]]):
+    r"""Implement a read-only view of the elements of a record.
+
+    The view does not copy the elements, so it reflects the changes
+    of the record. The slices are copied to tuples.
+
+    Args:
+        record: The record.
+
+    Example:
+        ```pycon
+        >>> from minrecord import Record
+        >>> record = Record("loss", elements=[(0, 2.0), (1, 1.2)])
+        >>> view = record.get_most_recent_view()
+        >>> view
+        ElementsView(size=2)
+        >>> record.add_value(0.8, step=2)
+        >>> view[-2:]
+        ((1, 1.2), (2, 0.8))
+
+        ```
+    """
+
+    def __init__(self, record: Record[T]) -> None:
+        self._record = record
+
+    def __getitem__(self, index: int | slice) -> Any:
+        # The storage of the record can be replaced, so it is not
+        # stored in the view.
+        elements = self._record._record
+        if not isinstance(index, slice):
+            return elements[index]
+        start, stop, step = index.indices(len(elements))
+        if step == 1:
+            return _slice(elements, start, max(start, stop))
+        return tuple(elements[i] for i in range(start, stop, step))
+
+    def __iter__(self) -> Iterator[tuple[Any, T]]:
+        return iter(self._record._record)
+
+    def __len__(self) -> int:
+        return len(self._record)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}(size={len(self):,})"
+
+    def __reversed__(self) -> Iterator[tuple[Any, T]]:
+        return reversed(self._record._record)
+
+
+class TimestampBuffer:
+    r"""Implement a ring buffer of non-decreasing timestamps.
+
+    The timestamps are stored in an ``array`` of ``float`` and the
+    oldest timestamp is overwritten when the buffer is full. A
+    timestamp lower than the last timestamp is replaced by the last
+    timestamp so the timestamps can be searched with a binary search.
+
+    Args:
+        maxlen: The maximum number of timestamps.
+        timestamps: The initial timestamps.
+
+    Example:
+        ```pycon
+        >>> from minrecord.generic import TimestampBuffer
+        >>> buffer = TimestampBuffer(3, [1.0, 2.0, 3.0])
+        >>> buffer.append(4.0)
+        >>> tuple(buffer)
+        (2.0, 3.0, 4.0)
+        >>> buffer.bisect_left(3.0)
+        1
+
+        ```
+    """
+
+    __slots__ = ("_data", "_head", "_maxlen")
+
+    def __init__(self, maxlen: int, timestamps: Iterable[float] = ()) -> None:
+        self._maxlen = maxlen
+        self._data = array("d")
+        # The position of the oldest timestamp when the buffer is full.
+        self._head = 0
+        for timestamp in timestamps:
+            self.append(timestamp)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, TimestampBuffer):
+            return NotImplemented
+        return len(self) == len(other) and tuple(self) == tuple(other)
+
+    __hash__ = None
+
+    def __iter__(self) -> Iterator[float]:
+        return chain(islice(self._data, self._head, None), islice(self._data, self._head))
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}(maxlen={self._maxlen:,}, size={len(self):,})"
+
+    def append(self, timestamp: float) -> None:
+        r"""Add a timestamp to the buffer.
+
+        Args:
+            timestamp: The timestamp to add.
+        """
+        data = self._data
+        if data:
+            timestamp = max(timestamp, data[self._head - 1])
+        if len(data) < self._maxlen:
+            data.append(timestamp)
+        else:
+            data[self._head] = timestamp
+            self._head = (self._head + 1) % self._maxlen
+
+    def bisect_left(self, timestamp: float) -> int:
+        r"""Find the position of the first timestamp greater than or
+        equal to a given timestamp.
+
+        Args:
+            timestamp: The timestamp to search.
+
+        Returns:
+            The position from the oldest timestamp.
+        """
+        return self._bisect(bisect_left, timestamp)
+
+    def bisect_right(self, timestamp: float) -> int:
+        r"""Find the position of the first timestamp greater than a
+        given timestamp.
+
+        Args:
+            timestamp: The timestamp to search.
+
+        Returns:
+            The position from the oldest timestamp.
+        """
+        return self._bisect(bisect_right, timestamp)
+
+    def copy(self) -> TimestampBuffer:
+        r"""Copy the buffer.
+
+        Returns:
+            A copy of the buffer.
+        """
+        buffer = self.__class__(self._maxlen)
+        buffer._data = array("d", self._data)
+        buffer._head = self._head
+        return buffer
+
+    def _bisect(self, bisect: Callable[..., int], timestamp: float) -> int:
+        r"""Search a timestamp with a binary search.
+
+        The buffer contains two sorted segments: the timestamps after
+        the head, then the timestamps before the head. Each timestamp
+        of the first segment is lower than or equal to the timestamps
+        of the second segment.
+
+        Args:
+            bisect: The bisect function.
+            timestamp: The timestamp to search.
+
+        Returns:
+            The position from the oldest timestamp.
+        """
+        data, head = self._data, self._head
+        size = len(data)
+        position = bisect(data, timestamp, head, size)
+        if position < size:
+            return position - head
+        return size - head + bisect(data, timestamp, 0, head)
+
+
+_STEP = itemgetter(0)
+_VALUE = itemgetter(1)
+
+
+def _slice(record: deque[Any], start: int, end: int) -> tuple[Any, ...]:
+    r"""Get a slice of a deque without copying the whole deque.
+
+    The deque is iterated from its closest end to the slice.
+
+    Args:
+        record: The deque.
+        start: The start of the slice.
+        end: The end of the slice (excluded).
+
+    Returns:
+        The items in the slice.
+    """
+    size = len(record)
+    if start <= size - end:
+        return tuple(islice(record, start, end))
+    return tuple(islice(reversed(record), size - end, size - start))[::-1]
+
+
+def _get_sorted_elements(record: BaseRecord[T]) -> Iterable[tuple[Any, T]]:
+    r"""Get the elements of a record sorted by step.
+
+    The elements are not copied if the steps are already sorted.
+
+    Args:
+        record: The record.
+
+    Returns:
+        The elements sorted by step. The order of the elements with
+            the same step is kept.
+
+    Raises:
+        ValueError: if the record has a value without step.
+    """
+    if isinstance(record, Record) and record._has_sorted_steps():
+        return record.iter_most_recent()
+    elements = record.get_most_recent()
+    if any(step is None for step, _ in elements):
+        msg = f"'{record.name}' record cannot be merged because it has values without step"
+        raise ValueError(msg)
+    return sorted(elements, key=_STEP)
+
+
+def _mean(values: list[Any]) -> Any:
+    r"""Compute the mean of values.
+
+    Args:
+        values: The values.
+
+    Returns:
+        The mean of the values.
+    """
+    return sum(values) / len(values)
+
+
+# The reductions of the values at the same step when records are merged.
+REDUCTIONS: dict[str, Callable[[list[Any]], Any]] = {
+    "first": itemgetter(0),
+    "max": max,
+    "mean": _mean,
+    "min": min,
+    "sum": sum,
+}
+
+
+def _is_unsorted(step1: float | None, step2: float | None) -> bool:
+    r"""Indicate if two consecutive steps are not non-decreasing.
+
+    Args:
+        step1: The first step.
+        step2: The second step.
+
+    Returns:
+        ``True`` if one of the steps is ``None``, if the steps cannot
+            be compared or if the second step is lower than the first
+            step, otherwise ``False``.
+    """
+    try:
+        return step1 is None or step2 is None or step2 < step1
+    except TypeError:
+        return True
+
+
+def elements_are_equal(
+    elements1: Collection[tuple[Any, ...]], elements2: Collection[tuple[Any, ...]]
+) -> bool:
+    r"""Indicate if two collections of elements are equal or not.
+
+    The elements are compared with ``==``, then the types of the
+    items are compared so ``1`` and ``1.0`` are not equal, like in
+    ``coola``. ``coola`` is used only if the items cannot be compared
+    with ``==``, for example NumPy arrays with several values.
+
+    Args:
+        elements1: The first collection of elements. Each element is
+            a tuple, for example ``(step, value)``.
+        elements2: The second collection of elements.
+
+    Returns:
+        ``True`` if the elements are equal, ``False`` otherwise.
+
+    Example:
+        ```pycon
+        >>> from minrecord.generic import elements_are_equal
+        >>> elements_are_equal([(0, 1.0), (1, 2.0)], [(0, 1.0), (1, 2.0)])
+        True
+        >>> elements_are_equal([(0, 1.0), (1, 2.0)], [(0, 1.0), (1, 2)])
+        False
+
+        ```
+    """
+    if isinstance(elements1, PackedStorage) and isinstance(elements2, PackedStorage):
+        # The types of the items are given by the typecodes.
+        return elements1.typecodes == elements2.typecodes and elements1 == elements2
+    try:
+        if elements1 != elements2:
+            return False
+    except (RuntimeError, TypeError, ValueError):
+        from coola.equality import objects_are_equal  # noqa: PLC0415
+
+        return objects_are_equal(tuple(elements1), tuple(elements2))
+    return list(map(type, chain.from_iterable(elements1))) == list(
+        map(type, chain.from_iterable(elements2))
+    )
@@ -0,0 +1,315 @@
+r"""Contain functionalities to measure the time spent in the records and
+the record managers.
+
+The instrumentation is disabled by default and it does not cost
+anything when it is disabled: ``enable_instrumentation`` replaces the
+methods of the record and record manager classes with wrappers that
+count the calls, measure the time with ``time.perf_counter_ns`` and
+the memory blocks allocated with ``sys.getallocatedblocks``, and
+``disable_instrumentation`` puts back the original methods.
+
+The statistics are inclusive: the time of a method includes the
+time of the instrumented methods that it calls, for example
+``ComparableRecord.add_value`` includes ``Record.add_value``. The
+counters are not protected by a lock, so they can be approximate if
+several threads use the records at the same time.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "INSTRUMENTED_METHODS",
+    "disable_instrumentation",
+    "enable_instrumentation",
+    "get_instrumentation_stats",
+    "instrumentation",
+    "is_instrumentation_enabled",
+    "reset_instrumentation_stats",
+]
+
+import functools
+import importlib
+from contextlib import contextmanager
+from sys import getallocatedblocks
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+# The names of the methods that are instrumented. Only the methods
+# that are defined by the instrumented classes are replaced.
+INSTRUMENTED_METHODS = (
+    "add_record",
+    "add_value",
+    "from_dict",
+    "get_best_value",
+    "get_best_values",
+    "get_last_value",
+    "get_last_values",
+    "get_most_recent",
+    "get_record",
+    "get_records",
+    "has_improved",
+    "has_record",
+    "load_state_dict",
+    "merge",
+    "state_dict",
+    "update",
+)
+
+# The modules that define the records and the record managers. They
+# are imported when the instrumentation is enabled.
+_INSTRUMENTED_MODULES = (
+    "minrecord.comparable",
+    "minrecord.generic",
+    "minrecord.ndarray",
+    "minrecord.pareto",
+    "minrecord.rate",
+    "minrecord.sqlite",
+)
+
+# The original methods of the instrumented classes, indexed by class
+# and method name. It is empty when the instrumentation is disabled.
+_ORIGINALS: dict[tuple[type, str], Any] = {}
+# The counters of each method: the number of calls, the time in
+# nanoseconds and the number of allocated memory blocks.
+_COUNTERS: dict[str, list[int]] = {}
+
+
+def enable_instrumentation() -> None:
+    r"""Enable the instrumentation of the records and the record
+    managers.
+
+    It does nothing if the instrumentation is already enabled. The
+    statistics are not reset, see ``reset_instrumentation_stats``.
+
+    Example:
+        ```pycon
+        >>> from minrecord import Record
+        >>> from minrecord.instrumentation import (
+        ...     disable_instrumentation,
+        ...     enable_instrumentation,
+        ...     get_instrumentation_stats,
+        ...     reset_instrumentation_stats,
+        ... )
+        >>> enable_instrumentation()
+        >>> record = Record("loss")
+        >>> record.add_value(1.2)
+        >>> disable_instrumentation()
+        >>> get_instrumentation_stats()["Record.add_value"]["calls"]
+        1
+        >>> reset_instrumentation_stats()
+
+        ```
+    """
+    if _ORIGINALS:
+        return
+    for cls in _get_instrumented_classes():
+        for name in INSTRUMENTED_METHODS:
+            method = cls.__dict__.get(name)
+            if method is None or getattr(method, "__isabstractmethod__", False):
+                continue
+            _ORIGINALS[cls, name] = method
+            setattr(cls, name, _instrument(f"{cls.__qualname__}.{name}", method))
+
+
+def disable_instrumentation() -> None:
+    r"""Disable the instrumentation of the records and the record
+    managers.
+
+    The original methods are restored, so the records do not have any
+    overhead. The statistics are kept until they are reset.
+
+    Example:
+        ```pycon
+        >>> from minrecord.instrumentation import (
+        ...     disable_instrumentation,
+        ...     enable_instrumentation,
+        ...     is_instrumentation_enabled,
+        ... )
+        >>> enable_instrumentation()
+        >>> disable_instrumentation()
+        >>> is_instrumentation_enabled()
+        False
+
+        ```
+    """
+    for (cls, name), method in _ORIGINALS.items():
+        setattr(cls, name, method)
+    _ORIGINALS.clear()
+
+
+def is_instrumentation_enabled() -> bool:
+    r"""Indicate if the instrumentation is enabled.
+
+    Returns:
+        ``True`` if the instrumentation is enabled, otherwise
+            ``False``.
+
+    Example:
+        ```pycon
+        >>> from minrecord.instrumentation import is_instrumentation_enabled
+        >>> is_instrumentation_enabled()
+        False
+
+        ```
+    """
+    return bool(_ORIGINALS)
+
+
+@contextmanager
+def instrumentation() -> Generator[None, None, None]:
+    r"""Context manager to enable the instrumentation in a block of
+    code.
+
+    The instrumentation is disabled when the block exits, unless it
+    was already enabled before.
+
+    Example:
+        ```pycon
+        >>> from minrecord import RecordManager
+        >>> from minrecord.instrumentation import (
+        ...     get_instrumentation_stats,
+        ...     instrumentation,
+        ...     reset_instrumentation_stats,
+        ... )
+        >>> manager = RecordManager()
+        >>> with instrumentation():
+        ...     manager.get_record("loss").add_value(1.2)
+        ...
+        >>> get_instrumentation_stats()["RecordManager.get_record"]["calls"]
+        1
+        >>> reset_instrumentation_stats()
+
+        ```
+    """
+    enabled = is_instrumentation_enabled()
+    enable_instrumentation()
+    try:
+        yield
+    finally:
+        if not enabled:
+            disable_instrumentation()
+
+
+def get_instrumentation_stats() -> dict[str, dict[str, int]]:
+    r"""Get the statistics of the instrumented methods.
+
+    Returns:
+        The statistics of each method that was called, sorted by
+            decreasing time. The keys are the qualified names of the
+            methods, for example ``"Record.add_value"``, and the
+            values are the number of calls (``"calls"``), the
+            cumulative time in nanoseconds (``"time_ns"``) and the net
+            number of memory blocks allocated by the calls
+            (``"allocated_blocks"``).
+
+    Example:
+        ```pycon
+        >>> from minrecord import Record
+        >>> from minrecord.instrumentation import (
+        ...     get_instrumentation_stats,
+        ...     instrumentation,
+        ...     reset_instrumentation_stats,
+        ... )
+        >>> with instrumentation():
+        ...     Record("loss").update([(0, 1.2), (1, 0.8)])
+        ...
+        >>> stats = get_instrumentation_stats()
+        >>> stats["Record.update"]["calls"]
+        1
+        >>> sorted(stats["Record.update"])
+        ['allocated_blocks', 'calls', 'time_ns']
+        >>> reset_instrumentation_stats()
+
+        ```
+    """
+    stats = {
+        name: {"calls": calls, "time_ns": time_ns, "allocated_blocks": blocks}
+        for name, (calls, time_ns, blocks) in _COUNTERS.items()
+        if calls
+    }
+    return dict(sorted(stats.items(), key=lambda item: -item[1]["time_ns"]))
+
+
+def reset_instrumentation_stats() -> None:
+    r"""Reset the statistics of the instrumented methods.
+
+    Example:
+        ```pycon
+        >>> from minrecord.instrumentation import (
+        ...     get_instrumentation_stats,
+        ...     reset_instrumentation_stats,
+        ... )
+        >>> reset_instrumentation_stats()
+        >>> get_instrumentation_stats()
+        {}
+
+        ```
+    """
+    for counters in _COUNTERS.values():
+        counters[:] = [0, 0, 0]
+
+
+def _get_instrumented_classes() -> tuple[type, ...]:
+    r"""Get the classes whose methods are instrumented.
+
+    The modules of the records and the record managers are imported,
+    then the classes are found in the class trees of ``BaseRecord``
+    and ``RecordManager``, so the custom records defined before the
+    instrumentation is enabled are also instrumented.
+
+    Returns:
+        The instrumented classes.
+    """
+    for module in _INSTRUMENTED_MODULES:
+        importlib.import_module(module)
+    from minrecord.base import BaseRecord  # noqa: PLC0415
+    from minrecord.manager import RecordManager  # noqa: PLC0415
+
+    return tuple(dict.fromkeys((*_get_subclasses(BaseRecord), *_get_subclasses(RecordManager))))
+
+
+def _get_subclasses(cls: type) -> list[type]:
+    r"""Get a class and all its subclasses.
+
+    Args:
+        cls: The class.
+
+    Returns:
+        The class and its subclasses, in depth-first order.
+    """
+    classes = [cls]
+    for subclass in cls.__subclasses__():
+        classes.extend(_get_subclasses(subclass))
+    return classes
+
+
+def _instrument(name: str, method: Any) -> Any:
+    r"""Wrap a method to update its counters at each call.
+
+    Args:
+        name: The name of the counters.
+        method: The method, which can be a ``classmethod`` or a
+            ``staticmethod``.
+
+    Returns:
+        The wrapped method.
+    """
+    if isinstance(method, (classmethod, staticmethod)):
+        return type(method)(_instrument(name, method.__func__))
+    counters = _COUNTERS.setdefault(name, [0, 0, 0])
+
+    @functools.wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        blocks = getallocatedblocks()
+        start = perf_counter_ns()
+        try:
+            return method(*args, **kwargs)
+        finally:
+            counters[1] += perf_counter_ns() - start
+            counters[2] += getallocatedblocks() - blocks
+            counters[0] += 1
+
+    return wrapper
@@ -2,20 +2,60 @@ r"""Contain a record manager implementation."""
 
 from __future__ import annotations
 
-__all__ = ["RecordManager"]
+__all__ = ["FINGERPRINT_KEY", "RecordManager", "RecordNamespace"]
 
 import copy
 import logging
-from typing import Any
-
-from coola.utils.format import repr_indent, repr_mapping, str_indent, str_mapping
+import pickle
+import shutil
+import sys
+import tempfile
+import weakref
+from bisect import bisect_left, insort
+from contextlib import contextmanager
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 from minrecord.base import BaseRecord
-from minrecord.functional import get_best_values
+from minrecord.config import get_memory_budget
+from minrecord.functional import get_best_values, get_last_values
 from minrecord.generic import Record
+from minrecord.rule import RecordRule, find_rule
+from minrecord.storage import ARRAY, PACKED
+from minrecord.utils.fingerprint import combine_fingerprints
+from minrecord.utils.imports import when_imported
+from minrecord.utils.pattern import compile_pattern, get_literal_prefix
+
+if TYPE_CHECKING:
+    import re
+    from collections.abc import Callable, Collection, Generator, Iterable, Mapping
 
 logger: logging.Logger = logging.getLogger(__name__)
 
+# The key of the fingerprint of the manager in its state dict.
+FINGERPRINT_KEY = "__fingerprint__"
+
+# The largest character, used to find the upper bound of the keys
+# in a namespace.
+_MAX_CHAR = chr(0x10FFFF)
+
+# The maximum number of cached pattern selections in each manager.
+_MAX_SELECTIONS = 128
+
+# The memory budget is checked when the number of records in memory
+# grows by this fraction, so the cost of the checks is amortized.
+_BUDGET_CHECK_FRACTION = 16
+# The memory budget is also checked when the records in memory were
+# accessed this number of times, or as many times as there are records
+# in memory, because the records grow when values are added to them.
+_BUDGET_CHECK_ACCESSES = 1024
+
+# The approximate number of bytes of an element in a deque, without
+# its step and its value: the pointer in the deque and the tuple.
+_OBJECT_ELEMENT_SIZE = 8 + sys.getsizeof((None, None))
+# The number of bytes of a packed step, value or timestamp.
+_PACKED_ITEM_SIZE = 8
+
 
 class RecordManager:
     r"""Implement a simple record manager.
@@ -24,8 +64,69 @@ class RecordManager:
     is possible to use other approaches. If this class does not fit your
     needs, feel free to use another approach.
 
+    The state dict of the manager contains the fingerprint of the
+    records (see ``get_fingerprint``) with the key ``FINGERPRINT_KEY``,
+    so it is possible to check if a checkpoint has the same state as a
+    manager without loading it. This key is reserved, so it cannot be
+    used for a record.
+
+    The state of a record can be loaded lazily with
+    ``load_state_dict(..., lazy=True)``. In that case, the raw state is
+    kept and the record is created the first time it is accessed.
+
+    The keys can be organized in namespaces, for example
+    ``"train/loss"`` and ``"val/acc/top1"``. A namespace is a prefix of
+    the keys, and the records of a namespace are found with a binary
+    search in a sorted index of the keys, so the methods that accept
+    a ``namespace`` argument only access the matching records. The
+    index is created on demand and updated when a key is added.
+
+    The records can also be selected with a glob pattern or a regular
+    expression (see ``select``). The keys selected by a pattern are
+    cached until a key is added to the manager.
+
+    The record of an unknown key is created when it is accessed with
+    ``get_record``. By default, it is a ``Record``, but the class of
+    the record and its arguments can be configured for the keys that
+    match a pattern with some ``RecordRule``s. The first rule that
+    matches the key is used, and the rule of each key is cached.
+
+    The approximate memory used by the records can be limited with a
+    memory budget. The manager checks the budget (see
+    ``enforce_memory_budget``) when a record is created or loaded and
+    at least 1/16 of the records were added since the last check, and
+    when the records were accessed with ``get_record`` at least 1,024
+    times, or as many times as there are records, since the last
+    check, so the records that grow are also checked. Over
+    budget, the least recently used records, i.e. the records that
+    were not accessed with ``get_record`` or ``add_record`` for the
+    longest time, are compacted to packed storage, then their
+    maximum size is halved until ``min_size``, then they are evicted
+    to disk. An evicted record is loaded again the first time it is
+    accessed. A record that is referenced outside of the manager, for
+    example by a variable, is not evicted because its later values
+    would be lost, and a record that cannot be pickled is not
+    evicted, so the budget may not be met: a warning is logged in
+    that case. The references are counted with ``sys.getrefcount``,
+    so only the strong references are detected, and the records are
+    never evicted on the Python implementations without it, for
+    example PyPy. The number of actions is returned by
+    ``get_memory_stats``.
+
     Args:
         records: The initial records to add to the manager.
+        rules: The rules used to create the records of the unknown
+            keys, in priority order.
+        memory_budget: The approximate number of bytes that the
+            records can use. If ``None``, the default memory budget
+            of the config is used, see
+            ``minrecord.config.set_memory_budget``.
+        min_size: The minimum maximum size of the records whose
+            maximum size is halved to fit in the memory budget.
+
+    Raises:
+        ValueError: if ``memory_budget`` or ``min_size`` is not
+            positive.
 
     Example:
         ```pycon
@@ -36,17 +137,64 @@ class RecordManager:
         MinScalarRecord(name=loss, max_size=10, size=0)
         >>> manager.get_record("new_record")
         Record(name=new_record, max_size=10, size=0)
+        >>> from minrecord.rule import RecordRule
+        >>> manager = RecordManager(rules=[RecordRule("*/loss", MinScalarRecord)])
+        >>> manager.get_record("train/loss")
+        MinScalarRecord(name=train/loss, max_size=10, size=0)
 
         ```
     """
 
-    def __init__(self, records: dict[str, BaseRecord[Any]] | None = None) -> None:
+    def __init__(
+        self,
+        records: dict[str, BaseRecord[Any]] | None = None,
+        rules: Iterable[RecordRule] = (),
+        *,
+        memory_budget: int | None = None,
+        min_size: int = 10,
+    ) -> None:
+        if memory_budget is not None and memory_budget <= 0:
+            msg = f"memory_budget must be greater than 0 (received: {memory_budget})"
+            raise ValueError(msg)
+        if min_size <= 0:
+            msg = f"min_size must be greater than 0 (received: {min_size})"
+            raise ValueError(msg)
         self._records = records or {}
+        self._rules = list(rules)
+        # The rule of each key, or None if no rule matches the key.
+        self._key_rules: dict[str, RecordRule | None] = {}
+        # The raw states of the records that are not created yet.
+        self._lazy_states: dict[str, dict[str, Any]] = {}
+        # The sorted keys, or None if the index is not created yet.
+        self._key_index: list[str] | None = None
+        # The keys selected by each pattern.
+        self._selections: dict[str | re.Pattern[str], list[str]] = {}
+        self._memory_budget = memory_budget or get_memory_budget()
+        self._min_size = min_size
+        # The keys of the records from the least to the most recently
+        # used, only if there is a memory budget.
+        self._recency: dict[str, None] = {}
+        # The number of records in memory at the next budget check.
+        self._next_budget_check = 0
+        # The number of accesses to the records in memory since the
+        # last budget check, and the number at the next budget check.
+        self._num_accesses = 0
+        self._next_access_check = _BUDGET_CHECK_ACCESSES
+        # The paths and the fingerprints of the evicted records.
+        self._evicted: dict[str, tuple[str, int]] = {}
+        self._spill_dir: str | None = None
+        # The budget is not checked while several records are
+        # accessed, so none of them is evicted.
+        self._budget_paused = False
+        self._memory_stats = {"checks": 0, "compacted": 0, "shrunk": 0, "evicted": 0, "reloaded": 0}
 
     def __len__(self) -> int:
-        return len(self._records)
+        return len(self._records) + len(self._lazy_states) + len(self._evicted)
 
     def __repr__(self) -> str:
+        from coola.utils.format import repr_indent, repr_mapping  # noqa: PLC0415
+
+        self._materialize_all()
         if self._records:
             return (
                 f"{self.__class__.__qualname__}(\n  {repr_indent(repr_mapping(self._records))}\n)"
@@ -54,10 +202,19 @@ class RecordManager:
         return f"{self.__class__.__qualname__}()"
 
     def __str__(self) -> str:
+        from coola.utils.format import str_indent, str_mapping  # noqa: PLC0415
+
+        self._materialize_all()
         if self._records:
             return f"{self.__class__.__qualname__}(\n  {str_indent(str_mapping(self._records))}\n)"
         return f"{self.__class__.__qualname__}()"
 
+    @property
+    def memory_budget(self) -> int | None:
+        r"""The approximate number of bytes that the records can use,
+        or ``None`` if there is no limit."""
+        return self._memory_budget
+
     def add_record(
         self, record: BaseRecord[Any], key: str | None = None, exist_ok: bool = False
     ) -> None:
@@ -74,6 +231,7 @@ class RecordManager:
         Raises:
             RuntimeError: if a record is already registered for the
                 key and ``exist_ok=False``.
+            ValueError: if the key is ``FINGERPRINT_KEY``.
 
         Example:
             ```pycon
@@ -95,16 +253,118 @@ class RecordManager:
         """
         if key is None:
             key = record.name
-        if key in self._records and not exist_ok:
+        _check_key(key)
+        if self.has_record(key) and not exist_ok:
             msg = (
-                f"A record ({self._records[key]!r}) is already registered for the key "
+                f"A record ({self.get_record(key)!r}) is already registered for the key "
                 f"{key}. Please use `exist_ok=True` if you want to overwrite the "
                 "record for this key"
             )
             raise RuntimeError(msg)
+        if not self.has_record(key):
+            self._index_key(key)
+        self._lazy_states.pop(key, None)
+        self._discard_evicted(key)
         self._records[key] = record
+        self._touch(key)
+        self._check_memory_budget(key)
 
-    def get_best_values(self, prefix: str = "", suffix: str = "") -> dict[str, Any]:
+    def add_rule(self, rule: RecordRule) -> None:
+        r"""Add a rule to create the records of the unknown keys.
+
+        The rule has a lower priority than the existing rules, and it
+        does not change the records that are already created.
+
+        Args:
+            rule: The rule to add.
+
+        Example:
+            ```pycon
+            >>> from minrecord import RecordManager, MaxScalarRecord
+            >>> from minrecord.rule import RecordRule
+            >>> manager = RecordManager()
+            >>> manager.add_rule(RecordRule("*/acc", MaxScalarRecord, max_size=5))
+            >>> manager.get_record("val/acc")
+            MaxScalarRecord(name=val/acc, max_size=5, size=0)
+
+            ```
+        """
+        self._rules.append(rule)
+        self._key_rules.clear()
+
+    def enforce_memory_budget(self) -> None:
+        r"""Reduce the memory used by the records until it fits in the
+        memory budget.
+
+        The least recently used records are compacted to packed
+        storage, then their maximum size is halved until
+        ``min_size``, then they are evicted to disk. The records that
+        are referenced outside of the manager are not evicted. The
+        memory of a record is estimated from its number of elements
+        and its most recent element. This method does nothing if
+        there is no memory budget.
+
+        Example:
+            ```pycon
+            >>> from minrecord import Record, RecordManager
+            >>> manager = RecordManager(memory_budget=2000, min_size=50)
+            >>> for key in ["a", "b", "c"]:
+            ...     manager.add_record(Record(key, max_size=100))
+            ...     manager.get_record(key).update([(i, float(i)) for i in range(100)])
+            ...
+            >>> manager.enforce_memory_budget()
+            >>> stats = manager.get_memory_stats()
+            >>> stats["shrunk"] > 0 and stats["evicted"] > 0
+            True
+            >>> manager.get_record("a").get_most_recent(2)
+            ((98, 98.0), (99, 99.0))
+
+            ```
+        """
+        if self._memory_budget is not None:
+            self._enforce_memory_budget()
+
+    def equal(self, other: Any) -> bool:
+        r"""Indicate if two record managers are equal or not.
+
+        The number of records and the keys are compared before the
+        records, so the comparison stops early if they are different.
+
+        Args:
+            other: The object to compare.
+
+        Returns:
+            ``True`` if the record managers are equal, ``False``
+                otherwise.
+
+        Example:
+            ```pycon
+            >>> from minrecord import RecordManager, MinScalarRecord
+            >>> manager1 = RecordManager({"loss": MinScalarRecord("loss")})
+            >>> manager2 = RecordManager({"loss": MinScalarRecord("loss")})
+            >>> manager1.equal(manager2)
+            True
+            >>> manager1.equal(RecordManager())
+            False
+
+            ```
+        """
+        if self is other:
+            return True
+        if type(other) is not type(self) or len(self) != len(other):
+            return False
+        records1, records2 = self.get_records(), other.get_records()
+        if records1.keys() != records2.keys():
+            return False
+        return all(record.equal(records2[key]) for key, record in records1.items())
+
+    def get_best_values(
+        self,
+        prefix: str = "",
+        suffix: str = "",
+        namespace: str | None = None,
+        pattern: str | re.Pattern[str] | None = None,
+    ) -> dict[str, Any]:
         r"""Get the best value of each metric.
 
         This method ignores the metrics with empty record and the
@@ -121,6 +381,11 @@ class RecordManager:
                 different from the metric name to avoid confusion.
                 By default, the returned dict uses the same name as the
                 metric.
+            namespace: If not ``None``, only the metrics whose key
+                starts with this namespace are used.
+            pattern: If not ``None``, only the metrics whose key
+                matches this glob pattern or regular expression are
+                used. See ``select`` for more information.
 
         Returns:
             The dict with the best value of each metric.
@@ -137,10 +402,122 @@ class RecordManager:
             {'best/accuracy': 42.0}
             >>> manager.get_best_values(suffix="/best")
             {'accuracy/best': 42.0}
+            >>> manager.add_record(MaxScalarRecord.from_elements("val/accuracy", [(0, 35.0)]))
+            >>> manager.get_best_values(namespace="val/")
+            {'val/accuracy': 35.0}
+            >>> manager.get_best_values(pattern="*/accuracy")
+            {'val/accuracy': 35.0}
+
+            ```
+        """
+        return get_best_values(self.get_records(namespace, pattern), prefix=prefix, suffix=suffix)
+
+    def get_fingerprint(self) -> int:
+        r"""Get the fingerprint of the state of the records.
+
+        It is combined from the fingerprints of the records and their
+        keys. The records update their fingerprint from the values
+        added since it was computed, so it is not necessary to
+        serialize or to hash all the values again. The records
+        whose state is loaded lazily are not created if their raw
+        state has a fingerprint.
+
+        Returns:
+            The fingerprint of the state of the records.
+
+        Example:
+            ```pycon
+            >>> from minrecord import RecordManager, MinScalarRecord
+            >>> manager1 = RecordManager({"loss": MinScalarRecord("loss")})
+            >>> manager2 = RecordManager({"loss": MinScalarRecord("loss")})
+            >>> manager1.get_fingerprint() == manager2.get_fingerprint()
+            True
+            >>> manager1.get_record("loss").add_value(1.0)
+            >>> manager1.get_fingerprint() == manager2.get_fingerprint()
+            False
+
+            ```
+        """
+        fingerprints = {}
+        for key, state in tuple(self._lazy_states.items()):
+            fingerprint = state["state"].get("fingerprint")
+            if fingerprint is None:
+                fingerprint = self.get_record(key).get_fingerprint()
+            fingerprints[key] = fingerprint
+        for key, (_, fingerprint) in self._evicted.items():
+            fingerprints[key] = fingerprint
+        for key, record in self._records.items():
+            fingerprints[key] = record.get_fingerprint()
+        return combine_fingerprints(fingerprints)
+
+    def get_last_values(
+        self,
+        prefix: str = "",
+        suffix: str = "",
+        namespace: str | None = None,
+        pattern: str | re.Pattern[str] | None = None,
+    ) -> dict[str, Any]:
+        r"""Get the last value of each metric.
+
+        This method ignores the metrics with empty record.
+
+        Args:
+            prefix: The prefix used to create the dict of last values.
+                The goal of this prefix is to generate a name which is
+                different from the metric name to avoid confusion.
+                By default, the returned dict uses the same name as the
+                metric.
+            suffix: The suffix used to create the dict of last values.
+                The goal of this suffix is to generate a name which is
+                different from the metric name to avoid confusion.
+                By default, the returned dict uses the same name as the
+                metric.
+            namespace: If not ``None``, only the metrics whose key
+                starts with this namespace are used.
+            pattern: If not ``None``, only the metrics whose key
+                matches this glob pattern or regular expression are
+                used. See ``select`` for more information.
+
+        Returns:
+            The dict with the last value of each metric.
+
+        Example:
+            ```pycon
+            >>> from minrecord import RecordManager, MaxScalarRecord
+            >>> manager = RecordManager()
+            >>> manager.add_record(MaxScalarRecord("accuracy"))
+            >>> manager.get_record("accuracy").update([(0, 42.0), (1, 35.0)])
+            >>> manager.get_last_values()
+            {'accuracy': 35.0}
+            >>> manager.get_last_values(prefix="last/")
+            {'last/accuracy': 35.0}
+            >>> manager.get_last_values(namespace="train/")
+            {}
 
             ```
         """
-        return get_best_values(self._records, prefix=prefix, suffix=suffix)
+        return get_last_values(self.get_records(namespace, pattern), prefix=prefix, suffix=suffix)
+
+    def get_memory_stats(self) -> dict[str, int]:
+        r"""Get the number of actions done to fit in the memory budget.
+
+        Returns:
+            The number of budget checks (``"checks"``), compacted
+                records (``"compacted"``), halvings of the maximum
+                size of a record (``"shrunk"``), evicted records
+                (``"evicted"``), and records loaded after an eviction
+                (``"reloaded"``).
+
+        Example:
+            ```pycon
+            >>> from minrecord import RecordManager
+            >>> manager = RecordManager()
+            >>> manager.get_memory_stats()
+            {'checks': 0, 'compacted': 0, 'shrunk': 0, 'evicted': 0, 'reloaded': 0}
+
+            ```
+        """
+        return dict(self._memory_stats)
 
     def get_record(self, key: str) -> BaseRecord[Any]:
         r"""Get the record associated to a key.
@@ -150,8 +527,12 @@ class RecordManager:
 
         Returns:
             The record if it exists, otherwise it returns an empty
-                record. The created empty record is a ``Record``
-                object.
+                record. The created empty record is created by the
+                first rule that matches the key, or is a ``Record``
+                object if no rule matches the key.
+
+        Raises:
+            ValueError: if the key is ``FINGERPRINT_KEY``.
 
         Example:
             ```pycon
@@ -165,13 +546,40 @@ class RecordManager:
 
             ```
         """
-        if not self.has_record(key):
-            self._records[key] = Record(name=key)
+        if key not in self._records:
+            if key in self._evicted:
+                self._records[key] = self._load_evicted(key)
+            elif key in self._lazy_states:
+                self._records[key] = BaseRecord.from_dict(self._lazy_states.pop(key))
+            else:
+                _check_key(key)
+                self._index_key(key)
+                self._records[key] = self._create_record(key)
+            self._touch(key)
+            self._check_memory_budget(key)
+        elif self._memory_budget is not None:
+            self._touch(key)
+            # The record may grow, for example if values are added to
+            # it, so the budget is also checked after some accesses.
+            self._num_accesses += 1
+            if self._num_accesses >= self._next_access_check and not self._budget_paused:
+                self._enforce_memory_budget(key)
         return self._records[key]
 
-    def get_records(self) -> dict[str, BaseRecord[Any]]:
+    def get_records(
+        self, namespace: str | None = None, pattern: str | re.Pattern[str] | None = None
+    ) -> dict[str, BaseRecord[Any]]:
         r"""Get all the records.
 
+        Args:
+            namespace: If not ``None``, only the records whose key
+                starts with this namespace are returned. The keys are
+                sorted in this case.
+            pattern: If not ``None``, only the records whose key
+                matches this glob pattern or regular expression are
+                returned. The keys are sorted in this case. See
+                ``select`` for more information.
+
         Returns:
             The records with their associated keys.
 
@@ -182,10 +590,23 @@ class RecordManager:
             >>> manager.add_record(MinScalarRecord("loss"))
             >>> manager.get_records()
             {'loss': MinScalarRecord(name=loss, max_size=10, size=0)}
+            >>> manager.add_record(MinScalarRecord("train/loss"))
+            >>> manager.get_records(namespace="train/")
+            {'train/loss': MinScalarRecord(name=train/loss, max_size=10, size=0)}
 
             ```
         """
-        return copy.copy(self._records)
+        if namespace is None and pattern is None:
+            self._materialize_all()
+            return copy.copy(self._records)
+        if pattern is None:
+            keys = self._get_namespace_keys(namespace)
+        else:
+            keys = self._get_pattern_keys(pattern)
+            if namespace:
+                keys = [key for key in keys if key.startswith(namespace)]
+        with self._pause_memory_budget():
+            return {key: self.get_record(key) for key in keys}
 
     def has_record(self, key: str) -> bool:
         r"""Indicate if the engine has a record for the given key.
@@ -208,13 +629,19 @@ class RecordManager:
 
             ```
         """
-        return key in self._records
+        return key in self._records or key in self._lazy_states or key in self._evicted
 
-    def load_state_dict(self, state_dict: dict[str, Any]) -> None:
+    def load_state_dict(self, state_dict: dict[str, Any], lazy: bool = False) -> None:
         r"""Load the state values from a dict.
 
         Args:
-            state_dict: A dict with the new state values.
+            state_dict: A dict with the new state values. The
+                fingerprint of the manager is ignored because it is
+                computed from the records.
+            lazy: If ``True``, the records that are not in the manager
+                are created the first time they are accessed. Until
+                then, their raw state is kept and ``state_dict``
+                returns it without re-encoding it.
 
         Example:
             ```pycon
@@ -224,14 +651,262 @@ class RecordManager:
             >>> manager.load_state_dict({"value": {"state": {"record": ((0, 1), (1, 0.5), (2, 0.25))}}})
             >>> manager.get_record("value").get_last_value()
             0.25
+            >>> manager.load_state_dict(
+            ...     {
+            ...         "loss": {
+            ...             "config": {
+            ...                 "_target_": "minrecord.MinScalarRecord",
+            ...                 "name": "loss",
+            ...                 "max_size": 10,
+            ...             },
+            ...             "state": {"record": ((0, 1),), "improved": True, "best_value": 1},
+            ...         }
+            ...     },
+            ...     lazy=True,
+            ... )
+            >>> manager.has_record("loss")
+            True
+            >>> manager.get_record("loss")
+            MinScalarRecord(name=loss, max_size=10, size=1)
 
             ```
         """
         for key, state in state_dict.items():
-            if self.has_record(key):
+            if key == FINGERPRINT_KEY:
+                continue
+            if key in self._evicted:
+                self.get_record(key)
+            if key in self._records:
                 self._records[key].load_state_dict(state["state"])
+            elif key in self._lazy_states:
+                self._lazy_states[key] = self._lazy_states[key] | {"state": state["state"]}
             else:
-                self._records[key] = BaseRecord.from_dict(state)
+                # The index is re-created on demand because many keys
+                # can be added.
+                self._key_index = None
+                self._selections.clear()
+                if lazy:
+                    self._lazy_states[key] = state
+                else:
+                    self._records[key] = BaseRecord.from_dict(state)
+        self._check_memory_budget()
+
+    def memory_report(self, top: int | None = None) -> str:
+        r"""Get a report of the memory used by the records, sorted by
+        footprint.
+
+        Args:
+            top: The number of records in the report. ``None`` means
+                all the records. The last line is always the total of
+                all the records.
+
+        Returns:
+            The report, with the key, the type, the number of elements
+                and the memory of each record, and the share of the
+                total memory.
+
+        Example:
+            ```pycon
+            >>> from minrecord import RecordManager, Record
+            >>> manager = RecordManager()
+            >>> manager.add_record(Record("small", elements=[(0, 1.0)]))
+            >>> manager.add_record(Record("large", max_size=1000, elements=[(0, "a" * 10_000)]))
+            >>> print(manager.memory_report(top=1))  # doctest: +ELLIPSIS
+            key      record  size  memory     share
+            large    Record     1  ... KiB   ...%
+            2 records               ... KiB  100.0%
+
+            ```
+        """
+        from minrecord.utils.memory import format_bytes  # noqa: PLC0415
+
+        usages = self.memory_usage()
+        total = sum(usage["total"] for usage in usages.values()) or 1
+        rows = [("key", "record", "size", "memory", "share")]
+        for key, usage in list(usages.items())[:top]:
+            record = self._records.get(key)
+            rows.append(
+                (
+                    key,
+                    "(lazy)" if record is None else type(record).__qualname__,
+                    "" if record is None else f"{len(record):,}",
+                    format_bytes(usage["total"]),
+                    f"{usage['total'] / total:.1%}",
+                )
+            )
+        rows.append((f"{len(usages):,} records", "", "", format_bytes(total), "100.0%"))
+        widths = [max(len(row[i]) for row in rows) for i in range(5)]
+        lines = [
+            f"{row[0]:<{widths[0]}}  {row[1]:<{widths[1]}}  {row[2]:>{widths[2]}}  "
+            f"{row[3]:>{widths[3]}}  {row[4]:>{widths[4]}}"
+            for row in rows
+        ]
+        return "\n".join(line.rstrip() for line in lines)
+
+    def memory_usage(self) -> dict[str, dict[str, int]]:
+        r"""Get the approximate number of bytes used by each record.
+
+        The memory of a record includes its key, see
+        ``BaseRecord.memory_usage`` for the other components. The
+        memory of a record whose state is loaded lazily is the memory
+        of its raw state (``"state"``). The evicted records are not
+        in memory, so they are ignored.
+
+        Returns:
+            The number of bytes used by each component of each record,
+                sorted by decreasing total number of bytes.
+
+        Example:
+            ```pycon
+            >>> from minrecord import RecordManager, Record
+            >>> manager = RecordManager()
+            >>> manager.add_record(Record("small", elements=[(0, 1.0)]))
+            >>> manager.add_record(Record("large", elements=[(0, "a" * 1000)]))
+            >>> list(manager.memory_usage())
+            ['large', 'small']
+            >>> manager.memory_usage()["large"]["values"]
+            1049
+
+            ```
+        """
+        from minrecord.utils.memory import get_deep_size  # noqa: PLC0415
+
+        usages = {}
+        for key, record in self._records.items():
+            usage = {"key": sys.getsizeof(key), **record.memory_usage()}
+            usage["total"] += usage["key"]
+            usages[key] = usage
+        for key, state in self._lazy_states.items():
+            usage = {"key": sys.getsizeof(key), "state": get_deep_size(state)}
+            usages[key] = usage | {"total": usage["key"] + usage["state"]}
+        return dict(sorted(usages.items(), key=lambda item: item[1]["total"], reverse=True))
+
+    def merge(
+        self,
+        others: Iterable[RecordManager],
+        reduce: str | Callable[[list[Any]], Any] = "mean",
+        reductions: Mapping[str, str | Callable[[list[Any]], Any]] | None = None,
+    ) -> RecordManager:
+        r"""Merge the records of the manager with the records of other
+        managers, for example the managers of several workers.
+
+        The records with the same key are merged by step with
+        ``Record.merge``, so the cost is ``O(N log k)`` where ``N`` is
+        the number of elements of the records with this key and ``k``
+        the number of managers. A record that is only in one manager
+        is copied. The managers are not modified.
+
+        Args:
+            others: The other managers.
+            reduce: The reduction of the values at the same step, see
+                ``Record.merge`` for the supported reductions.
+            reductions: The reductions of some keys. The other keys
+                use ``reduce``.
+
+        Returns:
+            A new manager with the merged records and the rules of
+                this manager. The keys of this manager are first,
+                then the new keys of the other managers.
+
+        Raises:
+            TypeError: if a record of a key is not a ``Record``.
+            ValueError: if a reduction is not supported, or a record
+                has a value without step.
+
+        Example:
+            ```pycon
+            >>> from minrecord import RecordManager, MaxScalarRecord, MinScalarRecord
+            >>> manager1 = RecordManager()
+            >>> manager1.add_record(MinScalarRecord.from_elements("loss", [(0, 4.0), (1, 2.0)]))
+            >>> manager1.add_record(MaxScalarRecord.from_elements("samples", [(0, 32), (1, 32)]))
+            >>> manager2 = RecordManager()
+            >>> manager2.add_record(MinScalarRecord.from_elements("loss", [(0, 2.0), (1, 1.0)]))
+            >>> manager2.add_record(MaxScalarRecord.from_elements("samples", [(0, 32), (1, 16)]))
+            >>> manager = manager1.merge([manager2], reductions={"samples": "sum"})
+            >>> manager.get_best_values()
+            {'loss': 1.5, 'samples': 64}
+            >>> manager.get_record("samples").get_most_recent()
+            ((0, 64), (1, 48))
+
+            ```
+        """
+        records: dict[str, list[BaseRecord[Any]]] = {}
+        for manager in (self, *others):
+            for key, record in manager.get_records().items():
+                records.setdefault(key, []).append(record)
+        reductions = reductions or {}
+        merged = RecordManager(
+            rules=self._rules, memory_budget=self._memory_budget, min_size=self._min_size
+        )
+        for key, (record, *rest) in records.items():
+            if not isinstance(record, Record):
+                msg = f"The record of the key {key} cannot be merged because it is not a Record"
+                raise TypeError(msg)
+            merged.add_record(record.merge(rest, reductions.get(key, reduce)), key)
+        return merged
+
+    def namespace(self, namespace: str) -> RecordNamespace:
+        r"""Get a view of the records in a namespace.
+
+        The view shares the records with the manager, so a record
+        added to the view is added to the manager.
+
+        Args:
+            namespace: The namespace, for example ``"val/"``.
+
+        Returns:
+            The view of the records in the namespace.
+
+        Example:
+            ```pycon
+            >>> from minrecord import RecordManager, MaxScalarRecord
+            >>> manager = RecordManager()
+            >>> val = manager.namespace("val/")
+            >>> val.add_record(MaxScalarRecord.from_elements("acc", [(0, 42.0)]))
+            >>> manager.get_best_values()
+            {'val/acc': 42.0}
+            >>> val.get_best_values()
+            {'acc': 42.0}
+
+            ```
+        """
+        return RecordNamespace(self, namespace)
+
+    def select(self, pattern: str | re.Pattern[str]) -> dict[str, BaseRecord[Any]]:
+        r"""Select the records whose key matches a pattern.
+
+        The keys selected by a pattern are cached until a key is added
+        to the manager, so selecting the same pattern several times
+        does not check all the keys again. The keys of a glob pattern
+        with a literal prefix, for example ``"val/*"``, are found in
+        the namespace of the prefix.
+
+        Args:
+            pattern: The glob pattern, for example ``"*/loss"``, or the
+                compiled regular expression. The whole key must match
+                the pattern. ``*`` also matches ``/`` in a glob
+                pattern.
+
+        Returns:
+            The selected records and their associated keys. The keys
+                are sorted.
+
+        Example:
+            ```pycon
+            >>> import re
+            >>> from minrecord import RecordManager, MinScalarRecord
+            >>> manager = RecordManager()
+            >>> for key in ["train/loss", "val/loss", "val/acc"]:
+            ...     manager.add_record(MinScalarRecord(key))
+            ...
+            >>> list(manager.select("*/loss"))
+            ['train/loss', 'val/loss']
+            >>> list(manager.select(re.compile(r"val/(acc|f1)")))
+            ['val/acc']
+
+            ```
+        """
+        return self.get_records(pattern=pattern)
 
     def state_dict(self) -> dict[str, Any]:
         r"""Return a dictionary containing state values of all the
@@ -245,8 +920,524 @@ class RecordManager:
             >>> from minrecord import RecordManager
             >>> manager = RecordManager()
             >>> manager.state_dict()
-            {}
+            {'__fingerprint__': 0}
 
             ```
         """
-        return {key: hist.to_dict() for key, hist in self._records.items()}
+        state = {key: hist.to_dict() for key, hist in self._records.items()}
+        state.update(self._lazy_states)
+        for key, (path, _) in self._evicted.items():
+            state[key] = _read_record(path).to_dict()
+        # The fingerprints of the records are already in their state.
+        fingerprints = {}
+        for key, record_state in state.items():
+            fingerprint = record_state["state"].get("fingerprint")
+            if fingerprint is None:
+                fingerprint = self.get_record(key).get_fingerprint()
+            fingerprints[key] = fingerprint
+        state[FINGERPRINT_KEY] = combine_fingerprints(fingerprints)
+        return state
+
+    def _check_memory_budget(self, key: str | None = None) -> None:
+        r"""Enforce the memory budget if enough records were added
+        since the last check.
+
+        Args:
+            key: The key of a record that must not be evicted, for
+                example the record that is accessed.
+        """
+        if (
+            self._memory_budget is not None
+            and not self._budget_paused
+            and len(self._records) >= self._next_budget_check
+        ):
+            self._enforce_memory_budget(key)
+
+    def _create_record(self, key: str) -> BaseRecord[Any]:
+        r"""Create the record of an unknown key.
+
+        Args:
+            key: The key of the record.
+
+        Returns:
+            The record created by the first rule that matches the key,
+                or a ``Record`` if no rule matches the key.
+        """
+        if key in self._key_rules:
+            rule = self._key_rules[key]
+        else:
+            rule = self._key_rules[key] = find_rule(self._rules, key)
+        if rule is None:
+            return Record(name=key)
+        return rule.create(key)
+
+    def _discard_evicted(self, key: str) -> None:
+        r"""Remove the evicted record of a key, if any.
+
+        Args:
+            key: The key of the record.
+        """
+        if key in self._evicted:
+            path, _ = self._evicted.pop(key)
+            Path(path).unlink(missing_ok=True)
+
+    def _enforce_memory_budget(self, protected: str | None = None) -> None:
+        r"""Reduce the memory used by the records until it fits in the
+        memory budget.
+
+        Args:
+            protected: The key of a record that must not be evicted.
+        """
+        stats = self._memory_stats
+        stats["checks"] += 1
+        usages = {key: _estimate_memory(record) for key, record in self._records.items()}
+        total = sum(usages.values())
+        # The records that were never accessed are the least recently
+        # used records.
+        keys = [key for key in self._records if key not in self._recency]
+        keys.extend(key for key in self._recency if key in self._records)
+        budget = self._memory_budget
+        for key in keys:
+            if total <= budget:
+                break
+            record = self._records[key]
+            if isinstance(record, Record) and record.compact():
+                stats["compacted"] += 1
+                usage = _estimate_memory(record)
+                total, usages[key] = total - usages[key] + usage, usage
+        record = None
+        shrunk = True
+        while total > budget and shrunk:
+            shrunk = False
+            for key in keys:
+                if total <= budget:
+                    break
+                record = self._records[key]
+                if isinstance(record, Record) and record.max_size > self._min_size:
+                    record.resize(max(self._min_size, record.max_size // 2))
+                    stats["shrunk"] += 1
+                    shrunk = True
+                    usage = _estimate_memory(record)
+                    total, usages[key] = total - usages[key] + usage, usage
+        # The local reference would prevent the eviction of a record.
+        del record
+        skipped = []
+        for key in keys:
+            if total <= budget:
+                break
+            if key == protected:
+                continue
+            # The later values of a record that is used outside of
+            # the manager would be lost if it was evicted.
+            if _is_referenced(self._records, key) or not self._evict_record(key):
+                skipped.append(key)
+                continue
+            stats["evicted"] += 1
+            total -= usages[key]
+        if total > budget and skipped:
+            logger.warning(
+                f"The memory budget ({budget:,} bytes) is exceeded ({total:,} bytes) "
+                f"but {len(skipped):,} records are not evicted because they are "
+                f"referenced outside of the manager or cannot be pickled: {skipped[:5]}"
+            )
+        size = len(self._records)
+        self._next_budget_check = size + size // _BUDGET_CHECK_FRACTION + 1
+        self._num_accesses = 0
+        self._next_access_check = max(size, _BUDGET_CHECK_ACCESSES)
+        logger.debug(f"Memory budget: {total:,}/{budget:,} bytes ({stats})")
+
+    def _evict_record(self, key: str) -> bool:
+        r"""Evict a record to disk.
+
+        Args:
+            key: The key of the record to evict.
+
+        Returns:
+            ``True`` if the record was evicted, or ``False`` if it
+                cannot be pickled, for example because its comparator
+                uses a lambda.
+        """
+        record = self._records[key]
+        try:
+            data = pickle.dumps(record)
+        except (AttributeError, TypeError, pickle.PicklingError):
+            logger.debug(f"The record '{key}' cannot be pickled, so it is not evicted")
+            return False
+        if self._spill_dir is None:
+            self._spill_dir = tempfile.mkdtemp(prefix="minrecord-")
+            weakref.finalize(self, shutil.rmtree, self._spill_dir, ignore_errors=True)
+        del self._records[key]
+        self._recency.pop(key, None)
+        path = Path(self._spill_dir).joinpath(f"{self._memory_stats['evicted']}.pkl")
+        path.write_bytes(data)
+        self._evicted[key] = (str(path), record.get_fingerprint())
+        return True
+
+    def _get_keys(self) -> Collection[str]:
+        r"""Get all the keys of the records.
+
+        Returns:
+            The keys of the records.
+        """
+        return self._records.keys() | self._lazy_states.keys() | self._evicted.keys()
+
+    def _get_namespace_keys(self, namespace: str) -> list[str]:
+        r"""Get the sorted keys in a namespace.
+
+        Args:
+            namespace: The namespace.
+
+        Returns:
+            The sorted keys that start with the namespace.
+        """
+        if self._key_index is None:
+            self._key_index = sorted(self._get_keys())
+        keys = self._key_index
+        start = bisect_left(keys, namespace)
+        end = bisect_left(keys, namespace + _MAX_CHAR, lo=start)
+        return keys[start:end]
+
+    def _get_pattern_keys(self, pattern: str | re.Pattern[str]) -> list[str]:
+        r"""Get the sorted keys that match a pattern.
+
+        Args:
+            pattern: The glob pattern or the compiled regular
+                expression.
+
+        Returns:
+            The sorted keys that match the pattern.
+        """
+        keys = self._selections.get(pattern)
+        if keys is None:
+            match = compile_pattern(pattern).fullmatch
+            keys = [
+                key for key in self._get_namespace_keys(get_literal_prefix(pattern)) if match(key)
+            ]
+            if len(self._selections) >= _MAX_SELECTIONS:
+                del self._selections[next(iter(self._selections))]
+            self._selections[pattern] = keys
+        return keys
+
+    def _index_key(self, key: str) -> None:
+        r"""Add a new key to the index of the keys.
+
+        The cached pattern selections are removed because they may not
+        contain the new key.
+
+        Args:
+            key: The key to add. It must not be in the manager.
+        """
+        if self._key_index is not None:
+            insort(self._key_index, key)
+        self._selections.clear()
+
+    def _load_evicted(self, key: str) -> BaseRecord[Any]:
+        r"""Load an evicted record and remove it from the disk.
+
+        Args:
+            key: The key of the evicted record.
+
+        Returns:
+            The record.
+        """
+        path, _ = self._evicted[key]
+        record = _read_record(path)
+        self._discard_evicted(key)
+        self._memory_stats["reloaded"] += 1
+        return record
+
+    def _materialize_all(self, namespace: str | None = None) -> None:
+        r"""Create all the records whose state is loaded lazily, and
+        load all the evicted records.
+
+        Args:
+            namespace: If not ``None``, only the records in this
+                namespace are created.
+        """
+        if not self._lazy_states and not self._evicted:
+            return
+        if namespace is None:
+            keys = (*self._lazy_states, *self._evicted)
+        else:
+            keys = [
+                key
+                for key in self._get_namespace_keys(namespace)
+                if key in self._lazy_states or key in self._evicted
+            ]
+        with self._pause_memory_budget():
+            for key in keys:
+                self.get_record(key)
+
+    @contextmanager
+    def _pause_memory_budget(self) -> Generator[None, None, None]:
+        r"""Pause the checks of the memory budget, so the records that
+        are accessed in the context are not evicted."""
+        paused, self._budget_paused = self._budget_paused, True
+        try:
+            yield
+        finally:
+            self._budget_paused = paused
+
+    def _touch(self, key: str) -> None:
+        r"""Mark a record as the most recently used record.
+
+        Args:
+            key: The key of the record.
+        """
+        if self._memory_budget is not None:
+            self._recency.pop(key, None)
+            self._recency[key] = None
+
+
+class RecordNamespace:
+    r"""Implement a view of the records of a manager in a namespace.
+
+    The keys of the view are relative to the namespace, and the view
+    shares the records with the manager. The records of the view are
+    found with the index of the keys of the manager.
+
+    Args:
+        manager: The record manager.
+        namespace: The namespace, for example ``"val/"``.
+
+    Example:
+        ```pycon
+        >>> from minrecord import RecordManager, MinScalarRecord
+        >>> manager = RecordManager()
+        >>> manager.add_record(MinScalarRecord.from_elements("train/loss", [(0, 1.5)]))
+        >>> manager.add_record(MinScalarRecord.from_elements("val/loss", [(0, 2.0)]))
+        >>> train = manager.namespace("train/")
+        >>> train
+        RecordNamespace(namespace=train/, size=1)
+        >>> train.get_last_values()
+        {'loss': 1.5}
+        >>> train.get_record("loss") is manager.get_record("train/loss")
+        True
+
+        ```
+    """
+
+    def __init__(self, manager: RecordManager, namespace: str) -> None:
+        self._manager = manager
+        self._namespace = namespace
+
+    def __len__(self) -> int:
+        return len(self._manager._get_namespace_keys(self._namespace))
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__qualname__}(namespace={self._namespace}, size={len(self):,})"
+
+    @property
+    def manager(self) -> RecordManager:
+        r"""The record manager."""
+        return self._manager
+
+    @property
+    def prefix(self) -> str:
+        r"""The namespace of the view, which is the prefix of its keys
+        in the manager."""
+        return self._namespace
+
+    def add_record(
+        self, record: BaseRecord[Any], key: str | None = None, exist_ok: bool = False
+    ) -> None:
+        r"""Add a record to the namespace.
+
+        Args:
+            record: The record to add.
+            key: The key of the record in the namespace. If ``None``,
+                the name of the record is used.
+            exist_ok: If ``False``, ``RuntimeError`` is raised if the
+                key already exists.
+
+        Raises:
+            RuntimeError: if a record is already registered for the
+                key and ``exist_ok=False``.
+        """
+        if key is None:
+            key = record.name
+        self._manager.add_record(record, key=self._namespace + key, exist_ok=exist_ok)
+
+    def get_best_values(self, prefix: str = "", suffix: str = "") -> dict[str, Any]:
+        r"""Get the best value of each metric in the namespace.
+
+        Args:
+            prefix: The prefix used to create the dict of best values.
+            suffix: The suffix used to create the dict of best values.
+
+        Returns:
+            The dict with the best value of each metric. The keys are
+                relative to the namespace.
+        """
+        return get_best_values(self.get_records(), prefix=prefix, suffix=suffix)
+
+    def get_last_values(self, prefix: str = "", suffix: str = "") -> dict[str, Any]:
+        r"""Get the last value of each metric in the namespace.
+
+        Args:
+            prefix: The prefix used to create the dict of last values.
+            suffix: The suffix used to create the dict of last values.
+
+        Returns:
+            The dict with the last value of each metric. The keys are
+                relative to the namespace.
+        """
+        return get_last_values(self.get_records(), prefix=prefix, suffix=suffix)
+
+    def get_record(self, key: str) -> BaseRecord[Any]:
+        r"""Get the record associated to a key in the namespace.
+
+        Args:
+            key: The key of the record in the namespace.
+
+        Returns:
+            The record if it exists, otherwise a new empty ``Record``
+                that is added to the manager.
+        """
+        return self._manager.get_record(self._namespace + key)
+
+    def get_records(self) -> dict[str, BaseRecord[Any]]:
+        r"""Get the records in the namespace.
+
+        Returns:
+            The records and their keys relative to the namespace.
+        """
+        size = len(self._namespace)
+        return {
+            key[size:]: record for key, record in self._manager.get_records(self._namespace).items()
+        }
+
+    def has_record(self, key: str) -> bool:
+        r"""Indicate if the namespace has a record for the given key.
+
+        Args:
+            key: The key of the record in the namespace.
+
+        Returns:
+            ``True`` if the record exists, ``False`` otherwise.
+        """
+        return self._manager.has_record(self._namespace + key)
+
+    def namespace(self, namespace: str) -> RecordNamespace:
+        r"""Get a view of the records in a sub-namespace.
+
+        Args:
+            namespace: The sub-namespace, relative to the namespace.
+
+        Returns:
+            The view of the records in the sub-namespace.
+        """
+        return self._manager.namespace(self._namespace + namespace)
+
+
+def _estimate_memory(record: BaseRecord[Any]) -> int:
+    r"""Estimate the number of bytes used by a record.
+
+    The size of the elements in a ``deque`` is estimated from the most
+    recent element, so the estimation is done in ``O(1)``.
+
+    Args:
+        record: The record.
+
+    Returns:
+        The approximate number of bytes used by the record.
+    """
+    size = sys.getsizeof(record) + sys.getsizeof(getattr(record, "__dict__", None))
+    if not isinstance(record, Record) or record.is_empty():
+        return size
+    if record.backend == PACKED:
+        element_size = 2 * _PACKED_ITEM_SIZE
+    elif record.backend == ARRAY:
+        # The values are the rows of an array and the steps are in a list.
+        element_size = record.get_last_value().nbytes + _PACKED_ITEM_SIZE
+    else:
+        step, value = record.get_most_recent(1)[0]
+        element_size = _OBJECT_ELEMENT_SIZE + sys.getsizeof(value)
+        if step is not None:
+            element_size += sys.getsizeof(step)
+    if record.clock is not None:
+        element_size += _PACKED_ITEM_SIZE
+    return size + len(record) * element_size
+
+
+def _check_key(key: str) -> None:
+    r"""Check a key can be used for a record.
+
+    Args:
+        key: The key to check.
+
+    Raises:
+        ValueError: if the key is ``FINGERPRINT_KEY``.
+    """
+    if key == FINGERPRINT_KEY:
+        msg = f"The key {FINGERPRINT_KEY!r} is reserved for the fingerprint of the manager"
+        raise ValueError(msg)
+
+
+def _get_refcount(records: dict[str, Any], key: str) -> int:
+    r"""Get the reference count of a record of a dict.
+
+    Args:
+        records: The records.
+        key: The key of the record.
+
+    Returns:
+        The reference count returned by ``sys.getrefcount``.
+    """
+    return sys.getrefcount(records[key])
+
+
+def _is_referenced(records: dict[str, Any], key: str) -> bool:
+    r"""Indicate if a record of a dict is referenced outside of the
+    dict.
+
+    The reference count is compared with the reference count of an
+    object that is only referenced by a dict, because the references
+    counted by ``sys.getrefcount`` depend on the Python version.
+
+    This check has some limitations. Only the strong references are
+    counted, so a record that is only referenced by a weak reference
+    is not considered referenced. A temporary reference, for example
+    the dict returned by ``get_records`` while it exists, is
+    considered as a reference. ``sys.getrefcount`` is specific to
+    CPython, so the records are always considered referenced on the
+    other implementations, for example PyPy, and they are never
+    evicted.
+
+    Args:
+        records: The records.
+        key: The key of the record.
+
+    Returns:
+        ``True`` if the record is referenced outside of the dict,
+            otherwise ``False``.
+    """
+    if not hasattr(sys, "getrefcount"):
+        return True
+    return _get_refcount(records, key) > _get_refcount({key: object()}, key)
+
+
+def _read_record(path: str) -> BaseRecord[Any]:
+    r"""Read a record evicted to disk.
+
+    Args:
+        path: The path to the evicted record.
+
+    Returns:
+        The record.
+    """
+    return pickle.loads(Path(path).read_bytes())  # noqa: S301
+
+
+def _register_equality_tester() -> None:
+    r"""Register the equality tester of the record managers in
+    ``coola``."""
+    from coola.equality.tester import (  # noqa: PLC0415
+        EqualEqualityTester,
+        get_default_registry,
+    )
+
+    get_default_registry().register(RecordManager, EqualEqualityTester(), exist_ok=True)
+
+
+when_imported("coola.equality", _register_equality_tester)
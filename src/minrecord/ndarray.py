@@ -0,0 +1,734 @@
+r"""Contain a record to track the element-wise best value of NumPy
+arrays.
+
+The values of the record are stored in a 2-D ring buffer, so a value
+is copied in a row of a NumPy array instead of being stored as an
+array object in a ``deque``. The best value is tracked element-wise
+with ``numpy.fmax`` or ``numpy.fmin`` in a preallocated array, for
+example to track the best accuracy of each class or the largest
+gradient norm of each layer.
+"""
+
+from __future__ import annotations
+
+__all__ = ["ArrayRecord", "ArrayStorage"]
+
+import sys
+from typing import TYPE_CHECKING, Any
+
+from minrecord.base import EmptyRecordError
+from minrecord.comparator import MODES
+from minrecord.generic import Record
+from minrecord.storage import ARRAY
+from minrecord.utils.fingerprint import append_fingerprint, hash_object
+from minrecord.utils.imports import check_numpy, is_numpy_available
+from minrecord.utils.memory import get_deep_size
+
+if is_numpy_available():
+    import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator, Sequence
+
+    if sys.version_info >= (3, 11):
+        from typing import Self
+    else:
+        from typing_extensions import Self
+
+# The initial number of rows of the buffer of a storage. The buffer
+# grows geometrically up to the maximum number of elements.
+_INITIAL_CAPACITY = 16
+# The functions used to update the best value in each mode. They
+# ignore the NaN values.
+_UFUNCS = {"max": "fmax", "min": "fmin"}
+
+
+class ArrayStorage:
+    r"""Implement a bounded storage of elements whose values are NumPy
+    arrays with the same shape.
+
+    The values are copied in the rows of a 2-D ring buffer, and the
+    steps are stored in a ``list``. The buffer is allocated with the
+    first value and it grows geometrically up to ``maxlen`` rows, so
+    a storage with a large ``maxlen`` does not allocate memory for
+    the values that are not added. It behaves like a ``deque`` of
+    ``(step, value)`` tuples with a ``maxlen``. The values returned by
+    the storage are copies of the rows, so they are not modified when
+    the storage is updated.
+
+    Args:
+        maxlen: The maximum number of elements.
+        elements: The initial elements.
+        shape: The shape of the values. If ``None``, the shape of the
+            first value is used.
+        dtype: The data type of the values. If ``None``, the data type
+            of the first value is used.
+
+    Raises:
+        TypeError: if a value cannot be cast to the data type of the
+            storage.
+        ValueError: if the shape of a value is not the shape of the
+            storage.
+
+    Example:
+        ```pycon
+        >>> import numpy as np
+        >>> from minrecord.ndarray import ArrayStorage
+        >>> storage = ArrayStorage(2, [(0, np.array([1.0, 2.0]))])
+        >>> storage.append((1, np.array([3.0, 4.0])))
+        >>> storage.append((2, np.array([5.0, 6.0])))
+        >>> storage[-1]
+        (2, array([5., 6.]))
+        >>> storage.to_array()
+        array([[3., 4.],
+               [5., 6.]])
+
+        ```
+    """
+
+    __slots__ = ("_dtype", "_head", "_maxlen", "_shape", "_steps", "_values")
+
+    backend = ARRAY
+
+    def __init__(
+        self,
+        maxlen: int,
+        elements: Iterable[tuple[Any, Any]] = (),
+        shape: Sequence[int] | None = None,
+        dtype: Any = None,
+    ) -> None:
+        check_numpy()
+        self._maxlen = maxlen
+        self._head = 0
+        self._shape = None if shape is None else tuple(shape)
+        self._dtype = None if dtype is None else np.dtype(dtype)
+        self._steps: list[Any] = []
+        # The buffer is allocated with the first value.
+        self._values: np.ndarray | None = None
+        for element in elements:
+            self.append(element)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, ArrayStorage):
+            return NotImplemented
+        return self._steps_in_order() == other._steps_in_order() and _arrays_are_equal(
+            self.to_array(), other.to_array()
+        )
+
+    __hash__ = None
+
+    def __getitem__(self, index: int) -> tuple[Any, np.ndarray]:
+        size = len(self._steps)
+        if not -size <= index < size:
+            msg = "storage index out of range"
+            raise IndexError(msg)
+        position = (self._head + index) % size
+        # The ellipsis keeps the 0-d values as arrays.
+        return (self._steps[position], self._values[position, ...].copy())
+
+    def __iter__(self) -> Iterator[tuple[Any, np.ndarray]]:
+        return map(self.__getitem__, range(len(self)))
+
+    def __len__(self) -> int:
+        return len(self._steps)
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__qualname__}(maxlen={self._maxlen:,}, size={len(self):,}, "
+            f"shape={self._shape}, dtype={self._dtype})"
+        )
+
+    def __reversed__(self) -> Iterator[tuple[Any, np.ndarray]]:
+        return map(self.__getitem__, range(-1, -len(self) - 1, -1))
+
+    @property
+    def dtype(self) -> np.dtype | None:
+        r"""The data type of the values or ``None`` if it is not known
+        yet."""
+        return self._dtype
+
+    @property
+    def maxlen(self) -> int:
+        r"""The maximum number of elements."""
+        return self._maxlen
+
+    @property
+    def shape(self) -> tuple[int, ...] | None:
+        r"""The shape of the values or ``None`` if it is not known
+        yet."""
+        return self._shape
+
+    def append(self, element: tuple[Any, Any]) -> None:
+        r"""Add an element to the storage.
+
+        The oldest element is removed if the storage is full.
+
+        Args:
+            element: The element to add.
+
+        Raises:
+            TypeError: if the value cannot be cast to the data type of
+                the storage.
+            ValueError: if the shape of the value is not the shape of
+                the storage.
+        """
+        step, value = element
+        value = _as_array(value, self._shape, self._dtype)
+        values, steps = self._values, self._steps
+        size = len(steps)
+        if values is None:
+            self._shape, self._dtype = value.shape, value.dtype
+            values = self._values = np.empty(
+                (min(self._maxlen, _INITIAL_CAPACITY), *value.shape), dtype=value.dtype
+            )
+        if size < self._maxlen:
+            if size == len(values):
+                values = self._values = np.concatenate(
+                    (values, np.empty_like(values[: min(size, self._maxlen - size)]))
+                )
+            values[size] = value
+            steps.append(step)
+        else:
+            head = self._head
+            values[head] = value
+            steps[head] = step
+            self._head = (head + 1) % self._maxlen
+
+    def memory_usage(self) -> dict[str, int]:
+        r"""Get the number of bytes used by the storage.
+
+        Returns:
+            The number of bytes used by the storage object
+                (``"storage"``), the steps (``"steps"``) and the
+                values (``"values"``).
+
+        Example:
+            ```pycon
+            >>> import numpy as np
+            >>> from minrecord.ndarray import ArrayStorage
+            >>> usage = ArrayStorage(3, [(0, np.zeros(4))]).memory_usage()
+            >>> sorted(usage)
+            ['steps', 'storage', 'values']
+
+            ```
+        """
+        return {
+            "storage": sys.getsizeof(self),
+            "steps": get_deep_size(self._steps),
+            "values": 0 if self._values is None else sys.getsizeof(self._values),
+        }
+
+    def to_array(self) -> np.ndarray:
+        r"""Get the values in an array.
+
+        Returns:
+            A new array whose rows are the values, from the oldest to
+                the most recent. Its first dimension is the number of
+                elements.
+
+        Example:
+            ```pycon
+            >>> import numpy as np
+            >>> from minrecord.ndarray import ArrayStorage
+            >>> storage = ArrayStorage(3, [(0, np.array([1, 2])), (1, np.array([3, 4]))])
+            >>> storage.to_array()
+            array([[1, 2],
+                   [3, 4]])
+
+            ```
+        """
+        if self._values is None:
+            return np.empty((0, *(self._shape or ())), dtype=self._dtype)
+        size, head = len(self._steps), self._head
+        if head == 0:
+            return self._values[:size].copy()
+        return np.concatenate((self._values[head:size], self._values[:head]))
+
+    def _steps_in_order(self) -> list[Any]:
+        r"""Get the steps from the oldest to the most recent.
+
+        Returns:
+            The steps.
+        """
+        return self._steps[self._head :] + self._steps[: self._head]
+
+
+class ArrayRecord(Record[Any]):
+    r"""Implement a record of NumPy arrays that tracks the element-wise
+    best value.
+
+    All the values have the same shape and data type, which are given
+    by the first value if they are not set. The values are stored in
+    an ``ArrayStorage``, and the best value is updated in place with
+    ``numpy.fmax`` or ``numpy.fmin``, so the NaN values are ignored.
+    The record also keeps the step of the best value of each element.
+    Like for ``ComparableRecord``, a value equal to the best value is
+    an improvement, the best value is not limited to the values that
+    are in the record, and the initial elements do not update the best
+    value. The record has improved if at least one element of the last
+    value is equal to the best value.
+
+    Args:
+        name: The name of the record.
+        mode: The mode of the best value: ``"max"`` or ``"min"``.
+        elements: The initial elements. Each element is a tuple with
+            the step and its associated value.
+        max_size: The maximum number of elements to store in the record.
+            If ``None``, the default maximum size of the config is
+            used.
+        best_value: The initial best value. If ``None``, the first
+            value added to the record is the best value.
+        best_steps: The initial step of the best value of each element.
+            If ``None``, the steps of the initial best value are
+            ``None``. It is used only if ``best_value`` is set.
+        improved: Indicate if the last value has improved the best
+            value or not.
+        shape: The shape of the values. If ``None``, the shape of the
+            first value is used.
+        dtype: The data type of the values. If ``None``, the data type
+            of the first value is used.
+        clock: The clock used to timestamp the values. See ``Record``
+            for more information.
+
+    Raises:
+        RuntimeError: if ``numpy`` is not installed.
+        ValueError: if the mode is not supported, or the shape of a
+            value is not the shape of the record.
+        TypeError: if a value cannot be cast to the data type of the
+            record.
+
+    Example:
+        ```pycon
+        >>> import numpy as np
+        >>> from minrecord.ndarray import ArrayRecord
+        >>> record = ArrayRecord("class_accuracy", mode="max")
+        >>> record.add_value(np.array([0.5, 0.7, 0.2]), step=0)
+        >>> record.add_value(np.array([0.6, 0.6, 0.1]), step=1)
+        >>> record.get_best_value()
+        array([0.6, 0.7, 0.2])
+        >>> record.get_best_steps()
+        array([1, 0, 0], dtype=object)
+        >>> record.has_improved()
+        True
+
+        ```
+    """
+
+    def __init__(
+        self,
+        name: str,
+        mode: str = "max",
+        elements: Iterable[tuple[int | None, Any]] = (),
+        max_size: int | None = None,
+        *,
+        best_value: Any = None,
+        best_steps: Any = None,
+        improved: bool = False,
+        shape: Sequence[int] | None = None,
+        dtype: Any = None,
+        clock: str | None = None,
+    ) -> None:
+        check_numpy()
+        if mode not in MODES:
+            msg = f"Incorrect mode: {mode}. The valid modes are: {list(MODES)}"
+            raise ValueError(msg)
+        self._mode = mode
+        self._ufunc = getattr(np, _UFUNCS[mode])
+        self._shape = None if shape is None else tuple(shape)
+        self._dtype = None if dtype is None else np.dtype(dtype)
+        super().__init__(name=name, elements=elements, max_size=max_size, clock=clock)
+        self._best_value: np.ndarray | None = None
+        self._best_steps: np.ndarray | None = None
+        if best_value is not None:
+            self._best_value = self._check_values((best_value,))[0].copy()
+            self._best_steps = self._check_steps(best_steps)
+        self._improved = bool(improved)
+
+    def __str__(self) -> str:
+        from coola.utils.format import str_indent, str_mapping  # noqa: PLC0415
+
+        args = str_indent(
+            str_mapping(
+                {
+                    "name": self.name,
+                    "max_size": self.max_size,
+                    "mode": self._mode,
+                    "shape": self._shape,
+                    "dtype": self._dtype,
+                    "best_value": self._best_value,
+                    "best_steps": self._best_steps,
+                    "improved": self._improved,
+                    "record": self.get_most_recent(),
+                }
+            )
+        )
+        return f"{self.__class__.__qualname__}(\n  {args}\n)"
+
+    @property
+    def dtype(self) -> np.dtype | None:
+        r"""The data type of the values or ``None`` if it is not known
+        yet."""
+        return self._dtype
+
+    @property
+    def mode(self) -> str:
+        r"""The mode of the best value: ``"max"`` or ``"min"``."""
+        return self._mode
+
+    @property
+    def shape(self) -> tuple[int, ...] | None:
+        r"""The shape of the values or ``None`` if it is not known
+        yet."""
+        return self._shape
+
+    def add_value(self, value: Any, step: int | None = None) -> None:
+        r"""Add a value to the record and update the element-wise best
+        value.
+
+        Args:
+            value: The value. It is converted to an array with the
+                shape and the data type of the record.
+            step: The step of the value.
+
+        Raises:
+            TypeError: if the value cannot be cast to the data type of
+                the record.
+            ValueError: if the shape of the value is not the shape of
+                the record.
+        """
+        array = self._check_values((value,))[0]
+        best = self._best_value
+        if best is None:
+            best = self._best_value = array.copy()
+            self._best_steps = np.full(best.shape, None, dtype=object)
+        else:
+            self._ufunc(best, array, out=best)
+        improved = best == array
+        self._best_steps[improved] = step
+        self._improved = bool(improved.any())
+        super().add_value(array, step)
+
+    def update(self, elements: Iterable[tuple[float | None, Any]]) -> None:
+        elements = list(elements)
+        if not elements:
+            return
+        # The values are checked before the record is modified.
+        arrays = self._check_values([value for _, value in elements])
+        steps = np.empty(len(elements), dtype=object)
+        steps[:] = [step for step, _ in elements]
+        values = np.stack(arrays)
+        best = self._ufunc.reduce(values, axis=0)
+        if self._best_value is None:
+            self._best_value = best
+            self._best_steps = np.full(best.shape, None, dtype=object)
+        else:
+            best = self._ufunc(self._best_value, best, out=self._best_value)
+        # The step of the best value of an element is the step of the
+        # last value that is equal to the best value.
+        is_best = values == best
+        found = is_best.any(axis=0)
+        last = len(values) - 1 - np.asarray(np.argmax(is_best[::-1], axis=0))
+        self._best_steps[found] = steps[last[found]]
+        self._improved = bool(is_best[-1].any())
+        add_value = super().add_value
+        for (step, _), array in zip(elements, arrays):
+            add_value(array, step)
+
+    def clone(self) -> ArrayRecord:
+        record = self.__class__(
+            name=self.name,
+            mode=self._mode,
+            elements=self._record,
+            max_size=self.max_size,
+            best_value=self._best_value,
+            best_steps=self._best_steps,
+            improved=self._improved,
+            shape=self._shape,
+            dtype=self._dtype,
+            clock=self.clock,
+        )
+        record._copy_storage(self)
+        return record
+
+    def equal(self, other: Any) -> bool:
+        if self is other:
+            return True
+        if (
+            type(other) is not type(self)
+            or self._mode != other._mode
+            or self._shape != other._shape
+            or self._dtype != other._dtype
+            or self._improved != other._improved
+            or not _arrays_are_equal(self._best_value, other._best_value)
+            or not _arrays_are_equal(self._best_steps, other._best_steps)
+        ):
+            return False
+        return super().equal(other)
+
+    def get_best_steps(self) -> np.ndarray:
+        r"""Get the step of the best value of each element.
+
+        Returns:
+            A new array of objects with the shape of the values. Each
+                item is the step of the last value that is equal to
+                the best value of the element.
+
+        Raises:
+            EmptyRecordError: if the record does not have a best
+                value.
+
+        Example:
+            ```pycon
+            >>> import numpy as np
+            >>> from minrecord.ndarray import ArrayRecord
+            >>> record = ArrayRecord("grad_norm", mode="min")
+            >>> record.update([(0, np.array([3.0, 1.0])), (1, np.array([2.0, 4.0]))])
+            >>> record.get_best_steps()
+            array([1, 0], dtype=object)
+
+            ```
+        """
+        self._get_best_value()
+        return self._best_steps.copy()
+
+    def get_fingerprint(self) -> int:
+        fingerprint = append_fingerprint(super().get_fingerprint(), hash_object(self._best_value))
+        fingerprint = append_fingerprint(fingerprint, hash_object(self._best_steps))
+        return append_fingerprint(fingerprint, hash_object(self._improved))
+
+    def get_values_array(self, n: int | None = None) -> np.ndarray:
+        r"""Get the recent values in an array.
+
+        Args:
+            n: The number of recent values to return. ``None`` means
+                all the recent values.
+
+        Returns:
+            A new array whose rows are the values, from the oldest to
+                the most recent.
+
+        Raises:
+            ValueError: if ``n`` is negative.
+
+        Example:
+            ```pycon
+            >>> import numpy as np
+            >>> from minrecord.ndarray import ArrayRecord
+            >>> record = ArrayRecord("class_accuracy")
+            >>> record.update([(0, np.array([0.5, 0.7])), (1, np.array([0.6, 0.6]))])
+            >>> record.get_values_array()
+            array([[0.5, 0.7],
+                   [0.6, 0.6]])
+            >>> record.get_values_array(1)
+            array([[0.6, 0.6]])
+
+            ```
+        """
+        if n is not None and n < 0:
+            msg = f"n must be greater than or equal to 0 (received: {n})"
+            raise ValueError(msg)
+        values = self._record.to_array()
+        return values if n is None else values[max(len(values) - n, 0) :]
+
+    def _get_best_value(self) -> np.ndarray:
+        if self.is_empty() or self._best_value is None:
+            msg = "The record is empty so it is not possible to get the best value."
+            raise EmptyRecordError(msg)
+        return self._best_value.copy()
+
+    def _has_improved(self) -> bool:
+        if self.is_empty():
+            msg = "The record is empty."
+            raise EmptyRecordError(msg)
+        return self._improved
+
+    def is_comparable(self) -> bool:
+        return True
+
+    def config_dict(self) -> dict[str, Any]:
+        config = super().config_dict()
+        config["mode"] = self._mode
+        if self._shape is not None:
+            config["shape"] = self._shape
+            config["dtype"] = str(self._dtype)
+        return config
+
+    def load_state_dict(self, state_dict: dict[str, Any]) -> None:
+        super().load_state_dict(state_dict)
+        self._best_value = self._best_steps = None
+        if state_dict["best_value"] is not None:
+            self._best_value = self._check_values((state_dict["best_value"],))[0].copy()
+            self._best_steps = self._check_steps(state_dict["best_steps"])
+        self._improved = state_dict["improved"]
+
+    @classmethod
+    def from_elements(
+        cls, name: str, elements: Iterable[tuple[float | None, Any]], mode: str = "max"
+    ) -> Self:
+        r"""Instantiate an ``ArrayRecord`` object from the elements.
+
+        Unlike the initial elements of the constructor, the elements
+        update the best value.
+
+        Args:
+            name: The name of the record.
+            elements: The elements. Each element is a tuple with the
+                step and its associated value.
+            mode: The mode of the best value: ``"max"`` or ``"min"``.
+
+        Returns:
+            The instantiated record.
+
+        Example:
+            ```pycon
+            >>> import numpy as np
+            >>> from minrecord.ndarray import ArrayRecord
+            >>> record = ArrayRecord.from_elements(
+            ...     "class_accuracy", [(0, np.array([0.5, 0.7])), (1, np.array([0.6, 0.6]))]
+            ... )
+            >>> record.get_best_value()
+            array([0.6, 0.7])
+
+            ```
+        """
+        record = cls(name=name, mode=mode)
+        record.update(elements)
+        return record
+
+    def _get_state_without_elements(self) -> dict[str, Any]:
+        state = super()._get_state_without_elements()
+        # The best value is updated in place, so it is copied.
+        best_value, best_steps = self._best_value, self._best_steps
+        state.update(
+            {
+                "improved": self._improved,
+                "best_value": None if best_value is None else best_value.copy(),
+                "best_steps": None if best_steps is None else best_steps.copy(),
+            }
+        )
+        return state
+
+    def _check_steps(self, steps: Any) -> np.ndarray:
+        r"""Check the steps of the best value.
+
+        Args:
+            steps: The step of the best value of each element or
+                ``None``.
+
+        Returns:
+            A new array of objects with the steps.
+
+        Raises:
+            ValueError: if the shape of the steps is not the shape of
+                the record.
+        """
+        if steps is None:
+            return np.full(self._shape, None, dtype=object)
+        array = np.empty(self._shape, dtype=object)
+        steps = np.asarray(steps, dtype=object)
+        if steps.shape != self._shape:
+            msg = (
+                f"'{self.name}' record expects best steps of shape {self._shape} "
+                f"(received: {steps.shape})"
+            )
+            raise ValueError(msg)
+        array[...] = steps
+        return array
+
+    def _check_values(self, values: Iterable[Any]) -> list[np.ndarray]:
+        r"""Convert values to arrays with the shape and the data type of
+        the record.
+
+        The shape and the data type of the record are set with the
+        first value if they are not known yet.
+
+        Args:
+            values: The values.
+
+        Returns:
+            The arrays. An array is not copied if the value is already
+                a C-contiguous array with the data type of the record.
+
+        Raises:
+            TypeError: if a value cannot be cast to the data type of
+                the record.
+            ValueError: if the shape of a value is not the shape of
+                the record.
+        """
+        shape, dtype = self._shape, self._dtype
+        arrays = []
+        try:
+            for value in values:
+                array = _as_array(value, shape, dtype)
+                shape, dtype = array.shape, array.dtype
+                arrays.append(array)
+        except TypeError as error:
+            msg = f"'{self.name}' record cannot add the value: {error}"
+            raise TypeError(msg) from error
+        except ValueError as error:
+            msg = f"'{self.name}' record cannot add the value: {error}"
+            raise ValueError(msg) from error
+        self._shape, self._dtype = shape, dtype
+        return arrays
+
+    def _create_storage(
+        self,
+        elements: Iterable[tuple[Any, Any]],
+        max_size: int,
+        storage: str,  # noqa: ARG002
+    ) -> ArrayStorage:
+        record = ArrayStorage(max_size, elements, shape=self._shape, dtype=self._dtype)
+        self._shape, self._dtype = record.shape, record.dtype
+        return record
+
+
+def _as_array(value: Any, shape: tuple[int, ...] | None, dtype: np.dtype | None) -> np.ndarray:
+    r"""Convert a value to a C-contiguous array with a given shape and
+    data type.
+
+    Args:
+        value: The value.
+        shape: The expected shape or ``None`` to accept any shape.
+        dtype: The data type of the array or ``None`` to keep the data
+            type of the value. The value is cast only if it is a
+            ``"same_kind"`` cast, so for example a ``float`` value
+            cannot be cast to ``int``.
+
+    Returns:
+        The array.
+
+    Raises:
+        TypeError: if the value cannot be cast to the data type.
+        ValueError: if the shape of the value is not the expected
+            shape.
+    """
+    array = np.asarray(value)
+    if shape is not None and array.shape != shape:
+        msg = f"expected a value of shape {shape} (received: {array.shape})"
+        raise ValueError(msg)
+    if dtype is not None and not np.can_cast(array.dtype, dtype, casting="same_kind"):
+        msg = f"cannot cast a value of type {array.dtype} to {dtype}"
+        raise TypeError(msg)
+    return np.asarray(array, dtype=dtype, order="C")
+
+
+def _arrays_are_equal(array1: np.ndarray | None, array2: np.ndarray | None) -> bool:
+    r"""Indicate if two arrays are equal or not.
+
+    The NaN values are equal to keep a record equal to its clone.
+
+    Args:
+        array1: The first array or ``None``.
+        array2: The second array or ``None``.
+
+    Returns:
+        ``True`` if the arrays have the same shape, data type and
+            values, otherwise ``False``.
+    """
+    if array1 is None or array2 is None:
+        return array1 is array2
+    return (
+        array1.shape == array2.shape
+        and array1.dtype == array2.dtype
+        and np.array_equal(array1, array2, equal_nan=array1.dtype.kind in "fc")
+    )
@@ -0,0 +1,306 @@
+r"""Contain a record to track the Pareto front of values with several
+objectives."""
+
+from __future__ import annotations
+
+__all__ = ["ParetoRecord"]
+
+import math
+from typing import TYPE_CHECKING, Any
+
+from minrecord.base import EmptyRecordError
+from minrecord.comparable import ComparableRecord
+from minrecord.generic import Record, elements_are_equal
+from minrecord.utils.fingerprint import append_fingerprint, hash_object
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from minrecord.comparator import ParetoComparator
+
+
+class ParetoRecord(ComparableRecord[tuple[float, ...]]):
+    r"""Implement a record to track the Pareto front of values with
+    several objectives.
+
+    Each value is a sequence with one number per objective, for
+    example ``(accuracy, latency, memory)``. The record keeps the
+    non-dominated values, called the Pareto front, with their steps.
+    The front is updated when a value is added: the value is compared
+    with each value of the front, so the cost is ``O(front size)``.
+    The value is added to the front if no value of the front dominates
+    it or is equal to it, and the values of the front that it
+    dominates are removed. Like the best value of a
+    ``ComparableRecord``, the front is not limited to the values
+    that are in the record.
+
+    If the front has more than ``max_front_size`` values, the value
+    in the most crowded region of the front is removed, so the front
+    keeps its extreme values and stays spread. The crowding distance
+    of NSGA-II is used. A value dominated only by removed values can
+    then be added to the front later.
+
+    The best value of the record is the tuple of the values of the
+    front, and the record has improved if the last value was added to
+    the front.
+
+    Args:
+        name: The name of the record.
+        comparator: The comparator that defines the objectives.
+        elements: The initial elements. Each element is a tuple with
+            the step and its associated value. Like for
+            ``ComparableRecord``, they do not update the front.
+        max_size: The maximum number of elements to store in the record.
+            If ``None``, the default maximum size of the config is
+            used.
+        front: The initial front. Each element is a tuple with the step
+            and its associated value.
+        improved: Indicate if the last value is in the front or not.
+        max_front_size: The maximum number of values in the front. If
+            ``None``, the maximum size of the record is used.
+        clock: The clock used to timestamp the values. See ``Record``
+            for more information.
+        storage: The storage mode of the values. See ``Record`` for
+            more information.
+
+    Raises:
+        ValueError: if ``max_front_size`` is not positive.
+
+    Example:
+        ```pycon
+        >>> from minrecord.comparator import ParetoComparator
+        >>> from minrecord.pareto import ParetoRecord
+        >>> record = ParetoRecord("sweep", ParetoComparator(["max", "min"]))
+        >>> record.add_value((0.80, 12.0), step=0)
+        >>> record.add_value((0.90, 15.0), step=1)
+        >>> record.add_value((0.85, 20.0), step=2)
+        >>> record.has_improved()
+        False
+        >>> record.add_value((0.82, 10.0), step=3)
+        >>> record.get_front()
+        ((1, (0.9, 15.0)), (3, (0.82, 10.0)))
+        >>> record.get_best_value()
+        ((0.9, 15.0), (0.82, 10.0))
+
+        ```
+    """
+
+    def __init__(
+        self,
+        name: str,
+        comparator: ParetoComparator,
+        elements: Iterable[tuple[int | None, Sequence[float]]] = (),
+        max_size: int | None = None,
+        front: Iterable[tuple[int | None, Sequence[float]]] = (),
+        *,
+        improved: bool = False,
+        max_front_size: int | None = None,
+        clock: str | None = None,
+        storage: str = "object",
+    ) -> None:
+        super().__init__(
+            name=name,
+            comparator=comparator,
+            elements=elements,
+            max_size=max_size,
+            improved=improved,
+            clock=clock,
+            storage=storage,
+        )
+        if max_front_size is not None and max_front_size <= 0:
+            msg = f"max_front_size must be greater than 0 (received: {max_front_size})"
+            raise ValueError(msg)
+        self._max_front_size = max_front_size
+        self._front: list[tuple[int | None, Sequence[float]]] = []
+        for step, value in front:
+            self._insert(value, step)
+
+    def __str__(self) -> str:
+        from coola.utils.format import str_indent, str_mapping  # noqa: PLC0415
+
+        args = str_indent(
+            str_mapping(
+                {
+                    "name": self.name,
+                    "max_size": self.max_size,
+                    "comparator": self._comparator,
+                    "front": self.get_front(),
+                    "improved": self._improved,
+                    "record": self.get_most_recent(),
+                }
+            )
+        )
+        return f"{self.__class__.__qualname__}(\n  {args}\n)"
+
+    @property
+    def max_front_size(self) -> int:
+        r"""The maximum number of values in the front."""
+        return self.max_size if self._max_front_size is None else self._max_front_size
+
+    def add_value(self, value: Sequence[float], step: int | None = None) -> None:
+        r"""Add a value to the record and update the front.
+
+        Args:
+            value: The value, with one number per objective.
+            step: The step of the value.
+
+        Raises:
+            ValueError: if the number of objectives of the value is
+                not the number of objectives of the comparator.
+        """
+        if len(value) != self._comparator.num_objectives:
+            msg = (
+                f"'{self.name}' record expects values with {self._comparator.num_objectives} "
+                f"objectives (received: {len(value)})"
+            )
+            raise ValueError(msg)
+        self._improved = self._insert(value, step)
+        Record.add_value(self, value, step)
+
+    def clone(self) -> ParetoRecord:
+        record = self.__class__(
+            name=self.name,
+            elements=self._record,
+            max_size=self.max_size,
+            comparator=self._comparator,
+            front=self._front,
+            improved=self._improved,
+            max_front_size=self._max_front_size,
+            clock=self.clock,
+            storage=self.storage,
+        )
+        record._copy_storage(self)
+        return record
+
+    def equal(self, other: Any) -> bool:
+        if self is other:
+            return True
+        if (
+            type(other) is not type(self)
+            or self._max_front_size != other._max_front_size
+            or len(self._front) != len(other._front)
+            or not elements_are_equal(self._front, other._front)
+        ):
+            return False
+        return super().equal(other)
+
+    def get_fingerprint(self) -> int:
+        return append_fingerprint(super().get_fingerprint(), hash_object(self.get_front()))
+
+    def get_front(self) -> tuple[tuple[int | None, Sequence[float]], ...]:
+        r"""Get the Pareto front.
+
+        Returns:
+            The non-dominated values with their steps, in the order
+                they were added to the front.
+
+        Example:
+            ```pycon
+            >>> from minrecord.comparator import ParetoComparator
+            >>> from minrecord.pareto import ParetoRecord
+            >>> record = ParetoRecord("sweep", ParetoComparator(["min", "min"]))
+            >>> record.update([(0, (1.0, 4.0)), (1, (2.0, 2.0)), (2, (3.0, 3.0))])
+            >>> record.get_front()
+            ((0, (1.0, 4.0)), (1, (2.0, 2.0)))
+
+            ```
+        """
+        return tuple(self._front)
+
+    def _get_best_value(self) -> tuple[Sequence[float], ...]:
+        if self.is_empty():
+            msg = "The record is empty so it is not possible to get the best value."
+            raise EmptyRecordError(msg)
+        return tuple(value for _, value in self._front)
+
+    def config_dict(self) -> dict[str, Any]:
+        config = super().config_dict()
+        if self._max_front_size is not None:
+            config["max_front_size"] = self._max_front_size
+        return config
+
+    def load_state_dict(self, state_dict: dict[str, Any]) -> None:
+        super().load_state_dict(state_dict)
+        self._front = list(state_dict["front"])
+
+    def _get_state_without_elements(self) -> dict[str, Any]:
+        state = super()._get_state_without_elements()
+        state["front"] = self.get_front()
+        return state
+
+    def _add_elements(self, elements: Iterable[tuple[int | None, Sequence[float]]]) -> None:
+        # The front is updated value by value.
+        for step, value in elements:
+            self.add_value(value, step)
+
+    def _insert(self, value: Sequence[float], step: int | None) -> bool:
+        r"""Insert a value in the front if it is not dominated.
+
+        Args:
+            value: The value to insert.
+            step: The step of the value.
+
+        Returns:
+            ``True`` if the value was inserted, otherwise ``False``.
+        """
+        dominates = self._comparator.dominates
+        front = self._front
+        kept = []
+        for element in front:
+            other = element[1]
+            if dominates(other, value) or _values_are_equal(other, value):
+                return False
+            if not dominates(value, other):
+                kept.append(element)
+        kept.append((step, value))
+        self._front = kept
+        if len(kept) > self.max_front_size:
+            position = _find_most_crowded(kept)
+            del kept[position]
+            # The value is not inserted if it is the removed value.
+            return position < len(kept)
+        return True
+
+
+def _values_are_equal(value1: Sequence[float], value2: Sequence[float]) -> bool:
+    r"""Indicate if two values have the same objectives.
+
+    Args:
+        value1: The first value.
+        value2: The second value.
+
+    Returns:
+        ``True`` if the values have the same objectives, otherwise
+            ``False``.
+    """
+    return all(item1 == item2 for item1, item2 in zip(value1, value2))
+
+
+def _find_most_crowded(front: list[tuple[Any, Sequence[float]]]) -> int:
+    r"""Find the value of a front that is in the most crowded region.
+
+    The crowding distance of a value is the sum over the objectives of
+    the distance between its two neighbors, normalized by the range of
+    the objective. The extreme values have an infinite distance.
+
+    Args:
+        front: The elements of the front. Each element is a tuple with
+            the step and its associated value.
+
+    Returns:
+        The position of the value with the smallest crowding distance.
+            The oldest value is chosen if several values have the same
+            distance.
+    """
+    distances = [0.0] * len(front)
+    for objective in range(len(front[0][1])):
+        order = sorted(range(len(front)), key=lambda i: front[i][1][objective])
+        low, high = front[order[0]][1][objective], front[order[-1]][1][objective]
+        distances[order[0]] = distances[order[-1]] = math.inf
+        if high == low:
+            continue
+        for previous, current, following in zip(order, order[1:], order[2:]):
+            distances[current] += (
+                front[following][1][objective] - front[previous][1][objective]
+            ) / (high - low)
+    return min(range(len(front)), key=distances.__getitem__)
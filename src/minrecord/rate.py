@@ -0,0 +1,229 @@
+r"""Contain a record to track the rate of cumulative counters."""
+
+from __future__ import annotations
+
+__all__ = ["RateRecord"]
+
+from collections import deque
+from typing import TYPE_CHECKING, Any
+
+from minrecord.base import EmptyRecordError
+from minrecord.comparable import ComparableRecord
+from minrecord.comparator import BaseComparator, MaxScalarComparator
+from minrecord.utils.fingerprint import append_fingerprint, hash_object
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+
+class RateRecord(ComparableRecord[float]):
+    r"""Implement a record to track the rate of a cumulative counter.
+
+    The values added to the record are the values of a cumulative
+    counter, for example the number of processed samples, and the
+    values stored in the record are the instantaneous rates of the
+    counter, for example the number of samples per step. The rate is
+    computed with respect to the step, or with respect to the time if
+    ``clock`` is set. The rates are updated in ``O(1)`` when a
+    counter value is added.
+
+    A counter value lower than the previous one is considered as a
+    reset of the counter, for example when a training is resumed, so
+    the counter is assumed to restart from 0. A step or a time lower
+    than or equal to the previous one restarts the rate computation,
+    so no rate is added to the record for this counter value.
+
+    Args:
+        name: The name of the record.
+        elements: The initial rates. Each element is a tuple with the
+            step and its associated rate.
+        max_size: The maximum number of rates to store in the record.
+            If ``None``, the default maximum size of the config is
+            used.
+        best_value: The initial best rate. If ``None``, the initial
+            best value of the ``comparator`` is used.
+        improved: Indicate if the last rate is the best rate or not.
+        comparator: The comparator to use to find the best rate.
+            If ``None``, the highest rate is the best rate.
+        window: The number of counter intervals used to compute the
+            windowed rate.
+        clock: The clock used to compute the rate with respect to the
+            time, in counts per second. See ``Record`` for more
+            information. If ``None``, the rate is computed with
+            respect to the step.
+        storage: The storage mode of the rates. See ``Record`` for
+            more information.
+
+    Raises:
+        ValueError: if ``window`` is not positive.
+
+    Example:
+        ```pycon
+        >>> from minrecord import RateRecord
+        >>> record = RateRecord("samples", window=2)
+        >>> record.add_value(0, step=0)
+        >>> record.add_value(32, step=1)
+        >>> record.add_value(96, step=2)
+        >>> record.get_most_recent()
+        ((1, 32.0), (2, 64.0))
+        >>> record.get_window_rate()
+        48.0
+        >>> record.get_best_value()
+        64.0
+
+        ```
+    """
+
+    def __init__(
+        self,
+        name: str,
+        elements: Iterable[tuple[int | None, float]] = (),
+        max_size: int | None = None,
+        best_value: float | None = None,
+        improved: bool = False,
+        *,
+        comparator: BaseComparator[float] | None = None,
+        window: int = 10,
+        clock: str | None = None,
+        storage: str = "object",
+    ) -> None:
+        if window <= 0:
+            msg = f"window must be greater than 0 (received: {window})"
+            raise ValueError(msg)
+        super().__init__(
+            name=name,
+            comparator=comparator or MaxScalarComparator(),
+            elements=elements,
+            max_size=max_size,
+            best_value=best_value,
+            improved=improved,
+            clock=clock,
+            storage=storage,
+        )
+        # The last value of the counter.
+        self._counter: float | None = None
+        # The increments of the counter since the creation of the
+        # record, without the resets.
+        self._total = 0
+        # The last positions (step or time) and their associated totals.
+        self._samples: deque[tuple[float, float]] = deque(maxlen=window + 1)
+
+    @property
+    def window(self) -> int:
+        r"""The number of counter intervals used to compute the windowed
+        rate."""
+        return self._samples.maxlen - 1
+
+    def add_value(self, value: float, step: int | None = None) -> None:
+        r"""Add a counter value to the record.
+
+        Args:
+            value: The value of the cumulative counter.
+            step: The step of the counter value.
+
+        Raises:
+            ValueError: if ``step`` is ``None`` and the rate is
+                computed with respect to the step.
+        """
+        if self._get_time is not None:
+            position = self._get_time()
+        elif step is None:
+            msg = f"'{self.name}' record requires a step to compute the rate per step"
+            raise ValueError(msg)
+        else:
+            position = step
+        counter = self._counter
+        self._counter = value
+        self._total += value if counter is None or value < counter else value - counter
+        samples = self._samples
+        if samples and position <= samples[-1][0]:
+            samples.clear()
+        samples.append((position, self._total))
+        if len(samples) > 1:
+            last_position, last_total = samples[-2]
+            super().add_value((self._total - last_total) / (position - last_position), step)
+
+    def clone(self) -> RateRecord:
+        record = self.__class__(
+            name=self.name,
+            elements=self._record,
+            max_size=self.max_size,
+            best_value=self._best_value,
+            improved=self._improved,
+            comparator=self._comparator,
+            window=self.window,
+            clock=self.clock,
+            storage=self.storage,
+        )
+        record._copy_storage(self)
+        record._counter = self._counter
+        record._total = self._total
+        record._samples.extend(self._samples)
+        return record
+
+    def equal(self, other: Any) -> bool:
+        if self is other:
+            return True
+        if (
+            type(other) is not type(self)
+            or self._counter != other._counter
+            or self._total != other._total
+            or self._samples != other._samples
+            or self.window != other.window
+        ):
+            return False
+        return super().equal(other)
+
+    def get_fingerprint(self) -> int:
+        return append_fingerprint(
+            super().get_fingerprint(),
+            hash_object((self._counter, self._total, tuple(self._samples))),
+        )
+
+    def get_window_rate(self) -> float:
+        r"""Get the rate of the counter over the last ``window``
+        intervals.
+
+        Returns:
+            The windowed rate.
+
+        Raises:
+            EmptyRecordError: if the rate cannot be computed because
+                less than two counter values were added since the
+                last restart.
+
+        Example:
+            ```pycon
+            >>> from minrecord import RateRecord
+            >>> record = RateRecord("samples", window=2)
+            >>> record.update([(0, 0), (1, 10), (2, 30), (3, 60)])
+            >>> record.get_window_rate()
+            25.0
+
+            ```
+        """
+        if len(self._samples) < 2:
+            msg = f"'{self.name}' record does not have enough counter values to compute the rate"
+            raise EmptyRecordError(msg)
+        first_position, first_total = self._samples[0]
+        last_position, last_total = self._samples[-1]
+        return (last_total - first_total) / (last_position - first_position)
+
+    def config_dict(self) -> dict[str, Any]:
+        config = super().config_dict()
+        config["window"] = self.window
+        return config
+
+    def load_state_dict(self, state_dict: dict[str, Any]) -> None:
+        super().load_state_dict(state_dict)
+        self._counter = state_dict["counter"]
+        self._total = state_dict["total"]
+        self._samples.clear()
+        self._samples.extend(state_dict["samples"])
+
+    def _get_state_without_elements(self) -> dict[str, Any]:
+        state = super()._get_state_without_elements()
+        state.update(
+            {"counter": self._counter, "total": self._total, "samples": tuple(self._samples)}
+        )
+        return state
@@ -0,0 +1,178 @@
+r"""Contain a registry of the record classes that is used to
+instantiate records from their config without ``objectory``."""
+
+from __future__ import annotations
+
+__all__ = ["OBJECT_TARGET", "RecordFactory", "get_record_class", "register_record_class"]
+
+import importlib
+from abc import ABCMeta
+from typing import TYPE_CHECKING, Any
+
+from minrecord.utils.imports import check_objectory
+
+if TYPE_CHECKING:
+    from minrecord.base import BaseRecord
+
+OBJECT_TARGET = "_target_"
+
+_RECORD_CLASSES: dict[str, type[BaseRecord[Any]]] = {}
+
+# The modules that define the built-in record classes. ``minrecord``
+# imports them lazily, so they are imported before a name without
+# module is resolved.
+_BUILTIN_MODULES = (
+    "minrecord.comparable",
+    "minrecord.generic",
+    "minrecord.ndarray",
+    "minrecord.pareto",
+    "minrecord.rate",
+)
+
+
+class RecordFactory(ABCMeta):
+    r"""Implement a metaclass to instantiate a record class given its
+    name.
+
+    The name is resolved with the record class registry. ``objectory``
+    is used only if the registry cannot resolve the name.
+
+    Example:
+        ```pycon
+        >>> from minrecord import BaseRecord
+        >>> BaseRecord.factory("minrecord.Record", name="loss")
+        Record(name=loss, max_size=10, size=0)
+
+        ```
+    """
+
+    def factory(cls, _target_: str, *args: Any, **kwargs: Any) -> Any:
+        r"""Instantiate an object given its name and its arguments.
+
+        Args:
+            _target_: The name of the class to instantiate.
+            *args: The positional arguments of the constructor.
+            **kwargs: The keyword arguments of the constructor.
+
+        Returns:
+            The instantiated object.
+
+        Raises:
+            RuntimeError: if the name cannot be resolved by the
+                registry and ``objectory`` is not installed.
+        """
+        try:
+            target = get_record_class(_target_)
+        except ValueError:
+            check_objectory()
+            from objectory import factory  # noqa: PLC0415
+
+            return factory(_target_, *args, **kwargs)
+        return target(*args, **kwargs)
+
+
+def register_record_class(cls: type[BaseRecord[Any]], name: str | None = None) -> None:
+    r"""Register a record class.
+
+    The subclasses of ``BaseRecord`` are automatically registered with
+    their fully qualified name when they are defined, so this function
+    is only needed to register an alias.
+
+    Args:
+        cls: The record class to register.
+        name: The name used to register the class. If ``None``, the
+            fully qualified name of the class is used.
+
+    Example:
+        ```pycon
+        >>> from minrecord import Record
+        >>> from minrecord.registry import get_record_class, register_record_class
+        >>> register_record_class(Record, name="my_record")
+        >>> get_record_class("my_record")
+        <class 'minrecord.generic.Record'>
+
+        ```
+    """
+    if name is None:
+        name = f"{cls.__module__}.{cls.__qualname__}"
+    _RECORD_CLASSES[name] = cls
+
+
+def get_record_class(name: str) -> type[BaseRecord[Any]]:
+    r"""Get the record class associated to a name.
+
+    If the name is not registered, the class is imported and the
+    result is cached so the next calls do not import it again. A name
+    without module, for example ``"Record"``, is resolved if it matches
+    a single registered class. This result is not cached because a
+    class with the same name can be registered later.
+
+    Args:
+        name: The name of the record class, for example its fully
+            qualified name.
+
+    Returns:
+        The record class.
+
+    Raises:
+        ValueError: if the name cannot be resolved to a class.
+
+    Example:
+        ```pycon
+        >>> from minrecord.registry import get_record_class
+        >>> get_record_class("minrecord.comparable.MinScalarRecord")
+        <class 'minrecord.comparable.MinScalarRecord'>
+        >>> get_record_class("minrecord.Record")
+        <class 'minrecord.generic.Record'>
+
+        ```
+    """
+    cls = _RECORD_CLASSES.get(name)
+    if cls is not None:
+        return cls
+    if "." not in name:
+        return _find_class(name)
+    cls = _RECORD_CLASSES[name] = _import_class(name)
+    return cls
+
+
+def _find_class(name: str) -> type[BaseRecord[Any]]:
+    r"""Find a registered class given its name without module.
+
+    Args:
+        name: The name of the class.
+
+    Returns:
+        The class.
+
+    Raises:
+        ValueError: if no class or several classes match the name.
+    """
+    for module in _BUILTIN_MODULES:
+        importlib.import_module(module)
+    matches = {cls for cls in _RECORD_CLASSES.values() if cls.__name__ == name}
+    if len(matches) != 1:
+        msg = f"Unable to find the record class '{name}' ({len(matches)} matching classes)"
+        raise ValueError(msg)
+    return matches.pop()
+
+
+def _import_class(name: str) -> type[BaseRecord[Any]]:
+    r"""Import a class given its fully qualified name.
+
+    Args:
+        name: The fully qualified name of the class.
+
+    Returns:
+        The class.
+
+    Raises:
+        ValueError: if the name cannot be resolved to a class.
+    """
+    module_name, _, class_name = name.rpartition(".")
+    try:
+        cls = getattr(importlib.import_module(module_name), class_name)
+    except (AttributeError, ImportError, ValueError) as exc:
+        msg = f"Unable to find the record class '{name}'"
+        raise ValueError(msg) from exc
+    return cls
@@ -0,0 +1,132 @@
+r"""Contain the rules used to create the records of unknown keys."""
+
+from __future__ import annotations
+
+__all__ = ["RecordRule", "find_rule"]
+
+from typing import TYPE_CHECKING, Any
+
+from minrecord.generic import Record
+from minrecord.utils.pattern import compile_pattern
+
+if TYPE_CHECKING:
+    import re
+    from collections.abc import Iterable
+
+    from minrecord.base import BaseRecord
+    from minrecord.comparator import BaseComparator
+
+
+class RecordRule:
+    r"""Implement a rule to create the record of a key that matches a
+    pattern.
+
+    Args:
+        pattern: The glob pattern, for example ``"*/loss"``, or the
+            compiled regular expression. The whole key must match
+            the pattern. ``*`` also matches ``/`` in a glob pattern.
+        record_cls: The class of the record to create.
+        comparator: The comparator of the record. If ``None``, it is
+            not passed to the record class.
+        max_size: The maximum size of the record. If ``None``, the
+            default maximum size of the record class is used.
+        **kwargs: Additional keyword arguments passed to the record
+            class.
+
+    Example:
+        ```pycon
+        >>> from minrecord import ComparableRecord, MinScalarRecord
+        >>> from minrecord.comparator import MaxScalarComparator
+        >>> from minrecord.rule import RecordRule
+        >>> rule = RecordRule("*/loss", MinScalarRecord, max_size=100)
+        >>> rule
+        RecordRule(pattern='*/loss', record_cls=MinScalarRecord, kwargs={'max_size': 100})
+        >>> rule.match("train/loss")
+        True
+        >>> rule.create("train/loss")
+        MinScalarRecord(name=train/loss, max_size=100, size=0)
+        >>> rule = RecordRule("*/acc", ComparableRecord, comparator=MaxScalarComparator())
+        >>> rule.create("val/acc").is_comparable()
+        True
+
+        ```
+    """
+
+    def __init__(
+        self,
+        pattern: str | re.Pattern[str],
+        record_cls: type[BaseRecord[Any]] = Record,
+        comparator: BaseComparator[Any] | None = None,
+        max_size: int | None = None,
+        **kwargs: Any,
+    ) -> None:
+        self._pattern = pattern
+        self._match = compile_pattern(pattern).fullmatch
+        self._record_cls = record_cls
+        if comparator is not None:
+            kwargs["comparator"] = comparator
+        if max_size is not None:
+            kwargs["max_size"] = max_size
+        self._kwargs = kwargs
+
+    def __repr__(self) -> str:
+        return (
+            f"{self.__class__.__qualname__}(pattern={self._pattern!r}, "
+            f"record_cls={self._record_cls.__qualname__}, kwargs={self._kwargs})"
+        )
+
+    @property
+    def pattern(self) -> str | re.Pattern[str]:
+        r"""The pattern of the keys."""
+        return self._pattern
+
+    def create(self, key: str) -> BaseRecord[Any]:
+        r"""Create the record of a key.
+
+        Args:
+            key: The key, which is used as the name of the record.
+
+        Returns:
+            The created record.
+        """
+        return self._record_cls(name=key, **self._kwargs)
+
+    def match(self, key: str) -> bool:
+        r"""Indicate if the rule applies to a key.
+
+        Args:
+            key: The key to check.
+
+        Returns:
+            ``True`` if the key matches the pattern of the rule,
+                otherwise ``False``.
+        """
+        return self._match(key) is not None
+
+
+def find_rule(rules: Iterable[RecordRule], key: str) -> RecordRule | None:
+    r"""Find the first rule that applies to a key.
+
+    Args:
+        rules: The rules, in priority order.
+        key: The key.
+
+    Returns:
+        The first rule that applies to the key, or ``None`` if no rule
+            applies.
+
+    Example:
+        ```pycon
+        >>> from minrecord import MaxScalarRecord, MinScalarRecord
+        >>> from minrecord.rule import RecordRule, find_rule
+        >>> rules = [RecordRule("*loss", MinScalarRecord), RecordRule("*", MaxScalarRecord)]
+        >>> find_rule(rules, "val/acc")
+        RecordRule(pattern='*', record_cls=MaxScalarRecord, kwargs={})
+        >>> find_rule(rules[:1], "val/acc")
+
+        ```
+    """
+    for rule in rules:
+        if rule.match(key):
+            return rule
+    return None
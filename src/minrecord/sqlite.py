@@ -0,0 +1,787 @@
+r"""Contain a record manager that persists the full history of the
+records in a SQLite database."""
+
+from __future__ import annotations
+
+__all__ = ["SQLiteRecordManager"]
+
+import hashlib
+import io
+import logging
+import pickle
+import sqlite3
+from typing import TYPE_CHECKING, Any
+
+from minrecord.comparator import MaxScalarComparator, MinScalarComparator
+from minrecord.manager import RecordManager
+
+if TYPE_CHECKING:
+    import re
+    import sys
+    from collections.abc import Collection, Iterable
+    from pathlib import Path
+    from types import TracebackType
+
+    from minrecord.base import BaseRecord
+    from minrecord.rule import RecordRule
+
+    if sys.version_info >= (3, 11):
+        from typing import Self
+    else:
+        from typing_extensions import Self
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+_MEMORY = ":memory:"
+
+# The best, last, step and value columns have no declared type so
+# SQLite keeps the Python int/float/str/bytes values as they are. The
+# last_encoded column is NULL if the record is empty, and the record
+# column is NULL until the record is written by flush, close or an
+# eviction.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    key TEXT PRIMARY KEY,
+    mode TEXT,
+    best,
+    last,
+    last_encoded INTEGER,
+    comparable INTEGER NOT NULL,
+    record BLOB
+);
+CREATE TABLE IF NOT EXISTS elements (
+    id INTEGER PRIMARY KEY,
+    key TEXT NOT NULL,
+    step,
+    value,
+    encoded INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS elements_key_step ON elements (key, step);
+"""
+
+_NATIVE_TYPES = (int, float, str, bytes)
+
+# The comparators of the records whose best value is computed with a
+# SQL aggregate, indexed by mode.
+_COMPARATORS = {"min": MinScalarComparator(), "max": MaxScalarComparator()}
+
+# The largest character, used to find the upper bound of the keys
+# in a namespace.
+_MAX_CHAR = chr(0x10FFFF)
+
+# The globals that can be unpickled from an untrusted database.
+_SAFE_GLOBALS = {("builtins", name) for name in ("bytearray", "complex", "frozenset", "set")}
+
+
+class SQLiteRecordManager(RecordManager):
+    r"""Implement a record manager that stores the full history of the
+    records in a SQLite database.
+
+    The records kept in memory act as a hot cache: they keep only the
+    most recent values, while every value added with ``add_value`` or
+    ``update`` is also appended to the database. The writes are
+    buffered and inserted in batches inside a transaction, and the
+    database uses the WAL journal mode. The best values are computed
+    with SQL aggregates and the last values are stored with the
+    records, so it is possible to query a database without loading
+    the records. The non-native values, for example
+    NaN which SQLite stores as ``NULL``, are pickled.
+
+    Note that the values added directly to a record, without going
+    through the manager, are not written to the database.
+
+    The records themselves are pickled only by ``flush``, ``close``
+    and the evictions, because pickling all the values of a record
+    after each batch would be slow. If the process stops without
+    closing the manager, the history is kept but the records are
+    created again the next time they are accessed.
+
+    Over the memory budget, the records are evicted to the database
+    and they are loaded from the database when they are accessed.
+
+    Args:
+        path: The path to the SQLite database. The database is created
+            if it does not exist. ``":memory:"`` creates an in-memory
+            database.
+        batch_size: The number of values to buffer before writing them
+            to the database.
+        rules: The rules used to create the records of the unknown
+            keys, in priority order.
+        memory_budget: The approximate number of bytes that the
+            records in memory can use. See ``RecordManager`` for more
+            information.
+        min_size: The minimum maximum size of the records whose
+            maximum size is halved to fit in the memory budget.
+        trusted: If ``True``, the pickled records and values of the
+            database are loaded. Unpickling can execute arbitrary
+            code, so it should be set to ``True`` only for the
+            databases from trusted sources. If ``False``, only the
+            records pickled by this manager and the values made of
+            built-in types, for example NaN, are loaded.
+
+    Raises:
+        ValueError: if ``batch_size``, ``memory_budget`` or
+            ``min_size`` is not a positive integer.
+
+    Example:
+        ```pycon
+        >>> from minrecord import MinScalarRecord
+        >>> from minrecord.sqlite import SQLiteRecordManager
+        >>> manager = SQLiteRecordManager(":memory:")
+        >>> manager.add_record(MinScalarRecord("loss", max_size=2))
+        >>> manager.update("loss", [(0, 3.0), (1, 1.0), (2, 2.0)])
+        >>> manager.get_record("loss").get_most_recent()
+        ((1, 1.0), (2, 2.0))
+        >>> manager.get_history("loss")
+        ((0, 3.0), (1, 1.0), (2, 2.0))
+        >>> manager.get_best_values()
+        {'loss': 1.0}
+        >>> manager.close()
+
+        ```
+    """
+
+    def __init__(
+        self,
+        path: Path | str = _MEMORY,
+        batch_size: int = 1000,
+        rules: Iterable[RecordRule] = (),
+        *,
+        memory_budget: int | None = None,
+        min_size: int = 10,
+        trusted: bool = False,
+    ) -> None:
+        super().__init__(rules=rules, memory_budget=memory_budget, min_size=min_size)
+        if batch_size <= 0:
+            msg = f"batch_size must be greater than 0 (received: {batch_size})"
+            raise ValueError(msg)
+        self._path = str(path)
+        self._batch_size = batch_size
+        self._connection = sqlite3.connect(self._path)
+        if self._path != _MEMORY:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(_SCHEMA)
+        self._pending: list[tuple[str, Any, Any, int]] = []
+        # The keys of the records whose best and last values changed.
+        self._dirty: set[str] = set()
+        # The keys of the records that changed since they were pickled.
+        self._unsaved: set[str] = set()
+        self._stored_keys: set[str] = {
+            key for (key,) in self._connection.execute("SELECT key FROM records")
+        }
+        # The keys of the records evicted to the database.
+        self._evicted_keys: set[str] = set()
+        self._trusted = trusted
+        # The digests of the records pickled by this manager, which
+        # can be loaded even if the database is not trusted.
+        self._digests: dict[str, bytes] = {}
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._get_keys())
+
+    @property
+    def path(self) -> str:
+        r"""The path to the SQLite database."""
+        return self._path
+
+    def add_record(
+        self, record: BaseRecord[Any], key: str | None = None, exist_ok: bool = False
+    ) -> None:
+        r"""Add a record to the manager.
+
+        The values already in the record are written to the database.
+        If a record is overwritten, its history is deleted from the
+        database.
+
+        Args:
+            record: The record to add to the manager.
+            key: The key to store the record. If ``None``, the name
+                of the record is used.
+            exist_ok: If ``False``, ``RuntimeError`` is raised if the
+                key already exists. This parameter should be set
+                to ``True`` to overwrite the record for this key.
+
+        Raises:
+            RuntimeError: if a record is already registered for the
+                key and ``exist_ok=False``.
+
+        Example:
+            ```pycon
+            >>> from minrecord import MinScalarRecord
+            >>> from minrecord.sqlite import SQLiteRecordManager
+            >>> manager = SQLiteRecordManager()
+            >>> manager.add_record(MinScalarRecord.from_elements("loss", [(0, 2.0)]))
+            >>> manager.get_history("loss")
+            ((0, 2.0),)
+            >>> manager.close()
+
+            ```
+        """
+        if key is None:
+            key = record.name
+        overwrite = self.has_record(key)
+        super().add_record(record, key=key, exist_ok=exist_ok)
+        if overwrite:
+            self._write_pending()
+            with self._connection:
+                self._connection.execute("DELETE FROM elements WHERE key = ?", (key,))
+        self._mark_modified(key)
+        self._append_elements(key, record.iter_most_recent())
+
+    def add_value(self, key: str, value: Any, step: float | None = None) -> None:
+        r"""Add a value to a record and write it to the database.
+
+        Args:
+            key: The key of the record. A ``Record`` is created if
+                the key does not exist.
+            value: The value to add to the record.
+            step: The step value to record. ``None`` means there is no
+                step to track.
+
+        Example:
+            ```pycon
+            >>> from minrecord.sqlite import SQLiteRecordManager
+            >>> manager = SQLiteRecordManager()
+            >>> manager.add_value("loss", 2.0, step=0)
+            >>> manager.get_last_values()
+            {'loss': 2.0}
+            >>> manager.close()
+
+            ```
+        """
+        self.get_record(key).add_value(value, step)
+        self._mark_modified(key)
+        self._append_elements(key, ((step, value),))
+
+    def update(self, key: str, elements: Iterable[tuple[float | None, Any]]) -> None:
+        r"""Add the elements to a record and write them to the
+        database.
+
+        Args:
+            key: The key of the record. A ``Record`` is created if
+                the key does not exist.
+            elements: The elements to add to the record. Each tuple
+                has the following structure ``(step, value)``.
+
+        Example:
+            ```pycon
+            >>> from minrecord.sqlite import SQLiteRecordManager
+            >>> manager = SQLiteRecordManager()
+            >>> manager.update("loss", [(0, 2.0), (1, 1.5)])
+            >>> manager.get_last_values()
+            {'loss': 1.5}
+            >>> manager.close()
+
+            ```
+        """
+        elements = tuple(elements)
+        self.get_record(key).update(elements)
+        self._mark_modified(key)
+        self._append_elements(key, elements)
+
+    def close(self) -> None:
+        r"""Write the buffered values to the database and close the
+        connection.
+
+        Example:
+            ```pycon
+            >>> from minrecord.sqlite import SQLiteRecordManager
+            >>> manager = SQLiteRecordManager()
+            >>> manager.close()
+
+            ```
+        """
+        self.flush()
+        self._connection.close()
+
+    def flush(self) -> None:
+        r"""Write the buffered values and the records that changed
+        since they were last written to the database.
+
+        Example:
+            ```pycon
+            >>> from minrecord.sqlite import SQLiteRecordManager
+            >>> manager = SQLiteRecordManager()
+            >>> manager.add_value("loss", 2.0, step=0)
+            >>> manager.flush()
+            >>> manager.close()
+
+            ```
+        """
+        self._write_pending()
+        if not self._unsaved:
+            return
+        rows = []
+        for key in self._unsaved:
+            data = _dump_record(key, self._records[key])
+            if data is None:
+                # The history of the record is still written.
+                logger.warning(f"The record '{key}' cannot be pickled, so it is not written")
+            else:
+                rows.append((data, key))
+                self._digests[key] = hashlib.sha256(data).digest()
+        with self._connection:
+            self._connection.executemany("UPDATE records SET record = ? WHERE key = ?", rows)
+        logger.debug(f"Wrote {len(rows):,} records")
+        self._unsaved.clear()
+
+    def get_best_values(
+        self,
+        prefix: str = "",
+        suffix: str = "",
+        namespace: str | None = None,
+        pattern: str | re.Pattern[str] | None = None,
+    ) -> dict[str, Any]:
+        r"""Get the best value of each metric.
+
+        The best values of the ``MinScalarComparator`` and
+        ``MaxScalarComparator`` based records are computed with a SQL
+        aggregate over the full history, merged with the best value of
+        the record, which can be better than the history if the state
+        of the record was loaded. The other comparable records use
+        their in-memory best value.
+
+        Args:
+            prefix: The prefix used to create the dict of best values.
+            suffix: The suffix used to create the dict of best values.
+            namespace: If not ``None``, only the metrics whose key
+                starts with this namespace are used.
+            pattern: If not ``None``, only the metrics whose key
+                matches this glob pattern or regular expression are
+                used.
+
+        Returns:
+            The dict with the best value of each metric.
+
+        Example:
+            ```pycon
+            >>> from minrecord import MaxScalarRecord
+            >>> from minrecord.sqlite import SQLiteRecordManager
+            >>> manager = SQLiteRecordManager()
+            >>> manager.add_record(MaxScalarRecord("accuracy"))
+            >>> manager.update("accuracy", [(0, 42.0), (1, 35.0)])
+            >>> manager.get_best_values(prefix="best/")
+            {'best/accuracy': 42.0}
+            >>> manager.close()
+
+            ```
+        """
+        self._materialize_all(namespace)
+        self._write_pending()
+        condition, parameters = _get_namespace_condition(namespace)
+        selected = None if pattern is None else set(self._get_pattern_keys(pattern))
+        values = {}
+        rows = self._connection.execute(
+            "SELECT r.key, r.mode, r.best, CASE r.mode WHEN 'min' THEN MIN(e.value) "  # noqa: S608
+            "WHEN 'max' THEN MAX(e.value) END "
+            "FROM records AS r LEFT JOIN elements AS e ON e.key = r.key AND e.encoded = 0 "
+            f"WHERE r.comparable = 1 AND {condition} GROUP BY r.key ORDER BY r.rowid",
+            parameters,
+        )
+        for key, mode, best, value in rows.fetchall():
+            if selected is not None and key not in selected:
+                continue
+            if mode is None or (value is None and best is None):
+                # The best value cannot be computed from the database.
+                record = self.get_record(key)
+                if record.is_empty():
+                    continue
+                value = record.get_best_value()  # noqa: PLW2901
+            elif best is not None and (
+                value is None or _COMPARATORS[mode].is_better(old_value=value, new_value=best)
+            ):
+                value = best  # noqa: PLW2901
+            values[f"{prefix}{key}{suffix}"] = value
+        return values
+
+    def get_fingerprint(self) -> int:
+        self._load_stored_records()
+        return super().get_fingerprint()
+
+    def get_history(self, key: str) -> tuple[tuple[Any, Any], ...]:
+        r"""Get all the elements of a record stored in the database.
+
+        Args:
+            key: The key of the record.
+
+        Returns:
+            The elements ``(step, value)`` in the order they were
+                added.
+
+        Example:
+            ```pycon
+            >>> from minrecord.sqlite import SQLiteRecordManager
+            >>> manager = SQLiteRecordManager()
+            >>> manager.update("loss", [(0, 2.0), (1, 1.5)])
+            >>> manager.get_history("loss")
+            ((0, 2.0), (1, 1.5))
+            >>> manager.close()
+
+            ```
+        """
+        self._write_pending()
+        rows = self._connection.execute(
+            "SELECT step, value, encoded FROM elements WHERE key = ? ORDER BY id", (key,)
+        )
+        return tuple(
+            (step, _decode_value(value, encoded, self._trusted)) for step, value, encoded in rows
+        )
+
+    def get_last_values(
+        self,
+        prefix: str = "",
+        suffix: str = "",
+        namespace: str | None = None,
+        pattern: str | re.Pattern[str] | None = None,
+    ) -> dict[str, Any]:
+        r"""Get the last value of each metric.
+
+        The records in memory use their last value, which can differ
+        from the history if the state of the record was loaded. The
+        last values of the other records are read from the database
+        without loading the records.
+
+        Args:
+            prefix: The prefix used to create the dict of last values.
+            suffix: The suffix used to create the dict of last values.
+            namespace: If not ``None``, only the metrics whose key
+                starts with this namespace are used.
+            pattern: If not ``None``, only the metrics whose key
+                matches this glob pattern or regular expression are
+                used.
+
+        Returns:
+            The dict with the last value of each metric.
+
+        Example:
+            ```pycon
+            >>> from minrecord.sqlite import SQLiteRecordManager
+            >>> manager = SQLiteRecordManager()
+            >>> manager.update("loss", [(0, 2.0), (1, 1.5)])
+            >>> manager.get_last_values(suffix="/last")
+            {'loss/last': 1.5}
+            >>> manager.close()
+
+            ```
+        """
+        self._materialize_all(namespace)
+        self._write_pending()
+        condition, parameters = _get_namespace_condition(namespace)
+        selected = None if pattern is None else set(self._get_pattern_keys(pattern))
+        rows = self._connection.execute(
+            "SELECT r.key, r.last, r.last_encoded FROM records AS r "  # noqa: S608
+            f"WHERE {condition} ORDER BY r.rowid",
+            parameters,
+        )
+        last_values = {}
+        for key, last, encoded in rows.fetchall():
+            if selected is not None and key not in selected:
+                continue
+            record = self._records.get(key)
+            if record is not None:
+                if not record.is_empty():
+                    last_values[f"{prefix}{key}{suffix}"] = record.get_last_value()
+            elif encoded is not None:
+                last_values[f"{prefix}{key}{suffix}"] = _decode_value(last, encoded, self._trusted)
+        return last_values
+
+    def get_record(self, key: str) -> BaseRecord[Any]:
+        if key not in self._records:
+            data = None
+            if key in self._stored_keys:
+                (data,) = self._connection.execute(
+                    "SELECT record FROM records WHERE key = ?", (key,)
+                ).fetchone()
+            if data is not None:
+                self._records[key] = self._load_record(key, data)
+                if key in self._evicted_keys:
+                    self._evicted_keys.discard(key)
+                    self._memory_stats["reloaded"] += 1
+            else:
+                # The record is new, or it was not written before the
+                # process stopped, so it is created.
+                self._mark_modified(key)
+        return super().get_record(key)
+
+    def get_records(
+        self, namespace: str | None = None, pattern: str | re.Pattern[str] | None = None
+    ) -> dict[str, BaseRecord[Any]]:
+        if namespace is None and pattern is None:
+            self._load_stored_records()
+        return super().get_records(namespace, pattern)
+
+    def has_record(self, key: str) -> bool:
+        return super().has_record(key) or key in self._stored_keys
+
+    def load_state_dict(self, state_dict: dict[str, Any], lazy: bool = False) -> None:
+        r"""Load the state values from a dict.
+
+        Only the in-memory records are updated. The history stored in
+        the database is not modified.
+
+        Args:
+            state_dict: A dict with the new state values.
+            lazy: If ``True``, the records that are not in the manager
+                or in the database are created the first time they are
+                accessed.
+        """
+        for key in self._stored_keys.intersection(state_dict):
+            self.get_record(key)
+        super().load_state_dict(state_dict, lazy=lazy)
+        for key in self._records.keys() & state_dict.keys():
+            self._mark_modified(key)
+
+    def state_dict(self) -> dict[str, Any]:
+        self._load_stored_records()
+        return super().state_dict()
+
+    def _evict_record(self, key: str) -> bool:
+        r"""Evict a record to the database.
+
+        Args:
+            key: The key of the record to evict.
+
+        Returns:
+            ``True`` if the record was evicted, or ``False`` if it
+                cannot be pickled, for example because its comparator
+                uses a lambda.
+        """
+        data = _dump_record(key, self._records[key])
+        if data is None:
+            logger.debug(f"The record '{key}' cannot be pickled, so it is not evicted")
+            return False
+        self._dirty.add(key)
+        self._write_pending()
+        with self._connection:
+            self._connection.execute("UPDATE records SET record = ? WHERE key = ?", (data, key))
+        self._digests[key] = hashlib.sha256(data).digest()
+        self._unsaved.discard(key)
+        del self._records[key]
+        self._recency.pop(key, None)
+        self._evicted_keys.add(key)
+        return True
+
+    def _get_keys(self) -> Collection[str]:
+        return self._stored_keys.union(self._records, self._lazy_states)
+
+    def _load_stored_records(self) -> None:
+        r"""Load the records stored in the database that are not in
+        memory."""
+        with self._pause_memory_budget():
+            for key in self._stored_keys.difference(self._records):
+                self.get_record(key)
+
+    def _append_elements(self, key: str, elements: Iterable[tuple[Any, Any]]) -> None:
+        r"""Buffer some elements and write them to the database if the
+        buffer is full.
+
+        Args:
+            key: The key of the record.
+            elements: The elements to write.
+        """
+        self._pending.extend((key, step, *_encode_value(value)) for step, value in elements)
+        if len(self._pending) >= self._batch_size:
+            self._write_pending()
+
+    def _load_record(self, key: str, data: bytes) -> BaseRecord[Any]:
+        r"""Unpickle a record of the database.
+
+        Args:
+            key: The key of the record.
+            data: The pickled record.
+
+        Returns:
+            The record.
+
+        Raises:
+            ValueError: if the record was not pickled by this manager
+                and the database is not trusted.
+        """
+        if not self._trusted and self._digests.get(key) != hashlib.sha256(data).digest():
+            msg = (
+                f"The record '{key}' is pickled in the database, which can execute arbitrary "
+                "code when it is loaded. Use trusted=True to load it if the database is from "
+                "a trusted source"
+            )
+            raise ValueError(msg)
+        return pickle.loads(data)  # noqa: S301
+
+    def _mark_modified(self, key: str) -> None:
+        r"""Mark a record as modified, so its best and last values and
+        the record are written to the database.
+
+        Args:
+            key: The key of the record.
+        """
+        self._dirty.add(key)
+        self._unsaved.add(key)
+
+    def _write_pending(self) -> None:
+        r"""Write the buffered values and the best and last values of
+        the modified records to the database in a single transaction.
+
+        The records are not pickled, see ``flush``.
+        """
+        if not self._pending and not self._dirty:
+            return
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO elements (key, step, value, encoded) VALUES (?, ?, ?, ?)",
+                self._pending,
+            )
+            self._connection.executemany(
+                "INSERT INTO records (key, mode, best, last, last_encoded, comparable) "
+                "VALUES (?, ?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET mode = excluded.mode, best = excluded.best, "
+                "last = excluded.last, last_encoded = excluded.last_encoded, "
+                "comparable = excluded.comparable",
+                [self._encode_record(key, self._records[key]) for key in self._dirty],
+            )
+        logger.debug(f"Wrote {len(self._pending):,} values and {len(self._dirty):,} records")
+        self._stored_keys.update(self._dirty)
+        self._pending.clear()
+        self._dirty.clear()
+
+    @staticmethod
+    def _encode_record(
+        key: str, record: BaseRecord[Any]
+    ) -> tuple[str, str | None, Any, Any, int | None, int]:
+        r"""Encode a record to a row of the ``records`` table, without
+        the pickled record.
+
+        The best value is stored only for the records whose best value
+        is computed with a SQL aggregate. The last value is stored so
+        it can be read without loading the record.
+
+        Args:
+            key: The key of the record.
+            record: The record to encode.
+
+        Returns:
+            The row of the ``records`` table.
+        """
+        comparator = getattr(record, "_comparator", None)
+        mode = None
+        if isinstance(comparator, MinScalarComparator):
+            mode = "min"
+        elif isinstance(comparator, MaxScalarComparator):
+            mode = "max"
+        best = None
+        if mode is not None and not record.is_empty():
+            best, encoded = _encode_value(record.get_best_value())
+            if encoded:
+                best = None
+        last, last_encoded = None, None
+        if not record.is_empty():
+            last, last_encoded = _encode_value(record.get_last_value())
+        return key, mode, best, last, last_encoded, int(record.is_comparable())
+
+
+def _get_namespace_condition(namespace: str | None) -> tuple[str, tuple[str, ...]]:
+    r"""Get the SQL condition to select the records in a namespace.
+
+    The condition is a range on the primary key of the records, so
+    the records are found with the index of the keys.
+
+    Args:
+        namespace: The namespace. ``None`` means all the records.
+
+    Returns:
+        The SQL condition and its parameters.
+    """
+    if namespace is None:
+        return "1", ()
+    return "r.key >= ? AND r.key < ?", (namespace, namespace + _MAX_CHAR)
+
+
+def _dump_record(key: str, record: BaseRecord[Any]) -> bytes | None:
+    r"""Pickle a record.
+
+    Args:
+        key: The key of the record.
+        record: The record to pickle.
+
+    Returns:
+        The pickled record, or ``None`` if the record cannot be
+            pickled, for example because its comparator uses a
+            lambda.
+    """
+    try:
+        return pickle.dumps(record)
+    except (AttributeError, TypeError, pickle.PicklingError) as exc:
+        logger.debug(f"Cannot pickle the record '{key}': {exc}")
+        return None
+
+
+def _encode_value(value: Any) -> tuple[Any, int]:
+    r"""Encode a value so it can be stored in the database.
+
+    The ``int``, ``float``, ``str``, ``bytes`` and ``None`` values are
+    stored natively, except NaN because SQLite stores it as ``NULL``.
+    The other values are pickled.
+
+    Args:
+        value: The value to encode.
+
+    Returns:
+        A tuple with the stored value and a flag which indicates if
+            the value was pickled.
+    """
+    # NaN is the only native value that is not equal to itself.
+    if value is None or (type(value) in _NATIVE_TYPES and value == value):  # noqa: PLR0124
+        return value, 0
+    return pickle.dumps(value), 1
+
+
+def _decode_value(value: Any, encoded: int, trusted: bool = False) -> Any:
+    r"""Decode a value stored in the database.
+
+    Args:
+        value: The stored value.
+        encoded: Indicate if the value was pickled.
+        trusted: If ``True``, any pickled value is loaded, otherwise
+            only the values made of built-in types are loaded.
+
+    Returns:
+        The decoded value.
+
+    Raises:
+        ValueError: if the value is not made of built-in types and
+            ``trusted=False``.
+    """
+    if not encoded:
+        return value
+    if trusted:
+        return pickle.loads(value)  # noqa: S301
+    try:
+        return _RestrictedUnpickler(io.BytesIO(value)).load()
+    except pickle.UnpicklingError as exc:
+        msg = (
+            "The database has a pickled value that is not made of built-in types, which can "
+            "execute arbitrary code when it is loaded. Use trusted=True to load it if the "
+            "database is from a trusted source"
+        )
+        raise ValueError(msg) from exc
+
+
+class _RestrictedUnpickler(pickle.Unpickler):
+    r"""Implement an unpickler that only loads the values made of
+    built-in types, so it cannot execute arbitrary code."""
+
+    def find_class(self, module: str, name: str) -> Any:
+        if (module, name) in _SAFE_GLOBALS:
+            return super().find_class(module, name)
+        msg = f"The global '{module}.{name}' is not allowed"
+        raise pickle.UnpicklingError(msg)
@@ -2,15 +2,38 @@ r"""Define some PyTest fixtures."""
 
 from __future__ import annotations
 
-__all__ = ["objectory_available", "objectory_not_available"]
+__all__ = [
+    "numpy_available",
+    "numpy_not_available",
+    "objectory_available",
+    "objectory_not_available",
+    "pyarrow_available",
+    "pyarrow_not_available",
+]
 
 import pytest
 
-from minrecord.utils.imports import is_objectory_available
+from minrecord.utils.imports import (
+    is_numpy_available,
+    is_objectory_available,
+    is_pyarrow_available,
+)
 
+numpy_available: pytest.MarkDecorator = pytest.mark.skipif(
+    not is_numpy_available(), reason="Require numpy"
+)
+numpy_not_available: pytest.MarkDecorator = pytest.mark.skipif(
+    is_numpy_available(), reason="Skip because numpy is available"
+)
 objectory_available: pytest.MarkDecorator = pytest.mark.skipif(
     not is_objectory_available(), reason="Require objectory"
 )
 objectory_not_available: pytest.MarkDecorator = pytest.mark.skipif(
     is_objectory_available(), reason="Skip because objectory is available"
 )
+pyarrow_available: pytest.MarkDecorator = pytest.mark.skipif(
+    not is_pyarrow_available(), reason="Require pyarrow"
+)
+pyarrow_not_available: pytest.MarkDecorator = pytest.mark.skipif(
+    is_pyarrow_available(), reason="Skip because pyarrow is available"
+)
@@ -0,0 +1,202 @@
+r"""Contain utility functions to compute content fingerprints.
+
+The fingerprints are integers in ``[0, MODULUS)``. They are
+deterministic across processes (they do not depend on
+``PYTHONHASHSEED``), so they can be stored in a checkpoint and
+compared later.
+
+The fingerprint of a sequence of elements is a polynomial rolling
+hash, so it can be updated in ``O(1)`` per element appended to the
+sequence, and per element evicted from a bounded sequence:
+
+    ``fingerprint = sum(hash_element(e_i) * BASE ** (n - 1 - i)) % MODULUS``
+
+The records compute their fingerprint when it is requested, then
+they update it from the elements added since, so adding a value does
+not hash it.
+"""
+
+from __future__ import annotations
+
+__all__ = [
+    "BASE",
+    "MODULUS",
+    "append_fingerprint",
+    "combine_fingerprints",
+    "hash_element",
+    "hash_object",
+]
+
+from functools import lru_cache
+from typing import Any
+
+# A Mersenne prime, which is also the modulus of the numeric hashes
+# in CPython.
+MODULUS = (1 << 61) - 1
+BASE = 1_099_511_628_211
+
+_NONE_HASH = 0x2F6A1B4C5D3E
+_NAN_HASH = 0x7F8000000001
+_NUMERIC_TYPES = {bool, float, int}
+
+
+def hash_object(obj: Any) -> int:
+    r"""Compute a deterministic hash of an object.
+
+    The numbers are hashed with the numeric hash of CPython, which
+    does not depend on the process, so numbers that are equal have
+    the same hash, for example ``1`` and ``1.0``. The other objects
+    are hashed with BLAKE2 from their pickled representation, or from
+    their ``repr`` if they cannot be pickled.
+
+    Args:
+        obj: The object to hash.
+
+    Returns:
+        The hash of the object, in ``[0, MODULUS)``.
+
+    Example:
+        ```pycon
+        >>> from minrecord.utils.fingerprint import hash_object
+        >>> hash_object("abc") == hash_object("abc")
+        True
+        >>> hash_object(1) == hash_object(2)
+        False
+
+        ```
+    """
+    if obj is None:
+        return _NONE_HASH
+    if type(obj) in _NUMERIC_TYPES:
+        # The hash of NaN depends on the object identity.
+        return hash(obj) % MODULUS if obj == obj else _NAN_HASH  # noqa: PLR0124
+    import hashlib  # noqa: PLC0415
+    import pickle  # noqa: PLC0415
+
+    if type(obj) is str:
+        data = obj.encode()
+    else:
+        try:
+            data = pickle.dumps(obj, protocol=4)
+        except Exception:  # noqa: BLE001
+            data = repr(obj).encode()
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), "little") % MODULUS
+
+
+def hash_element(element: tuple[Any, Any]) -> int:
+    r"""Compute a deterministic hash of a ``(step, value)`` element.
+
+    The elements with numeric steps and values are hashed with the
+    tuple hash of CPython because this function is called every time
+    a value is added to a record.
+
+    Args:
+        element: The element to hash.
+
+    Returns:
+        The hash of the element. It can be negative or greater than
+            ``MODULUS``.
+
+    Example:
+        ```pycon
+        >>> from minrecord.utils.fingerprint import hash_element
+        >>> hash_element((0, 1.0)) == hash_element((0, 1.0))
+        True
+        >>> hash_element((0, 1.0)) == hash_element((1.0, 0))
+        False
+
+        ```
+    """
+    step, value = element
+    if type(value) in _NUMERIC_TYPES and value == value:  # noqa: PLR0124
+        if type(step) in _NUMERIC_TYPES:
+            return hash(element)
+        if step is None:
+            return hash((_NONE_HASH, value))
+    return hash_object(step) * BASE + hash_object(value)
+
+
+def append_fingerprint(fingerprint: int, element_hash: int) -> int:
+    r"""Update the fingerprint of a sequence when an element is
+    appended.
+
+    Args:
+        fingerprint: The fingerprint of the sequence.
+        element_hash: The hash of the appended element.
+
+    Returns:
+        The fingerprint of the updated sequence.
+
+    Example:
+        ```pycon
+        >>> from minrecord.utils.fingerprint import append_fingerprint
+        >>> append_fingerprint(append_fingerprint(0, 1), 2)
+        1099511628213
+
+        ```
+    """
+    return (fingerprint * BASE + element_hash) % MODULUS
+
+
+def combine_fingerprints(fingerprints: dict[str, int]) -> int:
+    r"""Combine the fingerprints associated to some keys.
+
+    The result does not depend on the order of the keys.
+
+    Args:
+        fingerprints: The fingerprints and their associated keys.
+
+    Returns:
+        The combined fingerprint, in ``[0, MODULUS)``.
+
+    Example:
+        ```pycon
+        >>> from minrecord.utils.fingerprint import combine_fingerprints
+        >>> combine_fingerprints({"a": 1, "b": 2}) == combine_fingerprints({"b": 2, "a": 1})
+        True
+        >>> combine_fingerprints({"a": 1, "b": 2}) == combine_fingerprints({"a": 2, "b": 1})
+        False
+
+        ```
+    """
+    return (
+        sum(
+            _mix(append_fingerprint(_hash_key(key), fingerprint))
+            for key, fingerprint in fingerprints.items()
+        )
+        % MODULUS
+    )
+
+
+@lru_cache(maxsize=65536)
+def _hash_key(key: str) -> int:
+    r"""Compute the hash of a key, which is cached because the same
+    keys are combined every time a fingerprint is computed.
+
+    Args:
+        key: The key to hash.
+
+    Returns:
+        The hash of the key.
+    """
+    return hash_object(key)
+
+
+def _mix(value: int) -> int:
+    r"""Mix the bits of a 64-bit integer with the finalizer of
+    SplitMix64.
+
+    The sum of the fingerprints of the records is not enough to
+    combine them because it is linear, so the fingerprints of two
+    records could be swapped without changing the sum.
+
+    Args:
+        value: The integer to mix.
+
+    Returns:
+        The mixed integer.
+    """
+    mask = (1 << 64) - 1
+    value = ((value ^ (value >> 30)) * 0xBF58476D1CE4E5B9) & mask
+    value = ((value ^ (value >> 27)) * 0x94D049BB133111EB) & mask
+    return value ^ (value >> 31)
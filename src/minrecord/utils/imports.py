@@ -3,18 +3,110 @@ r"""Implement some utility functions to manage optional dependencies."""
 from __future__ import annotations
 
 __all__ = [
+    "check_numpy",
     "check_objectory",
+    "check_pyarrow",
+    "is_numpy_available",
     "is_objectory_available",
+    "is_pyarrow_available",
+    "numpy_available",
     "objectory_available",
+    "pyarrow_available",
+    "raise_error_numpy_missing",
     "raise_error_objectory_missing",
+    "raise_error_pyarrow_missing",
+    "when_imported",
 ]
 
+import importlib.util
+import sys
 from typing import TYPE_CHECKING, Any, NoReturn
 
-from coola.utils.imports import decorator_package_available, package_available
-
 if TYPE_CHECKING:
-    from collections.abc import Callable
+    from collections.abc import Callable, Sequence
+    from importlib.machinery import ModuleSpec
+    from types import ModuleType
+
+# The hooks to execute when a module is imported.
+_POST_IMPORT_HOOKS: dict[str, list[Callable[[], None]]] = {}
+
+
+#################
+#     numpy     #
+#################
+
+
+def is_numpy_available() -> bool:
+    r"""Indicate if the ``numpy`` package is installed or not.
+
+    Returns:
+        ``True`` if ``numpy`` is available otherwise ``False``.
+
+    Example:
+        ```pycon
+        >>> from minrecord.utils.imports import is_numpy_available
+        >>> is_numpy_available()
+
+        ```
+    """
+    from coola.utils.imports import package_available  # noqa: PLC0415
+
+    return package_available("numpy")
+
+
+def check_numpy() -> None:
+    r"""Check if the ``numpy`` package is installed.
+
+    Raises:
+        RuntimeError: if the ``numpy`` package is not installed.
+
+    Example:
+        ```pycon
+        >>> from minrecord.utils.imports import check_numpy
+        >>> check_numpy()
+
+        ```
+    """
+    if not is_numpy_available():
+        raise_error_numpy_missing()
+
+
+def numpy_available(fn: Callable[..., Any]) -> Callable[..., Any]:
+    r"""Implement a decorator to execute a function only if ``numpy``
+    package is installed.
+
+    Args:
+        fn: The function to execute.
+
+    Returns:
+        A wrapper around ``fn`` if ``numpy`` package is installed,
+            otherwise ``None``.
+
+    Example:
+        ```pycon
+        >>> from minrecord.utils.imports import numpy_available
+        >>> @numpy_available
+        ... def my_function(n: int = 0) -> int:
+        ...     return 42 + n
+        ...
+        >>> my_function()
+
+        ```
+    """
+    from coola.utils.imports import decorator_package_available  # noqa: PLC0415
+
+    return decorator_package_available(fn, is_numpy_available)
+
+
+def raise_error_numpy_missing() -> NoReturn:
+    r"""Raise a RuntimeError to indicate the ``numpy`` package is
+    missing."""
+    msg = (
+        "'numpy' package is required but not installed. "
+        "You can install 'numpy' package with the command:\n\n"
+        "pip install numpy\n"
+    )
+    raise RuntimeError(msg)
 
 
 #####################
@@ -35,6 +127,8 @@ def is_objectory_available() -> bool:
 
         ```
     """
+    from coola.utils.imports import package_available  # noqa: PLC0415
+
     return package_available("objectory")
 
 
@@ -77,6 +171,8 @@ def objectory_available(fn: Callable[..., Any]) -> Callable[..., Any]:
 
         ```
     """
+    from coola.utils.imports import decorator_package_available  # noqa: PLC0415
+
     return decorator_package_available(fn, is_objectory_available)
 
 
@@ -89,3 +185,151 @@ def raise_error_objectory_missing() -> NoReturn:
         "pip install objectory\n"
     )
     raise RuntimeError(msg)
+
+
+###################
+#     pyarrow     #
+###################
+
+
+def is_pyarrow_available() -> bool:
+    r"""Indicate if the ``pyarrow`` package is installed or not.
+
+    Returns:
+        ``True`` if ``pyarrow`` is available otherwise ``False``.
+
+    Example:
+        ```pycon
+        >>> from minrecord.utils.imports import is_pyarrow_available
+        >>> is_pyarrow_available()
+
+        ```
+    """
+    from coola.utils.imports import package_available  # noqa: PLC0415
+
+    return package_available("pyarrow")
+
+
+def check_pyarrow() -> None:
+    r"""Check if the ``pyarrow`` package is installed.
+
+    Raises:
+        RuntimeError: if the ``pyarrow`` package is not installed.
+
+    Example:
+        ```pycon
+        >>> from minrecord.utils.imports import check_pyarrow
+        >>> check_pyarrow()
+
+        ```
+    """
+    if not is_pyarrow_available():
+        raise_error_pyarrow_missing()
+
+
+def pyarrow_available(fn: Callable[..., Any]) -> Callable[..., Any]:
+    r"""Implement a decorator to execute a function only if ``pyarrow``
+    package is installed.
+
+    Args:
+        fn: The function to execute.
+
+    Returns:
+        A wrapper around ``fn`` if ``pyarrow`` package is installed,
+            otherwise ``None``.
+
+    Example:
+        ```pycon
+        >>> from minrecord.utils.imports import pyarrow_available
+        >>> @pyarrow_available
+        ... def my_function(n: int = 0) -> int:
+        ...     return 42 + n
+        ...
+        >>> my_function()
+
+        ```
+    """
+    from coola.utils.imports import decorator_package_available  # noqa: PLC0415
+
+    return decorator_package_available(fn, is_pyarrow_available)
+
+
+def raise_error_pyarrow_missing() -> NoReturn:
+    r"""Raise a RuntimeError to indicate the ``pyarrow`` package is
+    missing."""
+    msg = (
+        "'pyarrow' package is required but not installed. "
+        "You can install 'pyarrow' package with the command:\n\n"
+        "pip install pyarrow\n"
+    )
+    raise RuntimeError(msg)
+
+
+#############################
+#     post-import hooks     #
+#############################
+
+
+def when_imported(name: str, hook: Callable[[], None]) -> None:
+    r"""Execute a function when a module is imported.
+
+    This function can be used to configure an optional dependency
+    only if it is used, without importing it. If the module is
+    already imported, the function is executed immediately.
+
+    Args:
+        name: The name of the module.
+        hook: The function to execute after the module is imported.
+
+    Example:
+        ```pycon
+        >>> from minrecord.utils.imports import when_imported
+        >>> when_imported("math", lambda: print("math is imported"))
+        math is imported
+
+        ```
+    """
+    if name in sys.modules:
+        hook()
+        return
+    if name not in _POST_IMPORT_HOOKS:
+        _POST_IMPORT_HOOKS[name] = []
+        sys.meta_path.insert(0, _PostImportFinder(name))
+    _POST_IMPORT_HOOKS[name].append(hook)
+
+
+class _PostImportFinder:
+    r"""Implement a meta path finder that executes the post-import
+    hooks of a module after it is loaded.
+
+    The class does not inherit from ``importlib.abc.MetaPathFinder``
+    because ``importlib.abc`` is slow to import.
+
+    Args:
+        name: The name of the module.
+    """
+
+    def __init__(self, name: str) -> None:
+        self._name = name
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None,  # noqa: ARG002
+        target: ModuleType | None = None,  # noqa: ARG002
+    ) -> ModuleSpec | None:
+        if fullname != self._name:
+            return None
+        sys.meta_path.remove(self)
+        spec = importlib.util.find_spec(fullname)
+        if spec is None or spec.loader is None:
+            return spec
+        exec_module = spec.loader.exec_module
+
+        def _exec_module(module: ModuleType) -> None:
+            exec_module(module)
+            for hook in _POST_IMPORT_HOOKS.pop(fullname, ()):
+                hook()
+
+        spec.loader.exec_module = _exec_module
+        return spec
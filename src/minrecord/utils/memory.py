@@ -0,0 +1,118 @@
+r"""Contain utility functions to measure the memory used by objects."""
+
+from __future__ import annotations
+
+__all__ = ["format_bytes", "get_deep_size"]
+
+import sys
+import types
+from collections import deque
+from collections.abc import Mapping
+from typing import Any
+
+# The objects that are shared, so they are not counted in the memory
+# of an object that references them.
+_SHARED_TYPES = (
+    type,
+    types.BuiltinFunctionType,
+    types.FunctionType,
+    types.MethodType,
+    types.ModuleType,
+)
+_CONTAINER_TYPES = (deque, frozenset, list, set, tuple)
+_UNITS = ("B", "KiB", "MiB", "GiB", "TiB")
+
+
+def get_deep_size(obj: Any, seen: set[int] | None = None) -> int:
+    r"""Get the approximate number of bytes used by an object and the
+    objects it references.
+
+    The size of each object is given by ``sys.getsizeof``, so the
+    size of a NumPy array includes its data if it owns it. The
+    objects referenced several times are counted once. The classes,
+    the functions, the modules, ``None`` and the booleans are shared
+    objects, so they are not counted.
+
+    Args:
+        obj: The object.
+        seen: The identifiers of the objects that are already
+            counted. They are not counted again, and the identifiers
+            of the counted objects are added to this set.
+
+    Returns:
+        The approximate number of bytes used by the object.
+
+    Example:
+        ```pycon
+        >>> from minrecord.utils.memory import get_deep_size
+        >>> get_deep_size([1.0, 2.0]) > get_deep_size([])
+        True
+        >>> value = [1.0] * 100
+        >>> get_deep_size([value, value]) < 2 * get_deep_size(value)
+        True
+
+        ```
+    """
+    if seen is None:
+        seen = set()
+    size = 0
+    stack = [obj]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or obj is None or type(obj) is bool or isinstance(obj, _SHARED_TYPES):
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        if isinstance(obj, Mapping):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, _CONTAINER_TYPES):
+            stack.extend(obj)
+        if hasattr(obj, "__dict__"):
+            stack.append(obj.__dict__)
+        stack.extend(getattr(obj, slot) for slot in _get_slots(type(obj)) if hasattr(obj, slot))
+    return size
+
+
+def format_bytes(size: float) -> str:
+    r"""Format a number of bytes with a binary unit.
+
+    Args:
+        size: The number of bytes.
+
+    Returns:
+        The formatted number of bytes.
+
+    Example:
+        ```pycon
+        >>> from minrecord.utils.memory import format_bytes
+        >>> format_bytes(512)
+        '512 B'
+        >>> format_bytes(1536)
+        '1.50 KiB'
+        >>> format_bytes(3 * 2**30)
+        '3.00 GiB'
+
+        ```
+    """
+    for unit in _UNITS[:-1]:
+        if abs(size) < 1024:
+            return f"{size:,} {unit}" if unit == "B" else f"{size:.2f} {unit}"
+        size /= 1024
+    return f"{size:,.2f} {_UNITS[-1]}"
+
+
+def _get_slots(cls: type) -> tuple[str, ...]:
+    r"""Get the names of the slots of a class and its parents.
+
+    Args:
+        cls: The class.
+
+    Returns:
+        The names of the slots.
+    """
+    slots = []
+    for base in cls.__mro__:
+        names = base.__dict__.get("__slots__", ())
+        slots.extend((names,) if isinstance(names, str) else names)
+    return tuple(slot for slot in slots if slot not in {"__dict__", "__weakref__"})
@@ -0,0 +1,71 @@
+r"""Contain utility functions to select keys with glob or regular
+expression patterns."""
+
+from __future__ import annotations
+
+__all__ = ["compile_pattern", "get_literal_prefix"]
+
+import fnmatch
+import functools
+import re
+
+_GLOB_SPECIAL_CHARS = re.compile(r"[*?\[]")
+
+
+@functools.lru_cache(maxsize=256)
+def compile_pattern(pattern: str | re.Pattern[str]) -> re.Pattern[str]:
+    r"""Compile a pattern to select keys.
+
+    A string is a glob pattern (see ``fnmatch``) where ``*`` also
+    matches ``/``, and a compiled regular expression is returned
+    as it is. The compiled patterns are cached. A key is selected if
+    the whole key matches the compiled pattern (see ``re.fullmatch``).
+
+    Args:
+        pattern: The glob pattern or the compiled regular expression.
+
+    Returns:
+        The compiled regular expression.
+
+    Example:
+        ```pycon
+        >>> from minrecord.utils.pattern import compile_pattern
+        >>> regex = compile_pattern("*/loss")
+        >>> bool(regex.fullmatch("train/loss"))
+        True
+        >>> bool(regex.fullmatch("train/loss/ema"))
+        False
+
+        ```
+    """
+    if isinstance(pattern, re.Pattern):
+        return pattern
+    return re.compile(fnmatch.translate(pattern))
+
+
+def get_literal_prefix(pattern: str | re.Pattern[str]) -> str:
+    r"""Get the literal prefix of a pattern.
+
+    All the keys that match the pattern start with this prefix. The
+    prefix of a regular expression is always empty.
+
+    Args:
+        pattern: The glob pattern or the compiled regular expression.
+
+    Returns:
+        The literal prefix of the pattern.
+
+    Example:
+        ```pycon
+        >>> from minrecord.utils.pattern import get_literal_prefix
+        >>> get_literal_prefix("val/*/top1")
+        'val/'
+        >>> get_literal_prefix("*/loss")
+        ''
+
+        ```
+    """
+    if isinstance(pattern, re.Pattern):
+        return ""
+    match = _GLOB_SPECIAL_CHARS.search(pattern)
+    return pattern if match is None else pattern[: match.start()]
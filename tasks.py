@@ -20,6 +20,7 @@ SOURCE = f"src/{NAME}"
 TESTS = "tests"
 UNIT_TESTS = f"{TESTS}/unit"
 INTEGRATION_TESTS = f"{TESTS}/integration"
+BENCHMARKS = f"{TESTS}/benchmark"
 PYTHON_VERSION = "3.13"
 
 
@@ -304,6 +305,46 @@ def integration_test(c: Context, cov: bool = False) -> None:
     logger.info("✅ Integration tests complete")
 
 
+@task
+def benchmark(c: Context, compare: bool = False, fail: str = "", large: bool = False) -> None:
+    r"""Run the benchmarks.
+
+    The results are saved in the ``.benchmarks`` directory so the
+    benchmarks of different commits can be compared.
+
+    Args:
+        c: The invoke context.
+        compare: If True, compare the results with the last saved run.
+            Default is False.
+        fail: The regression threshold used with ``compare``, for
+            example ``"mean:10%"``. The task fails if a benchmark is
+            slower than the last saved run by more than this
+            threshold. Default is no threshold.
+        large: If True, also run the benchmarks of the record managers
+            with 100k and 1M records. Default is False.
+
+    Example:
+        # Run the benchmarks and save the results
+        invoke benchmark
+
+        # Run the benchmarks and compare with the last saved results
+        invoke benchmark --compare
+
+        # Fail if a benchmark is more than 10% slower than the last saved results
+        invoke benchmark --compare --fail=mean:10%
+    """
+    logger.info("⏱️  Running benchmarks...")
+    cmd = ["python -m pytest --benchmark-only --benchmark-autosave --benchmark-group-by=group"]
+    if compare:
+        cmd.append("--benchmark-compare")
+        if fail:
+            cmd.append(f"--benchmark-compare-fail={fail}")
+    cmd.append(f"{BENCHMARKS}")
+    env = {"MINRECORD_BENCHMARK_LARGE": "1"} if large else {}
+    c.run(" ".join(cmd), pty=True, env=env)
+    logger.info("✅ Benchmarks complete")
+
+
 @task
 def show_installed_packages(c: Context) -> None:
     r"""Show the installed packages.
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import pytest
+
+from minrecord.utils.memory import format_bytes
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from _pytest.terminal import TerminalReporter
+
+# The benchmarks are slow, so they only run with ``--benchmark-only``
+# (see ``invoke benchmark``) and are skipped by the test tasks.
+_BENCHMARK_DIR = Path(__file__).parent
+
+# The memory measurements of the session. The keys are the names of
+# the scaling curves, and the values map each size to the measured
+# number of bytes.
+_MEMORY_CURVES: dict[str, dict[int, int]] = defaultdict(dict)
+
+
+@pytest.fixture
+def record_memory() -> Callable[[str, int, int], None]:
+    r"""Get a function to record a point of a memory scaling curve.
+
+    The curves are reported at the end of the session.
+    """
+
+    def record(curve: str, size: int, num_bytes: int) -> None:
+        _MEMORY_CURVES[curve][size] = num_bytes
+
+    return record
+
+
+def pytest_collection_modifyitems(config: pytest.Config, items: list[pytest.Item]) -> None:
+    if config.getoption("benchmark_only", default=False):
+        return
+    skip = pytest.mark.skip(reason="The benchmarks only run with --benchmark-only")
+    for item in items:
+        if item.path.is_relative_to(_BENCHMARK_DIR):
+            item.add_marker(skip)
+
+
+def pytest_terminal_summary(terminalreporter: TerminalReporter) -> None:
+    if not _MEMORY_CURVES:
+        return
+    terminalreporter.section("memory scaling")
+    for curve, points in sorted(_MEMORY_CURVES.items()):
+        terminalreporter.write_line(curve)
+        for size, num_bytes in sorted(points.items()):
+            terminalreporter.write_line(
+                f"  {size:>12,}  {format_bytes(num_bytes):>12}  {num_bytes / size:>10,.1f} B/unit"
+            )
@@ -0,0 +1,43 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from minrecord import BaseRecord, MaxScalarRecord, MinScalarRecord, Record
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+pytest.importorskip("pytest_benchmark")
+
+NUM_RECORDS = 10_000
+
+
+def create_record_dicts(num_records: int) -> list[dict[str, Any]]:
+    classes = (Record, MinScalarRecord, MaxScalarRecord)
+    return [
+        classes[i % len(classes)](f"record{i}", elements=((0, 1.0), (1, 0.5))).to_dict()
+        for i in range(num_records)
+    ]
+
+
+###############################################
+#     Benchmarks for BaseRecord.from_dict     #
+###############################################
+
+
+def test_benchmark_from_dict_10k(benchmark: BenchmarkFixture) -> None:
+    data = create_record_dicts(NUM_RECORDS)
+    records = benchmark.pedantic(
+        lambda: [BaseRecord.from_dict(item) for item in data], rounds=3, iterations=1
+    )
+    assert len(records) == NUM_RECORDS
+
+
+def test_benchmark_from_dict_large_record(benchmark: BenchmarkFixture) -> None:
+    data = MinScalarRecord(
+        "loss", elements=[(step, float(step)) for step in range(10_000)], max_size=10_000
+    ).to_dict()
+    record = benchmark(BaseRecord.from_dict, data)
+    assert len(record) == 10_000
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from minrecord import (
+    ComparableRecord,
+    MaxScalarComparator,
+    MaxScalarRecord,
+    MinScalarRecord,
+)
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+    from minrecord import BaseRecord
+
+pytest.importorskip("pytest_benchmark")
+
+MAX_SIZE = 1_000
+
+RECORD_FACTORIES = {
+    "ComparableRecord": lambda: ComparableRecord[float](
+        "accuracy", MaxScalarComparator(), max_size=MAX_SIZE
+    ),
+    "MaxScalarRecord": lambda: MaxScalarRecord("accuracy", max_size=MAX_SIZE),
+    "MinScalarRecord": lambda: MinScalarRecord("loss", max_size=MAX_SIZE),
+}
+
+
+def create_record(name: str) -> BaseRecord[float]:
+    record = RECORD_FACTORIES[name]()
+    record.update([(step, float(step % 100)) for step in range(MAX_SIZE)])
+    return record
+
+
+#####################################################
+#     Benchmarks for ComparableRecord.add_value     #
+#####################################################
+
+
+@pytest.mark.benchmark(group="add_value")
+@pytest.mark.parametrize("name", sorted(RECORD_FACTORIES))
+def test_benchmark_comparable_record_add_value(benchmark: BenchmarkFixture, name: str) -> None:
+    record = create_record(name)
+    benchmark(record.add_value, 50.0, 1)
+    assert len(record) == MAX_SIZE
+
+
+@pytest.mark.benchmark(group="add_value")
+@pytest.mark.parametrize("name", sorted(RECORD_FACTORIES))
+def test_benchmark_comparable_record_add_value_alternate(
+    benchmark: BenchmarkFixture, name: str
+) -> None:
+    record = create_record(name)
+    values = iter(range(10**9))
+    # The values alternate between a very high and a very low value, so
+    # the best value of the record is updated.
+    benchmark(lambda: record.add_value(next(values) % 2 * 1e9 - 5e8))
+    assert len(record) == MAX_SIZE
+
+
+##################################################
+#     Benchmarks for ComparableRecord.update     #
+##################################################
+
+
+@pytest.mark.benchmark(group="update")
+@pytest.mark.parametrize("name", sorted(RECORD_FACTORIES))
+def test_benchmark_comparable_record_update(benchmark: BenchmarkFixture, name: str) -> None:
+    record = create_record(name)
+    elements = [(step, float(step % 100)) for step in range(MAX_SIZE)]
+    benchmark(record.update, elements)
+    assert len(record) == MAX_SIZE
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from minrecord import Record
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+pytest.importorskip("pytest_benchmark")
+
+MAX_SIZE = 1_000
+
+
+def create_record(storage: str = "auto") -> Record:
+    return Record(
+        "loss",
+        elements=[(step, float(step)) for step in range(MAX_SIZE)],
+        max_size=MAX_SIZE,
+        storage=storage,
+    )
+
+
+###########################################
+#     Benchmarks for Record.add_value     #
+###########################################
+
+
+@pytest.mark.benchmark(group="add_value")
+@pytest.mark.parametrize("storage", ["auto", "object"])
+def test_benchmark_record_add_value(benchmark: BenchmarkFixture, storage: str) -> None:
+    record = create_record(storage)
+    benchmark(record.add_value, 1.0, 1)
+    assert len(record) == MAX_SIZE
+
+
+@pytest.mark.benchmark(group="add_value")
+def test_benchmark_record_add_value_no_step(benchmark: BenchmarkFixture) -> None:
+    record = Record("loss", elements=[(None, 1.0)] * MAX_SIZE, max_size=MAX_SIZE)
+    benchmark(record.add_value, 1.0)
+    assert len(record) == MAX_SIZE
+
+
+########################################
+#     Benchmarks for Record.update     #
+########################################
+
+
+@pytest.mark.benchmark(group="update")
+@pytest.mark.parametrize("storage", ["auto", "object"])
+def test_benchmark_record_update(benchmark: BenchmarkFixture, storage: str) -> None:
+    record = create_record(storage)
+    elements = [(step, float(step)) for step in range(MAX_SIZE)]
+    benchmark(record.update, elements)
+    assert len(record) == MAX_SIZE
+
+
+#################################################
+#     Benchmarks for Record.get_most_recent     #
+#################################################
+
+
+@pytest.mark.benchmark(group="get_most_recent")
+@pytest.mark.parametrize("storage", ["auto", "object"])
+def test_benchmark_record_get_most_recent(benchmark: BenchmarkFixture, storage: str) -> None:
+    record = create_record(storage)
+    assert len(benchmark(record.get_most_recent)) == MAX_SIZE
+
+
+@pytest.mark.benchmark(group="get_most_recent")
+def test_benchmark_record_get_most_recent_10(benchmark: BenchmarkFixture) -> None:
+    record = create_record()
+    assert len(benchmark(record.get_most_recent, 10)) == 10
+
+
+##############################################################
+#     Benchmarks for Record.state_dict/load_state_dict     #
+##############################################################
+
+
+@pytest.mark.benchmark(group="state_dict")
+@pytest.mark.parametrize("storage", ["auto", "object"])
+def test_benchmark_record_state_dict_round_trip(benchmark: BenchmarkFixture, storage: str) -> None:
+    record = create_record(storage)
+    other = Record("loss", max_size=MAX_SIZE, storage=storage)
+    benchmark(lambda: other.load_state_dict(record.state_dict()))
+    assert other.equal(record)
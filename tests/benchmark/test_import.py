@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+from typing import TYPE_CHECKING
+
+import pytest
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+pytest.importorskip("pytest_benchmark")
+
+# The maximum time in microseconds to import minrecord, without the
+# interpreter startup.
+IMPORT_TIME_BUDGET = 100_000
+
+
+def get_import_time() -> int:
+    r"""Get the cumulative import time of ``minrecord`` in a new
+    interpreter.
+
+    Returns:
+        The import time in microseconds.
+    """
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import minrecord"],
+        capture_output=True,
+        check=True,
+        text=True,
+    ).stderr
+    for line in stderr.splitlines():
+        _, cumulative, name = line.split("|")
+        if name.strip() == "minrecord":
+            return int(cumulative)
+    msg = "minrecord is not in the import time report"
+    raise RuntimeError(msg)
+
+
+###########################################
+#     Benchmarks for import minrecord     #
+###########################################
+
+
+def test_benchmark_import(benchmark: BenchmarkFixture) -> None:
+    import_time = benchmark.pedantic(get_import_time, rounds=5, iterations=1)
+    assert import_time < IMPORT_TIME_BUDGET
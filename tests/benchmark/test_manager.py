@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import functools
+import os
+from typing import TYPE_CHECKING
+
+import pytest
+
+from minrecord import MaxScalarRecord, MinScalarRecord, Record, RecordManager
+
+if TYPE_CHECKING:
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+pytest.importorskip("pytest_benchmark")
+
+NUM_RECORDS = 10_000
+# The numbers of records of the managers. The managers with 100k and
+# 1M records take several seconds to create and the largest ones use
+# about 1 GB, so they are only benchmarked if the environment variable
+# MINRECORD_BENCHMARK_LARGE is set (see ``invoke benchmark --large``).
+SIZES = (10, 1_000, 10_000) + (
+    (100_000, 1_000_000) if os.environ.get("MINRECORD_BENCHMARK_LARGE") else ()
+)
+
+
+def create_manager(num_records: int) -> RecordManager:
+    classes = (Record, MinScalarRecord, MaxScalarRecord)
+    elements = [(step, float(step)) for step in range(10)]
+    return RecordManager(
+        {
+            f"record{i}": classes[i % len(classes)](f"record{i}", elements=elements)
+            for i in range(num_records)
+        }
+    )
+
+
+@functools.cache
+def get_manager(num_records: int) -> RecordManager:
+    r"""Get a manager shared by the benchmarks that do not modify
+    it."""
+    return create_manager(num_records)
+
+
+def get_rounds(num_records: int) -> int:
+    return max(3, 10_000 // num_records)
+
+
+##############################################
+#     Benchmarks for RecordManager.equal     #
+##############################################
+
+
+def test_benchmark_manager_equal_10k(benchmark: BenchmarkFixture) -> None:
+    manager1, manager2 = create_manager(NUM_RECORDS), create_manager(NUM_RECORDS)
+    assert benchmark.pedantic(manager1.equal, args=(manager2,), rounds=3, iterations=1)
+
+
+#######################################################
+#     Benchmarks for the updates of the records     #
+#######################################################
+
+
+@pytest.mark.benchmark(group="manager_update")
+@pytest.mark.parametrize("num_records", SIZES)
+def test_benchmark_manager_update(benchmark: BenchmarkFixture, num_records: int) -> None:
+    manager = create_manager(num_records)
+    keys = [f"record{i}" for i in range(num_records)]
+    elements = [(10, 0.5)]
+
+    def update() -> None:
+        for key in keys:
+            manager.get_record(key).update(elements)
+
+    benchmark.pedantic(update, rounds=get_rounds(num_records), iterations=1)
+    assert manager.get_record("record0").get_last_value() == 0.5
+
+
+@pytest.mark.benchmark(group="manager_add_value")
+@pytest.mark.parametrize("num_records", SIZES)
+def test_benchmark_manager_add_value(benchmark: BenchmarkFixture, num_records: int) -> None:
+    manager = create_manager(num_records)
+    keys = [f"record{i}" for i in range(num_records)]
+
+    def add_values() -> None:
+        for key in keys:
+            manager.get_record(key).add_value(0.5, step=10)
+
+    benchmark.pedantic(add_values, rounds=get_rounds(num_records), iterations=1)
+    assert manager.get_record("record0").get_last_value() == 0.5
+
+
+#################################################
+#     Benchmarks for the reads of the records     #
+#################################################
+
+
+@pytest.mark.benchmark(group="manager_get_most_recent")
+@pytest.mark.parametrize("num_records", SIZES)
+def test_benchmark_manager_get_most_recent(benchmark: BenchmarkFixture, num_records: int) -> None:
+    manager = get_manager(num_records)
+
+    def get_most_recent() -> dict:
+        return {key: record.get_most_recent() for key, record in manager.get_records().items()}
+
+    values = benchmark.pedantic(get_most_recent, rounds=get_rounds(num_records), iterations=1)
+    assert len(values) == num_records
+
+
+@pytest.mark.benchmark(group="manager_get_best_values")
+@pytest.mark.parametrize("num_records", SIZES)
+def test_benchmark_manager_get_best_values(benchmark: BenchmarkFixture, num_records: int) -> None:
+    manager = get_manager(num_records)
+    values = benchmark.pedantic(
+        manager.get_best_values, rounds=get_rounds(num_records), iterations=1
+    )
+    assert len(values) == num_records - num_records // 3 - (num_records % 3 > 0)
+
+
+@pytest.mark.benchmark(group="manager_get_last_values")
+@pytest.mark.parametrize("num_records", SIZES)
+def test_benchmark_manager_get_last_values(benchmark: BenchmarkFixture, num_records: int) -> None:
+    manager = get_manager(num_records)
+    values = benchmark.pedantic(
+        manager.get_last_values, rounds=get_rounds(num_records), iterations=1
+    )
+    assert len(values) == num_records
+
+
+#####################################################################
+#     Benchmarks for RecordManager.state_dict/load_state_dict     #
+#####################################################################
+
+
+@pytest.mark.benchmark(group="manager_state_dict")
+@pytest.mark.parametrize("num_records", SIZES)
+def test_benchmark_manager_state_dict(benchmark: BenchmarkFixture, num_records: int) -> None:
+    manager = get_manager(num_records)
+    state = benchmark.pedantic(manager.state_dict, rounds=get_rounds(num_records), iterations=1)
+    assert "record0" in state
+
+
+@pytest.mark.benchmark(group="manager_state_dict_round_trip")
+@pytest.mark.parametrize("num_records", SIZES)
+def test_benchmark_manager_state_dict_round_trip(
+    benchmark: BenchmarkFixture, num_records: int
+) -> None:
+    manager = get_manager(num_records)
+
+    def round_trip() -> RecordManager:
+        other = RecordManager()
+        other.load_state_dict(manager.state_dict())
+        return other
+
+    other = benchmark.pedantic(round_trip, rounds=get_rounds(num_records), iterations=1)
+    assert len(other) == num_records
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import gc
+import tracemalloc
+from typing import TYPE_CHECKING, Any
+
+import pytest
+
+from minrecord import MaxScalarRecord, MinScalarRecord, Record, RecordManager
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from pytest_benchmark.fixture import BenchmarkFixture
+
+pytest.importorskip("pytest_benchmark")
+
+NUM_ELEMENTS = (1_000, 10_000, 100_000)
+NUM_RECORDS = (100, 1_000, 10_000)
+# The maximum number of bytes allocated per element or per record.
+# These budgets are about twice the current measurements, so they
+# detect large regressions without depending on the Python version.
+ELEMENT_BUDGETS = {"auto": 40, "object": 250}
+RECORD_BUDGET = 4_000
+
+
+def measure_memory(func: Callable[..., Any], *args: Any) -> tuple[Any, int, int]:
+    r"""Measure the memory allocated by a function with
+    ``tracemalloc``.
+
+    Args:
+        func: The function to call.
+        *args: The positional arguments of the function.
+
+    Returns:
+        The output of the function, the number of bytes allocated by
+            the function that are still allocated after the call, and
+            the peak number of bytes allocated during the call.
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        output = func(*args)
+        # A full collection also clears the free lists of the
+        # interpreter, whose objects are still traced.
+        gc.collect()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return output, current, peak
+
+
+def create_record(num_elements: int, storage: str) -> Record:
+    return Record(
+        "loss",
+        elements=((step, float(step)) for step in range(num_elements)),
+        max_size=num_elements,
+        storage=storage,
+    )
+
+
+def create_manager(num_records: int) -> RecordManager:
+    classes = (Record, MinScalarRecord, MaxScalarRecord)
+    return RecordManager(
+        {
+            f"record{i}": classes[i % len(classes)](
+                f"record{i}", elements=((step, float(step)) for step in range(10))
+            )
+            for i in range(num_records)
+        }
+    )
+
+
+def run_memory_benchmark(
+    benchmark: BenchmarkFixture, func: Callable[..., Any], *args: Any
+) -> tuple[Any, int, int]:
+    r"""Measure the memory of a function, and add the measurements to
+    the extra information of the benchmark, so they are saved with the
+    timings."""
+    output, current, peak = benchmark.pedantic(
+        measure_memory, args=(func, *args), rounds=1, iterations=1
+    )
+    benchmark.extra_info["current_bytes"] = current
+    benchmark.extra_info["peak_bytes"] = peak
+    return output, current, peak
+
+
+###################################
+#     Memory of the elements     #
+###################################
+
+
+@pytest.mark.benchmark(group="memory_record")
+@pytest.mark.parametrize("storage", ["auto", "object"])
+@pytest.mark.parametrize("num_elements", NUM_ELEMENTS)
+def test_memory_record_elements(
+    benchmark: BenchmarkFixture,
+    record_memory: Callable[[str, int, int], None],
+    num_elements: int,
+    storage: str,
+) -> None:
+    record, current, _ = run_memory_benchmark(benchmark, create_record, num_elements, storage)
+    record_memory(f"Record bytes per element ({record.backend})", num_elements, current)
+    assert current / num_elements < ELEMENT_BUDGETS[storage]
+
+
+##################################
+#     Memory of the managers     #
+##################################
+
+
+@pytest.mark.benchmark(group="memory_manager")
+@pytest.mark.parametrize("num_records", NUM_RECORDS)
+def test_memory_manager_records(
+    benchmark: BenchmarkFixture,
+    record_memory: Callable[[str, int, int], None],
+    num_records: int,
+) -> None:
+    manager, current, _ = run_memory_benchmark(benchmark, create_manager, num_records)
+    record_memory("RecordManager bytes per record (10 elements)", num_records, current)
+    assert len(manager) == num_records
+    assert current / num_records < RECORD_BUDGET
+
+
+@pytest.mark.benchmark(group="memory_state_dict")
+@pytest.mark.parametrize("num_records", NUM_RECORDS)
+def test_memory_manager_state_dict(
+    benchmark: BenchmarkFixture,
+    record_memory: Callable[[str, int, int], None],
+    num_records: int,
+) -> None:
+    manager = create_manager(num_records)
+    state, _, peak = run_memory_benchmark(benchmark, manager.state_dict)
+    record_memory("RecordManager.state_dict peak bytes per record", num_records, peak)
+    assert "record0" in state
+    assert peak / num_records < RECORD_BUDGET
+
+
+@pytest.mark.benchmark(group="memory_load_state_dict")
+@pytest.mark.parametrize("num_records", NUM_RECORDS)
+def test_memory_manager_load_state_dict(
+    benchmark: BenchmarkFixture,
+    record_memory: Callable[[str, int, int], None],
+    num_records: int,
+) -> None:
+    state = create_manager(num_records).state_dict()
+    manager = RecordManager()
+    _, _, peak = run_memory_benchmark(benchmark, manager.load_state_dict, state)
+    record_memory("RecordManager.load_state_dict peak bytes per record", num_records, peak)
+    assert len(manager) == num_records
+    assert peak / num_records < RECORD_BUDGET
+
+
+###############################
+#     Memory versus speed     #
+###############################
+
+
+@pytest.mark.benchmark(group="memory_vs_speed")
+@pytest.mark.parametrize("storage", ["auto", "object"])
+def test_benchmark_record_add_value_memory_vs_speed(
+    benchmark: BenchmarkFixture, storage: str
+) -> None:
+    r"""Measure the time to add a value and the memory per element of a
+    storage, to show what the memory saving of the packed storage
+    costs in speed."""
+    num_elements = NUM_ELEMENTS[1]
+    record, current, _ = measure_memory(create_record, num_elements, storage)
+    benchmark.extra_info["backend"] = record.backend
+    benchmark.extra_info["bytes_per_element"] = current / num_elements
+    benchmark(record.add_value, 1.0, num_elements)
+    assert len(record) == num_elements
+    assert current / num_elements < ELEMENT_BUDGETS[storage]
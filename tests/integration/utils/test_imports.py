@@ -2,10 +2,17 @@ from __future__ import annotations
 
 import pytest
 
-from minrecord.testing import objectory_available, objectory_not_available
+from minrecord.testing import (
+    objectory_available,
+    objectory_not_available,
+    pyarrow_available,
+    pyarrow_not_available,
+)
 from minrecord.utils.imports import (
     check_objectory,
+    check_pyarrow,
     is_objectory_available,
+    is_pyarrow_available,
 )
 
 
@@ -37,3 +44,29 @@ def test_is_objectory_available_true() -> None:
 @objectory_not_available
 def test_is_objectory_available_false() -> None:
     assert not is_objectory_available()
+
+
+###################
+#     pyarrow     #
+###################
+
+
+@pyarrow_available
+def test_check_pyarrow_with_package() -> None:
+    check_pyarrow()
+
+
+@pyarrow_not_available
+def test_check_pyarrow_without_package() -> None:
+    with pytest.raises(RuntimeError, match=r"'pyarrow' package is required but not installed."):
+        check_pyarrow()
+
+
+@pyarrow_available
+def test_is_pyarrow_available_true() -> None:
+    assert is_pyarrow_available()
+
+
+@pyarrow_not_available
+def test_is_pyarrow_available_false() -> None:
+    assert not is_pyarrow_available()
@@ -0,0 +1,311 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+from unittest.mock import patch
+
+import pytest
+from coola.equality import objects_are_equal
+
+from minrecord import (
+    ComparableRecord,
+    MaxScalarRecord,
+    MinScalarRecord,
+    Record,
+    RecordManager,
+)
+from minrecord.comparator import MaxScalarComparator
+from minrecord.arrow import (
+    _get_columns,
+    from_arrow_table,
+    from_parquet,
+    to_arrow_table,
+    to_parquet,
+)
+from minrecord.testing import objectory_available, pyarrow_available
+from minrecord.utils.imports import is_pyarrow_available
+
+if is_pyarrow_available():
+    import pyarrow as pa
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def create_manager() -> RecordManager:
+    manager = RecordManager()
+    manager.add_record(MinScalarRecord.from_elements("loss", [(0, 3.0), (1, 1.0), (2, 2.0)]))
+    manager.add_record(MaxScalarRecord.from_elements("accuracy", [(1, 0.5), (2, 0.7)]))
+    return manager
+
+
+def create_mixed_manager() -> RecordManager:
+    manager = RecordManager()
+    manager.add_record(Record("name", elements=[(0, "abc"), (1, "def")]))
+    manager.add_record(MinScalarRecord.from_elements("count", [(0, 2), (1, 1)]))
+    manager.add_record(MinScalarRecord.from_elements("loss", [(0, 3.0), (1, 1.5)]))
+    return manager
+
+
+####################################
+#     Tests for to_arrow_table     #
+####################################
+
+
+@pyarrow_available
+def test_to_arrow_table_long() -> None:
+    table = to_arrow_table(create_manager())
+    assert table.column_names == ["key", "step", "value"]
+    assert table["key"].to_pylist() == ["loss", "loss", "loss", "accuracy", "accuracy"]
+    assert table["step"].to_pylist() == [0, 1, 2, 1, 2]
+    assert table["value"].to_pylist() == [3.0, 1.0, 2.0, 0.5, 0.7]
+
+
+@objectory_available
+@pyarrow_available
+def test_to_arrow_table_does_not_copy_state() -> None:
+    manager = create_manager()
+    record = manager.get_record("loss")
+    with (
+        patch.object(record, "state_dict") as state_dict,
+        patch.object(record, "get_fingerprint") as get_fingerprint,
+    ):
+        table = to_arrow_table(manager)
+    state_dict.assert_not_called()
+    get_fingerprint.assert_not_called()
+    assert from_arrow_table(table).get_record("loss").equal(record)
+
+
+@pyarrow_available
+def test_to_arrow_table_long_mapping() -> None:
+    table = to_arrow_table({"lr": Record("lr", elements=[(None, 0.1)])})
+    assert table["key"].to_pylist() == ["lr"]
+    assert table["step"].to_pylist() == [None]
+    assert table["value"].to_pylist() == [0.1]
+
+
+@pyarrow_available
+def test_to_arrow_table_long_empty() -> None:
+    table = to_arrow_table(RecordManager())
+    assert table.num_rows == 0
+    assert table.column_names == ["key", "step", "value"]
+
+
+@pyarrow_available
+def test_to_arrow_table_long_int() -> None:
+    table = to_arrow_table({"count": Record("count", elements=[(0, 2), (1, 1)])})
+    assert table["value"].type == pa.int64()
+    assert table["value"].to_pylist() == [2, 1]
+
+
+@pyarrow_available
+def test_get_columns_packed_zero_copy() -> None:
+    record = Record("loss", elements=[(0, 3.0), (1, 1.0)], storage="auto")
+    steps, values = _get_columns("loss", record)
+    assert steps.buffers()[1].address == record._record.buffers()[0].buffer_info()[0]
+    assert values.buffers()[1].address == record._record.buffers()[1].buffer_info()[0]
+
+
+@pyarrow_available
+def test_to_arrow_table_packed_add_value() -> None:
+    record = Record("loss", max_size=2, elements=[(0, 3.0), (1, 1.0), (2, 2.0)], storage="auto")
+    table = to_arrow_table({"loss": record})
+    record.add_value(4.0, step=3)
+    assert table["step"].to_pylist() == [1, 2]
+    assert table["value"].to_pylist() == [1.0, 2.0]
+    assert record.get_most_recent() == ((2, 2.0), (3, 4.0))
+
+
+@pyarrow_available
+def test_to_arrow_table_packed_steps_none() -> None:
+    record = Record("loss", elements=[(None, 3.0), (None, 1.0)], storage="auto")
+    table = to_arrow_table({"loss": record})
+    assert table["step"].to_pylist() == [None, None]
+    assert table["value"].to_pylist() == [3.0, 1.0]
+
+
+@pyarrow_available
+def test_to_arrow_table_long_mixed_types() -> None:
+    table = to_arrow_table(create_mixed_manager())
+    assert table["value"].type == pa.string()
+    assert table["value"].to_pylist() == ['"abc"', '"def"', "2", "1", "3.0", "1.5"]
+
+
+@pyarrow_available
+def test_to_arrow_table_long_mixed_types_not_json() -> None:
+    with pytest.raises(ValueError, match=r"The values of the records have different types"):
+        to_arrow_table(
+            {
+                "a": Record("a", elements=[(0, b"abc")]),
+                "b": Record("b", elements=[(0, 1.0)]),
+            }
+        )
+
+
+@pyarrow_available
+def test_to_arrow_table_incorrect_values() -> None:
+    with pytest.raises(ValueError, match=r"The values of the 'a' record cannot be converted"):
+        to_arrow_table({"a": Record("a", elements=[(0, object())])})
+
+
+@pyarrow_available
+def test_to_arrow_table_wide() -> None:
+    table = to_arrow_table(create_manager(), layout="wide")
+    assert table.column_names == ["step", "loss", "accuracy"]
+    assert table["step"].to_pylist() == [0, 1, 2]
+    assert table["loss"].to_pylist() == [3.0, 1.0, 2.0]
+    assert table["accuracy"].to_pylist() == [None, 0.5, 0.7]
+
+
+@pyarrow_available
+def test_to_arrow_table_wide_mixed_step_types() -> None:
+    table = to_arrow_table(
+        {"a": Record("a", elements=[(0, 1.0)]), "b": Record("b", elements=[(0.5, 2.0)])},
+        layout="wide",
+    )
+    assert table["step"].to_pylist() == [0.0, 0.5]
+
+
+@pyarrow_available
+def test_to_arrow_table_wide_empty() -> None:
+    table = to_arrow_table({"loss": MinScalarRecord("loss")}, layout="wide")
+    assert table.column_names == ["step"]
+    assert table.num_rows == 0
+
+
+@pyarrow_available
+def test_to_arrow_table_wide_missing_step() -> None:
+    with pytest.raises(ValueError, match=r"The wide layout requires unique and not-null steps"):
+        to_arrow_table({"loss": Record("loss", elements=[(None, 1.0)])}, layout="wide")
+
+
+@pyarrow_available
+def test_to_arrow_table_wide_duplicate_step() -> None:
+    with pytest.raises(ValueError, match=r"The wide layout requires unique and not-null steps"):
+        to_arrow_table({"loss": Record("loss", elements=[(0, 1.0), (0, 2.0)])}, layout="wide")
+
+
+@pyarrow_available
+def test_to_arrow_table_incorrect_layout() -> None:
+    with pytest.raises(ValueError, match=r"Incorrect layout: square"):
+        to_arrow_table(create_manager(), layout="square")
+
+
+def test_to_arrow_table_without_pyarrow() -> None:
+    with (
+        patch("minrecord.utils.imports.is_pyarrow_available", lambda: False),
+        pytest.raises(RuntimeError, match=r"'pyarrow' package is required but not installed."),
+    ):
+        to_arrow_table(create_manager())
+
+
+######################################
+#     Tests for from_arrow_table     #
+######################################
+
+
+@objectory_available
+@pyarrow_available
+@pytest.mark.parametrize("layout", ["long", "wide"])
+def test_from_arrow_table(layout: str) -> None:
+    manager = create_manager()
+    assert objects_are_equal(
+        from_arrow_table(to_arrow_table(manager, layout=layout)).state_dict(),
+        manager.state_dict(),
+    )
+
+
+@objectory_available
+@pyarrow_available
+def test_from_arrow_table_max_size() -> None:
+    manager = RecordManager()
+    manager.add_record(MinScalarRecord.from_elements("loss", [(0, 3.0), (1, 1.0), (2, 2.0)]))
+    manager.add_record(MinScalarRecord("empty", max_size=2))
+    manager2 = from_arrow_table(to_arrow_table(manager))
+    assert objects_are_equal(manager2.state_dict(), manager.state_dict())
+
+
+@objectory_available
+@pyarrow_available
+@pytest.mark.parametrize("layout", ["long", "wide"])
+def test_from_arrow_table_mixed_types(layout: str) -> None:
+    manager = create_mixed_manager()
+    assert from_arrow_table(to_arrow_table(manager, layout=layout)).equal(manager)
+
+
+@pyarrow_available
+def test_from_arrow_table_int() -> None:
+    manager = RecordManager()
+    manager.add_record(MinScalarRecord.from_elements("count", [(0, 2), (1, 1)]))
+    manager2 = from_arrow_table(to_arrow_table(manager))
+    assert manager2.equal(manager)
+    assert manager2.get_record("count").get_most_recent() == ((0, 2), (1, 1))
+
+
+@pyarrow_available
+def test_from_arrow_table_pickled_metadata_untrusted() -> None:
+    manager = RecordManager()
+    manager.add_record(ComparableRecord("acc", MaxScalarComparator(), elements=[(0, 1.0)]))
+    with pytest.raises(ValueError, match=r"The table has pickled metadata"):
+        from_arrow_table(to_arrow_table(manager))
+
+
+@pyarrow_available
+def test_from_arrow_table_pickled_metadata_trusted() -> None:
+    manager = create_manager()
+    manager.add_record(ComparableRecord("acc", MaxScalarComparator(), elements=[(0, 1.0)]))
+    manager2 = from_arrow_table(to_arrow_table(manager), trusted=True)
+    assert list(manager2.get_records()) == ["loss", "accuracy", "acc"]
+    assert manager2.equal(manager)
+
+
+@pyarrow_available
+def test_from_arrow_table_long_without_metadata() -> None:
+    table = pa.table({"key": ["a", "b", "a"], "step": [0, 0, 1], "value": [1.0, 2.0, 3.0]})
+    manager = from_arrow_table(table)
+    assert manager.get_record("a").get_most_recent() == ((0, 1.0), (1, 3.0))
+    assert manager.get_record("b").get_most_recent() == ((0, 2.0),)
+    assert isinstance(manager.get_record("a"), Record)
+
+
+@pyarrow_available
+def test_from_arrow_table_wide_without_metadata() -> None:
+    table = pa.table({"step": [0, 1], "a": [1.0, None], "b": [2.0, 3.0]})
+    manager = from_arrow_table(table)
+    assert manager.get_record("a").get_most_recent() == ((0, 1.0),)
+    assert manager.get_record("b").get_most_recent() == ((0, 2.0), (1, 3.0))
+
+
+#################################################
+#     Tests for to_parquet and from_parquet     #
+#################################################
+
+
+@objectory_available
+@pyarrow_available
+@pytest.mark.parametrize("layout", ["long", "wide"])
+def test_parquet_round_trip(tmp_path: Path, layout: str) -> None:
+    path = tmp_path.joinpath("records.parquet")
+    manager = create_manager()
+    to_parquet(manager, path, layout=layout)
+    assert path.is_file()
+    assert objects_are_equal(from_parquet(path).state_dict(), manager.state_dict())
+
+
+@objectory_available
+@pyarrow_available
+def test_parquet_round_trip_mixed_types(tmp_path: Path) -> None:
+    path = tmp_path.joinpath("records.parquet")
+    manager = create_mixed_manager()
+    to_parquet(manager, path)
+    assert from_parquet(path).equal(manager)
+
+
+@pyarrow_available
+def test_from_parquet_pickled_metadata(tmp_path: Path) -> None:
+    path = tmp_path.joinpath("records.parquet")
+    manager = RecordManager()
+    manager.add_record(ComparableRecord("acc", MaxScalarComparator(), elements=[(0, 1.0)]))
+    to_parquet(manager, path)
+    with pytest.raises(ValueError, match=r"The table has pickled metadata"):
+        from_parquet(path)
+    assert from_parquet(path, trusted=True).equal(manager)
@@ -2,8 +2,14 @@ from __future__ import annotations
 
 from coola.equality.tester import get_default_registry
 
-from minrecord import BaseRecord
+from minrecord import BaseRecord, Record
+from minrecord.utils.memory import get_deep_size
 
 
 def test_equality_tester_registry_has_equality_tester() -> None:
     assert get_default_registry().has_equality_tester(BaseRecord)
+
+
+def test_base_record_memory_usage() -> None:
+    record = Record("loss", elements=[(0, 1.0)])
+    assert BaseRecord.memory_usage(record) == {"total": get_deep_size(record)}
@@ -7,11 +7,14 @@ from minrecord import (
     BaseRecord,
     ComparableRecord,
     EmptyRecordError,
+    KeyComparator,
+    LexicographicComparator,
     MaxScalarComparator,
     MaxScalarRecord,
     MinScalarComparator,
     MinScalarRecord,
 )
+from minrecord.config import config_scope
 from minrecord.testing import objectory_available
 from minrecord.utils.imports import is_objectory_available
 
@@ -51,6 +54,25 @@ def test_comparable_record_max_size(max_size: int) -> None:
     )
 
 
+def test_comparable_record_max_size_config_scope() -> None:
+    with config_scope(max_size=5):
+        assert ComparableRecord[float]("accuracy", MaxScalarComparator()).max_size == 5
+        assert MaxScalarRecord("accuracy").max_size == 5
+        assert MinScalarRecord("loss").max_size == 5
+
+
+def test_comparable_record_equal_true() -> None:
+    assert ComparableRecord("loss", MinScalarComparator()).equal(
+        ComparableRecord("loss", MinScalarComparator())
+    )
+
+
+def test_comparable_record_equal_false_different_comparators() -> None:
+    assert not ComparableRecord("loss", MinScalarComparator()).equal(
+        ComparableRecord("loss", MaxScalarComparator())
+    )
+
+
 def test_comparable_record_max_size_incorrect() -> None:
     with pytest.raises(ValueError, match=r"Record size must be greater than 0"):
         ComparableRecord[float]("accuracy", MaxScalarComparator(), max_size=0)
@@ -71,6 +93,76 @@ def test_comparable_record_add_value() -> None:
     )
 
 
+def test_comparable_record_update() -> None:
+    record = ComparableRecord[float]("accuracy", MaxScalarComparator())
+    record.update([(0, 2.0), (1, 4.0), (2, 3.0)])
+    assert record.get_most_recent() == ((0, 2.0), (1, 4.0), (2, 3.0))
+    assert record.get_best_value() == 4.0
+    assert not record.has_improved()
+
+
+def test_comparable_record_update_empty() -> None:
+    record = ComparableRecord[float]("accuracy", MaxScalarComparator())
+    record.update([])
+    assert record.is_empty()
+
+
+def test_comparable_record_update_same_as_add_value() -> None:
+    elements = [(step, float((step * 7) % 11)) for step in range(25)]
+    record1 = MinScalarRecord("loss", max_size=5)
+    record1.update(iter(elements))
+    record2 = MinScalarRecord("loss", max_size=5)
+    for step, value in elements:
+        record2.add_value(value, step)
+    assert record1.equal(record2)
+    assert record1.get_fingerprint() == record2.get_fingerprint()
+
+
+def test_comparable_record_update_lexicographic() -> None:
+    record = ComparableRecord("metrics", LexicographicComparator(["max", "min"]))
+    record.update([(0, (0.8, 0.1)), (1, (0.9, 0.5)), (2, (0.9, 0.4))])
+    assert record.get_best_value() == (0.9, 0.4)
+    assert record.has_improved()
+    record.add_value((0.9, 0.45), step=3)
+    assert record.get_best_value() == (0.9, 0.4)
+    assert not record.has_improved()
+
+
+def test_comparable_record_update_key_dict() -> None:
+    record = ComparableRecord("metrics", KeyComparator(key=lambda value: value["acc"]))
+    record.update([(0, {"acc": 0.8}), (1, {"acc": 0.9}), (2, {"acc": 0.7})])
+    assert record.get_best_value() == {"acc": 0.9}
+    assert not record.has_improved()
+
+
+def test_comparable_record_merge() -> None:
+    record1 = MinScalarRecord.from_elements("loss", [(0, 4.0), (1, 2.0), (2, 1.0)])
+    record2 = MinScalarRecord.from_elements("loss", [(0, 2.0), (1, 1.0), (2, 5.0)])
+    record = record1.merge([record2])
+    assert isinstance(record, MinScalarRecord)
+    assert record.get_most_recent() == ((0, 3.0), (1, 1.5), (2, 3.0))
+    assert record.get_best_value() == 1.5
+    assert not record.has_improved()
+
+
+def test_comparable_record_merge_improved() -> None:
+    record1 = MaxScalarRecord.from_elements("acc", [(0, 0.5), (1, 0.7)])
+    record2 = MaxScalarRecord.from_elements("acc", [(0, 0.6), (1, 0.8)])
+    record = record1.merge([record2], reduce="max")
+    assert record.get_best_value() == 0.8
+    assert record.has_improved()
+
+
+def test_comparable_record_merge_comparator() -> None:
+    record1 = ComparableRecord("acc", MaxScalarComparator(), max_size=5)
+    record1.update([(0, 1), (1, 3)])
+    record = record1.merge([MaxScalarRecord.from_elements("acc", [(1, 5)])], reduce="sum")
+    assert type(record) is ComparableRecord
+    assert record.max_size == 5
+    assert record.get_most_recent() == ((0, 1), (1, 8))
+    assert record.get_best_value() == 8
+
+
 def test_comparable_record_clone() -> None:
     record = ComparableRecord(
         name="accuracy",
@@ -85,6 +177,41 @@ def test_comparable_record_clone() -> None:
     assert record.equal(record_cloned)
 
 
+def test_comparable_record_clone_clock() -> None:
+    record = ComparableRecord(
+        name="accuracy", comparator=MaxScalarComparator(), elements=((0, 2),), clock="monotonic"
+    )
+    record.add_value(4, step=1)
+    record_cloned = record.clone()
+    assert record_cloned.clock == "monotonic"
+    assert record_cloned.get_timestamps() == record.get_timestamps()
+    assert record.equal(record_cloned)
+
+
+def test_min_scalar_record_clock() -> None:
+    record = MinScalarRecord("loss", clock="wall")
+    record.add_value(2.0, step=0)
+    assert record.config_dict()["clock"] == "wall"
+    assert BaseRecord.from_dict(record.to_dict()).equal(record)
+
+
+def test_comparable_record_clone_storage() -> None:
+    record = ComparableRecord(
+        name="accuracy", comparator=MaxScalarComparator(), elements=((0, 2),), storage="object"
+    )
+    record_cloned = record.clone()
+    assert record_cloned.storage == "object"
+    assert record_cloned.backend == "object"
+    assert record.equal(record_cloned)
+
+
+def test_max_scalar_record_storage() -> None:
+    record = MaxScalarRecord("accuracy", storage="auto")
+    record.add_value(2.0, step=0)
+    assert record.config_dict()["storage"] == "auto"
+    assert BaseRecord.from_dict(record.to_dict()).equal(record)
+
+
 def test_comparable_record_clone_empty() -> None:
     record = ComparableRecord[float](name="loss", comparator=MinScalarComparator())
     record_cloned = record.clone()
@@ -270,22 +397,28 @@ def test_comparable_record_load_state_dict_reset() -> None:
 
 
 def test_comparable_record_state_dict() -> None:
-    assert ComparableRecord(
+    record = ComparableRecord(
         "accuracy",
         MaxScalarComparator(),
         elements=((0, 1), (1, 5)),
         best_value=5,
         improved=True,
-    ).state_dict() == {
+    )
+    assert record.state_dict() == {
         "record": ((0, 1), (1, 5)),
+        "fingerprint": record.get_fingerprint(),
+        "backend": "object",
         "improved": True,
         "best_value": 5,
     }
 
 
 def test_comparable_record_state_dict_empty() -> None:
-    assert ComparableRecord("accuracy", MaxScalarComparator()).state_dict() == {
+    record = ComparableRecord("accuracy", MaxScalarComparator())
+    assert record.state_dict() == {
         "record": (),
+        "fingerprint": record.get_fingerprint(),
+        "backend": "object",
         "improved": False,
         "best_value": -float("inf"),
     }
@@ -443,6 +576,34 @@ def test_min_scalar_record_equal_false_different_types() -> None:
     assert not MinScalarRecord("loss").equal(MaxScalarRecord("loss"))
 
 
+def test_min_scalar_record_get_fingerprint() -> None:
+    assert (
+        MinScalarRecord.from_elements("loss", [(0, 2.0), (1, 1.0)]).get_fingerprint()
+        == MinScalarRecord.from_elements("loss", [(0, 2.0), (1, 1.0)]).get_fingerprint()
+    )
+
+
+def test_min_scalar_record_get_fingerprint_different_best_values() -> None:
+    record = MinScalarRecord("loss", max_size=1)
+    record.update([(0, 1.0), (1, 2.0)])
+    assert (
+        record.get_fingerprint()
+        != MinScalarRecord.from_elements("loss", [(1, 2.0)]).get_fingerprint()
+    )
+
+
+def test_min_scalar_record_equal_false_different_best_values() -> None:
+    record = MinScalarRecord.from_elements("loss", [(0, 1.0)])
+    record.load_state_dict({"record": ((0, 1.0),), "improved": True, "best_value": 0.5})
+    assert not record.equal(MinScalarRecord.from_elements("loss", [(0, 1.0)]))
+
+
+def test_min_scalar_record_equal_false_different_improved() -> None:
+    record = MinScalarRecord.from_elements("loss", [(0, 1.0)])
+    record.load_state_dict({"record": ((0, 1.0),), "improved": False, "best_value": 1.0})
+    assert not record.equal(MinScalarRecord.from_elements("loss", [(0, 1.0)]))
+
+
 def test_min_scalar_record_get_best_value_last_is_best() -> None:
     record = MinScalarRecord("loss")
     record.add_value(2, step=0)
@@ -2,7 +2,20 @@ from __future__ import annotations
 
 from coola.equality.tester import get_default_registry
 
-from minrecord import BaseComparator, MaxScalarComparator, MinScalarComparator
+import pickle
+from operator import itemgetter
+
+import pytest
+from coola.equality import objects_are_equal
+
+from minrecord import (
+    BaseComparator,
+    KeyComparator,
+    LexicographicComparator,
+    MaxScalarComparator,
+    MinScalarComparator,
+    ParetoComparator,
+)
 
 #########################################
 #     Tests for MaxScalarComparator     #
@@ -66,5 +79,296 @@ def test_min_scalar_is_better_float() -> None:
     assert comparator.is_better(12.2, 5.1)
 
 
+##############################################
+#     Tests for BaseComparator.find_best     #
+##############################################
+
+
+def test_find_best_improved() -> None:
+    assert MaxScalarComparator().find_best(0.5, [0.2, 0.6, 0.8]) == (0.8, True)
+
+
+def test_find_best_not_improved() -> None:
+    assert MaxScalarComparator().find_best(0.5, [0.2, 0.6, 0.3]) == (0.6, False)
+
+
+def test_find_best_equal() -> None:
+    assert MinScalarComparator().find_best(0.5, [0.5]) == (0.5, True)
+
+
+def test_find_best_same_as_is_better() -> None:
+    comparator = MinScalarComparator()
+    values = [3.0, 1.0, 2.0, 1.0, 0.5, 0.7]
+    best_value, improved = comparator.get_initial_best_value(), False
+    for value in values:
+        improved = comparator.is_better(old_value=best_value, new_value=value)
+        if improved:
+            best_value = value
+    assert comparator.find_best(comparator.get_initial_best_value(), values) == (
+        best_value,
+        improved,
+    )
+
+
+###################################
+#     Tests for KeyComparator     #
+###################################
+
+
+def test_key_repr() -> None:
+    assert repr(KeyComparator(key=len, mode="min")).startswith("KeyComparator(key=<built-in")
+
+
+def test_key_mode() -> None:
+    assert KeyComparator(key=len).mode == "max"
+
+
+def test_key_mode_incorrect() -> None:
+    with pytest.raises(ValueError, match=r"Incorrect mode: avg"):
+        KeyComparator(key=len, mode="avg")
+
+
+def test_key_equal_true() -> None:
+    assert KeyComparator(key=len, mode="min").equal(KeyComparator(key=len, mode="min"))
+
+
+def test_key_equal_false_different_keys() -> None:
+    assert not KeyComparator(key=len).equal(KeyComparator(key=abs))
+
+
+def test_key_equal_false_different_modes() -> None:
+    assert not KeyComparator(key=len, mode="min").equal(KeyComparator(key=len, mode="max"))
+
+
+def test_key_equal_false_different_types() -> None:
+    assert not KeyComparator(key=len).equal(MaxScalarComparator())
+
+
+def test_key_get_initial_best_value() -> None:
+    assert KeyComparator(key=len).get_initial_best_value() is None
+
+
+def test_key_get_key() -> None:
+    assert KeyComparator(key=lambda value: value["acc"]).get_key({"acc": 0.9}) == 0.9
+
+
+def test_key_is_better_max() -> None:
+    comparator = KeyComparator(key=lambda value: value["acc"])
+    assert comparator.is_better(old_value={"acc": 0.8}, new_value={"acc": 0.9})
+    assert comparator.is_better(old_value={"acc": 0.9}, new_value={"acc": 0.9})
+    assert not comparator.is_better(old_value={"acc": 0.9}, new_value={"acc": 0.8})
+
+
+def test_key_is_better_min() -> None:
+    comparator = KeyComparator(key=len, mode="min")
+    assert comparator.is_better(old_value="abc", new_value="ab")
+    assert not comparator.is_better(old_value="ab", new_value="abc")
+
+
+def test_key_is_better_initial_best_value() -> None:
+    assert KeyComparator(key=len).is_better(old_value=None, new_value="")
+
+
+def test_key_is_better_same_value_twice() -> None:
+    comparator = KeyComparator(key=lambda value: value["acc"])
+    value = {"acc": 0.9}
+    assert comparator.is_better(old_value=None, new_value=value)
+    value["acc"] = 0.5
+    assert not comparator.is_better(old_value=value, new_value={"acc": 0.4})
+
+
+def test_key_find_best() -> None:
+    comparator = KeyComparator(key=len, mode="min")
+    assert comparator.find_best(None, ["abc", "a", "ab"]) == ("a", False)
+    assert comparator.find_best("ab", ["abc", "a"]) == ("a", True)
+
+
+def test_key_find_best_computes_keys_once() -> None:
+    calls = []
+
+    def key(value: float) -> float:
+        calls.append(value)
+        return value
+
+    comparator = KeyComparator(key=key)
+    assert comparator.find_best(None, [1.0, 3.0, 2.0]) == (3.0, False)
+    assert comparator.find_best(3.0, [4.0]) == (4.0, True)
+    assert calls == [1.0, 3.0, 2.0, 3.0, 4.0]
+
+
+def test_key_pickle() -> None:
+    comparator = KeyComparator(key=itemgetter("acc"), mode="min")
+    loaded = pickle.loads(pickle.dumps(comparator))  # noqa: S301
+    assert loaded.mode == "min"
+    assert loaded.is_better(old_value={"acc": 0.9}, new_value={"acc": 0.8})
+
+
+def test_key_pickle_lambda() -> None:
+    comparator = KeyComparator(key=lambda value: value["acc"])
+    with pytest.raises(TypeError, match=r"cannot be pickled, so the comparator cannot be pickled"):
+        pickle.dumps(comparator)
+
+
+#############################################
+#     Tests for LexicographicComparator     #
+#############################################
+
+
+def test_lexicographic_repr() -> None:
+    assert (
+        repr(LexicographicComparator(["max", "min"]))
+        == "LexicographicComparator(modes=('max', 'min'), keys=(0, 1))"
+    )
+
+
+def test_lexicographic_modes() -> None:
+    assert LexicographicComparator(["max", "min"]).modes == ("max", "min")
+
+
+def test_lexicographic_modes_empty() -> None:
+    with pytest.raises(ValueError, match=r"modes cannot be empty"):
+        LexicographicComparator([])
+
+
+def test_lexicographic_modes_incorrect() -> None:
+    with pytest.raises(ValueError, match=r"Incorrect mode: avg"):
+        LexicographicComparator(["max", "avg"])
+
+
+def test_lexicographic_keys_incorrect() -> None:
+    with pytest.raises(ValueError, match=r"keys and modes must have the same length"):
+        LexicographicComparator(["max", "min"], keys=["accuracy"])
+
+
+def test_lexicographic_equal_true() -> None:
+    assert LexicographicComparator(["max", "min"], keys=["a", "b"]).equal(
+        LexicographicComparator(("max", "min"), keys=("a", "b"))
+    )
+
+
+def test_lexicographic_equal_false_different_modes() -> None:
+    assert not LexicographicComparator(["max", "min"]).equal(
+        LexicographicComparator(["max", "max"])
+    )
+
+
+def test_lexicographic_equal_false_different_keys() -> None:
+    assert not LexicographicComparator(["max"], keys=["a"]).equal(
+        LexicographicComparator(["max"], keys=["b"])
+    )
+
+
+def test_lexicographic_get_key() -> None:
+    assert LexicographicComparator(["max", "min"]).get_key((0.9, 0.5)) == (0.9, -0.5)
+
+
+def test_lexicographic_is_better_tuple() -> None:
+    comparator = LexicographicComparator(["max", "min"])
+    assert comparator.is_better(old_value=(0.8, 0.1), new_value=(0.9, 0.5))
+    assert comparator.is_better(old_value=(0.9, 0.5), new_value=(0.9, 0.4))
+    assert comparator.is_better(old_value=(0.9, 0.5), new_value=(0.9, 0.5))
+    assert not comparator.is_better(old_value=(0.9, 0.4), new_value=(0.9, 0.5))
+    assert not comparator.is_better(old_value=(0.9, 0.5), new_value=(0.8, 0.1))
+
+
+def test_lexicographic_is_better_dict() -> None:
+    comparator = LexicographicComparator(["max", "min"], keys=["accuracy", "loss"])
+    assert comparator.is_better(
+        old_value={"accuracy": 0.9, "loss": 0.5}, new_value={"accuracy": 0.9, "loss": 0.4}
+    )
+    assert not comparator.is_better(
+        old_value={"accuracy": 0.9, "loss": 0.5}, new_value={"accuracy": 0.8, "loss": 0.1}
+    )
+
+
+def test_lexicographic_find_best() -> None:
+    comparator = LexicographicComparator(["max", "min"])
+    assert comparator.find_best(None, [(0.8, 0.1), (0.9, 0.5), (0.9, 0.4), (0.7, 0.0)]) == (
+        (0.9, 0.4),
+        False,
+    )
+
+
+def test_lexicographic_pickle() -> None:
+    comparator = LexicographicComparator(["max", "min"], keys=["accuracy", "loss"])
+    assert pickle.loads(pickle.dumps(comparator)).equal(comparator)  # noqa: S301
+
+
+######################################
+#     Tests for ParetoComparator     #
+######################################
+
+
+def test_pareto_repr() -> None:
+    assert repr(ParetoComparator(["max", "min"])) == "ParetoComparator(modes=('max', 'min'))"
+
+
+def test_pareto_modes() -> None:
+    comparator = ParetoComparator(["max", "min", "min"])
+    assert comparator.modes == ("max", "min", "min")
+    assert comparator.num_objectives == 3
+
+
+def test_pareto_modes_empty() -> None:
+    with pytest.raises(ValueError, match=r"modes cannot be empty"):
+        ParetoComparator([])
+
+
+def test_pareto_modes_incorrect() -> None:
+    with pytest.raises(ValueError, match=r"Incorrect mode: avg"):
+        ParetoComparator(["max", "avg"])
+
+
+def test_pareto_equal_true() -> None:
+    assert ParetoComparator(["max", "min"]).equal(ParetoComparator(("max", "min")))
+
+
+def test_pareto_equal_false_different_modes() -> None:
+    assert not ParetoComparator(["max", "min"]).equal(ParetoComparator(["min", "max"]))
+
+
+def test_pareto_equal_false_different_types() -> None:
+    assert not ParetoComparator(["max"]).equal(MaxScalarComparator())
+
+
+def test_pareto_objects_are_equal() -> None:
+    assert objects_are_equal(ParetoComparator(["max", "min"]), ParetoComparator(["max", "min"]))
+
+
+def test_pareto_get_initial_best_value() -> None:
+    assert ParetoComparator(["max", "min"]).get_initial_best_value() == (
+        -float("inf"),
+        float("inf"),
+    )
+
+
+def test_pareto_dominates() -> None:
+    comparator = ParetoComparator(["max", "min"])
+    assert comparator.dominates((0.9, 10.0), (0.8, 12.0))
+    assert comparator.dominates((0.9, 10.0), (0.9, 12.0))
+    assert comparator.dominates((0.9, 10.0), (0.8, 10.0))
+    assert not comparator.dominates((0.9, 10.0), (0.9, 10.0))
+    assert not comparator.dominates((0.9, 10.0), (0.95, 12.0))
+    assert not comparator.dominates((0.8, 12.0), (0.9, 10.0))
+
+
+def test_pareto_dominates_int() -> None:
+    assert ParetoComparator(["min", "min", "max"]).dominates((1, 2, 3), (1, 3, 3))
+
+
+def test_pareto_is_better() -> None:
+    comparator = ParetoComparator(["max", "min"])
+    assert comparator.is_better(old_value=(0.8, 12.0), new_value=(0.9, 10.0))
+    assert comparator.is_better(old_value=(0.8, 12.0), new_value=(0.8, 12.0))
+    assert not comparator.is_better(old_value=(0.8, 12.0), new_value=(0.9, 13.0))
+
+
+def test_pareto_is_better_initial_best_value() -> None:
+    comparator = ParetoComparator(["max", "min"])
+    assert comparator.is_better(
+        old_value=comparator.get_initial_best_value(), new_value=(0.9, 10.0)
+    )
+
+
 def test_equality_tester_registry_has_equality_tester() -> None:
     assert get_default_registry().has_equality_tester(BaseComparator)
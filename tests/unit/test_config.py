@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import threading
 from typing import TYPE_CHECKING
 
 import pytest
 
 from minrecord.config import (
     Config,
+    config_scope,
     get_default_config,
     get_max_size,
+    get_memory_budget,
     reset_max_size,
+    reset_memory_budget,
     set_max_size,
+    set_memory_budget,
 )
 
 if TYPE_CHECKING:
@@ -229,6 +235,43 @@ def test_attribute_storage_location() -> None:
     assert get_default_config._config is config
 
 
+def test_config_init_default_memory_budget() -> None:
+    """Test that Config initializes without memory budget."""
+    assert Config().get_memory_budget() is None
+
+
+def test_config_set_memory_budget() -> None:
+    """Test setting memory_budget to a valid positive integer."""
+    config = Config()
+    config.set_memory_budget(1024)
+    assert config.get_memory_budget() == 1024
+
+
+def test_config_set_memory_budget_none() -> None:
+    """Test removing the memory budget."""
+    config = Config()
+    config.set_memory_budget(1024)
+    config.set_memory_budget(None)
+    assert config.get_memory_budget() is None
+
+
+@pytest.mark.parametrize("memory_budget", [0, -1, 1.5, "1024"])
+def test_config_set_memory_budget_incorrect(memory_budget: object) -> None:
+    """Test that setting an incorrect memory_budget raises
+    ValueError."""
+    config = Config()
+    with pytest.raises(ValueError, match=r"memory_budget must be a positive integer or None"):
+        config.set_memory_budget(memory_budget)
+
+
+def test_config_reset_memory_budget() -> None:
+    """Test resetting memory_budget to the default value."""
+    config = Config()
+    config.set_memory_budget(1024)
+    config.reset_memory_budget()
+    assert config.get_memory_budget() == Config.DEFAULT_MEMORY_BUDGET
+
+
 ##################################
 #     Tests for get_max_size     #
 ##################################
@@ -261,3 +304,163 @@ def test_reset_max_size() -> None:
     assert get_max_size() == 5
     reset_max_size()
     assert get_max_size() == Config.DEFAULT_MAX_SIZE
+
+
+#######################################
+#     Tests for get_memory_budget     #
+#######################################
+
+
+def test_get_memory_budget() -> None:
+    """Test getting the memory_budget."""
+    assert get_memory_budget() is None
+
+
+#######################################
+#     Tests for set_memory_budget     #
+#######################################
+
+
+def test_set_memory_budget() -> None:
+    """Test setting memory_budget to a valid positive integer."""
+    set_memory_budget(1024)
+    assert get_memory_budget() == 1024
+
+
+#########################################
+#     Tests for reset_memory_budget     #
+#########################################
+
+
+def test_reset_memory_budget() -> None:
+    """Test resetting memory_budget to the default value."""
+    set_memory_budget(1024)
+    reset_memory_budget()
+    assert get_memory_budget() is None
+
+
+##################################
+#     Tests for config_scope     #
+##################################
+
+
+def test_config_scope_max_size() -> None:
+    """Test overriding max_size in a scope."""
+    with config_scope(max_size=5):
+        assert get_max_size() == 5
+    assert get_max_size() == 10
+
+
+def test_config_scope_memory_budget() -> None:
+    """Test overriding memory_budget in a scope."""
+    with config_scope(memory_budget=1024):
+        assert get_memory_budget() == 1024
+    assert get_memory_budget() is None
+
+
+def test_config_scope_memory_budget_none() -> None:
+    """Test removing the memory budget in a scope."""
+    set_memory_budget(1024)
+    with config_scope(memory_budget=None):
+        assert get_memory_budget() is None
+    assert get_memory_budget() == 1024
+
+
+def test_config_scope_does_not_change_default_config() -> None:
+    """Test that a scope does not change the global config."""
+    with config_scope(max_size=5, memory_budget=1024):
+        assert get_default_config().get_max_size() == 10
+        assert get_default_config().get_memory_budget() is None
+
+
+def test_config_scope_empty() -> None:
+    """Test that a scope without values keeps the current values."""
+    set_max_size(7)
+    with config_scope():
+        assert get_max_size() == 7
+        assert get_memory_budget() is None
+
+
+def test_config_scope_overrides_set_max_size() -> None:
+    """Test that a scope has priority over the global config."""
+    with config_scope(max_size=5):
+        set_max_size(7)
+        assert get_max_size() == 5
+    assert get_max_size() == 7
+
+
+def test_config_scope_nested() -> None:
+    """Test nested scopes."""
+    with config_scope(max_size=5, memory_budget=1024):
+        with config_scope(max_size=3):
+            assert get_max_size() == 3
+            assert get_memory_budget() == 1024
+        assert get_max_size() == 5
+    assert get_max_size() == 10
+
+
+def test_config_scope_restore_on_error() -> None:
+    """Test that the values are restored if an exception is raised."""
+
+    def fail() -> None:
+        with config_scope(max_size=5):
+            msg = "abc"
+            raise RuntimeError(msg)
+
+    with pytest.raises(RuntimeError, match="abc"):
+        fail()
+    assert get_max_size() == 10
+
+
+@pytest.mark.parametrize("max_size", [0, -1, 1.5])
+def test_config_scope_incorrect_max_size(max_size: float) -> None:
+    """Test that an invalid max_size raises an error."""
+    with pytest.raises(ValueError, match="max_size must be a positive integer"):
+        config_scope(max_size=max_size).__enter__()
+    assert get_max_size() == 10
+
+
+def test_config_scope_incorrect_memory_budget() -> None:
+    """Test that an invalid memory_budget raises an error and does not
+    change max_size."""
+    with (
+        pytest.raises(ValueError, match="memory_budget must be a positive integer or None"),
+        config_scope(max_size=5, memory_budget=0),
+    ):
+        pass
+    assert get_max_size() == 10
+
+
+def test_config_scope_threads() -> None:
+    """Test that the scopes of different threads are independent."""
+    barrier = threading.Barrier(2)
+    results = {}
+
+    def worker(max_size: int) -> None:
+        with config_scope(max_size=max_size):
+            barrier.wait()
+            results[max_size] = get_max_size()
+            barrier.wait()
+
+    threads = [threading.Thread(target=worker, args=(size,)) for size in (3, 5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {3: 3, 5: 5}
+    assert get_max_size() == 10
+
+
+def test_config_scope_asyncio_tasks() -> None:
+    """Test that the scopes of different asyncio tasks are
+    independent."""
+
+    async def worker(max_size: int) -> int:
+        with config_scope(max_size=max_size):
+            await asyncio.sleep(0)
+            return get_max_size()
+
+    async def main() -> list[int]:
+        return await asyncio.gather(worker(3), worker(5))
+
+    assert asyncio.run(main()) == [3, 5]
@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import re
+
 import pytest
 
 from minrecord import (
@@ -10,6 +12,7 @@ from minrecord import (
     get_best_values,
     get_last_values,
 )
+from minrecord.functional import select_records
 
 
 @pytest.fixture
@@ -47,6 +50,10 @@ def test_get_best_values_empty() -> None:
     assert get_best_values({}) == {}
 
 
+def test_get_best_values_pattern(records: dict[str, BaseRecord]) -> None:
+    assert get_best_values(records, pattern="*o*") == {"loss": 1.2}
+
+
 #####################################
 #     Tests for get_last_values     #
 #####################################
@@ -74,3 +81,31 @@ def test_get_last_values_suffix(records: dict[str, BaseRecord]) -> None:
 
 def test_get_last_values_empty() -> None:
     assert get_last_values({}) == {}
+
+
+def test_get_last_values_pattern(records: dict[str, BaseRecord]) -> None:
+    assert get_last_values(records, pattern=re.compile(r"(loss|epoch)")) == {
+        "loss": 1.2,
+        "epoch": 1,
+    }
+
+
+####################################
+#     Tests for select_records     #
+####################################
+
+
+def test_select_records_glob(records: dict[str, BaseRecord]) -> None:
+    assert list(select_records(records, "*c*")) == ["accuracy", "epoch"]
+
+
+def test_select_records_regex(records: dict[str, BaseRecord]) -> None:
+    assert list(select_records(records, re.compile(r"f\d"))) == ["f1"]
+
+
+def test_select_records_regex_full_match(records: dict[str, BaseRecord]) -> None:
+    assert select_records(records, re.compile(r"los")) == {}
+
+
+def test_select_records_empty() -> None:
+    assert select_records({}, "*") == {}
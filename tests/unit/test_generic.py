@@ -1,7 +1,16 @@
 from __future__ import annotations
 
+import math
+import random
+import sys
+from bisect import bisect_left, bisect_right
+from typing import Any
+from unittest.mock import patch
+
 import pytest
 from coola.equality import objects_are_equal
+from coola.testing.fixtures import numpy_available
+from coola.utils.imports import is_numpy_available
 
 from minrecord import (
     BaseRecord,
@@ -10,13 +19,14 @@ from minrecord import (
     NotAComparableRecordError,
     Record,
 )
+from minrecord.config import config_scope, reset_max_size, set_max_size
+from minrecord.generic import TimestampBuffer, elements_are_equal
+from minrecord.registry import OBJECT_TARGET
+from minrecord.storage import PackedStorage
 from minrecord.testing import objectory_available, objectory_not_available
-from minrecord.utils.imports import is_objectory_available
 
-if is_objectory_available():
-    from objectory import OBJECT_TARGET
-else:  # pragma: no cover
-    from minrecord.utils.fallback.objectory import OBJECT_TARGET
+if is_numpy_available():
+    import numpy as np
 
 ############################
 #     Tests for Record     #
@@ -41,6 +51,25 @@ def test_record_init_max_size(max_size: int) -> None:
     assert Record("loss", max_size=max_size).max_size == max_size
 
 
+def test_record_init_max_size_default() -> None:
+    assert Record("loss").max_size == 10
+
+
+def test_record_init_max_size_config_scope() -> None:
+    with config_scope(max_size=5):
+        assert Record("loss").max_size == 5
+        assert Record("loss", max_size=3).max_size == 3
+    assert Record("loss").max_size == 10
+
+
+def test_record_init_max_size_set_max_size() -> None:
+    set_max_size(5)
+    try:
+        assert Record("loss").max_size == 5
+    finally:
+        reset_max_size()
+
+
 def test_record_init_max_size_incorrect() -> None:
     with pytest.raises(ValueError, match=r"Record size must be greater than 0"):
         Record("loss", max_size=0)
@@ -53,6 +82,39 @@ def test_record_add_value() -> None:
     )
 
 
+@pytest.mark.parametrize("storage", ["auto", "object"])
+def test_record_add_value_incomparable_steps(storage: str) -> None:
+    record = Record("loss", max_size=3, storage=storage)
+    record.add_value(1.0, step="epoch1")
+    record.add_value(2.0, step=2)
+    record.add_value(3.0, step="epoch3")
+    record.add_value(4.0, step=4)
+    assert record.get_most_recent() == ((2, 2.0), ("epoch3", 3.0), (4, 4.0))
+    assert record._num_unsorted == record._count_unsorted() == 2
+    record.add_value(5.0, step=5)
+    assert record._num_unsorted == record._count_unsorted() == 1
+    record.add_value(6.0, step=6)
+    assert record._has_sorted_steps()
+    assert record.get_range(5, 6) == ((5, 5.0), (6, 6.0))
+
+
+def test_record_add_value_max_size_1_unsorted_steps() -> None:
+    record = Record("loss", max_size=1)
+    record.update([(2, 1.0), (1, 2.0), (None, 3.0)])
+    assert record.get_most_recent() == ((None, 3.0),)
+    assert record._num_unsorted == record._count_unsorted() == 0
+
+
+def test_record_add_value_after_resize_unsorted_steps() -> None:
+    record = Record("loss", elements=[(0, 1.0), (5, 2.0)])
+    record.resize(1)
+    record.add_value(3.0, step=4)
+    assert record._num_unsorted == record._count_unsorted() == 0
+    record.resize(3)
+    record.add_value(4.0, step=1)
+    assert record._num_unsorted == record._count_unsorted() == 1
+
+
 def test_record_add_value_list() -> None:
     record = Record[list]("loss")
     record.add_value([1, 2, 3])
@@ -107,6 +169,266 @@ def test_record_equal_false_different_types_record() -> None:
     assert not Record("loss").equal(MinScalarRecord("loss"))
 
 
+def test_record_equal_false_different_lengths() -> None:
+    assert not Record("loss", elements=((None, 35), (1, 42))).equal(
+        Record("loss", elements=((None, 35),))
+    )
+
+
+def test_record_equal_false_different_value_types() -> None:
+    assert not Record("loss", elements=((0, 1),)).equal(Record("loss", elements=((0, 1.0),)))
+
+
+def test_record_equal_false_different_step_types() -> None:
+    assert not Record("loss", elements=((0, 1.0),)).equal(Record("loss", elements=((0.0, 1.0),)))
+
+
+@numpy_available
+def test_record_equal_true_arrays() -> None:
+    assert Record("loss", elements=((0, np.ones(3)),)).equal(
+        Record("loss", elements=((0, np.ones(3)),))
+    )
+
+
+@numpy_available
+def test_record_equal_false_arrays() -> None:
+    assert not Record("loss", elements=((0, np.ones(3)),)).equal(
+        Record("loss", elements=((0, np.zeros(3)),))
+    )
+
+
+########################################
+#     Tests for elements_are_equal     #
+########################################
+
+
+def test_elements_are_equal_true() -> None:
+    assert elements_are_equal([(0, 1.0), (None, "abc")], [(0, 1.0), (None, "abc")])
+
+
+def test_elements_are_equal_true_empty() -> None:
+    assert elements_are_equal([], [])
+
+
+def test_elements_are_equal_false_different_values() -> None:
+    assert not elements_are_equal([(0, 1.0)], [(0, 2.0)])
+
+
+def test_elements_are_equal_false_different_types() -> None:
+    assert not elements_are_equal([(0, True)], [(0, 1)])
+
+
+def test_elements_are_equal_packed() -> None:
+    assert elements_are_equal(
+        PackedStorage(3, [(0, 1.0), (1, math.nan)]), PackedStorage(3, [(0, 1.0), (1, math.nan)])
+    )
+
+
+def test_elements_are_equal_packed_false_different_types() -> None:
+    assert not elements_are_equal(PackedStorage(3, [(0, 1)]), PackedStorage(3, [(0, 1.0)]))
+    assert not elements_are_equal(PackedStorage(3, [(0, 1.0)]), PackedStorage(3, [(0.0, 1.0)]))
+
+
+@numpy_available
+def test_elements_are_equal_arrays() -> None:
+    assert elements_are_equal([(0, np.ones(3))], [(0, np.ones(3))])
+
+
+def test_record_get_fingerprint_empty() -> None:
+    assert Record("loss").get_fingerprint() == 0
+
+
+def test_record_get_fingerprint_same_values() -> None:
+    assert (
+        Record("loss", elements=((None, 35), (1, "abc"))).get_fingerprint()
+        == Record("loss", elements=((None, 35), (1, "abc"))).get_fingerprint()
+    )
+
+
+def test_record_get_fingerprint_different_values() -> None:
+    assert (
+        Record("loss", elements=((0, 1.0), (1, 2.0))).get_fingerprint()
+        != Record("loss", elements=((0, 1.0), (1, 3.0))).get_fingerprint()
+    )
+
+
+def test_record_get_fingerprint_different_orders() -> None:
+    assert (
+        Record("loss", elements=((0, 1.0), (1, 2.0))).get_fingerprint()
+        != Record("loss", elements=((1, 2.0), (0, 1.0))).get_fingerprint()
+    )
+
+
+def test_record_get_fingerprint_add_value() -> None:
+    record = Record("loss")
+    record.add_value(1.0, step=0)
+    record.add_value("abc")
+    assert (
+        record.get_fingerprint()
+        == Record("loss", elements=((0, 1.0), (None, "abc"))).get_fingerprint()
+    )
+
+
+def test_record_get_fingerprint_cached() -> None:
+    record = Record("loss", elements=((0, 1.0),))
+    fingerprint = record.get_fingerprint()
+    with patch.object(record, "_compute_fingerprint") as compute:
+        assert record.get_fingerprint() == fingerprint
+    compute.assert_not_called()
+    record.add_value(2.0, step=1)
+    assert record.get_fingerprint() != fingerprint
+
+
+@pytest.mark.parametrize("max_size", [1, 3, 10])
+def test_record_get_fingerprint_eviction(max_size: int) -> None:
+    record = Record("loss", max_size=max_size)
+    record.update([(i, i / 3) for i in range(25)])
+    expected = Record("loss", elements=[(i, i / 3) for i in range(25 - max_size, 25)])
+    assert record.get_fingerprint() == expected.get_fingerprint()
+
+
+@pytest.mark.parametrize("storage", ["auto", "object"])
+@pytest.mark.parametrize("num_values", [1, 2, 3])
+def test_record_get_fingerprint_update_eviction(storage: str, num_values: int) -> None:
+    record = Record("loss", max_size=12, storage=storage)
+    record.update([(i, i / 3) for i in range(10)])
+    record.get_fingerprint()
+    with patch.object(record, "_compute_fingerprint") as compute:
+        record.update([(i, i / 3) for i in range(10, 10 + num_values)])
+        fingerprint = record.get_fingerprint()
+    compute.assert_not_called()
+    expected = Record("loss", elements=record.get_most_recent(), max_size=12)
+    assert fingerprint == expected.get_fingerprint()
+
+
+def test_record_get_fingerprint_update_many_values() -> None:
+    record = Record("loss", max_size=4)
+    record.update([(i, i / 3) for i in range(4)])
+    record.get_fingerprint()
+    record.update([(i, i / 3) for i in range(4, 6)])
+    assert not record._evicted_elements
+    expected = Record("loss", elements=[(i, i / 3) for i in range(2, 6)])
+    assert record.get_fingerprint() == expected.get_fingerprint()
+
+
+def test_record_get_fingerprint_load_state_dict() -> None:
+    record = Record("loss")
+    record.load_state_dict({"record": ((0, 1.0), (1, 2.0))})
+    assert (
+        record.get_fingerprint() == Record("loss", elements=((0, 1.0), (1, 2.0))).get_fingerprint()
+    )
+
+
+def test_record_get_fingerprint_clone() -> None:
+    record = Record("loss", elements=((0, 1.0), (1, 2.0)))
+    assert record.clone().get_fingerprint() == record.get_fingerprint()
+
+
+def test_record_get_value_at_step() -> None:
+    record = Record("loss", elements=[(0, 2.0), (1, 1.2), (3, 0.8)])
+    assert record.get_value_at_step(0) == 2.0
+    assert record.get_value_at_step(1) == 1.2
+    assert record.get_value_at_step(3) == 0.8
+
+
+def test_record_get_value_at_step_duplicate_steps() -> None:
+    assert Record("loss", elements=[(0, 2.0), (1, 1.2), (1, 0.8)]).get_value_at_step(1) == 0.8
+
+
+def test_record_get_value_at_step_unsorted_steps() -> None:
+    record = Record("loss", elements=[(2, 2.0), (None, 1.5), (1, 1.2), (2, 0.8)])
+    assert not record._has_sorted_steps()
+    assert record.get_value_at_step(1) == 1.2
+    assert record.get_value_at_step(2) == 0.8
+
+
+def test_record_get_value_at_step_none_step() -> None:
+    assert not Record("loss", elements=[(None, 2.0)])._has_sorted_steps()
+
+
+@pytest.mark.parametrize("step", [-1, 2, 4, 1.5])
+@pytest.mark.parametrize("elements", [[(0, 2.0), (1, 1.2), (3, 0.8)], [(3, 2.0), (1, 1.2), (0, 1)]])
+def test_record_get_value_at_step_missing(step: float, elements: list) -> None:
+    with pytest.raises(KeyError, match=r"'loss' record does not have a value at step"):
+        Record("loss", elements=elements).get_value_at_step(step)
+
+
+def test_record_get_value_at_step_empty() -> None:
+    with pytest.raises(KeyError, match=r"'loss' record does not have a value at step 0"):
+        Record("loss").get_value_at_step(0)
+
+
+def test_record_get_value_at_step_eviction() -> None:
+    record = Record("loss", max_size=3)
+    record.update([(5, 0.0), (0, 1.0), (1, 2.0)])
+    assert not record._has_sorted_steps()
+    assert record.get_value_at_step(5) == 0.0
+    record.add_value(3.0, step=2)
+    assert record._has_sorted_steps()
+    assert record.get_value_at_step(2) == 3.0
+    with pytest.raises(KeyError, match=r"'loss' record does not have a value at step 5"):
+        record.get_value_at_step(5)
+
+
+def test_record_get_value_at_step_load_state_dict() -> None:
+    record = Record("loss")
+    record.load_state_dict({"record": ((1, 1.0), (0, 2.0))})
+    assert not record._has_sorted_steps()
+    assert record.get_value_at_step(0) == 2.0
+    record.load_state_dict({"record": ((0, 1.0), (1, 2.0))})
+    assert record._has_sorted_steps()
+    assert record.get_value_at_step(0) == 1.0
+
+
+def test_record_get_range() -> None:
+    record = Record("loss", elements=[(0, 2.0), (1, 1.2), (2, 0.8), (3, 0.5)])
+    assert record.get_range(1, 2) == ((1, 1.2), (2, 0.8))
+    assert record.get_range(0.5, 2.5) == ((1, 1.2), (2, 0.8))
+
+
+def test_record_get_range_open() -> None:
+    record = Record("loss", elements=[(0, 2.0), (1, 1.2), (2, 0.8), (3, 0.5)])
+    assert record.get_range() == record.get_most_recent()
+    assert record.get_range(start_step=2) == ((2, 0.8), (3, 0.5))
+    assert record.get_range(end_step=1) == ((0, 2.0), (1, 1.2))
+
+
+def test_record_get_range_empty() -> None:
+    assert Record("loss").get_range(0, 10) == ()
+
+
+def test_record_get_range_no_match() -> None:
+    assert Record("loss", elements=[(0, 2.0), (1, 1.2)]).get_range(5, 10) == ()
+
+
+def test_record_get_range_unsorted_steps() -> None:
+    record = Record("loss", elements=[(3, 2.0), (None, 1.5), (1, 1.2), (2, 0.8), (1, 0.5)])
+    assert record.get_range(1, 2) == ((1, 1.2), (2, 0.8), (1, 0.5))
+    assert record.get_range() == ((3, 2.0), (1, 1.2), (2, 0.8), (1, 0.5))
+
+
+def test_record_get_range_index_invalidated() -> None:
+    record = Record("loss", elements=[(3, 2.0), (1, 1.2)])
+    assert record.get_range(1, 3) == ((3, 2.0), (1, 1.2))
+    record.add_value(0.5, step=2)
+    assert record.get_range(1, 3) == ((3, 2.0), (1, 1.2), (2, 0.5))
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_record_step_queries_match_scan(seed: int) -> None:
+    rng = random.Random(seed)  # noqa: S311
+    record = Record("loss", max_size=7)
+    for i in range(50):
+        step = i if rng.random() < 0.8 else rng.choice([None, rng.randint(0, 50)])
+        record.add_value(rng.random(), step=step)
+        start, end = sorted(rng.sample(range(60), 2))
+        assert record.get_range(start, end) == BaseRecord.get_range(record, start, end)
+        steps = [s for s, _ in record.get_most_recent() if s is not None]
+        for s in steps:
+            assert record.get_value_at_step(s) == BaseRecord.get_value_at_step(record, s)
+        assert record._num_unsorted == record._count_unsorted()
+
+
 def test_record_get_best_value() -> None:
     record = Record("loss")
     with pytest.raises(
@@ -143,6 +465,84 @@ def test_record_get_most_recent_add_max_size() -> None:
     assert record.get_last_value() == 9
 
 
+@pytest.mark.parametrize(
+    ("n", "expected"),
+    [(0, ()), (1, ((3, 1.0),)), (2, ((2, 2.0), (3, 1.0))), (5, ((1, 3.0), (2, 2.0), (3, 1.0)))],
+)
+def test_record_get_most_recent_n(n: int, expected: tuple) -> None:
+    record = Record("loss", elements=[(1, 3.0), (2, 2.0), (3, 1.0)])
+    assert record.get_most_recent(n) == expected
+
+
+def test_record_get_most_recent_n_negative() -> None:
+    with pytest.raises(ValueError, match=r"n must be greater than or equal to 0"):
+        Record("loss").get_most_recent(-1)
+
+
+def test_record_get_most_recent_view() -> None:
+    record = Record("loss", max_size=3, elements=[(1, 3.0), (2, 2.0)])
+    view = record.get_most_recent_view()
+    assert len(view) == 2
+    record.add_value(1.0, step=3)
+    record.add_value(0.5, step=4)
+    assert len(view) == 3
+    assert view[0] == (2, 2.0)
+    assert view[-1] == (4, 0.5)
+    assert view[1:] == ((3, 1.0), (4, 0.5))
+    assert view[-5:1] == ((2, 2.0),)
+    assert view[2:1] == ()
+    assert view[::-2] == ((4, 0.5), (2, 2.0))
+    assert list(view) == [(2, 2.0), (3, 1.0), (4, 0.5)]
+    assert list(reversed(view)) == [(4, 0.5), (3, 1.0), (2, 2.0)]
+    assert (3, 1.0) in view
+    assert view.index((3, 1.0)) == 1
+    assert repr(view) == "ElementsView(size=3)"
+
+
+def test_record_get_most_recent_view_read_only() -> None:
+    view = Record("loss", elements=[(1, 3.0)]).get_most_recent_view()
+    with pytest.raises(TypeError):
+        view[0] = (2, 2.0)
+
+
+def test_record_get_steps() -> None:
+    record = Record("loss", elements=[(None, 3.0), (2, 2.0), (3, 1.0)])
+    assert record.get_steps() == (None, 2, 3)
+    assert record.get_steps(2) == (2, 3)
+
+
+def test_record_get_steps_empty() -> None:
+    assert Record("loss").get_steps() == ()
+
+
+def test_record_get_values() -> None:
+    record = Record("loss", elements=[(None, 3.0), (2, 2.0), (3, 1.0)])
+    assert record.get_values() == (3.0, 2.0, 1.0)
+    assert record.get_values(0) == ()
+    assert record.get_values(1) == (1.0,)
+
+
+def test_record_get_values_empty() -> None:
+    assert Record("loss").get_values() == ()
+
+
+def test_record_iter_most_recent() -> None:
+    record = Record("loss", elements=[(1, 3.0), (2, 2.0)])
+    assert list(record.iter_most_recent()) == [(1, 3.0), (2, 2.0)]
+
+
+@pytest.mark.parametrize("n", [None, 0, 1, 3, 10])
+def test_record_column_accessors_match_base_record(n: int | None) -> None:
+    record = Record("loss", max_size=5, elements=[(i, float(i)) for i in range(8)])
+    elements = tuple(record.get_most_recent_view())
+    assert record.get_most_recent(n) == (
+        elements if n is None else elements[max(len(elements) - n, 0) :]
+    )
+    assert record.get_steps(n) == BaseRecord.get_steps(record, n)
+    assert record.get_values(n) == BaseRecord.get_values(record, n)
+    assert tuple(record.iter_most_recent()) == tuple(BaseRecord.iter_most_recent(record))
+
+
 def test_record_get_last_value() -> None:
     assert Record("loss", elements=((None, 35), (1, 42))).get_last_value() == 42
 
@@ -180,6 +580,99 @@ def test_record_is_empty_false() -> None:
     assert not Record("loss", elements=((None, 35), (1, 42))).is_empty()
 
 
+def test_record_memory_usage_packed() -> None:
+    usage = Record(
+        "loss", max_size=100, elements=[(i, float(i)) for i in range(100)]
+    ).memory_usage()
+    assert usage["steps"] >= 800
+    assert usage["values"] >= 800
+    assert usage["timestamps"] == 0
+    assert usage["other"] > 0
+    assert usage["total"] == sum(size for key, size in usage.items() if key != "total")
+
+
+def test_record_memory_usage_object() -> None:
+    value = "a" * 1000
+    record = Record("loss", elements=[(None, value), (1, value), (2, "abc")])
+    usage = record.memory_usage()
+    assert usage["steps"] == sys.getsizeof(1) + sys.getsizeof(2)
+    assert usage["values"] == sys.getsizeof(value) + sys.getsizeof("abc")
+    assert usage["storage"] == sys.getsizeof(record._record) + 3 * sys.getsizeof((1, value))
+
+
+def test_record_memory_usage_timestamps() -> None:
+    assert create_timed_record().memory_usage()["timestamps"] > 0
+
+
+@numpy_available
+def test_record_memory_usage_arrays() -> None:
+    record = Record("loss", elements=[(0, np.zeros(1000))])
+    assert record.memory_usage()["values"] > 8000
+
+
+def test_record_resize_smaller() -> None:
+    record = Record("loss", elements=[(0, 4.0), (1, 3.0), (2, 2.0), (3, 1.0)])
+    record.resize(2)
+    assert record.max_size == 2
+    assert record.equal(Record("loss", max_size=2, elements=[(2, 2.0), (3, 1.0)]))
+    assert (
+        record.get_fingerprint() == Record("loss", elements=[(2, 2.0), (3, 1.0)]).get_fingerprint()
+    )
+    record.add_value(0.5, step=4)
+    assert record.get_most_recent() == ((3, 1.0), (4, 0.5))
+
+
+def test_record_resize_larger() -> None:
+    record = Record("loss", max_size=2, elements=[(0, 4.0), (1, 3.0)])
+    record.resize(5)
+    record.add_value(2.0, step=2)
+    assert record.equal(Record("loss", max_size=5, elements=[(0, 4.0), (1, 3.0), (2, 2.0)]))
+
+
+def test_record_resize_keeps_backend() -> None:
+    record = Record("loss", elements=[(0, "abc"), (1, 3.0)])
+    record.resize(1)
+    assert record.backend == "object"
+
+
+def test_record_resize_timestamps() -> None:
+    record = create_timed_record()
+    record.resize(2)
+    assert record.get_timestamps() == (2.0, 4.0)
+
+
+def test_record_resize_incorrect_max_size() -> None:
+    with pytest.raises(ValueError, match=r"Record size must be greater than 0"):
+        Record("loss").resize(0)
+
+
+def test_record_compact() -> None:
+    record = Record("loss", max_size=2)
+    record.update([(0, "abc"), (1, 2.0), (2, 1.0)])
+    assert record.compact()
+    assert record.backend == "packed"
+    assert record.get_most_recent() == ((1, 2.0), (2, 1.0))
+
+
+def test_record_compact_packed() -> None:
+    assert not Record("loss", elements=[(0, 1.0)], storage="auto").compact()
+
+
+def test_record_compact_not_packable() -> None:
+    record = Record("loss", elements=[(0, "abc")])
+    assert not record.compact()
+    assert record.backend == "object"
+
+
+def test_record_compact_storage_object() -> None:
+    record = Record("loss", elements=[(0, 1.0)], storage="object")
+    assert record.compact()
+    assert record.backend == "packed"
+    assert record.storage == "auto"
+    record.add_value(2.0, step=1)
+    assert record.backend == "packed"
+
+
 def test_record_update() -> None:
     record = Record("loss")
     record.update(elements=((None, 35), (1, 42)))
@@ -228,21 +721,30 @@ def test_record_load_state_dict_reset() -> None:
 
 
 def test_record_state_dict() -> None:
+    record = Record("loss", elements=((0, 1), (1, 5)))
     assert objects_are_equal(
-        Record("loss", elements=((0, 1), (1, 5))).state_dict(), {"record": ((0, 1), (1, 5))}
+        record.state_dict(),
+        {"record": ((0, 1), (1, 5)), "fingerprint": record.get_fingerprint(), "backend": "object"},
     )
 
 
 def test_record_state_dict_empty() -> None:
-    assert objects_are_equal(Record("loss").state_dict(), {"record": ()})
+    assert objects_are_equal(
+        Record("loss").state_dict(), {"record": (), "fingerprint": 0, "backend": "object"}
+    )
 
 
 def test_record_to_dict() -> None:
+    record = Record("loss", elements=[(0, 5)])
     assert objects_are_equal(
-        Record("loss", elements=[(0, 5)]).to_dict(),
+        record.to_dict(),
         {
             "config": {OBJECT_TARGET: "minrecord.generic.Record", "name": "loss", "max_size": 10},
-            "state": {"record": ((0, 5),)},
+            "state": {
+                "record": ((0, 5),),
+                "fingerprint": record.get_fingerprint(),
+                "backend": "object",
+            },
         },
     )
 
@@ -252,12 +754,11 @@ def test_record_to_dict_empty() -> None:
         Record("loss").to_dict(),
         {
             "config": {OBJECT_TARGET: "minrecord.generic.Record", "name": "loss", "max_size": 10},
-            "state": {"record": ()},
+            "state": {"record": (), "fingerprint": 0, "backend": "object"},
         },
     )
 
 
-@objectory_available
 def test_record_from_dict() -> None:
     assert BaseRecord.from_dict(
         {
@@ -267,7 +768,6 @@ def test_record_from_dict() -> None:
     ).equal(Record("loss", max_size=7, elements=((0, 1), (1, 5))))
 
 
-@objectory_available
 def test_record_from_dict_empty() -> None:
     assert BaseRecord.from_dict(
         {
@@ -277,12 +777,434 @@ def test_record_from_dict_empty() -> None:
     ).equal(Record("loss"))
 
 
+def test_record_from_dict_without_objectory() -> None:
+    with patch("minrecord.utils.imports.is_objectory_available", lambda: False):
+        assert BaseRecord.from_dict(
+            {
+                "config": {OBJECT_TARGET: "minrecord.Record", "name": "loss", "max_size": 7},
+                "state": {"record": ((0, 1), (1, 5))},
+            }
+        ).equal(Record("loss", max_size=7, elements=((0, 1), (1, 5))))
+
+
+def test_record_from_dict_short_name() -> None:
+    assert BaseRecord.from_dict(
+        {
+            "config": {OBJECT_TARGET: "Record", "name": "loss", "max_size": 7},
+            "state": {"record": ((0, 1), (1, 5))},
+        }
+    ).equal(Record("loss", max_size=7, elements=((0, 1), (1, 5))))
+
+
 @objectory_not_available
 def test_record_from_dict_objectory_missing() -> None:
     with pytest.raises(RuntimeError, match=r"'objectory' package is required but not installed."):
         BaseRecord.from_dict(
             {
-                "config": {OBJECT_TARGET: "minrecord.Record", "name": "loss", "max_size": 7},
+                "config": {OBJECT_TARGET: "missing.Record", "name": "loss", "max_size": 7},
                 "state": {"record": ((0, 1), (1, 5))},
             }
         )
+
+
+#########################################
+#     Tests for Record (timestamps)     #
+#########################################
+
+
+def create_timed_record(max_size: int = 10) -> Record:
+    record = Record("loss", max_size=max_size, clock="monotonic")
+    record.load_state_dict(
+        {"record": [(0, 4.0), (1, 3.0), (2, 2.0), (3, 1.0)], "timestamps": [1.0, 2.0, 2.0, 4.0]}
+    )
+    return record
+
+
+def test_record_clock_default() -> None:
+    record = Record("loss")
+    assert record.clock is None
+    assert "timestamps" not in record.state_dict()
+    assert "clock" not in record.config_dict()
+
+
+@pytest.mark.parametrize("clock", ["monotonic", "wall"])
+def test_record_clock(clock: str) -> None:
+    record = Record("loss", clock=clock)
+    record.add_value(2.0, step=0)
+    record.add_value(1.0, step=1)
+    assert record.clock == clock
+    assert record.config_dict()["clock"] == clock
+    timestamps = record.get_timestamps()
+    assert len(timestamps) == 2
+    assert timestamps[0] <= timestamps[1]
+
+
+def test_record_clock_incorrect() -> None:
+    with pytest.raises(ValueError, match=r"Incorrect clock: missing"):
+        Record("loss", clock="missing")
+
+
+def test_record_clock_add_value() -> None:
+    with patch("time.time", side_effect=[1.0, 3.0, 2.0, 5.0]):
+        record = Record("loss", max_size=3, clock="wall")
+        record.update([(0, 4.0), (1, 3.0), (2, 2.0), (3, 1.0)])
+    assert record.get_timestamps() == (3.0, 3.0, 5.0)
+    assert record.get_most_recent() == ((1, 3.0), (2, 2.0), (3, 1.0))
+
+
+def test_record_clock_initial_elements() -> None:
+    record = Record("loss", elements=[(0, 1.0)], clock="monotonic")
+    assert record.get_timestamps() == (float("-inf"),)
+
+
+def test_record_clock_clone() -> None:
+    record = create_timed_record()
+    clone = record.clone()
+    assert clone.get_timestamps() == (1.0, 2.0, 2.0, 4.0)
+    assert clone.equal(record)
+    clone.add_value(0.5, step=4)
+    assert record.get_timestamps() == (1.0, 2.0, 2.0, 4.0)
+
+
+def test_record_clock_equal_false_different_timestamps() -> None:
+    record = create_timed_record()
+    other = create_timed_record()
+    other.load_state_dict(
+        {"record": [(0, 4.0), (1, 3.0), (2, 2.0), (3, 1.0)], "timestamps": [1.0, 2.0, 3.0, 4.0]}
+    )
+    assert not record.equal(other)
+
+
+def test_record_clock_equal_false_different_clocks() -> None:
+    assert not Record("loss", clock="monotonic").equal(Record("loss", clock="wall"))
+
+
+def test_record_clock_from_dict() -> None:
+    record = create_timed_record()
+    assert BaseRecord.from_dict(record.to_dict()).equal(record)
+
+
+def test_record_clock_load_state_dict_without_timestamps() -> None:
+    record = Record("loss", clock="monotonic")
+    record.load_state_dict({"record": [(0, 2.0), (1, 1.0)]})
+    assert record.get_timestamps() == (float("-inf"), float("-inf"))
+
+
+def test_record_clock_load_state_dict_incorrect_timestamps() -> None:
+    record = Record("loss", clock="monotonic")
+    with pytest.raises(ValueError, match=r"The number of timestamps \(1\) does not match"):
+        record.load_state_dict({"record": [(0, 2.0), (1, 1.0)], "timestamps": [1.0]})
+
+
+def test_record_clock_state_dict() -> None:
+    assert create_timed_record(max_size=3).state_dict()["timestamps"] == (2.0, 2.0, 4.0)
+
+
+def test_record_clock_not_timestamped() -> None:
+    with pytest.raises(RuntimeError, match=r"'loss' record does not timestamp its values"):
+        Record("loss").get_range_by_time()
+
+
+@pytest.mark.parametrize(
+    ("start_time", "end_time", "expected"),
+    [
+        (None, None, ((0, 4.0), (1, 3.0), (2, 2.0), (3, 1.0))),
+        (2.0, None, ((1, 3.0), (2, 2.0), (3, 1.0))),
+        (None, 2.0, ((0, 4.0), (1, 3.0), (2, 2.0))),
+        (1.5, 3.0, ((1, 3.0), (2, 2.0))),
+        (4.5, None, ()),
+        (None, 0.5, ()),
+        (3.0, 1.0, ()),
+    ],
+)
+def test_record_get_range_by_time(
+    start_time: float | None, end_time: float | None, expected: tuple
+) -> None:
+    assert create_timed_record().get_range_by_time(start_time, end_time) == expected
+
+
+def test_record_get_range_by_time_ring_buffer() -> None:
+    with patch("time.monotonic", side_effect=[float(i) for i in range(10)]):
+        record = Record("loss", max_size=4, clock="monotonic")
+        record.update([(i, float(i)) for i in range(10)])
+    assert record.get_timestamps() == (6.0, 7.0, 8.0, 9.0)
+    assert record.get_range_by_time(7.0, 8.5) == ((7, 7.0), (8, 8.0))
+    assert record.get_range_by_time(None, 6.0) == ((6, 6.0),)
+    assert record.get_range_by_time(9.0) == ((9, 9.0),)
+
+
+def test_record_get_time_window() -> None:
+    with patch("time.monotonic", side_effect=[1.0, 2.0, 10.0, 65.0]):
+        record = Record("loss", clock="monotonic")
+        record.update([(0, 3.0), (1, 2.0), (2, 1.0)])
+        assert record.get_time_window(60.0) == ((2, 1.0),)
+
+
+@pytest.mark.parametrize(
+    ("timestamp", "expected"), [(1.0, 4.0), (2.0, 2.0), (3.9, 2.0), (9.0, 1.0)]
+)
+def test_record_get_value_at_time(timestamp: float, expected: float) -> None:
+    assert create_timed_record().get_value_at_time(timestamp) == expected
+
+
+def test_record_get_value_at_time_missing() -> None:
+    with pytest.raises(KeyError, match=r"'loss' record does not have a value at time 0.5"):
+        create_timed_record().get_value_at_time(0.5)
+
+
+def test_record_get_timestamps_n() -> None:
+    record = create_timed_record()
+    assert record.get_timestamps(0) == ()
+    assert record.get_timestamps(2) == (2.0, 4.0)
+    assert record.get_timestamps(10) == (1.0, 2.0, 2.0, 4.0)
+
+
+def test_record_get_timestamps_n_negative() -> None:
+    with pytest.raises(ValueError, match=r"n must be greater than or equal to 0"):
+        create_timed_record().get_timestamps(-1)
+
+
+####################################
+#     Tests for Record (merge)     #
+####################################
+
+
+def test_record_merge_mean() -> None:
+    record1 = Record("loss", elements=[(0, 4.0), (1, 2.0)])
+    record2 = Record("loss", elements=[(0, 2.0), (1, 1.0), (2, 3.0)])
+    record = record1.merge([record2])
+    assert record.get_most_recent() == ((0, 3.0), (1, 1.5), (2, 3.0))
+    assert record1.get_most_recent() == ((0, 4.0), (1, 2.0))
+    assert record2.get_most_recent() == ((0, 2.0), (1, 1.0), (2, 3.0))
+
+
+@pytest.mark.parametrize(
+    ("reduce", "expected"),
+    [
+        ("sum", ((0, 9), (1, 3), (2, 4))),
+        ("min", ((0, 2), (1, 1), (2, 4))),
+        ("max", ((0, 4), (1, 2), (2, 4))),
+        ("first", ((0, 4), (1, 2), (2, 4))),
+        ("mean", ((0, 3.0), (1, 1.5), (2, 4))),
+        (lambda values: len(values), ((0, 3), (1, 2), (2, 4))),
+    ],
+)
+def test_record_merge_reduce(reduce: Any, expected: tuple) -> None:
+    record1 = Record("count", elements=[(0, 4), (1, 2)])
+    record2 = Record("count", elements=[(0, 2), (1, 1), (2, 4)])
+    record3 = Record("count", elements=[(0, 3)])
+    assert record1.merge([record2, record3], reduce=reduce).get_most_recent() == expected
+
+
+def test_record_merge_incorrect_reduce() -> None:
+    with pytest.raises(ValueError, match=r"Incorrect reduction: median"):
+        Record("loss").merge([], reduce="median")
+
+
+def test_record_merge_keeps_config() -> None:
+    record = Record("loss", max_size=2, storage="object").merge(
+        [Record("loss", elements=[(0, 1.0), (1, 2.0), (2, 3.0)])]
+    )
+    assert record.max_size == 2
+    assert record.storage == "object"
+    assert record.get_most_recent() == ((1, 2.0), (2, 3.0))
+
+
+def test_record_merge_duplicate_steps() -> None:
+    record1 = Record("loss", elements=[(0, 1.0), (0, 3.0), (1, 2.0)])
+    record2 = Record("loss", elements=[(0, 2.0)])
+    assert record1.merge([record2]).get_most_recent() == ((0, 2.0), (1, 2.0))
+
+
+def test_record_merge_unsorted_steps() -> None:
+    record1 = Record("loss", elements=[(2, 1.0), (0, 3.0), (1, 2.0)])
+    record2 = Record("loss", elements=[(1, 4.0), (3, 2.0)])
+    assert record1.merge([record2]).get_most_recent() == ((0, 3.0), (1, 3.0), (2, 1.0), (3, 2.0))
+
+
+def test_record_merge_steps_none() -> None:
+    with pytest.raises(ValueError, match=r"'loss' record cannot be merged"):
+        Record("loss").merge([Record("loss", elements=[(None, 1.0)])])
+
+
+def test_record_merge_random() -> None:
+    rng = random.Random(42)  # noqa: S311
+    records = [
+        Record("loss", elements=sorted((rng.randrange(50), rng.random()) for _ in range(20)))
+        for _ in range(5)
+    ]
+    values = {}
+    for record in records:
+        for step, value in record.get_most_recent():
+            values.setdefault(step, []).append(value)
+    expected = tuple((step, max(values[step])) for step in sorted(values))[-10:]
+    assert records[0].merge(records[1:], reduce="max").get_most_recent() == expected
+
+
+def test_record_merge_empty() -> None:
+    assert Record("loss").merge([Record("loss")]).is_empty()
+
+
+######################################
+#     Tests for Record (storage)     #
+######################################
+
+
+def test_record_storage_default() -> None:
+    record = Record("loss", elements=[(0, 2.0), (1, 1.0)])
+    assert record.storage == "object"
+    assert record.backend == "object"
+    assert "storage" not in record.config_dict()
+
+
+def test_record_storage_auto() -> None:
+    record = Record("loss", elements=[(0, 2.0), (1, 1.0)], storage="auto")
+    assert record.storage == "auto"
+    assert record.backend == "packed"
+    assert record.config_dict()["storage"] == "auto"
+
+
+def test_record_storage_incorrect() -> None:
+    with pytest.raises(ValueError, match=r"Incorrect storage: missing"):
+        Record("loss", storage="missing")
+
+
+def test_record_storage_initial_elements_not_packable() -> None:
+    record = Record("loss", elements=[(0, 2.0), (1, "abc")], storage="auto")
+    assert record.backend == "object"
+    assert record.get_most_recent() == ((0, 2.0), (1, "abc"))
+
+
+@pytest.mark.parametrize(
+    ("value", "step"), [("abc", 2), (3, 2), (3.0, 2.5), (3.0, None), (2**70, 2), (True, 2)]
+)
+def test_record_storage_add_value_fallback(value: Any, step: Any) -> None:
+    record = Record("loss", max_size=3, elements=[(0, 2.0), (1, 1.0)], storage="auto")
+    fingerprint = Record("loss", max_size=3, elements=[(0, 2.0), (1, 1.0)], storage="object")
+    fingerprint.add_value(value, step)
+    record.add_value(value, step)
+    assert record.backend == "object"
+    assert record.get_most_recent() == ((0, 2.0), (1, 1.0), (step, value))
+    assert record.get_fingerprint() == fingerprint.get_fingerprint()
+    assert elements_are_equal(record.get_most_recent(), fingerprint.get_most_recent())
+
+
+def test_record_storage_add_value_keeps_types() -> None:
+    record = Record("loss", storage="auto")
+    record.update([(0, 1), (1, 2)])
+    assert record.backend == "packed"
+    assert record.equal(Record("loss", elements=[(0, 1), (1, 2)], storage="auto"))
+    assert not record.equal(Record("loss", elements=[(0, 1.0), (1, 2.0)], storage="auto"))
+
+
+def test_record_storage_add_value_full() -> None:
+    record = Record("loss", max_size=3, storage="auto")
+    record.update([(i, float(i)) for i in range(5)])
+    assert record.backend == "packed"
+    assert record.get_most_recent() == ((2, 2.0), (3, 3.0), (4, 4.0))
+    assert record.get_value_at_step(3) == 3.0
+    assert record.get_range(3) == ((3, 3.0), (4, 4.0))
+
+
+def test_record_storage_equal_different_backends() -> None:
+    record = Record("loss", elements=[(0, 2.0), (1, 1.0)], storage="auto")
+    other = Record("loss", storage="auto")
+    other.load_state_dict({"record": [(0, 2.0), (1, 1.0)], "backend": "object"})
+    assert other.backend == "object"
+    assert record.equal(other)
+    assert other.equal(record)
+
+
+def test_record_storage_equal_false_different_storages() -> None:
+    assert not Record("loss", storage="auto").equal(Record("loss", storage="object"))
+
+
+def test_record_storage_clone_keeps_backend() -> None:
+    record = Record("loss", max_size=2, elements=[(0, 2.0)], storage="auto")
+    record.update([(1, "abc"), (2, 1.0), (3, 0.5)])
+    clone = record.clone()
+    assert clone.backend == "object"
+    assert clone.equal(record)
+
+
+def test_record_storage_clone_nan() -> None:
+    record = Record("loss", elements=[(0, float("nan"))])
+    assert record.clone().equal(record)
+
+
+def test_record_storage_get_most_recent_view_after_fallback() -> None:
+    record = Record("loss", elements=[(0, 2.0)], storage="auto")
+    view = record.get_most_recent_view()
+    record.add_value("abc", step=1)
+    assert view[-1] == (1, "abc")
+    assert len(view) == 2
+
+
+def test_record_storage_state_dict() -> None:
+    record = Record("loss", elements=[(0, 2.0)], storage="auto")
+    assert record.state_dict()["backend"] == "packed"
+    record.add_value("abc", step=1)
+    assert record.state_dict()["backend"] == "object"
+
+
+def test_record_storage_load_state_dict_backend_object() -> None:
+    record = Record("loss")
+    record.load_state_dict({"record": [(0, 2.0), (1, 1.0)], "backend": "object"})
+    assert record.backend == "object"
+
+
+def test_record_storage_load_state_dict_without_backend() -> None:
+    record = Record("loss", storage="auto")
+    record.load_state_dict({"record": [(0, 2.0), (1, 1.0)]})
+    assert record.backend == "packed"
+
+
+def test_record_storage_from_dict() -> None:
+    record = Record("loss", max_size=2, elements=[(0, 2.0), (1, "abc")], storage="auto")
+    record.add_value(1.0, step=2)
+    loaded = BaseRecord.from_dict(record.to_dict())
+    assert loaded.backend == "object"
+    assert loaded.equal(record)
+
+
+#####################################
+#     Tests for TimestampBuffer     #
+#####################################
+
+
+def test_timestamp_buffer_append() -> None:
+    buffer = TimestampBuffer(3)
+    for timestamp in [1.0, 2.0, 1.5, 3.0, 4.0]:
+        buffer.append(timestamp)
+    assert len(buffer) == 3
+    assert tuple(buffer) == (2.0, 3.0, 4.0)
+
+
+def test_timestamp_buffer_eq() -> None:
+    assert TimestampBuffer(3, [1.0, 2.0]) == TimestampBuffer(5, [1.0, 2.0])
+    assert TimestampBuffer(3, [1.0, 2.0]) != TimestampBuffer(3, [1.0, 3.0])
+    assert TimestampBuffer(3, [1.0, 2.0]) != (1.0, 2.0)
+
+
+def test_timestamp_buffer_copy() -> None:
+    buffer = TimestampBuffer(2, [1.0, 2.0, 3.0])
+    copy = buffer.copy()
+    copy.append(4.0)
+    assert tuple(buffer) == (2.0, 3.0)
+    assert tuple(copy) == (3.0, 4.0)
+
+
+def test_timestamp_buffer_repr() -> None:
+    assert repr(TimestampBuffer(3, [1.0])) == "TimestampBuffer(maxlen=3, size=1)"
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_timestamp_buffer_bisect_random(seed: int) -> None:
+    rng = random.Random(seed)  # noqa: S311
+    maxlen = rng.randint(1, 20)
+    timestamps = sorted(rng.randint(0, 30) for _ in range(rng.randint(0, 50)))
+    buffer = TimestampBuffer(maxlen, map(float, timestamps))
+    expected = timestamps[-maxlen:]
+    for timestamp in range(-1, 32):
+        assert buffer.bisect_left(timestamp) == bisect_left(expected, timestamp)
+        assert buffer.bisect_right(timestamp) == bisect_right(expected, timestamp)
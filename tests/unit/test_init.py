@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import importlib
+import subprocess
+import sys
+
+import pytest
+
+import minrecord
+from minrecord.ndarray import ArrayRecord
+from minrecord.sqlite import SQLiteRecordManager
+
+
+def run_python(code: str) -> str:
+    return subprocess.run(  # noqa: S603
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    ).stdout.strip()
+
+
+def test_version() -> None:
+    assert isinstance(minrecord.__version__, str)
+
+
+def test_lazy_attribute() -> None:
+    assert minrecord.SQLiteRecordManager is SQLiteRecordManager
+
+
+def test_lazy_attribute_array_record() -> None:
+    assert minrecord.ArrayRecord is ArrayRecord
+
+
+@pytest.mark.parametrize("name", sorted(minrecord.__all__))
+def test_lazy_attribute_all(name: str) -> None:
+    assert getattr(minrecord, name) is getattr(
+        importlib.import_module(minrecord._LAZY_ATTRIBUTES[name]), name
+    )
+
+
+def test_import_does_not_import_submodules() -> None:
+    assert run_python("import sys, minrecord; print('minrecord.manager' in sys.modules)") == (
+        "False"
+    )
+
+
+def test_missing_attribute() -> None:
+    with pytest.raises(AttributeError, match=r"module 'minrecord' has no attribute 'missing'"):
+        minrecord.missing  # noqa: B018
+
+
+def test_dir() -> None:
+    assert set(minrecord.__all__).issubset(dir(minrecord))
+
+
+@pytest.mark.parametrize("module", ["coola", "numpy", "objectory", "pyarrow", "sqlite3"])
+def test_import_does_not_import_module(module: str) -> None:
+    assert run_python(f"import sys, minrecord; print({module!r} in sys.modules)") == "False"
+
+
+@pytest.mark.parametrize("module", ["numpy", "pyarrow", "sqlite3"])
+def test_import_records_does_not_import_module(module: str) -> None:
+    assert (
+        run_python(
+            "import sys\n"
+            "from minrecord import MinScalarRecord, Record, RecordManager\n"
+            "RecordManager({'loss': MinScalarRecord('loss')}).get_record('loss').add_value(1.0)\n"
+            f"print({module!r} in sys.modules)"
+        )
+        == "False"
+    )
+
+
+def test_import_registers_equality_testers() -> None:
+    assert (
+        run_python(
+            "import minrecord\n"
+            "from coola.equality import objects_are_equal\n"
+            "print(objects_are_equal(minrecord.MinScalarRecord('loss'), "
+            "minrecord.MinScalarRecord('acc')))"
+        )
+        == "False"
+    )
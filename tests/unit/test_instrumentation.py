@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pytest
+
+from coola.testing.fixtures import numpy_available
+from coola.utils.imports import is_numpy_available
+
+from minrecord import (
+    ArrayRecord,
+    BaseRecord,
+    EmptyRecordError,
+    MinScalarRecord,
+    ParetoRecord,
+    Record,
+    RecordManager,
+)
+from minrecord.comparator import ParetoComparator
+from minrecord.instrumentation import (
+    disable_instrumentation,
+    enable_instrumentation,
+    get_instrumentation_stats,
+    instrumentation,
+    is_instrumentation_enabled,
+    reset_instrumentation_stats,
+)
+
+if is_numpy_available():
+    import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+
+
+@pytest.fixture(autouse=True)
+def _reset_instrumentation() -> Generator[None, None, None]:
+    yield
+    disable_instrumentation()
+    reset_instrumentation_stats()
+
+
+############################################
+#     Tests for enable_instrumentation     #
+############################################
+
+
+def test_enable_instrumentation() -> None:
+    enable_instrumentation()
+    assert is_instrumentation_enabled()
+
+
+def test_enable_instrumentation_replaces_methods() -> None:
+    add_value = Record.__dict__["add_value"]
+    enable_instrumentation()
+    assert Record.__dict__["add_value"] is not add_value
+    assert Record.__dict__["add_value"].__wrapped__ is add_value
+
+
+def test_enable_instrumentation_twice() -> None:
+    enable_instrumentation()
+    enable_instrumentation()
+    record = Record("loss")
+    record.add_value(1.0)
+    assert get_instrumentation_stats()["Record.add_value"]["calls"] == 1
+
+
+def test_enable_instrumentation_record() -> None:
+    enable_instrumentation()
+    record = Record("loss")
+    record.add_value(1.0)
+    record.add_value(2.0)
+    record.update([(2, 3.0)])
+    assert record.get_last_value() == 3.0
+    stats = get_instrumentation_stats()
+    # update calls add_value for each element.
+    assert stats["Record.add_value"]["calls"] == 3
+    assert stats["Record.update"]["calls"] == 1
+    assert stats["Record.get_last_value"]["calls"] == 1
+    assert stats["Record.add_value"]["time_ns"] > 0
+
+
+def test_enable_instrumentation_comparable_record_inclusive() -> None:
+    enable_instrumentation()
+    record = MinScalarRecord("loss")
+    record.add_value(1.0)
+    assert record.get_best_value() == 1.0
+    stats = get_instrumentation_stats()
+    assert stats["ComparableRecord.add_value"]["calls"] == 1
+    assert stats["Record.add_value"]["calls"] == 1
+    assert stats["ComparableRecord.add_value"]["time_ns"] >= stats["Record.add_value"]["time_ns"]
+    assert stats["BaseRecord.get_best_value"]["calls"] == 1
+
+
+def test_enable_instrumentation_pareto_record() -> None:
+    enable_instrumentation()
+    record = ParetoRecord("sweep", ParetoComparator(["max", "min"]))
+    record.add_value((0.8, 12.0), step=0)
+    record.add_value((0.9, 15.0), step=1)
+    assert record.get_best_value() == ((0.8, 12.0), (0.9, 15.0))
+    stats = get_instrumentation_stats()
+    assert stats["ParetoRecord.add_value"]["calls"] == 2
+    assert stats["BaseRecord.get_best_value"]["calls"] == 1
+
+
+@numpy_available
+def test_enable_instrumentation_array_record() -> None:
+    enable_instrumentation()
+    record = ArrayRecord("weights")
+    record.add_value(np.ones(3), step=0)
+    assert get_instrumentation_stats()["ArrayRecord.add_value"]["calls"] == 1
+
+
+def test_enable_instrumentation_custom_record() -> None:
+    class MyRecord(Record):
+        def add_value(self, value: float, step: int | None = None) -> None:
+            super().add_value(value, step)
+
+    enable_instrumentation()
+    MyRecord("loss").add_value(1.0)
+    stats = get_instrumentation_stats()
+    assert stats[f"{MyRecord.__qualname__}.add_value"]["calls"] == 1
+    assert stats["Record.add_value"]["calls"] == 1
+
+
+def test_enable_instrumentation_manager() -> None:
+    enable_instrumentation()
+    manager = RecordManager()
+    manager.get_record("loss").add_value(1.0)
+    assert manager.get_last_values() == {"loss": 1.0}
+    manager.load_state_dict(manager.state_dict())
+    stats = get_instrumentation_stats()
+    assert stats["RecordManager.get_record"]["calls"] == 1
+    assert stats["RecordManager.get_last_values"]["calls"] == 1
+    assert stats["RecordManager.state_dict"]["calls"] == 1
+    assert stats["RecordManager.load_state_dict"]["calls"] == 1
+
+
+def test_enable_instrumentation_classmethod() -> None:
+    data = Record("loss", elements=[(0, 1.0)]).to_dict()
+    enable_instrumentation()
+    record = BaseRecord.from_dict(data)
+    assert record.equal(Record("loss", elements=[(0, 1.0)]))
+    assert get_instrumentation_stats()["BaseRecord.from_dict"]["calls"] == 1
+
+
+def test_enable_instrumentation_exception() -> None:
+    enable_instrumentation()
+    with pytest.raises(EmptyRecordError, match="empty"):
+        Record("loss").get_last_value()
+    assert get_instrumentation_stats()["Record.get_last_value"]["calls"] == 1
+
+
+def test_enable_instrumentation_allocated_blocks() -> None:
+    enable_instrumentation()
+    record = Record("loss", max_size=1000, storage="object")
+    record.update([(step, [step]) for step in range(1000)])
+    assert get_instrumentation_stats()["Record.update"]["allocated_blocks"] > 0
+
+
+#############################################
+#     Tests for disable_instrumentation     #
+#############################################
+
+
+def test_disable_instrumentation() -> None:
+    enable_instrumentation()
+    disable_instrumentation()
+    assert not is_instrumentation_enabled()
+
+
+def test_disable_instrumentation_restores_methods() -> None:
+    methods = dict(Record.__dict__)
+    manager_methods = dict(RecordManager.__dict__)
+    enable_instrumentation()
+    disable_instrumentation()
+    assert all(Record.__dict__[name] is method for name, method in methods.items())
+    assert all(RecordManager.__dict__[name] is method for name, method in manager_methods.items())
+
+
+def test_disable_instrumentation_keeps_stats() -> None:
+    enable_instrumentation()
+    Record("loss").add_value(1.0)
+    disable_instrumentation()
+    Record("loss").add_value(1.0)
+    assert get_instrumentation_stats()["Record.add_value"]["calls"] == 1
+
+
+def test_disable_instrumentation_not_enabled() -> None:
+    disable_instrumentation()
+    assert not is_instrumentation_enabled()
+
+
+#####################################
+#     Tests for instrumentation     #
+#####################################
+
+
+def test_instrumentation() -> None:
+    with instrumentation():
+        assert is_instrumentation_enabled()
+        Record("loss").add_value(1.0)
+    assert not is_instrumentation_enabled()
+    assert get_instrumentation_stats()["Record.add_value"]["calls"] == 1
+
+
+def test_instrumentation_already_enabled() -> None:
+    enable_instrumentation()
+    with instrumentation():
+        pass
+    assert is_instrumentation_enabled()
+
+
+###############################################
+#     Tests for get_instrumentation_stats     #
+###############################################
+
+
+def test_get_instrumentation_stats_empty() -> None:
+    assert get_instrumentation_stats() == {}
+
+
+def test_get_instrumentation_stats_sorted() -> None:
+    with instrumentation():
+        manager = RecordManager()
+        manager.get_record("loss").update([(step, float(step)) for step in range(10)])
+    times = [stats["time_ns"] for stats in get_instrumentation_stats().values()]
+    assert times == sorted(times, reverse=True)
+
+
+#################################################
+#     Tests for reset_instrumentation_stats     #
+#################################################
+
+
+def test_reset_instrumentation_stats() -> None:
+    with instrumentation():
+        Record("loss").add_value(1.0)
+    reset_instrumentation_stats()
+    assert get_instrumentation_stats() == {}
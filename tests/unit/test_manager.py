@@ -1,8 +1,26 @@
 from __future__ import annotations
 
+import logging
+import re
+import sys
+from pathlib import Path
+from unittest.mock import Mock
+
 import pytest
+from coola.equality import objects_are_equal
 
-from minrecord import MaxScalarRecord, MinScalarRecord, Record, RecordManager
+from minrecord import (
+    BaseRecord,
+    ComparableRecord,
+    KeyComparator,
+    MaxScalarRecord,
+    MinScalarRecord,
+    Record,
+    RecordManager,
+    RecordRule,
+)
+from minrecord.config import reset_memory_budget, set_memory_budget
+from minrecord.manager import FINGERPRINT_KEY, _estimate_memory
 from minrecord.testing import objectory_available
 from minrecord.utils.imports import is_objectory_available
 
@@ -73,6 +91,104 @@ def test_record_manager_add_record_duplicate_key() -> None:
         manager.add_record(MinScalarRecord("loss"))
 
 
+def test_record_manager_get_fingerprint_empty() -> None:
+    assert RecordManager().get_fingerprint() == 0
+
+
+def test_record_manager_get_fingerprint_same() -> None:
+    assert (
+        RecordManager(
+            {"loss": MinScalarRecord.from_elements("loss", [(0, 1.0)]), "lr": Record("lr")}
+        ).get_fingerprint()
+        == RecordManager(
+            {"lr": Record("lr"), "loss": MinScalarRecord.from_elements("loss", [(0, 1.0)])}
+        ).get_fingerprint()
+    )
+
+
+def test_record_manager_get_fingerprint_add_value() -> None:
+    manager = RecordManager({"loss": MinScalarRecord("loss")})
+    fingerprint = manager.get_fingerprint()
+    manager.get_record("loss").add_value(1.0)
+    assert manager.get_fingerprint() != fingerprint
+
+
+def test_record_manager_get_fingerprint_different_keys() -> None:
+    record = Record("loss", elements=[(0, 1.0)])
+    assert (
+        RecordManager({"loss": record}).get_fingerprint()
+        != RecordManager({"loss2": record}).get_fingerprint()
+    )
+
+
+@objectory_available
+def test_record_manager_get_fingerprint_lazy() -> None:
+    manager = RecordManager({"loss": MinScalarRecord.from_elements("loss", [(0, 1.0)])})
+    manager2 = RecordManager()
+    manager2.load_state_dict(manager.state_dict(), lazy=True)
+    assert manager2.get_fingerprint() == manager.get_fingerprint()
+    assert not manager2._records
+
+
+@objectory_available
+def test_record_manager_get_fingerprint_lazy_without_fingerprint() -> None:
+    manager = RecordManager()
+    manager.load_state_dict(create_lazy_state(), lazy=True)
+    assert (
+        manager.get_fingerprint()
+        == RecordManager(
+            {
+                "loss": MinScalarRecord.from_elements("loss", [(0, 10), (1, 6)]),
+                "accuracy": MaxScalarRecord.from_elements("accuracy", [(0, 1), (1, 2)]),
+            }
+        ).get_fingerprint()
+    )
+
+
+def test_record_manager_equal_true() -> None:
+    assert RecordManager({"loss": MinScalarRecord.from_elements("loss", [(0, 1.0)])}).equal(
+        RecordManager({"loss": MinScalarRecord.from_elements("loss", [(0, 1.0)])})
+    )
+
+
+def test_record_manager_equal_true_empty() -> None:
+    assert RecordManager().equal(RecordManager())
+
+
+def test_record_manager_equal_false_different_values() -> None:
+    assert not RecordManager({"loss": MinScalarRecord.from_elements("loss", [(0, 1.0)])}).equal(
+        RecordManager({"loss": MinScalarRecord.from_elements("loss", [(0, 2.0)])})
+    )
+
+
+def test_record_manager_equal_false_different_keys() -> None:
+    assert not RecordManager({"loss": Record("loss")}).equal(RecordManager({"acc": Record("loss")}))
+
+
+def test_record_manager_equal_false_different_lengths() -> None:
+    assert not RecordManager({"loss": Record("loss")}).equal(RecordManager())
+
+
+def test_record_manager_equal_false_different_types() -> None:
+    assert not RecordManager().equal({})
+
+
+@objectory_available
+def test_record_manager_equal_lazy() -> None:
+    manager = RecordManager()
+    manager.load_state_dict(
+        {"loss": MinScalarRecord.from_elements("loss", [(0, 1.0)]).to_dict()}, lazy=True
+    )
+    assert manager.equal(RecordManager({"loss": MinScalarRecord.from_elements("loss", [(0, 1.0)])}))
+
+
+def test_record_manager_objects_are_equal() -> None:
+    assert objects_are_equal(
+        RecordManager({"loss": Record("loss")}), RecordManager({"loss": Record("loss")})
+    )
+    assert not objects_are_equal(RecordManager({"loss": Record("loss")}), RecordManager())
+
+
 def test_record_manager_get_best_values_empty() -> None:
     assert RecordManager().get_best_values() == {}
 
@@ -115,6 +231,24 @@ def test_record_manager_get_best_values_2_record() -> None:
     assert state.get_best_values() == {"loss": 0.8, "accuracy": 42}
 
 
+def test_record_manager_get_last_values_empty() -> None:
+    assert RecordManager().get_last_values() == {}
+
+
+def test_record_manager_get_last_values_2_record() -> None:
+    manager = RecordManager()
+    manager.add_record(MinScalarRecord.from_elements("loss", [(0, 1.2), (1, 0.8)]))
+    manager.add_record(Record("lr", elements=[(0, 0.1)]))
+    manager.add_record(Record("empty"))
+    assert manager.get_last_values() == {"loss": 0.8, "lr": 0.1}
+
+
+def test_record_manager_get_last_values_prefix_suffix() -> None:
+    manager = RecordManager()
+    manager.add_record(MinScalarRecord.from_elements("loss", [(0, 1.2), (1, 0.8)]))
+    assert manager.get_last_values(prefix="last/", suffix="/v") == {"last/loss/v": 0.8}
+
+
 def test_record_manager_get_record_exists() -> None:
     manager = RecordManager()
     record = MinScalarRecord("loss")
@@ -204,15 +338,156 @@ def test_record_manager_load_state_dict_without_record() -> None:
     assert record.get_best_value() == 6
 
 
+def create_lazy_state() -> dict:
+    return {
+        "loss": {
+            "config": {
+                OBJECT_TARGET: "minrecord.comparable.MinScalarRecord",
+                "name": "loss",
+                "max_size": 10,
+            },
+            "state": {"record": ((0, 10), (1, 6)), "improved": True, "best_value": 6},
+        },
+        "accuracy": {
+            "config": {
+                OBJECT_TARGET: "minrecord.comparable.MaxScalarRecord",
+                "name": "accuracy",
+                "max_size": 10,
+            },
+            "state": {"record": ((0, 1), (1, 2)), "improved": True, "best_value": 2},
+        },
+    }
+
+
+@objectory_available
+def test_record_manager_load_state_dict_lazy() -> None:
+    manager = RecordManager()
+    manager.load_state_dict(create_lazy_state(), lazy=True)
+    assert manager._records == {}
+    assert len(manager) == 2
+    assert manager.has_record("loss")
+    assert manager._records == {}
+
+
+@objectory_available
+def test_record_manager_load_state_dict_lazy_get_record() -> None:
+    manager = RecordManager()
+    manager.load_state_dict(create_lazy_state(), lazy=True)
+    record = manager.get_record("loss")
+    assert isinstance(record, MinScalarRecord)
+    assert record.get_best_value() == 6
+    assert list(manager._records) == ["loss"]
+    assert list(manager._lazy_states) == ["accuracy"]
+
+
+@objectory_available
+def test_record_manager_load_state_dict_lazy_get_records() -> None:
+    manager = RecordManager()
+    manager.load_state_dict(create_lazy_state(), lazy=True)
+    assert list(manager.get_records()) == ["loss", "accuracy"]
+    assert manager._lazy_states == {}
+
+
+@objectory_available
+def test_record_manager_load_state_dict_lazy_get_best_values() -> None:
+    manager = RecordManager()
+    manager.load_state_dict(create_lazy_state(), lazy=True)
+    assert manager.get_best_values() == {"loss": 6, "accuracy": 2}
+    assert manager.get_last_values() == {"loss": 6, "accuracy": 2}
+
+
+@objectory_available
+def test_record_manager_load_state_dict_lazy_state_dict_pass_through() -> None:
+    manager = RecordManager()
+    state = create_lazy_state()
+    manager.load_state_dict(state, lazy=True)
+    manager.get_record("loss").add_value(5, step=2)
+    state_dict = manager.state_dict()
+    assert state_dict["accuracy"] is state["accuracy"]
+    assert state_dict["loss"]["state"]["record"] == ((0, 10), (1, 6), (2, 5))
+
+
+@objectory_available
+def test_record_manager_load_state_dict_lazy_twice() -> None:
+    manager = RecordManager()
+    manager.load_state_dict(create_lazy_state(), lazy=True)
+    manager.load_state_dict(
+        {"loss": {"state": {"record": ((5, 1),), "improved": True, "best_value": 1}}}
+    )
+    assert "loss" in manager._lazy_states
+    record = manager.get_record("loss")
+    assert isinstance(record, MinScalarRecord)
+    assert record.get_most_recent() == ((5, 1),)
+
+
+@objectory_available
+def test_record_manager_load_state_dict_lazy_add_record() -> None:
+    manager = RecordManager()
+    manager.load_state_dict(create_lazy_state(), lazy=True)
+    with pytest.raises(RuntimeError, match=r"A record .* is already registered for the key loss"):
+        manager.add_record(MinScalarRecord("loss"))
+    manager.add_record(MaxScalarRecord("accuracy"), exist_ok=True)
+    assert manager.get_record("accuracy").is_empty()
+    assert "accuracy" not in manager._lazy_states
+
+
+@objectory_available
+def test_record_manager_load_state_dict_lazy_repr() -> None:
+    manager = RecordManager()
+    manager.load_state_dict(create_lazy_state(), lazy=True)
+    assert "MinScalarRecord" in repr(manager)
+    assert "MinScalarRecord" in str(manager)
+
+
+def test_record_manager_state_dict_fingerprint() -> None:
+    manager = RecordManager({"loss": MinScalarRecord.from_elements("loss", [(0, 1.0)])})
+    assert manager.state_dict()[FINGERPRINT_KEY] == manager.get_fingerprint()
+
+
+def test_record_manager_state_dict_fingerprint_add_value() -> None:
+    manager = RecordManager({"loss": MinScalarRecord.from_elements("loss", [(0, 1.0)])})
+    fingerprint = manager.state_dict()[FINGERPRINT_KEY]
+    manager.get_record("loss").add_value(2.0, step=1)
+    state = manager.state_dict()
+    assert state[FINGERPRINT_KEY] != fingerprint
+    assert state[FINGERPRINT_KEY] == manager.get_fingerprint()
+
+
+@objectory_available
+def test_record_manager_load_state_dict_fingerprint() -> None:
+    manager = RecordManager({"loss": MinScalarRecord.from_elements("loss", [(0, 1.0)])})
+    manager2 = RecordManager()
+    manager2.load_state_dict(manager.state_dict())
+    assert manager2.equal(manager)
+    assert manager2.get_fingerprint() == manager.get_fingerprint()
+
+
+def test_record_manager_add_record_fingerprint_key() -> None:
+    manager = RecordManager()
+    with pytest.raises(ValueError, match=r"The key '__fingerprint__' is reserved"):
+        manager.add_record(MinScalarRecord(FINGERPRINT_KEY))
+    assert not manager.has_record(FINGERPRINT_KEY)
+
+
+def test_record_manager_get_record_fingerprint_key() -> None:
+    manager = RecordManager()
+    with pytest.raises(ValueError, match=r"The key '__fingerprint__' is reserved"):
+        manager.get_record(FINGERPRINT_KEY)
+    assert len(manager) == 0
+
+
 def test_record_manager_state_dict_empty() -> None:
-    assert RecordManager().state_dict() == {}
+    assert RecordManager().state_dict() == {FINGERPRINT_KEY: 0}
 
 
 def test_record_manager_state_dict_1_record() -> None:
     manager = RecordManager()
     record = MinScalarRecord("loss")
     manager.add_record(record)
-    assert manager.state_dict() == {"loss": record.to_dict()}
+    assert manager.state_dict() == {
+        "loss": record.to_dict(),
+        FINGERPRINT_KEY: manager.get_fingerprint(),
+    }
 
 
 def test_record_manager_state_dict_2_record() -> None:
@@ -221,4 +496,607 @@ def test_record_manager_state_dict_2_record() -> None:
     manager.add_record(record1)
     record2 = MaxScalarRecord("accuracy")
     manager.add_record(record2)
-    assert manager.state_dict() == {"loss": record1.to_dict(), "accuracy": record2.to_dict()}
+    assert manager.state_dict() == {
+        "loss": record1.to_dict(),
+        "accuracy": record2.to_dict(),
+        FINGERPRINT_KEY: manager.get_fingerprint(),
+    }
+
+
+def create_namespace_manager() -> RecordManager:
+    manager = RecordManager()
+    manager.add_record(MinScalarRecord.from_elements("train/loss", [(0, 2.0), (1, 1.0)]))
+    manager.add_record(MinScalarRecord.from_elements("val/loss", [(0, 3.0), (1, 4.0)]))
+    manager.add_record(MaxScalarRecord.from_elements("val/acc/top1", [(0, 0.5), (1, 0.4)]))
+    manager.add_record(MaxScalarRecord.from_elements("validation", [(0, 0.1)]))
+    manager.add_record(Record("val/lr", elements=[(0, 0.01)]))
+    return manager
+
+
+def test_record_manager_get_best_values_namespace() -> None:
+    assert create_namespace_manager().get_best_values(namespace="val/") == {
+        "val/acc/top1": 0.5,
+        "val/loss": 3.0,
+    }
+
+
+def test_record_manager_get_best_values_namespace_prefix_suffix() -> None:
+    assert create_namespace_manager().get_best_values(
+        prefix="best/", suffix="/v", namespace="train/"
+    ) == {"best/train/loss/v": 1.0}
+
+
+def test_record_manager_get_best_values_namespace_missing() -> None:
+    assert create_namespace_manager().get_best_values(namespace="test/") == {}
+
+
+def test_record_manager_get_last_values_namespace() -> None:
+    assert create_namespace_manager().get_last_values(namespace="val") == {
+        "val/acc/top1": 0.4,
+        "val/loss": 4.0,
+        "val/lr": 0.01,
+        "validation": 0.1,
+    }
+
+
+def test_record_manager_get_records_namespace() -> None:
+    manager = create_namespace_manager()
+    assert list(manager.get_records(namespace="val/")) == ["val/acc/top1", "val/loss", "val/lr"]
+    assert list(manager.get_records(namespace="")) == [
+        "train/loss",
+        "val/acc/top1",
+        "val/loss",
+        "val/lr",
+        "validation",
+    ]
+
+
+def test_record_manager_get_records_namespace_new_keys() -> None:
+    manager = create_namespace_manager()
+    assert list(manager.get_records(namespace="test/")) == []
+    manager.add_record(MinScalarRecord("test/loss"))
+    manager.get_record("test/acc")
+    manager.add_record(MinScalarRecord("test/loss"), exist_ok=True)
+    assert list(manager.get_records(namespace="test/")) == ["test/acc", "test/loss"]
+    assert manager._key_index.count("test/loss") == 1
+
+
+def test_record_manager_get_records_namespace_load_state_dict() -> None:
+    manager = create_namespace_manager()
+    assert list(manager.get_records(namespace="test/")) == []
+    manager.load_state_dict(
+        {"test/loss": MinScalarRecord.from_elements("test/loss", [(0, 1.0)]).to_dict()}
+    )
+    assert list(manager.get_records(namespace="test/")) == ["test/loss"]
+
+
+def test_record_manager_get_records_namespace_lazy() -> None:
+    manager = RecordManager()
+    manager.load_state_dict(
+        {
+            "train/loss": MinScalarRecord.from_elements("train/loss", [(0, 1.0)]).to_dict(),
+            "val/loss": MinScalarRecord.from_elements("val/loss", [(0, 2.0)]).to_dict(),
+        },
+        lazy=True,
+    )
+    assert manager.get_best_values(namespace="val/") == {"val/loss": 2.0}
+    assert list(manager._records) == ["val/loss"]
+    assert list(manager._lazy_states) == ["train/loss"]
+
+
+def test_record_manager_namespace() -> None:
+    manager = create_namespace_manager()
+    view = manager.namespace("val/")
+    assert view.manager is manager
+    assert view.prefix == "val/"
+    assert len(view) == 3
+    assert repr(view) == "RecordNamespace(namespace=val/, size=3)"
+
+
+def test_record_manager_namespace_get_best_values() -> None:
+    view = create_namespace_manager().namespace("val/")
+    assert view.get_best_values() == {"acc/top1": 0.5, "loss": 3.0}
+    assert view.get_best_values(prefix="best/") == {"best/acc/top1": 0.5, "best/loss": 3.0}
+
+
+def test_record_manager_namespace_get_last_values() -> None:
+    view = create_namespace_manager().namespace("val/")
+    assert view.get_last_values(suffix="/last") == {
+        "acc/top1/last": 0.4,
+        "loss/last": 4.0,
+        "lr/last": 0.01,
+    }
+
+
+def test_record_manager_namespace_shares_records() -> None:
+    manager = create_namespace_manager()
+    view = manager.namespace("val/")
+    assert view.get_record("loss") is manager.get_record("val/loss")
+    assert view.has_record("loss")
+    assert not view.has_record("missing")
+    view.add_record(MinScalarRecord("cost"))
+    view.get_record("new").add_value(1.0)
+    assert manager.has_record("val/cost")
+    assert manager.get_last_values(namespace="val/new") == {"val/new": 1.0}
+    assert len(view) == 5
+
+
+def test_record_manager_namespace_add_record_exist_ok() -> None:
+    view = create_namespace_manager().namespace("val/")
+    with pytest.raises(RuntimeError, match=r"A record .* is already registered"):
+        view.add_record(MinScalarRecord("loss"))
+    view.add_record(MinScalarRecord("loss"), exist_ok=True)
+    assert view.get_record("loss").is_empty()
+
+
+def test_record_manager_namespace_nested() -> None:
+    view = create_namespace_manager().namespace("val/").namespace("acc/")
+    assert view.prefix == "val/acc/"
+    assert view.get_records() == {"top1": view.manager.get_record("val/acc/top1")}
+
+
+def test_record_manager_select_glob() -> None:
+    assert list(create_namespace_manager().select("*/loss")) == ["train/loss", "val/loss"]
+
+
+def test_record_manager_select_regex() -> None:
+    assert list(create_namespace_manager().select(re.compile(r"val/(acc/top\d|lr)"))) == [
+        "val/acc/top1",
+        "val/lr",
+    ]
+
+
+def test_record_manager_select_missing() -> None:
+    assert create_namespace_manager().select("test/*") == {}
+
+
+def test_record_manager_select_cache() -> None:
+    manager = create_namespace_manager()
+    assert list(manager.select("val/*")) == ["val/acc/top1", "val/loss", "val/lr"]
+    assert manager._selections == {"val/*": ["val/acc/top1", "val/loss", "val/lr"]}
+    manager.get_record("val/loss").add_value(1.0)
+    assert "val/*" in manager._selections
+    manager.add_record(MinScalarRecord("val/cost"))
+    assert manager._selections == {}
+    assert list(manager.select("val/*")) == ["val/acc/top1", "val/cost", "val/loss", "val/lr"]
+    manager.get_record("val/f1")
+    assert list(manager.select("val/*")) == [
+        "val/acc/top1",
+        "val/cost",
+        "val/f1",
+        "val/loss",
+        "val/lr",
+    ]
+
+
+def test_record_manager_select_cache_load_state_dict() -> None:
+    manager = create_namespace_manager()
+    assert list(manager.select("*/loss")) == ["train/loss", "val/loss"]
+    manager.load_state_dict({"val/loss": manager.get_record("val/loss").to_dict()})
+    assert "*/loss" in manager._selections
+    manager.load_state_dict({"test/loss": MinScalarRecord("test/loss").to_dict()}, lazy=True)
+    assert list(manager.select("*/loss")) == ["test/loss", "train/loss", "val/loss"]
+
+
+def test_record_manager_select_cache_max_size() -> None:
+    manager = create_namespace_manager()
+    for i in range(200):
+        manager.select(f"val/{i}")
+    assert len(manager._selections) == 128
+    assert "val/199" in manager._selections
+
+
+def test_record_manager_get_best_values_pattern() -> None:
+    assert create_namespace_manager().get_best_values(pattern="*/loss") == {
+        "train/loss": 1.0,
+        "val/loss": 3.0,
+    }
+
+
+def test_record_manager_get_last_values_pattern() -> None:
+    assert create_namespace_manager().get_last_values(pattern="val*") == {
+        "val/acc/top1": 0.4,
+        "val/loss": 4.0,
+        "val/lr": 0.01,
+        "validation": 0.1,
+    }
+
+
+def test_record_manager_get_records_namespace_pattern() -> None:
+    assert list(create_namespace_manager().get_records(namespace="val/", pattern="*/loss")) == [
+        "val/loss"
+    ]
+
+
+def test_record_manager_rules() -> None:
+    manager = RecordManager(
+        rules=[
+            RecordRule("*/loss", MinScalarRecord, max_size=5),
+            RecordRule("*/acc*", MaxScalarRecord),
+        ]
+    )
+    manager.get_record("train/loss").add_value(2.0)
+    manager.get_record("val/acc/top1").add_value(0.5)
+    manager.get_record("epoch").add_value(1)
+    assert manager.get_record("train/loss").equal(
+        MinScalarRecord(
+            "train/loss", max_size=5, elements=[(None, 2.0)], best_value=2.0, improved=True
+        )
+    )
+    assert isinstance(manager.get_record("val/acc/top1"), MaxScalarRecord)
+    assert isinstance(manager.get_record("epoch"), Record)
+    assert manager.get_best_values() == {"train/loss": 2.0, "val/acc/top1": 0.5}
+
+
+def test_record_manager_rules_do_not_change_existing_records() -> None:
+    manager = RecordManager(
+        {"train/loss": Record("train/loss")}, rules=[RecordRule("*/loss", MinScalarRecord)]
+    )
+    manager.add_record(Record("val/loss"))
+    assert type(manager.get_record("train/loss")) is Record
+    assert type(manager.get_record("val/loss")) is Record
+
+
+def test_record_manager_rules_cache() -> None:
+    manager = RecordManager(rules=[RecordRule("*/loss", MinScalarRecord)])
+    manager.get_record("train/loss")
+    manager.get_record("epoch")
+    assert list(manager._key_rules) == ["train/loss", "epoch"]
+    assert manager._key_rules["epoch"] is None
+
+
+def test_record_manager_add_rule() -> None:
+    manager = RecordManager(rules=[RecordRule("*/loss", MinScalarRecord)])
+    manager.get_record("epoch")
+    manager.add_rule(RecordRule("*", MaxScalarRecord))
+    assert manager._key_rules == {}
+    assert isinstance(manager.get_record("train/loss"), MinScalarRecord)
+    assert isinstance(manager.get_record("val/acc"), MaxScalarRecord)
+    assert type(manager.get_record("epoch")) is Record
+
+
+def test_record_manager_rules_namespace() -> None:
+    manager = RecordManager(rules=[RecordRule("val/*", MaxScalarRecord)])
+    manager.namespace("val/").get_record("acc").add_value(0.5)
+    assert manager.get_best_values() == {"val/acc": 0.5}
+
+
+def create_full_records(max_size: int = 100) -> dict[str, Record]:
+    return {
+        key: Record(
+            key,
+            max_size=max_size,
+            elements=[(i, float(i)) for i in range(max_size)],
+            storage="auto",
+        )
+        for key in ["a", "b", "c"]
+    }
+
+
+def get_memory(manager: RecordManager) -> int:
+    return sum(_estimate_memory(record) for record in manager._records.values())
+
+
+def test_record_manager_memory_budget_default() -> None:
+    manager = RecordManager()
+    assert manager.memory_budget is None
+    manager.get_record("loss")
+    manager.enforce_memory_budget()
+    assert manager._recency == {}
+    assert manager.get_memory_stats() == {
+        "checks": 0,
+        "compacted": 0,
+        "shrunk": 0,
+        "evicted": 0,
+        "reloaded": 0,
+    }
+
+
+def test_record_manager_memory_budget() -> None:
+    assert RecordManager(memory_budget=1024).memory_budget == 1024
+
+
+def test_record_manager_memory_budget_config() -> None:
+    set_memory_budget(1024)
+    try:
+        assert RecordManager().memory_budget == 1024
+    finally:
+        reset_memory_budget()
+
+
+@pytest.mark.parametrize("memory_budget", [0, -1])
+def test_record_manager_memory_budget_incorrect(memory_budget: int) -> None:
+    with pytest.raises(ValueError, match=r"memory_budget must be greater than 0"):
+        RecordManager(memory_budget=memory_budget)
+
+
+def test_record_manager_min_size_incorrect() -> None:
+    with pytest.raises(ValueError, match=r"min_size must be greater than 0"):
+        RecordManager(min_size=0)
+
+
+def test_record_manager_memory_budget_under_budget() -> None:
+    manager = RecordManager(create_full_records(), memory_budget=10**9)
+    manager.enforce_memory_budget()
+    assert manager.get_memory_stats()["checks"] == 1
+    assert [record.max_size for record in manager.get_records().values()] == [100, 100, 100]
+
+
+def test_record_manager_memory_budget_shrink_least_recently_used() -> None:
+    manager = RecordManager(create_full_records())
+    manager._memory_budget = get_memory(manager) - 100
+    manager.get_record("b")
+    manager.get_record("a")
+    manager.enforce_memory_budget()
+    assert manager.get_memory_stats()["shrunk"] == 1
+    assert {key: record.max_size for key, record in manager.get_records().items()} == {
+        "a": 100,
+        "b": 100,
+        "c": 50,
+    }
+    assert manager.get_record("c").get_most_recent(1) == ((99, 99.0),)
+
+
+def test_record_manager_memory_budget_shrink_min_size() -> None:
+    manager = RecordManager(create_full_records(), memory_budget=1, min_size=30)
+    manager.enforce_memory_budget()
+    stats = manager.get_memory_stats()
+    assert stats["shrunk"] == 6
+    assert stats["evicted"] == 3
+    assert {record.max_size for record in manager.get_records().values()} == {30}
+
+
+def test_record_manager_memory_budget_compact() -> None:
+    record = Record("a", max_size=2)
+    record.update([(0, "abc"), (1, 2.0), (2, 1.0)])
+    manager = RecordManager({"a": record}, memory_budget=1)
+    manager.enforce_memory_budget()
+    assert manager.get_memory_stats()["compacted"] == 1
+    assert manager.get_record("a").backend == "packed"
+
+
+def test_record_manager_memory_budget_evict() -> None:
+    manager = RecordManager(create_full_records(), memory_budget=1, min_size=100)
+    fingerprint = manager.get_fingerprint()
+    state = manager.state_dict()
+    manager.enforce_memory_budget()
+    assert manager.get_memory_stats()["evicted"] == 3
+    assert manager._records == {}
+    assert len(manager) == 3
+    assert manager.has_record("a")
+    assert manager.get_fingerprint() == fingerprint
+    assert objects_are_equal(manager.state_dict(), state)
+    assert manager._get_namespace_keys("") == ["a", "b", "c"]
+
+
+def test_record_manager_memory_budget_evict_referenced_record(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    manager = RecordManager(create_full_records(), memory_budget=1, min_size=100)
+    record = manager.get_record("b")
+    with caplog.at_level(logging.WARNING):
+        manager.enforce_memory_budget()
+    assert manager.get_memory_stats()["evicted"] == 2
+    assert list(manager._records) == ["b"]
+    assert "1 records are not evicted" in caplog.text
+    record.add_value(-1.0, step=1000)
+    assert manager.get_record("b").get_last_value() == -1.0
+
+
+def test_record_manager_memory_budget_evict_released_record() -> None:
+    manager = RecordManager(create_full_records(), memory_budget=1, min_size=100)
+    record = manager.get_record("b")
+    manager.enforce_memory_budget()
+    del record
+    manager.enforce_memory_budget()
+    assert manager.get_memory_stats()["evicted"] == 3
+    assert manager._records == {}
+
+
+def test_record_manager_memory_budget_evict_unpicklable_record(
+    caplog: pytest.LogCaptureFixture,
+) -> None:
+    records = create_full_records()
+    records["b"] = ComparableRecord(
+        "b", KeyComparator(key=lambda value: value), elements=[(i, float(i)) for i in range(100)]
+    )
+    manager = RecordManager(records, memory_budget=1, min_size=100)
+    with caplog.at_level(logging.WARNING):
+        manager.enforce_memory_budget()
+    assert manager.get_memory_stats()["evicted"] == 2
+    assert list(manager._records) == ["b"]
+    assert "referenced outside of the manager or cannot be pickled" in caplog.text
+
+
+def test_record_manager_memory_budget_reload() -> None:
+    records = create_full_records()
+    manager = RecordManager(
+        {key: record.clone() for key, record in records.items()}, memory_budget=1, min_size=100
+    )
+    manager.enforce_memory_budget()
+    record = manager.get_record("b")
+    assert record.equal(records["b"])
+    assert manager.get_memory_stats()["reloaded"] == 1
+    assert manager.get_memory_stats()["evicted"] == 3
+    assert list(manager._records) == ["b"]
+    assert manager.get_records().keys() == {"a", "b", "c"}
+
+
+def test_record_manager_memory_budget_get_record_evicts_other_records() -> None:
+    manager = RecordManager(create_full_records(), memory_budget=1, min_size=100)
+    manager.get_record("new")
+    assert manager.get_memory_stats()["evicted"] == 3
+    assert list(manager._records) == ["new"]
+
+
+def test_record_manager_memory_budget_get_record_add_value() -> None:
+    manager = RecordManager({"loss": Record("loss", max_size=5000)}, memory_budget=50000)
+    for step in range(3000):
+        manager.get_record("loss").add_value(float(step), step=step)
+    assert manager.get_memory_stats()["checks"] == 2
+    assert manager.get_memory_stats()["compacted"] == 1
+    assert manager.get_record("loss").backend == "packed"
+    assert manager.get_record("loss").get_most_recent(1) == ((2999, 2999.0),)
+
+
+def test_record_manager_memory_budget_get_record_throttled() -> None:
+    manager = RecordManager(create_full_records(), memory_budget=10**9)
+    manager.enforce_memory_budget()
+    for _ in range(1023):
+        manager.get_record("a")
+    assert manager.get_memory_stats()["checks"] == 1
+    manager.get_record("a")
+    assert manager.get_memory_stats()["checks"] == 2
+
+
+def test_record_manager_memory_budget_get_record_without_budget() -> None:
+    manager = RecordManager(create_full_records())
+    for _ in range(2000):
+        manager.get_record("a")
+    assert manager.get_memory_stats()["checks"] == 0
+
+
+def test_record_manager_memory_budget_without_getrefcount(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.delattr(sys, "getrefcount")
+    manager = RecordManager(create_full_records(), memory_budget=1, min_size=100)
+    manager.enforce_memory_budget()
+    assert manager.get_memory_stats()["evicted"] == 0
+    assert len(manager._records) == 3
+
+
+def test_record_manager_memory_budget_load_state_dict() -> None:
+    manager = RecordManager(create_full_records(), memory_budget=1, min_size=100)
+    manager.enforce_memory_budget()
+    manager.load_state_dict({"a": {"state": {"record": [(0, 1.0)]}}})
+    assert manager.get_record("a").get_most_recent() == ((0, 1.0),)
+
+
+def test_record_manager_memory_budget_add_record_overwrite() -> None:
+    manager = RecordManager(create_full_records(), memory_budget=1, min_size=100)
+    manager.enforce_memory_budget()
+    path = manager._evicted["a"][0]
+    manager.add_record(Record("a"), exist_ok=True)
+    assert not Path(path).exists()
+    assert manager.get_record("a").is_empty()
+
+
+def test_record_manager_memory_budget_remove_spill_dir() -> None:
+    manager = RecordManager(create_full_records(), memory_budget=1, min_size=100)
+    manager.enforce_memory_budget()
+    spill_dir = manager._spill_dir
+    assert Path(spill_dir).is_dir()
+    del manager
+    assert not Path(spill_dir).exists()
+
+
+def test_record_manager_memory_usage() -> None:
+    manager = RecordManager()
+    manager.add_record(Record("small", elements=[(0, 1.0)]))
+    manager.add_record(Record("large", elements=[(0, "a" * 1000)]))
+    usages = manager.memory_usage()
+    assert list(usages) == ["large", "small"]
+    record_usage = manager.get_record("small").memory_usage()
+    assert usages["small"] == {
+        "key": sys.getsizeof("small"),
+        **record_usage,
+        "total": record_usage["total"] + sys.getsizeof("small"),
+    }
+
+
+def test_record_manager_memory_usage_empty() -> None:
+    assert RecordManager().memory_usage() == {}
+
+
+def test_record_manager_memory_usage_lazy() -> None:
+    manager = RecordManager()
+    manager.load_state_dict({"loss": Record("loss", elements=[(0, 1.0)]).to_dict()}, lazy=True)
+    usage = manager.memory_usage()["loss"]
+    assert usage["state"] > 0
+    assert usage["total"] == usage["key"] + usage["state"]
+    assert not manager._records
+
+
+def test_record_manager_memory_usage_evicted() -> None:
+    manager = RecordManager(create_full_records(), memory_budget=1, min_size=100)
+    manager.enforce_memory_budget()
+    assert manager.memory_usage() == {}
+
+
+def test_record_manager_merge() -> None:
+    manager1 = RecordManager()
+    manager1.add_record(MinScalarRecord.from_elements("loss", [(0, 4.0), (1, 2.0)]))
+    manager1.add_record(Record("lr", elements=[(0, 0.1)]))
+    manager2 = RecordManager()
+    manager2.add_record(MinScalarRecord.from_elements("loss", [(0, 2.0), (1, 1.0)]))
+    manager2.add_record(MaxScalarRecord.from_elements("acc", [(1, 0.5)]))
+    manager = manager1.merge([manager2])
+    assert list(manager.get_records()) == ["loss", "lr", "acc"]
+    assert manager.get_record("loss").get_most_recent() == ((0, 3.0), (1, 1.5))
+    assert manager.get_best_values() == {"loss": 1.5, "acc": 0.5}
+    assert manager.get_last_values() == {"loss": 1.5, "lr": 0.1, "acc": 0.5}
+    assert manager1.get_record("loss").get_most_recent() == ((0, 4.0), (1, 2.0))
+
+
+def test_record_manager_merge_reductions() -> None:
+    managers = [
+        RecordManager(
+            {
+                "loss": MinScalarRecord.from_elements("loss", [(0, value)]),
+                "samples": MaxScalarRecord.from_elements("samples", [(0, 32)]),
+            }
+        )
+        for value in (1.0, 2.0, 3.0)
+    ]
+    manager = managers[0].merge(managers[1:], reduce="max", reductions={"samples": "sum"})
+    assert manager.get_last_values() == {"loss": 3.0, "samples": 96}
+
+
+def test_record_manager_merge_keeps_rules() -> None:
+    rule = RecordRule("*loss", MinScalarRecord)
+    manager = RecordManager(rules=[rule]).merge([RecordManager()])
+    assert isinstance(manager.get_record("val/loss"), MinScalarRecord)
+
+
+def test_record_manager_merge_lazy() -> None:
+    manager1 = RecordManager()
+    manager1.load_state_dict(
+        {"loss": MinScalarRecord.from_elements("loss", [(0, 1.0)]).to_dict()}, lazy=True
+    )
+    manager2 = RecordManager({"loss": MinScalarRecord.from_elements("loss", [(0, 3.0)])})
+    assert manager1.merge([manager2]).get_last_values() == {"loss": 2.0}
+
+
+def test_record_manager_merge_not_a_record() -> None:
+    manager = RecordManager({"loss": Mock(spec=BaseRecord)})
+    with pytest.raises(TypeError, match=r"The record of the key loss cannot be merged"):
+        manager.merge([])
+
+
+def test_record_manager_memory_report() -> None:
+    manager = RecordManager()
+    manager.add_record(Record("small", elements=[(0, 1.0)]))
+    manager.add_record(Record("large", elements=[(0, "a" * 10_000)]))
+    manager.add_record(MinScalarRecord("val/loss"))
+    lines = manager.memory_report().splitlines()
+    assert lines[0].split() == ["key", "record", "size", "memory", "share"]
+    assert lines[1].split()[:3] == ["large", "Record", "1"]
+    assert len(lines) == 5
+    assert lines[-1].startswith("3 records")
+    assert lines[-1].endswith("100.0%")
+
+
+def test_record_manager_memory_report_top() -> None:
+    manager = RecordManager(create_full_records())
+    assert len(manager.memory_report(top=1).splitlines()) == 3
+
+
+def test_record_manager_memory_report_empty() -> None:
+    assert RecordManager().memory_report().splitlines()[-1].split() == [
+        "0",
+        "records",
+        "1",
+        "B",
+        "100.0%",
+    ]
@@ -0,0 +1,545 @@
+from __future__ import annotations
+
+import math
+import pickle
+from unittest.mock import patch
+
+import pytest
+
+from minrecord import BaseRecord, EmptyRecordError, Record, RecordManager
+from minrecord.ndarray import ArrayRecord, ArrayStorage
+from minrecord.storage import get_backend
+from minrecord.testing import numpy_available
+from minrecord.utils.imports import is_numpy_available
+
+if is_numpy_available():
+    import numpy as np
+
+##################################
+#     Tests for ArrayStorage     #
+##################################
+
+
+@numpy_available
+def test_array_storage_repr() -> None:
+    assert (
+        repr(ArrayStorage(5, [(0, np.zeros(3))]))
+        == "ArrayStorage(maxlen=5, size=1, shape=(3,), dtype=float64)"
+    )
+
+
+@numpy_available
+def test_array_storage_empty() -> None:
+    storage = ArrayStorage(5)
+    assert len(storage) == 0
+    assert storage.maxlen == 5
+    assert storage.shape is None
+    assert storage.dtype is None
+    assert tuple(storage) == ()
+    assert storage.to_array().shape == (0,)
+
+
+@numpy_available
+def test_array_storage_empty_shape() -> None:
+    storage = ArrayStorage(5, shape=[2, 3], dtype="float32")
+    assert storage.shape == (2, 3)
+    assert storage.dtype == np.float32
+    assert storage.to_array().shape == (0, 2, 3)
+
+
+@numpy_available
+def test_array_storage_append() -> None:
+    storage = ArrayStorage(5)
+    storage.append((0, [1.0, 2.0]))
+    storage.append((1, np.array([3.0, 4.0])))
+    assert storage.shape == (2,)
+    assert storage.dtype == np.float64
+    assert np.array_equal(storage.to_array(), np.array([[1.0, 2.0], [3.0, 4.0]]))
+    assert [step for step, _ in storage] == [0, 1]
+
+
+@numpy_available
+def test_array_storage_append_full() -> None:
+    storage = ArrayStorage(3, [(i, np.full(2, i)) for i in range(5)])
+    assert len(storage) == 3
+    assert [step for step, _ in storage] == [2, 3, 4]
+    assert [step for step, _ in reversed(storage)] == [4, 3, 2]
+    assert np.array_equal(storage.to_array(), np.array([[2, 2], [3, 3], [4, 4]]))
+
+
+@numpy_available
+def test_array_storage_append_grow() -> None:
+    storage = ArrayStorage(100, [(i, np.full(2, float(i))) for i in range(40)])
+    assert len(storage) == 40
+    assert np.array_equal(storage.to_array()[:, 0], np.arange(40.0))
+
+
+@numpy_available
+def test_array_storage_allocates_lazily() -> None:
+    storage = ArrayStorage(1_000_000, [(0, np.zeros(1000))])
+    assert storage.memory_usage()["values"] < 1_000_000
+
+
+@numpy_available
+def test_array_storage_append_copies_value() -> None:
+    value = np.array([1.0, 2.0])
+    storage = ArrayStorage(3, [(0, value)])
+    value[0] = 5.0
+    assert np.array_equal(storage[0][1], np.array([1.0, 2.0]))
+
+
+@numpy_available
+def test_array_storage_getitem_returns_copy() -> None:
+    storage = ArrayStorage(2, [(0, np.array([1.0, 2.0]))])
+    step, value = storage[0]
+    storage.append((1, np.array([3.0, 4.0])))
+    storage.append((2, np.array([5.0, 6.0])))
+    assert step == 0
+    assert np.array_equal(value, np.array([1.0, 2.0]))
+
+
+@numpy_available
+def test_array_storage_getitem_0d() -> None:
+    storage = ArrayStorage(3, [(0, 1.5)])
+    step, value = storage[0]
+    assert step == 0
+    assert isinstance(value, np.ndarray)
+    assert value.shape == ()
+
+
+@pytest.mark.parametrize("index", [3, -4])
+@numpy_available
+def test_array_storage_getitem_out_of_range(index: int) -> None:
+    storage = ArrayStorage(3, [(i, np.zeros(2)) for i in range(3)])
+    with pytest.raises(IndexError, match=r"storage index out of range"):
+        storage[index]
+
+
+@numpy_available
+def test_array_storage_append_incorrect_shape() -> None:
+    storage = ArrayStorage(3, [(0, np.zeros(2))])
+    with pytest.raises(ValueError, match=r"expected a value of shape \(2,\)"):
+        storage.append((1, np.zeros(3)))
+    assert len(storage) == 1
+
+
+@numpy_available
+def test_array_storage_append_incorrect_dtype() -> None:
+    storage = ArrayStorage(3, [(0, np.zeros(2, dtype=int))])
+    with pytest.raises(TypeError, match=r"cannot cast a value of type float64"):
+        storage.append((1, np.zeros(2)))
+
+
+@numpy_available
+def test_array_storage_eq_true() -> None:
+    assert ArrayStorage(3, [(0, np.array([1.0, math.nan]))]) == ArrayStorage(
+        5, [(0, np.array([1.0, math.nan]))]
+    )
+
+
+@numpy_available
+def test_array_storage_eq_false() -> None:
+    storage = ArrayStorage(3, [(0, np.array([1.0, 2.0]))])
+    assert storage != ArrayStorage(3, [(1, np.array([1.0, 2.0]))])
+    assert storage != ArrayStorage(3, [(0, np.array([1.0, 3.0]))])
+    assert storage != ArrayStorage(3, [(0, np.array([1, 2]))])
+    assert storage != [(0, np.array([1.0, 2.0]))]
+
+
+@numpy_available
+def test_array_storage_memory_usage() -> None:
+    usage = ArrayStorage(16, [(i, np.zeros(100)) for i in range(16)]).memory_usage()
+    assert usage["values"] >= 16 * 100 * 8
+    assert usage["steps"] > 0
+
+
+@numpy_available
+def test_array_storage_backend() -> None:
+    assert get_backend(ArrayStorage(3)) == "array"
+
+
+#################################
+#     Tests for ArrayRecord     #
+#################################
+
+
+@numpy_available
+def test_array_record_repr() -> None:
+    assert repr(ArrayRecord("acc")) == "ArrayRecord(name=acc, max_size=10, size=0)"
+
+
+@numpy_available
+def test_array_record_str() -> None:
+    assert str(ArrayRecord("acc")).startswith("ArrayRecord(")
+
+
+@numpy_available
+def test_array_record_properties() -> None:
+    record = ArrayRecord("acc", mode="min", shape=[3], dtype="float32")
+    assert record.mode == "min"
+    assert record.shape == (3,)
+    assert record.dtype == np.float32
+    assert record.backend == "array"
+    assert record.is_comparable()
+
+
+@numpy_available
+def test_array_record_incorrect_mode() -> None:
+    with pytest.raises(ValueError, match=r"Incorrect mode: mean"):
+        ArrayRecord("acc", mode="mean")
+
+
+@numpy_available
+def test_array_record_elements() -> None:
+    record = ArrayRecord("acc", elements=[(0, np.array([1.0, 2.0])), (1, np.array([3.0, 0.0]))])
+    assert record.shape == (2,)
+    assert len(record) == 2
+    with pytest.raises(EmptyRecordError, match=r"The record is empty"):
+        record.get_best_value()
+
+
+@numpy_available
+def test_array_record_add_value_max() -> None:
+    record = ArrayRecord("acc", mode="max")
+    record.add_value(np.array([0.5, 0.7, 0.2]), step=0)
+    record.add_value(np.array([0.6, 0.6, 0.1]), step=1)
+    assert np.array_equal(record.get_best_value(), np.array([0.6, 0.7, 0.2]))
+    assert record.get_best_steps().tolist() == [1, 0, 0]
+    assert record.has_improved()
+
+
+@numpy_available
+def test_array_record_add_value_min() -> None:
+    record = ArrayRecord("loss", mode="min")
+    record.add_value(np.array([0.5, 0.7]), step=0)
+    record.add_value(np.array([0.6, 0.8]), step=1)
+    assert np.array_equal(record.get_best_value(), np.array([0.5, 0.7]))
+    assert record.get_best_steps().tolist() == [0, 0]
+    assert not record.has_improved()
+
+
+@numpy_available
+def test_array_record_add_value_equal_is_improvement() -> None:
+    record = ArrayRecord("acc")
+    record.add_value(np.array([0.5, 0.7]), step=0)
+    record.add_value(np.array([0.5, 0.1]), step=1)
+    assert record.get_best_steps().tolist() == [1, 0]
+    assert record.has_improved()
+
+
+@numpy_available
+def test_array_record_add_value_nan() -> None:
+    record = ArrayRecord("acc")
+    record.add_value(np.array([math.nan, 0.7]), step=0)
+    assert record.get_best_steps().tolist() == [None, 0]
+    record.add_value(np.array([0.5, math.nan]), step=1)
+    assert np.array_equal(record.get_best_value(), np.array([0.5, 0.7]))
+    assert record.get_best_steps().tolist() == [1, 0]
+
+
+@numpy_available
+def test_array_record_add_value_2d() -> None:
+    record = ArrayRecord("confusion")
+    record.add_value(np.array([[1, 2], [3, 4]]), step=0)
+    record.add_value(np.array([[2, 1], [3, 5]]), step=1)
+    assert np.array_equal(record.get_best_value(), np.array([[2, 2], [3, 5]]))
+    assert record.get_best_steps().tolist() == [[1, 0], [1, 1]]
+
+
+@numpy_available
+def test_array_record_add_value_scalar() -> None:
+    record = ArrayRecord("loss", mode="min")
+    record.update([(0, 2.0), (1, 1.0), (2, 3.0)])
+    assert record.get_best_value() == 1.0
+    assert record.get_best_steps() == 1
+    assert record.get_last_value() == 3.0
+
+
+@numpy_available
+def test_array_record_add_value_casts_dtype() -> None:
+    record = ArrayRecord("acc", dtype="float32")
+    record.add_value(np.array([1, 2]))
+    assert record.get_last_value().dtype == np.float32
+
+
+@numpy_available
+def test_array_record_add_value_incorrect_shape() -> None:
+    record = ArrayRecord("acc")
+    record.add_value(np.zeros(3), step=0)
+    with pytest.raises(ValueError, match=r"'acc' record cannot add the value"):
+        record.add_value(np.zeros(2), step=1)
+    assert len(record) == 1
+    assert record.get_best_steps().tolist() == [0, 0, 0]
+
+
+@numpy_available
+def test_array_record_add_value_incorrect_dtype() -> None:
+    record = ArrayRecord("acc", dtype=int)
+    with pytest.raises(TypeError, match=r"'acc' record cannot add the value"):
+        record.add_value(np.array([1.5, 2.0]))
+    assert record.is_empty()
+
+
+@numpy_available
+def test_array_record_add_value_does_not_keep_reference() -> None:
+    value = np.array([1.0, 2.0])
+    record = ArrayRecord("acc")
+    record.add_value(value)
+    value[0] = 5.0
+    assert np.array_equal(record.get_best_value(), np.array([1.0, 2.0]))
+    assert np.array_equal(record.get_last_value(), np.array([1.0, 2.0]))
+
+
+@numpy_available
+def test_array_record_best_value_is_copy() -> None:
+    record = ArrayRecord("acc")
+    record.add_value(np.array([1.0, 2.0]))
+    record.get_best_value()[0] = 5.0
+    record.get_best_steps()[0] = 5
+    assert np.array_equal(record.get_best_value(), np.array([1.0, 2.0]))
+    assert record.get_best_steps().tolist() == [None, None]
+
+
+@numpy_available
+def test_array_record_best_value_not_limited_to_window() -> None:
+    record = ArrayRecord("acc", max_size=2)
+    record.update([(i, np.array([5.0 - i, float(i)])) for i in range(5)])
+    assert np.array_equal(record.get_best_value(), np.array([5.0, 4.0]))
+    assert record.get_best_steps().tolist() == [0, 4]
+    assert record.get_steps() == (3, 4)
+
+
+@pytest.mark.parametrize("mode", ["max", "min"])
+@numpy_available
+def test_array_record_update_same_as_add_value(mode: str) -> None:
+    rng = np.random.default_rng(42)
+    values = rng.integers(0, 5, size=(30, 4)).astype(float)
+    values[rng.random(values.shape) < 0.1] = math.nan
+    elements = [(step, value) for step, value in enumerate(values)]
+    record1 = ArrayRecord("acc", mode=mode, max_size=7)
+    for step, value in elements[:12]:
+        record1.add_value(value, step)
+    record1.update(elements[12:])
+    record2 = ArrayRecord("acc", mode=mode, max_size=7)
+    for step, value in elements:
+        record2.add_value(value, step)
+    assert record1.equal(record2)
+    assert record1.get_fingerprint() == record2.get_fingerprint()
+
+
+@numpy_available
+def test_array_record_update_incorrect_value() -> None:
+    record = ArrayRecord("acc")
+    with pytest.raises(ValueError, match=r"'acc' record cannot add the value"):
+        record.update([(0, np.zeros(2)), (1, np.zeros(3))])
+    assert record.is_empty()
+
+
+@numpy_available
+def test_array_record_update_empty() -> None:
+    record = ArrayRecord("acc")
+    record.update([])
+    assert record.is_empty()
+
+
+@numpy_available
+def test_array_record_fingerprint_after_eviction() -> None:
+    record = ArrayRecord("acc", max_size=3)
+    record.update([(i, np.full(2, float(i))) for i in range(10)])
+    expected = ArrayRecord("acc", elements=[(i, np.full(2, float(i))) for i in range(7, 10)])
+    assert Record.get_fingerprint(record) == expected._compute_fingerprint()
+
+
+@numpy_available
+def test_array_record_get_values_array() -> None:
+    record = ArrayRecord("acc", max_size=3)
+    record.update([(i, np.full(2, i)) for i in range(5)])
+    assert np.array_equal(record.get_values_array(), np.array([[2, 2], [3, 3], [4, 4]]))
+    assert np.array_equal(record.get_values_array(2), np.array([[3, 3], [4, 4]]))
+    assert record.get_values_array(0).shape == (0, 2)
+
+
+@numpy_available
+def test_array_record_get_values_array_incorrect_n() -> None:
+    with pytest.raises(ValueError, match=r"n must be greater than or equal to 0"):
+        ArrayRecord("acc").get_values_array(-1)
+
+
+@numpy_available
+def test_array_record_get_best_steps_empty() -> None:
+    with pytest.raises(EmptyRecordError, match=r"The record is empty"):
+        ArrayRecord("acc").get_best_steps()
+
+
+@numpy_available
+def test_array_record_has_improved_empty() -> None:
+    with pytest.raises(EmptyRecordError, match=r"The record is empty"):
+        ArrayRecord("acc").has_improved()
+
+
+@numpy_available
+def test_array_record_get_value_at_step() -> None:
+    record = ArrayRecord.from_elements("acc", [(i, np.full(2, i)) for i in range(5)])
+    assert np.array_equal(record.get_value_at_step(3), np.array([3, 3]))
+    assert len(record.get_range(1, 2)) == 2
+
+
+@numpy_available
+def test_array_record_clone() -> None:
+    record = ArrayRecord.from_elements(
+        "acc", [(0, np.array([1.0, 2.0])), (1, np.array([2.0, 1.0]))]
+    )
+    clone = record.clone()
+    assert clone is not record
+    assert clone.equal(record)
+    clone.add_value(np.array([3.0, 3.0]), step=2)
+    assert record.get_best_steps().tolist() == [1, 0]
+
+
+@numpy_available
+def test_array_record_equal_false() -> None:
+    record = ArrayRecord.from_elements("acc", [(0, np.array([1.0, 2.0]))])
+    assert not record.equal(ArrayRecord.from_elements("acc", [(0, np.array([1.0, 3.0]))]))
+    assert not record.equal(
+        ArrayRecord.from_elements("acc", [(0, np.array([1.0, 2.0]))], mode="min")
+    )
+    assert not record.equal(ArrayRecord("acc", elements=[(0, np.array([1.0, 2.0]))]))
+    assert not record.equal(ArrayRecord("acc"))
+
+
+@numpy_available
+def test_array_record_resize() -> None:
+    record = ArrayRecord.from_elements("acc", [(i, np.full(2, i)) for i in range(5)])
+    record.resize(2)
+    assert record.max_size == 2
+    assert record.backend == "array"
+    assert record.get_steps() == (3, 4)
+    assert Record.get_fingerprint(record) == record.clone()._compute_fingerprint()
+
+
+@numpy_available
+def test_array_record_compact() -> None:
+    record = ArrayRecord.from_elements("acc", [(0, np.zeros(2))])
+    assert not record.compact()
+    assert record.backend == "array"
+
+
+@numpy_available
+def test_array_record_config_dict() -> None:
+    record = ArrayRecord.from_elements("acc", [(0, np.zeros(2, dtype=np.float32))], mode="min")
+    assert record.config_dict() == {
+        "_target_": "minrecord.ndarray.ArrayRecord",
+        "name": "acc",
+        "max_size": 10,
+        "mode": "min",
+        "shape": (2,),
+        "dtype": "float32",
+    }
+
+
+@numpy_available
+def test_array_record_state_dict() -> None:
+    record = ArrayRecord.from_elements("acc", [(0, np.array([1.0, 2.0]))])
+    state = record.state_dict()
+    assert state["improved"]
+    assert np.array_equal(state["best_value"], np.array([1.0, 2.0]))
+    assert state["best_steps"].tolist() == [0, 0]
+    assert state["backend"] == "array"
+    record.add_value(np.array([3.0, 3.0]), step=1)
+    assert np.array_equal(state["best_value"], np.array([1.0, 2.0]))
+
+
+@numpy_available
+def test_array_record_load_state_dict() -> None:
+    record = ArrayRecord.from_elements(
+        "acc", [(0, np.array([1.0, 2.0])), (1, np.array([2.0, 1.0]))]
+    )
+    other = ArrayRecord("acc")
+    other.load_state_dict(record.state_dict())
+    assert other.equal(record)
+    assert other.get_fingerprint() == record.get_fingerprint()
+
+
+@numpy_available
+def test_array_record_load_state_dict_incorrect_best_steps() -> None:
+    state = ArrayRecord.from_elements("acc", [(0, np.zeros(2))]).state_dict()
+    state["best_steps"] = [0, 1, 2]
+    with pytest.raises(ValueError, match=r"expects best steps of shape \(2,\)"):
+        ArrayRecord("acc").load_state_dict(state)
+
+
+@numpy_available
+def test_array_record_best_value_arg() -> None:
+    record = ArrayRecord("acc", best_value=[0.5, 0.5])
+    assert record.shape == (2,)
+    record.add_value(np.array([0.4, 0.6]), step=3)
+    assert np.array_equal(record.get_best_value(), np.array([0.5, 0.6]))
+    assert record.get_best_steps().tolist() == [None, 3]
+
+
+@numpy_available
+def test_array_record_to_dict_from_dict() -> None:
+    record = ArrayRecord.from_elements(
+        "acc", [(0, np.array([1.0, 2.0])), (1, np.array([2.0, 1.0]))], mode="min"
+    )
+    assert BaseRecord.from_dict(record.to_dict()).equal(record)
+
+
+@numpy_available
+def test_array_record_pickle() -> None:
+    record = ArrayRecord.from_elements("acc", [(0, np.array([1.0, 2.0]))])
+    assert pickle.loads(pickle.dumps(record)).equal(record)  # noqa: S301
+
+
+@numpy_available
+def test_array_record_clock() -> None:
+    record = ArrayRecord("acc", clock="monotonic")
+    record.add_value(np.zeros(2), step=0)
+    assert len(record.get_timestamps()) == 1
+
+
+@numpy_available
+def test_array_record_memory_usage() -> None:
+    record = ArrayRecord.from_elements("acc", [(i, np.zeros(1000)) for i in range(10)])
+    usage = record.memory_usage()
+    assert usage["values"] >= 10 * 1000 * 8
+    assert usage["total"] == sum(value for key, value in usage.items() if key != "total")
+
+
+@numpy_available
+def test_array_record_manager() -> None:
+    manager = RecordManager()
+    manager.add_record(ArrayRecord("acc"))
+    manager.get_record("acc").add_value(np.array([1.0, 2.0]), step=0)
+    manager.get_record("acc").add_value(np.array([2.0, 1.0]), step=1)
+    assert np.array_equal(manager.get_best_values()["acc"], np.array([2.0, 2.0]))
+
+
+@numpy_available
+def test_array_record_merge() -> None:
+    record1 = ArrayRecord.from_elements(
+        "acc", [(0, np.array([0.2, 0.4])), (1, np.array([0.6, 0.2]))]
+    )
+    record2 = ArrayRecord.from_elements(
+        "acc", [(0, np.array([0.4, 0.6])), (1, np.array([0.2, 0.4]))]
+    )
+    record = record1.merge([record2])
+    assert np.allclose(record.get_values_array(), np.array([[0.3, 0.5], [0.4, 0.3]]))
+    assert np.allclose(record.get_best_value(), np.array([0.4, 0.5]))
+    assert record.get_best_steps().tolist() == [1, 0]
+
+
+@numpy_available
+def test_array_record_merge_reduce_function() -> None:
+    record1 = ArrayRecord.from_elements("acc", [(0, np.array([1, 4]))])
+    record2 = ArrayRecord.from_elements("acc", [(0, np.array([3, 2]))])
+    record = record1.merge([record2], reduce=lambda values: np.max(values, axis=0))
+    assert np.array_equal(record.get_last_value(), np.array([3, 4]))
+
+
+def test_array_record_without_numpy() -> None:
+    with (
+        patch("minrecord.utils.imports.is_numpy_available", lambda: False),
+        pytest.raises(RuntimeError, match=r"'numpy' package is required but not installed."),
+    ):
+        ArrayRecord("acc")
@@ -0,0 +1,279 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from minrecord import (
+    BaseRecord,
+    EmptyRecordError,
+    ParetoComparator,
+    ParetoRecord,
+    RecordManager,
+)
+
+
+def is_front(comparator: ParetoComparator, front: tuple, values: list[tuple[float, ...]]) -> bool:
+    front_values = [value for _, value in front]
+    return all(
+        not any(comparator.dominates(other, value) for other in values) for value in front_values
+    ) and all(
+        any(comparator.dominates(value, other) or value == other for value in front_values)
+        for other in values
+    )
+
+
+##################################
+#     Tests for ParetoRecord     #
+##################################
+
+
+def test_pareto_record_repr() -> None:
+    assert (
+        repr(ParetoRecord("sweep", ParetoComparator(["max", "min"])))
+        == "ParetoRecord(name=sweep, max_size=10, size=0)"
+    )
+
+
+def test_pareto_record_str() -> None:
+    assert str(ParetoRecord("sweep", ParetoComparator(["max", "min"]))).startswith("ParetoRecord(")
+
+
+def test_pareto_record_is_comparable() -> None:
+    assert ParetoRecord("sweep", ParetoComparator(["max", "min"])).is_comparable()
+
+
+def test_pareto_record_max_front_size_default() -> None:
+    assert ParetoRecord("sweep", ParetoComparator(["max"]), max_size=5).max_front_size == 5
+
+
+def test_pareto_record_max_front_size() -> None:
+    assert ParetoRecord("sweep", ParetoComparator(["max"]), max_front_size=3).max_front_size == 3
+
+
+@pytest.mark.parametrize("max_front_size", [0, -1])
+def test_pareto_record_max_front_size_incorrect(max_front_size: int) -> None:
+    with pytest.raises(ValueError, match=r"max_front_size must be greater than 0"):
+        ParetoRecord("sweep", ParetoComparator(["max"]), max_front_size=max_front_size)
+
+
+def test_pareto_record_add_value() -> None:
+    record = ParetoRecord("sweep", ParetoComparator(["max", "min"]))
+    record.add_value((0.8, 12.0), step=0)
+    assert record.has_improved()
+    assert record.get_most_recent() == ((0, (0.8, 12.0)),)
+    assert record.get_front() == ((0, (0.8, 12.0)),)
+
+
+def test_pareto_record_add_value_dominated() -> None:
+    record = ParetoRecord("sweep", ParetoComparator(["max", "min"]))
+    record.add_value((0.8, 12.0), step=0)
+    record.add_value((0.7, 13.0), step=1)
+    assert not record.has_improved()
+    assert record.get_front() == ((0, (0.8, 12.0)),)
+    assert len(record) == 2
+
+
+def test_pareto_record_add_value_equal() -> None:
+    record = ParetoRecord("sweep", ParetoComparator(["max", "min"]))
+    record.add_value((0.8, 12.0), step=0)
+    record.add_value((0.8, 12.0), step=1)
+    assert not record.has_improved()
+    assert record.get_front() == ((0, (0.8, 12.0)),)
+
+
+def test_pareto_record_add_value_dominates() -> None:
+    record = ParetoRecord("sweep", ParetoComparator(["max", "min"]))
+    record.update([(0, (0.8, 12.0)), (1, (0.9, 15.0)), (2, (0.95, 11.0))])
+    assert record.has_improved()
+    assert record.get_front() == ((2, (0.95, 11.0)),)
+
+
+def test_pareto_record_add_value_non_dominated() -> None:
+    record = ParetoRecord("sweep", ParetoComparator(["max", "min"]))
+    record.update([(0, (0.8, 12.0)), (1, (0.9, 15.0)), (2, (0.7, 10.0))])
+    assert record.get_front() == ((0, (0.8, 12.0)), (1, (0.9, 15.0)), (2, (0.7, 10.0)))
+
+
+def test_pareto_record_add_value_list() -> None:
+    record = ParetoRecord("sweep", ParetoComparator(["min", "min"]))
+    record.update([(0, [1.0, 2.0]), (1, [2.0, 1.0]), (2, [0.5, 0.5])])
+    assert record.get_front() == ((2, [0.5, 0.5]),)
+
+
+def test_pareto_record_add_value_incorrect_num_objectives() -> None:
+    record = ParetoRecord("sweep", ParetoComparator(["max", "min"]))
+    with pytest.raises(ValueError, match=r"expects values with 2 objectives \(received: 3\)"):
+        record.add_value((0.8, 12.0, 1.0))
+    assert record.is_empty()
+
+
+def test_pareto_record_front_outside_window() -> None:
+    record = ParetoRecord("sweep", ParetoComparator(["max"]), max_size=2)
+    record.update([(0, (1.0,)), (1, (0.5,)), (2, (0.2,))])
+    assert record.get_most_recent() == ((1, (0.5,)), (2, (0.2,)))
+    assert record.get_front() == ((0, (1.0,)),)
+
+
+def test_pareto_record_max_front_size_keeps_extremes() -> None:
+    record = ParetoRecord("sweep", ParetoComparator(["min", "min"]), max_front_size=3)
+    record.update([(0, (0.0, 10.0)), (1, (10.0, 0.0)), (2, (5.0, 5.0)), (3, (4.0, 6.0))])
+    assert len(record.get_front()) == 3
+    assert (0, (0.0, 10.0)) in record.get_front()
+    assert (1, (10.0, 0.0)) in record.get_front()
+
+
+def test_pareto_record_max_front_size_removes_most_crowded() -> None:
+    record = ParetoRecord("sweep", ParetoComparator(["min", "min"]), max_front_size=3)
+    record.update([(0, (0.0, 10.0)), (1, (10.0, 0.0)), (2, (2.0, 8.0))])
+    record.add_value((6.0, 4.0), step=3)
+    assert record.get_front() == ((0, (0.0, 10.0)), (1, (10.0, 0.0)), (3, (6.0, 4.0)))
+    assert record.has_improved()
+
+
+def test_pareto_record_max_front_size_removes_new_value() -> None:
+    record = ParetoRecord("sweep", ParetoComparator(["min", "min"]), max_front_size=2)
+    record.update([(0, (0.0, 10.0)), (1, (10.0, 0.0))])
+    record.add_value((5.0, 5.0), step=2)
+    assert not record.has_improved()
+    assert record.get_front() == ((0, (0.0, 10.0)), (1, (10.0, 0.0)))
+
+
+def test_pareto_record_random_front() -> None:
+    rng = random.Random(42)  # noqa: S311
+    comparator = ParetoComparator(["max", "min", "min"])
+    values = [tuple(rng.random() for _ in range(3)) for _ in range(500)]
+    record = ParetoRecord("sweep", comparator, max_front_size=1000)
+    record.update(enumerate(values))
+    assert is_front(comparator, record.get_front(), values)
+
+
+def test_pareto_record_get_best_value() -> None:
+    record = ParetoRecord("sweep", ParetoComparator(["max", "min"]))
+    record.update([(0, (0.8, 12.0)), (1, (0.9, 15.0))])
+    assert record.get_best_value() == ((0.8, 12.0), (0.9, 15.0))
+
+
+def test_pareto_record_get_best_value_empty() -> None:
+    record = ParetoRecord("sweep", ParetoComparator(["max", "min"]))
+    with pytest.raises(EmptyRecordError, match=r"The record is empty"):
+        record.get_best_value()
+
+
+def test_pareto_record_init_front() -> None:
+    record = ParetoRecord(
+        "sweep",
+        ParetoComparator(["max", "min"]),
+        front=[(0, (0.8, 12.0)), (1, (0.7, 13.0)), (2, (0.9, 15.0))],
+    )
+    assert record.get_front() == ((0, (0.8, 12.0)), (2, (0.9, 15.0)))
+
+
+def test_pareto_record_clone() -> None:
+    record = ParetoRecord("sweep", ParetoComparator(["max", "min"]), max_front_size=5)
+    record.update([(0, (0.8, 12.0)), (1, (0.9, 15.0))])
+    clone = record.clone()
+    assert clone.equal(record)
+    clone.add_value((1.0, 1.0), step=2)
+    assert record.get_front() == ((0, (0.8, 12.0)), (1, (0.9, 15.0)))
+
+
+def test_pareto_record_equal_true() -> None:
+    record1 = ParetoRecord("sweep", ParetoComparator(["max", "min"]))
+    record1.update([(0, (0.8, 12.0)), (1, (0.9, 15.0))])
+    record2 = ParetoRecord("sweep", ParetoComparator(["max", "min"]))
+    record2.update([(0, (0.8, 12.0)), (1, (0.9, 15.0))])
+    assert record1.equal(record2)
+
+
+def test_pareto_record_equal_false_different_fronts() -> None:
+    record1 = ParetoRecord("sweep", ParetoComparator(["max", "min"]), elements=[(0, (0.8, 12.0))])
+    record2 = ParetoRecord(
+        "sweep",
+        ParetoComparator(["max", "min"]),
+        elements=[(0, (0.8, 12.0))],
+        front=[(0, (0.8, 12.0))],
+    )
+    assert not record1.equal(record2)
+
+
+def test_pareto_record_equal_false_different_max_front_sizes() -> None:
+    assert not ParetoRecord("sweep", ParetoComparator(["max"]), max_front_size=3).equal(
+        ParetoRecord("sweep", ParetoComparator(["max"]), max_front_size=4)
+    )
+
+
+def test_pareto_record_equal_false_different_comparators() -> None:
+    assert not ParetoRecord("sweep", ParetoComparator(["max"])).equal(
+        ParetoRecord("sweep", ParetoComparator(["min"]))
+    )
+
+
+def test_pareto_record_get_fingerprint() -> None:
+    record = ParetoRecord("sweep", ParetoComparator(["max", "min"]))
+    record.update([(0, (0.8, 12.0)), (1, (0.9, 15.0))])
+    assert record.get_fingerprint() == record.clone().get_fingerprint()
+    fingerprint = record.get_fingerprint()
+    record.add_value((0.95, 11.0), step=2)
+    assert record.get_fingerprint() != fingerprint
+
+
+def test_pareto_record_config_dict() -> None:
+    comparator = ParetoComparator(["max", "min"])
+    assert ParetoRecord("sweep", comparator, max_front_size=3).config_dict() == {
+        "_target_": "minrecord.pareto.ParetoRecord",
+        "name": "sweep",
+        "max_size": 10,
+        "comparator": comparator,
+        "max_front_size": 3,
+    }
+
+
+def test_pareto_record_state_dict() -> None:
+    record = ParetoRecord("sweep", ParetoComparator(["max", "min"]))
+    record.update([(0, (0.8, 12.0)), (1, (0.7, 13.0))])
+    state = record.state_dict()
+    assert state["front"] == ((0, (0.8, 12.0)),)
+    assert state["improved"] is False
+
+
+def test_pareto_record_load_state_dict() -> None:
+    record = ParetoRecord("sweep", ParetoComparator(["max", "min"]))
+    record.update([(0, (0.8, 12.0)), (1, (0.9, 15.0))])
+    other = ParetoRecord("sweep", ParetoComparator(["max", "min"]))
+    other.load_state_dict(record.state_dict())
+    assert other.equal(record)
+    other.add_value((0.85, 14.0), step=2)
+    assert other.get_front() == ((0, (0.8, 12.0)), (1, (0.9, 15.0)), (2, (0.85, 14.0)))
+
+
+def test_pareto_record_from_dict() -> None:
+    record = ParetoRecord("sweep", ParetoComparator(["max", "min"]), max_front_size=3)
+    record.update([(0, (0.8, 12.0)), (1, (0.9, 15.0))])
+    assert BaseRecord.from_dict(record.to_dict()).equal(record)
+
+
+def test_pareto_record_from_elements() -> None:
+    record = ParetoRecord.from_elements(
+        "sweep", ParetoComparator(["max", "min"]), [(0, (0.8, 12.0)), (1, (0.7, 13.0))]
+    )
+    assert record.get_front() == ((0, (0.8, 12.0)),)
+
+
+def test_pareto_record_merge() -> None:
+    comparator = ParetoComparator(["max", "min"])
+    record1 = ParetoRecord("sweep", comparator)
+    record1.update([(0, (0.8, 12.0)), (1, (0.9, 15.0))])
+    record2 = ParetoRecord("sweep", comparator)
+    record2.update([(1, (0.7, 10.0)), (2, (0.85, 20.0))])
+    record = record1.merge([record2], reduce="first")
+    assert record.get_most_recent() == ((0, (0.8, 12.0)), (1, (0.9, 15.0)), (2, (0.85, 20.0)))
+    assert record.get_front() == ((0, (0.8, 12.0)), (1, (0.9, 15.0)))
+    assert not record.has_improved()
+
+
+def test_pareto_record_manager_get_best_values() -> None:
+    manager = RecordManager()
+    manager.add_record(ParetoRecord("sweep", ParetoComparator(["max", "min"])))
+    manager.get_record("sweep").update([(0, (0.8, 12.0)), (1, (0.9, 15.0))])
+    assert manager.get_best_values() == {"sweep": ((0.8, 12.0), (0.9, 15.0))}
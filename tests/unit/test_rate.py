@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from unittest.mock import patch
+
+import pytest
+
+from minrecord import BaseRecord, EmptyRecordError, MinScalarComparator, RateRecord
+from minrecord.config import config_scope
+
+################################
+#     Tests for RateRecord     #
+################################
+
+
+def test_rate_record_repr() -> None:
+    assert repr(RateRecord("samples")) == "RateRecord(name=samples, max_size=10, size=0)"
+
+
+def test_rate_record_max_size_config_scope() -> None:
+    with config_scope(max_size=5):
+        assert RateRecord("samples").max_size == 5
+
+
+def test_rate_record_window() -> None:
+    assert RateRecord("samples", window=5).window == 5
+
+
+def test_rate_record_window_incorrect() -> None:
+    with pytest.raises(ValueError, match=r"window must be greater than 0"):
+        RateRecord("samples", window=0)
+
+
+def test_rate_record_add_value() -> None:
+    record = RateRecord("samples")
+    record.add_value(10, step=0)
+    assert record.is_empty()
+    record.add_value(30, step=2)
+    record.add_value(60, step=3)
+    assert record.get_most_recent() == ((2, 10.0), (3, 30.0))
+    assert record.get_last_value() == 30.0
+    assert record.get_best_value() == 30.0
+    assert record.has_improved()
+
+
+def test_rate_record_add_value_without_step() -> None:
+    record = RateRecord("samples")
+    with pytest.raises(ValueError, match=r"'samples' record requires a step"):
+        record.add_value(10)
+
+
+def test_rate_record_add_value_counter_reset() -> None:
+    record = RateRecord("samples")
+    record.update([(0, 0), (1, 100), (2, 200), (3, 50), (4, 150)])
+    assert record.get_most_recent() == ((1, 100.0), (2, 100.0), (3, 50.0), (4, 100.0))
+
+
+def test_rate_record_add_value_step_reset() -> None:
+    record = RateRecord("samples")
+    record.update([(0, 0), (1, 100), (2, 200), (1, 300), (2, 350)])
+    assert record.get_most_recent() == ((1, 100.0), (2, 100.0), (2, 50.0))
+    assert record.get_window_rate() == 50.0
+
+
+def test_rate_record_add_value_clock() -> None:
+    with patch("time.monotonic", side_effect=[0.0, 0.5, 0.5, 2.5, 2.5]):
+        record = RateRecord("samples", clock="monotonic")
+        record.add_value(0)
+        record.add_value(100)
+        record.add_value(200, step=3)
+    assert record.get_most_recent() == ((None, 200.0), (3, 50.0))
+    assert record.get_window_rate() == pytest.approx(80.0)
+    assert record.get_timestamps() == (0.5, 2.5)
+
+
+def test_rate_record_comparator() -> None:
+    record = RateRecord("latency", comparator=MinScalarComparator())
+    record.update([(0, 0), (1, 100), (2, 150)])
+    assert record.get_best_value() == 50.0
+
+
+def test_rate_record_get_window_rate() -> None:
+    record = RateRecord("samples", window=3)
+    record.update([(i, i * i) for i in range(10)])
+    assert record.get_window_rate() == (81 - 36) / 3
+
+
+def test_rate_record_get_window_rate_empty() -> None:
+    record = RateRecord("samples")
+    record.add_value(10, step=0)
+    with pytest.raises(EmptyRecordError, match=r"does not have enough counter values"):
+        record.get_window_rate()
+
+
+def test_rate_record_clone() -> None:
+    record = RateRecord("samples", window=2)
+    record.update([(0, 0), (1, 10), (2, 30)])
+    clone = record.clone()
+    assert clone.equal(record)
+    clone.add_value(60, step=3)
+    assert record.get_window_rate() == 15.0
+    assert clone.get_window_rate() == 25.0
+
+
+def test_rate_record_equal_false_different_counter() -> None:
+    record1 = RateRecord("samples")
+    record1.update([(0, 0), (1, 10)])
+    record2 = RateRecord("samples")
+    record2.update([(0, 10), (1, 20)])
+    assert record1.get_most_recent() == record2.get_most_recent()
+    assert not record1.equal(record2)
+    assert record1.get_fingerprint() != record2.get_fingerprint()
+
+
+def test_rate_record_equal_false_different_window() -> None:
+    assert not RateRecord("samples", window=2).equal(RateRecord("samples", window=3))
+
+
+def test_rate_record_config_dict() -> None:
+    config = RateRecord("samples", window=3).config_dict()
+    assert config["window"] == 3
+    assert config["max_size"] == 10
+
+
+def test_rate_record_state_dict() -> None:
+    record = RateRecord("samples", window=2)
+    record.update([(0, 0), (1, 10), (2, 30)])
+    state = record.state_dict()
+    assert state["counter"] == 30
+    assert state["total"] == 30
+    assert state["samples"] == ((0, 0), (1, 10), (2, 30))
+
+
+def test_rate_record_load_state_dict_resume() -> None:
+    record = RateRecord("samples", window=2)
+    record.update([(0, 0), (1, 10), (2, 30)])
+    resumed = RateRecord("samples", window=2)
+    resumed.load_state_dict(record.state_dict())
+    resumed.update([(3, 20), (4, 60)])
+    assert resumed.get_most_recent() == ((1, 10.0), (2, 20.0), (3, 20.0), (4, 40.0))
+    assert resumed.get_window_rate() == 30.0
+
+
+def test_rate_record_from_dict() -> None:
+    record = RateRecord("samples", window=2, clock="wall")
+    record.update([(0, 0), (1, 10), (2, 30)])
+    assert BaseRecord.from_dict(record.to_dict()).equal(record)
+
+
+def test_rate_record_merge_sum() -> None:
+    record1 = RateRecord("samples")
+    record1.update([(0, 0), (1, 10), (2, 30)])
+    record2 = RateRecord("samples")
+    record2.update([(0, 0), (1, 20), (2, 30)])
+    record = record1.merge([record2], reduce="sum")
+    assert record.get_most_recent() == ((1, 30.0), (2, 30.0))
+    assert record.get_best_value() == 30.0
+    assert record.has_improved()
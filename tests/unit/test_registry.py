@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+from minrecord import (
+    BaseRecord,
+    ComparableRecord,
+    MaxScalarRecord,
+    MinScalarRecord,
+    Record,
+)
+from minrecord.registry import (
+    _RECORD_CLASSES,
+    RecordFactory,
+    get_record_class,
+    register_record_class,
+)
+from minrecord.testing import objectory_available, objectory_not_available
+
+
+@pytest.fixture(autouse=True)
+def _reset_registry() -> None:
+    classes = _RECORD_CLASSES.copy()
+    yield
+    _RECORD_CLASSES.clear()
+    _RECORD_CLASSES.update(classes)
+
+
+###################################
+#     Tests for RecordFactory     #
+###################################
+
+
+def test_record_factory_metaclass() -> None:
+    assert isinstance(BaseRecord, RecordFactory)
+
+
+def test_record_factory_registered() -> None:
+    record = BaseRecord.factory("minrecord.comparable.MinScalarRecord", name="loss", max_size=5)
+    assert isinstance(record, MinScalarRecord)
+    assert record.name == "loss"
+    assert record.max_size == 5
+
+
+@objectory_available
+def test_record_factory_objectory() -> None:
+    assert BaseRecord.factory("collections.Counter", [1, 1, 2]) == {1: 2, 2: 1}
+
+
+@objectory_not_available
+def test_record_factory_objectory_missing() -> None:
+    with pytest.raises(RuntimeError, match=r"'objectory' package is required but not installed."):
+        BaseRecord.factory("missing.Record", name="loss")
+
+
+###########################################
+#     Tests for register_record_class     #
+###########################################
+
+
+def test_register_record_class() -> None:
+    register_record_class(MinScalarRecord, name="min")
+    assert _RECORD_CLASSES["min"] is MinScalarRecord
+
+
+def test_register_record_class_subclass() -> None:
+    class MyRecord(Record): ...
+
+    assert _RECORD_CLASSES[f"{__name__}.{MyRecord.__qualname__}"] is MyRecord
+
+
+@pytest.mark.parametrize(
+    ("name", "cls"),
+    [
+        ("minrecord.generic.Record", Record),
+        ("minrecord.comparable.ComparableRecord", ComparableRecord),
+        ("minrecord.comparable.MaxScalarRecord", MaxScalarRecord),
+        ("minrecord.comparable.MinScalarRecord", MinScalarRecord),
+    ],
+)
+def test_register_record_class_builtin(name: str, cls: type[BaseRecord]) -> None:
+    assert _RECORD_CLASSES[name] is cls
+
+
+######################################
+#     Tests for get_record_class     #
+######################################
+
+
+def test_get_record_class_registered() -> None:
+    assert get_record_class("minrecord.comparable.MinScalarRecord") is MinScalarRecord
+
+
+def test_get_record_class_import() -> None:
+    assert "minrecord.MaxScalarRecord" not in _RECORD_CLASSES
+    assert get_record_class("minrecord.MaxScalarRecord") is MaxScalarRecord
+    assert _RECORD_CLASSES["minrecord.MaxScalarRecord"] is MaxScalarRecord
+
+
+def test_get_record_class_short_name() -> None:
+    assert get_record_class("MinScalarRecord") is MinScalarRecord
+
+
+def test_get_record_class_short_name_not_imported() -> None:
+    code = (
+        "from minrecord.registry import get_record_class\n"
+        "print(get_record_class('ParetoRecord').__module__)"
+    )
+    assert (
+        subprocess.run(  # noqa: S603
+            [sys.executable, "-c", code], capture_output=True, check=True, text=True
+        ).stdout.strip()
+        == "minrecord.pareto"
+    )
+
+
+def test_get_record_class_short_name_ambiguous() -> None:
+    class Record(BaseRecord): ...
+
+    with pytest.raises(ValueError, match=r"\(2 matching classes\)"):
+        get_record_class("Record")
+
+
+@pytest.mark.parametrize("name", ["Missing", "minrecord.Missing", "missing.Record"])
+def test_get_record_class_missing(name: str) -> None:
+    with pytest.raises(ValueError, match=r"Unable to find the record class"):
+        get_record_class(name)
@@ -0,0 +1,88 @@
+from __future__ import annotations
+
+import re
+
+from minrecord import (
+    ComparableRecord,
+    MaxScalarComparator,
+    MaxScalarRecord,
+    MinScalarRecord,
+    Record,
+    RecordRule,
+)
+from minrecord.rule import find_rule
+
+################################
+#     Tests for RecordRule     #
+################################
+
+
+def test_record_rule_repr() -> None:
+    assert repr(RecordRule("*/loss", MinScalarRecord, max_size=5)) == (
+        "RecordRule(pattern='*/loss', record_cls=MinScalarRecord, kwargs={'max_size': 5})"
+    )
+
+
+def test_record_rule_pattern() -> None:
+    assert RecordRule("*/loss").pattern == "*/loss"
+
+
+def test_record_rule_match_glob() -> None:
+    rule = RecordRule("*/loss")
+    assert rule.match("train/loss")
+    assert not rule.match("train/loss/ema")
+
+
+def test_record_rule_match_regex() -> None:
+    rule = RecordRule(re.compile(r"(train|val)/acc"))
+    assert rule.match("val/acc")
+    assert not rule.match("test/acc")
+
+
+def test_record_rule_create_default() -> None:
+    assert RecordRule("*").create("loss").equal(Record("loss"))
+
+
+def test_record_rule_create_max_size() -> None:
+    assert (
+        RecordRule("*", MinScalarRecord, max_size=5)
+        .create("loss")
+        .equal(MinScalarRecord("loss", max_size=5))
+    )
+
+
+def test_record_rule_create_comparator() -> None:
+    assert (
+        RecordRule("*", ComparableRecord, comparator=MaxScalarComparator(), max_size=3)
+        .create("acc")
+        .equal(ComparableRecord("acc", comparator=MaxScalarComparator(), max_size=3))
+    )
+
+
+def test_record_rule_create_kwargs() -> None:
+    assert RecordRule("*", Record, clock="wall").create("loss").clock == "wall"
+
+
+def test_record_rule_create_new_record() -> None:
+    rule = RecordRule("*", MinScalarRecord)
+    assert rule.create("loss") is not rule.create("loss")
+
+
+###############################
+#     Tests for find_rule     #
+###############################
+
+
+def test_find_rule_first_match() -> None:
+    rule1 = RecordRule("*loss", MinScalarRecord)
+    rule2 = RecordRule("*", MaxScalarRecord)
+    assert find_rule([rule1, rule2], "val/loss") is rule1
+    assert find_rule([rule1, rule2], "val/acc") is rule2
+
+
+def test_find_rule_no_match() -> None:
+    assert find_rule([RecordRule("*loss", MinScalarRecord)], "val/acc") is None
+
+
+def test_find_rule_empty() -> None:
+    assert find_rule([], "val/acc") is None
@@ -0,0 +1,417 @@
+from __future__ import annotations
+
+import math
+import sqlite3
+from typing import TYPE_CHECKING
+
+import pytest
+from coola.equality import objects_are_equal
+
+from minrecord import (
+    ComparableRecord,
+    KeyComparator,
+    MaxScalarRecord,
+    MinScalarRecord,
+    Record,
+    RecordManager,
+    RecordRule,
+    SQLiteRecordManager,
+)
+from minrecord.comparator import MaxScalarComparator
+from minrecord.testing import objectory_available
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+@pytest.fixture
+def path(tmp_path: Path) -> Path:
+    return tmp_path.joinpath("records.db")
+
+
+#########################################
+#     Tests for SQLiteRecordManager     #
+#########################################
+
+
+def test_sqlite_record_manager_len_empty() -> None:
+    with SQLiteRecordManager() as manager:
+        assert len(manager) == 0
+
+
+def test_sqlite_record_manager_batch_size_incorrect() -> None:
+    with pytest.raises(ValueError, match=r"batch_size must be greater than 0"):
+        SQLiteRecordManager(batch_size=0)
+
+
+def test_sqlite_record_manager_path(path: Path) -> None:
+    with SQLiteRecordManager(path) as manager:
+        assert manager.path == str(path)
+
+
+def test_sqlite_record_manager_wal(path: Path) -> None:
+    SQLiteRecordManager(path).close()
+    connection = sqlite3.connect(path)
+    assert connection.execute("PRAGMA journal_mode").fetchone() == ("wal",)
+    connection.close()
+
+
+def test_sqlite_record_manager_add_value() -> None:
+    with SQLiteRecordManager() as manager:
+        manager.add_value("loss", 2.0, step=0)
+        manager.add_value("loss", 1.0, step=1)
+        record = manager.get_record("loss")
+        assert isinstance(record, Record)
+        assert record.get_most_recent() == ((0, 2.0), (1, 1.0))
+        assert manager.get_history("loss") == ((0, 2.0), (1, 1.0))
+
+
+def test_sqlite_record_manager_history_larger_than_window() -> None:
+    with SQLiteRecordManager() as manager:
+        manager.add_record(MinScalarRecord("loss", max_size=3))
+        manager.update("loss", [(i, float(10 - i)) for i in range(10)])
+        assert manager.get_record("loss").get_most_recent() == ((7, 3.0), (8, 2.0), (9, 1.0))
+        assert manager.get_history("loss") == tuple((i, float(10 - i)) for i in range(10))
+
+
+def test_sqlite_record_manager_history_types() -> None:
+    with SQLiteRecordManager() as manager:
+        manager.update("value", [(None, 1), (1.5, "abc"), (2, [1, 2]), (3, True), (4, None)])
+        assert manager.get_history("value") == (
+            (None, 1),
+            (1.5, "abc"),
+            (2, [1, 2]),
+            (3, True),
+            (4, None),
+        )
+
+
+def test_sqlite_record_manager_history_missing() -> None:
+    with SQLiteRecordManager() as manager:
+        assert manager.get_history("missing") == ()
+
+
+def test_sqlite_record_manager_batch_size() -> None:
+    with SQLiteRecordManager(batch_size=2) as manager:
+        manager.add_value("loss", 2.0, step=0)
+        assert manager._connection.execute("SELECT COUNT(*) FROM elements").fetchone() == (0,)
+        manager.add_value("loss", 1.0, step=1)
+        assert manager._connection.execute("SELECT COUNT(*) FROM elements").fetchone() == (2,)
+
+
+def test_sqlite_record_manager_add_record_with_elements() -> None:
+    with SQLiteRecordManager() as manager:
+        manager.add_record(MaxScalarRecord.from_elements("acc", [(0, 1.0), (1, 2.0)]))
+        assert manager.get_history("acc") == ((0, 1.0), (1, 2.0))
+
+
+def test_sqlite_record_manager_add_record_duplicate_key() -> None:
+    with SQLiteRecordManager() as manager:
+        manager.add_record(MinScalarRecord("loss"))
+        with pytest.raises(RuntimeError, match=r"A record .* is already registered"):
+            manager.add_record(MinScalarRecord("loss"))
+
+
+def test_sqlite_record_manager_add_record_duplicate_key_stored(path: Path) -> None:
+    with SQLiteRecordManager(path) as manager:
+        manager.add_record(MinScalarRecord("loss"))
+    with (
+        SQLiteRecordManager(path, trusted=True) as manager,
+        pytest.raises(RuntimeError, match=r"A record .* is already registered"),
+    ):
+        manager.add_record(MinScalarRecord("loss"))
+
+
+def test_sqlite_record_manager_add_record_exist_ok() -> None:
+    with SQLiteRecordManager() as manager:
+        manager.update("loss", [(0, 5.0), (1, 4.0)])
+        manager.add_record(MinScalarRecord.from_elements("loss", [(0, 1.0)]), exist_ok=True)
+        assert manager.get_history("loss") == ((0, 1.0),)
+        assert manager.get_best_values() == {"loss": 1.0}
+
+
+def test_sqlite_record_manager_get_best_values() -> None:
+    with SQLiteRecordManager() as manager:
+        manager.add_record(MinScalarRecord("loss", max_size=2))
+        manager.add_record(MaxScalarRecord("accuracy", max_size=2))
+        manager.add_record(MaxScalarRecord("empty"))
+        manager.update("loss", [(0, 1.0), (1, 3.0), (2, 2.0)])
+        manager.update("accuracy", [(0, 0.9), (1, 0.1), (2, 0.2)])
+        manager.update("lr", [(0, 0.1)])
+        assert manager.get_best_values() == {"loss": 1.0, "accuracy": 0.9}
+
+
+def test_sqlite_record_manager_get_best_values_prefix_suffix() -> None:
+    with SQLiteRecordManager() as manager:
+        manager.add_record(MinScalarRecord("loss"))
+        manager.update("loss", [(0, 1.0), (1, 3.0)])
+        assert manager.get_best_values(prefix="best/", suffix="/v") == {"best/loss/v": 1.0}
+
+
+def test_sqlite_record_manager_get_best_values_custom_comparable() -> None:
+    with SQLiteRecordManager() as manager:
+        manager.add_record(ComparableRecord("acc", MaxScalarComparator()))
+        manager.add_record(ComparableRecord("empty", MaxScalarComparator()))
+        manager.update("acc", [(0, 1.0), (1, 3.0), (2, 2.0)])
+        assert manager.get_best_values() == {"acc": 3.0}
+
+
+def test_sqlite_record_manager_get_best_values_load_state_dict() -> None:
+    with SQLiteRecordManager() as manager:
+        manager.add_record(MinScalarRecord("loss"))
+        manager.load_state_dict(
+            {"loss": {"state": {"record": ((0, 0.1),), "improved": True, "best_value": 0.1}}}
+        )
+        manager.add_value("loss", 0.7, step=1)
+        assert manager.get_record("loss").get_best_value() == 0.1
+        assert manager.get_best_values() == {"loss": 0.1}
+
+
+def test_sqlite_record_manager_get_best_values_load_state_dict_reopen(path: Path) -> None:
+    with SQLiteRecordManager(path) as manager:
+        manager.add_record(MaxScalarRecord("acc"))
+        manager.load_state_dict(
+            {"acc": {"state": {"record": ((0, 0.9),), "improved": True, "best_value": 0.9}}}
+        )
+        manager.update("acc", [(1, 0.5), (2, 0.95)])
+    with SQLiteRecordManager(path) as manager:
+        assert manager.get_best_values() == {"acc": 0.95}
+        assert not manager._records
+
+
+def test_sqlite_record_manager_nan() -> None:
+    with SQLiteRecordManager() as manager:
+        manager.add_record(MinScalarRecord("loss"))
+        manager.update("loss", [(0, 2.0), (1, float("nan"))])
+        history = manager.get_history("loss")
+        assert history[0] == (0, 2.0)
+        assert history[1][0] == 1
+        assert math.isnan(history[1][1])
+        assert math.isnan(manager.get_last_values()["loss"])
+        assert manager.get_best_values() == {"loss": 2.0}
+
+
+def test_sqlite_record_manager_inf() -> None:
+    with SQLiteRecordManager() as manager:
+        manager.add_record(MinScalarRecord("loss"))
+        manager.update("loss", [(0, float("inf")), (1, float("-inf"))])
+        assert manager.get_history("loss") == ((0, float("inf")), (1, float("-inf")))
+        assert manager.get_last_values() == {"loss": float("-inf")}
+        assert manager.get_best_values() == {"loss": float("-inf")}
+
+
+def test_sqlite_record_manager_get_last_values() -> None:
+    with SQLiteRecordManager() as manager:
+        manager.add_record(MinScalarRecord("empty"))
+        manager.update("loss", [(0, 1.0), (1, 3.0)])
+        manager.update("name", [(0, "abc"), (1, {"a": 1})])
+        assert manager.get_last_values(prefix="last/") == {
+            "last/loss": 3.0,
+            "last/name": {"a": 1},
+        }
+
+
+def test_sqlite_record_manager_get_last_values_load_state_dict() -> None:
+    with SQLiteRecordManager() as manager:
+        manager.update("loss", [(0, 1.0), (1, 2.0)])
+        manager.load_state_dict({"loss": {"state": {"record": ((0, 9.0),)}}})
+        assert manager.get_record("loss").get_last_value() == 9.0
+        assert manager.get_last_values() == {"loss": 9.0}
+
+
+def test_sqlite_record_manager_get_last_values_load_state_dict_reopen(path: Path) -> None:
+    with SQLiteRecordManager(path) as manager:
+        manager.update("loss", [(0, 1.0), (1, 2.0)])
+        manager.load_state_dict({"loss": {"state": {"record": ((0, 9.0),)}}})
+    with SQLiteRecordManager(path) as manager:
+        assert manager.get_last_values() == {"loss": 9.0}
+        assert not manager._records
+
+
+def test_sqlite_record_manager_get_last_values_direct_write() -> None:
+    with SQLiteRecordManager() as manager:
+        manager.update("loss", [(0, 1.0), (1, 2.0)])
+        manager.get_record("loss").add_value(0.5, step=2)
+        assert manager.get_last_values() == {"loss": 0.5}
+
+
+def test_sqlite_record_manager_reopen(path: Path) -> None:
+    with SQLiteRecordManager(path) as manager:
+        manager.add_record(MinScalarRecord("loss", max_size=2))
+        manager.update("loss", [(0, 1.0), (1, 3.0), (2, 2.0)])
+        manager.update("lr", [(0, 0.1)])
+    with SQLiteRecordManager(path, trusted=True) as manager:
+        assert len(manager) == 2
+        assert manager.has_record("loss")
+        assert manager.get_best_values() == {"loss": 1.0}
+        assert manager.get_last_values() == {"loss": 2.0, "lr": 0.1}
+        assert not manager._records
+        record = manager.get_record("loss")
+        assert isinstance(record, MinScalarRecord)
+        assert record.get_most_recent() == ((1, 3.0), (2, 2.0))
+        assert record.get_best_value() == 1.0
+        manager.add_value("loss", 0.5, step=3)
+    with SQLiteRecordManager(path, trusted=True) as manager:
+        assert manager.get_history("loss") == ((0, 1.0), (1, 3.0), (2, 2.0), (3, 0.5))
+        assert manager.get_record("loss").get_most_recent() == ((2, 2.0), (3, 0.5))
+
+
+def test_sqlite_record_manager_reopen_untrusted(path: Path) -> None:
+    with SQLiteRecordManager(path) as manager:
+        manager.update("loss", [(0, 1.0), (1, float("nan")), (2, {1, 2}), (3, [1, 2])])
+    with SQLiteRecordManager(path) as manager:
+        history = manager.get_history("loss")
+        assert history[0] == (0, 1.0)
+        assert math.isnan(history[1][1])
+        assert history[2:] == ((2, {1, 2}), (3, [1, 2]))
+        assert manager.get_last_values() == {"loss": [1, 2]}
+        with pytest.raises(ValueError, match=r"Use trusted=True to load it"):
+            manager.get_record("loss")
+
+
+def test_sqlite_record_manager_reopen_untrusted_value(path: Path) -> None:
+    with SQLiteRecordManager(path) as manager:
+        manager.update("value", [(0, KeyComparator(key=abs))])
+    with (
+        SQLiteRecordManager(path) as manager,
+        pytest.raises(ValueError, match=r"Use trusted=True to load it"),
+    ):
+        manager.get_history("value")
+    with SQLiteRecordManager(path, trusted=True) as manager:
+        assert isinstance(manager.get_last_values()["value"], KeyComparator)
+
+
+def test_sqlite_record_manager_get_fingerprint(path: Path) -> None:
+    with SQLiteRecordManager(path) as manager:
+        manager.update("loss", [(0, 1.0), (1, 3.0)])
+        fingerprint = manager.get_fingerprint()
+    with SQLiteRecordManager(path, trusted=True) as manager:
+        assert manager.get_fingerprint() == fingerprint
+    assert (
+        RecordManager({"loss": Record("loss", elements=[(0, 1.0), (1, 3.0)])}).get_fingerprint()
+        == fingerprint
+    )
+
+
+def test_sqlite_record_manager_get_records(path: Path) -> None:
+    with SQLiteRecordManager(path) as manager:
+        manager.update("loss", [(0, 1.0)])
+    with SQLiteRecordManager(path, trusted=True) as manager:
+        records = manager.get_records()
+        assert list(records) == ["loss"]
+        assert records["loss"].get_most_recent() == ((0, 1.0),)
+
+
+def test_sqlite_record_manager_state_dict(path: Path) -> None:
+    with SQLiteRecordManager(path) as manager:
+        manager.add_record(MinScalarRecord("loss"))
+        manager.update("loss", [(0, 1.0), (1, 3.0)])
+        state = manager.state_dict()
+    with SQLiteRecordManager(path, trusted=True) as manager:
+        assert objects_are_equal(manager.state_dict(), state)
+
+
+def test_sqlite_record_manager_load_state_dict(path: Path) -> None:
+    with SQLiteRecordManager(path) as manager:
+        manager.add_record(MinScalarRecord("loss"))
+        manager.load_state_dict(
+            {"loss": {"state": {"record": ((0, 2.0),), "improved": True, "best_value": 2.0}}}
+        )
+    with SQLiteRecordManager(path, trusted=True) as manager:
+        assert manager.get_record("loss").get_most_recent() == ((0, 2.0),)
+        assert manager.get_history("loss") == ()
+        assert manager.get_best_values() == {"loss": 2.0}
+        assert manager.get_last_values() == {"loss": 2.0}
+
+
+@objectory_available
+def test_sqlite_record_manager_load_state_dict_lazy(path: Path) -> None:
+    state = MinScalarRecord.from_elements("loss", [(0, 2.0)]).to_dict()
+    with SQLiteRecordManager(path) as manager:
+        manager.load_state_dict({"loss": state}, lazy=True)
+        assert manager.has_record("loss")
+        assert len(manager) == 1
+        assert manager.state_dict()["loss"] is state
+        manager.flush()
+        assert not manager._stored_keys
+        assert manager.get_best_values() == {"loss": 2.0}
+    with SQLiteRecordManager(path, trusted=True) as manager:
+        assert isinstance(manager.get_record("loss"), MinScalarRecord)
+
+
+def test_sqlite_record_manager_namespace(path: Path) -> None:
+    with SQLiteRecordManager(path) as manager:
+        manager.add_record(MinScalarRecord("train/loss"))
+        manager.add_record(MinScalarRecord("val/loss"))
+        manager.update("train/loss", [(0, 2.0), (1, 1.0)])
+        manager.update("val/loss", [(0, 3.0), (1, 4.0)])
+        manager.update("val/lr", [(0, 0.1)])
+    with SQLiteRecordManager(path, trusted=True) as manager:
+        assert manager.get_best_values(namespace="val/") == {"val/loss": 3.0}
+        assert manager.get_last_values(namespace="val/") == {"val/loss": 4.0, "val/lr": 0.1}
+        assert list(manager.get_records(namespace="val/")) == ["val/loss", "val/lr"]
+        assert manager.namespace("train/").get_best_values() == {"loss": 1.0}
+        assert list(manager._records) == ["val/loss", "val/lr", "train/loss"]
+
+
+def test_sqlite_record_manager_pattern(path: Path) -> None:
+    with SQLiteRecordManager(path) as manager:
+        manager.add_record(MinScalarRecord("train/loss"))
+        manager.add_record(MinScalarRecord("val/loss"))
+        manager.update("train/loss", [(0, 2.0), (1, 1.0)])
+        manager.update("val/loss", [(0, 3.0), (1, 4.0)])
+        manager.update("val/lr", [(0, 0.1)])
+    with SQLiteRecordManager(path, trusted=True) as manager:
+        assert manager.get_best_values(pattern="*/loss") == {"train/loss": 1.0, "val/loss": 3.0}
+        assert manager.get_last_values(pattern="val/l*") == {"val/loss": 4.0, "val/lr": 0.1}
+        assert list(manager.select("*/lr")) == ["val/lr"]
+
+
+def test_sqlite_record_manager_rules() -> None:
+    with SQLiteRecordManager(rules=[RecordRule("*/loss", MinScalarRecord)]) as manager:
+        manager.update("train/loss", [(0, 2.0), (1, 1.0)])
+        assert isinstance(manager.get_record("train/loss"), MinScalarRecord)
+        assert manager.get_best_values() == {"train/loss": 1.0}
+
+
+def test_sqlite_record_manager_memory_budget_evict() -> None:
+    with SQLiteRecordManager(memory_budget=1, min_size=100) as manager:
+        manager.update("train/loss", [(0, 2.0), (1, 1.0)])
+        manager.update("val/loss", [(0, 3.0), (1, 4.0)])
+        assert manager.get_memory_stats()["evicted"] >= 1
+        assert len(manager) == 2
+        assert manager.get_history("train/loss") == ((0, 2.0), (1, 1.0))
+        assert manager.get_record("train/loss").get_most_recent() == ((0, 2.0), (1, 1.0))
+        assert manager.get_memory_stats()["reloaded"] >= 1
+        assert manager.get_last_values() == {"train/loss": 1.0, "val/loss": 4.0}
+
+
+def test_sqlite_record_manager_memory_budget_evict_unpicklable_record() -> None:
+    with SQLiteRecordManager(memory_budget=1, min_size=100) as manager:
+        manager.add_record(ComparableRecord("metric", KeyComparator(key=lambda value: value)))
+        manager.update("metric", [(0, 2.0), (1, 1.0)])
+        manager.update("loss", [(0, 3.0), (1, 4.0)])
+        assert "metric" in manager._records
+        assert manager.get_history("metric") == ((0, 2.0), (1, 1.0))
+        assert manager.get_last_values() == {"metric": 1.0, "loss": 4.0}
+
+
+def test_sqlite_record_manager_batch_does_not_pickle_records() -> None:
+    with SQLiteRecordManager(batch_size=2) as manager:
+        manager.update("loss", [(i, float(i)) for i in range(10)])
+        rows = manager._connection.execute("SELECT key, last, record FROM records").fetchall()
+        assert rows == [("loss", 9.0, None)]
+        manager.flush()
+        ((data,),) = manager._connection.execute("SELECT record FROM records").fetchall()
+        assert data is not None
+
+
+def test_sqlite_record_manager_record_not_written(path: Path) -> None:
+    manager = SQLiteRecordManager(path, batch_size=1)
+    manager.add_record(MinScalarRecord("loss"))
+    manager.update("loss", [(0, 3.0), (1, 2.0)])
+    manager._connection.close()
+    with SQLiteRecordManager(path) as manager:
+        assert manager.has_record("loss")
+        assert manager.get_history("loss") == ((0, 3.0), (1, 2.0))
+        assert manager.get_record("loss").is_empty()
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import math
+import sys
+from collections import deque
+
+import pytest
+
+from minrecord.storage import PackedStorage, create_storage, get_backend
+
+###################################
+#     Tests for PackedStorage     #
+###################################
+
+
+def test_packed_storage_repr() -> None:
+    assert repr(PackedStorage(5, [(0, 1.0)])) == "PackedStorage(maxlen=5, size=1)"
+
+
+def test_packed_storage_maxlen() -> None:
+    assert PackedStorage(5).maxlen == 5
+
+
+def test_packed_storage_empty() -> None:
+    storage = PackedStorage(5)
+    assert len(storage) == 0
+    assert tuple(storage) == ()
+    assert tuple(reversed(storage)) == ()
+
+
+def test_packed_storage_append() -> None:
+    storage = PackedStorage(5)
+    storage.append((0, 1.0))
+    storage.append((1, 2.0))
+    assert tuple(storage) == ((0, 1.0), (1, 2.0))
+
+
+def test_packed_storage_append_full() -> None:
+    storage = PackedStorage(3, [(i, float(i)) for i in range(5)])
+    assert len(storage) == 3
+    assert tuple(storage) == ((2, 2.0), (3, 3.0), (4, 4.0))
+    assert tuple(reversed(storage)) == ((4, 4.0), (3, 3.0), (2, 2.0))
+
+
+def test_packed_storage_keeps_types() -> None:
+    storage = PackedStorage(5, [(0, 1), (1, 2)])
+    assert [type(value) for _, value in storage] == [int, int]
+
+
+def test_packed_storage_steps_none() -> None:
+    storage = PackedStorage(2, [(None, 1.0), (None, 2.0), (None, 3.0)])
+    assert tuple(storage) == ((None, 2.0), (None, 3.0))
+    assert storage[0] == (None, 2.0)
+
+
+@pytest.mark.parametrize(
+    "element",
+    [
+        (0, "abc"),
+        (0, True),
+        (0, 1),
+        (1.0, 2.0),
+        (None, 2.0),
+        (0, 2**63),
+        (-(2**64), 2.0),
+    ],
+)
+def test_packed_storage_append_incorrect_element(element: tuple) -> None:
+    storage = PackedStorage(3, [(0, 1.0), (1, 2.0), (2, 3.0)])
+    with pytest.raises(TypeError, match="cannot be packed"):
+        storage.append(element)
+    assert tuple(storage) == ((0, 1.0), (1, 2.0), (2, 3.0))
+
+
+def test_packed_storage_append_incorrect_first_element() -> None:
+    with pytest.raises(TypeError, match="cannot be packed"):
+        PackedStorage(3, [("abc", 1.0)])
+
+
+def test_packed_storage_append_int_value_overflow_growing() -> None:
+    storage = PackedStorage(3, [(0, 1)])
+    with pytest.raises(TypeError, match="cannot be packed"):
+        storage.append((1, 2**63))
+    with pytest.raises(TypeError, match="cannot be packed"):
+        storage.append((2**63, 2))
+    assert tuple(storage) == ((0, 1),)
+
+
+def test_packed_storage_append_int_step_overflow_full() -> None:
+    storage = PackedStorage(2, [(0, 1), (1, 2), (2, 3)])
+    with pytest.raises(TypeError, match="cannot be packed"):
+        storage.append((2**63, 4))
+    assert tuple(storage) == ((1, 2), (2, 3))
+    storage.append((3, 4))
+    assert tuple(storage) == ((2, 3), (3, 4))
+
+
+def test_packed_storage_buffers() -> None:
+    steps, values = PackedStorage(5, [(0, 1.0), (1, 2.0)]).buffers()
+    assert steps.tolist() == [0, 1]
+    assert values.tolist() == [1.0, 2.0]
+
+
+def test_packed_storage_buffers_full() -> None:
+    storage = PackedStorage(3, [(i, float(i)) for i in range(5)])
+    steps, values = storage.buffers()
+    assert steps.tolist() == [2, 3, 4]
+    assert values.tolist() == [2.0, 3.0, 4.0]
+    assert tuple(storage) == ((2, 2.0), (3, 3.0), (4, 4.0))
+
+
+def test_packed_storage_buffers_steps_none() -> None:
+    steps, values = PackedStorage(5, [(None, 1.0), (None, 2.0)]).buffers()
+    assert steps is None
+    assert values.tolist() == [1.0, 2.0]
+
+
+@pytest.mark.parametrize("size", [2, 3])
+def test_packed_storage_buffers_not_modified(size: int) -> None:
+    storage = PackedStorage(3, [(i, float(i)) for i in range(size)])
+    steps, values = storage.buffers()
+    storage.append((5, 5.0))
+    storage.append((6, 6.0))
+    assert steps.tolist() == list(range(size))
+    assert values.tolist() == [float(i) for i in range(size)]
+    assert tuple(storage)[-2:] == ((5, 5.0), (6, 6.0))
+
+
+def test_packed_storage_getitem() -> None:
+    storage = PackedStorage(3, [(i, float(i)) for i in range(4)])
+    assert storage[0] == (1, 1.0)
+    assert storage[2] == (3, 3.0)
+    assert storage[-1] == (3, 3.0)
+    assert storage[-3] == (1, 1.0)
+
+
+@pytest.mark.parametrize("index", [3, -4])
+def test_packed_storage_getitem_out_of_range(index: int) -> None:
+    storage = PackedStorage(3, [(i, float(i)) for i in range(3)])
+    with pytest.raises(IndexError, match="storage index out of range"):
+        storage[index]
+
+
+def test_packed_storage_eq_true() -> None:
+    assert PackedStorage(3, [(0, 1.0), (1, 2.0)]) == PackedStorage(5, [(0, 1.0), (1, 2.0)])
+
+
+def test_packed_storage_eq_deque() -> None:
+    assert PackedStorage(3, [(0, 1.0), (1, 2.0)]) == deque([(0, 1.0), (1, 2.0)])
+    assert deque([(0, 1.0), (1, 2.0)]) == PackedStorage(3, [(0, 1.0), (1, 2.0)])
+
+
+def test_packed_storage_eq_nan() -> None:
+    assert PackedStorage(3, [(0, math.nan)]) == PackedStorage(3, [(0, math.nan)])
+
+
+def test_packed_storage_eq_nan_different_heads() -> None:
+    storage = PackedStorage(3, [(i, float(i)) for i in range(4)])
+    storage.append((4, math.nan))
+    assert storage == PackedStorage(3, [(2, 2.0), (3, 3.0), (4, math.nan)])
+
+
+def test_packed_storage_eq_different_heads() -> None:
+    storage = PackedStorage(3, [(i, float(i)) for i in range(5)])
+    assert storage == PackedStorage(3, [(2, 2.0), (3, 3.0), (4, 4.0)])
+    assert storage != PackedStorage(3, [(2, 2.0), (3, 3.0), (5, 4.0)])
+
+
+def test_packed_storage_eq_empty() -> None:
+    assert PackedStorage(3) == PackedStorage(5)
+
+
+def test_packed_storage_eq_steps_none() -> None:
+    assert PackedStorage(3, [(None, 1.0)]) == PackedStorage(3, [(None, 1.0)])
+    assert PackedStorage(3, [(None, 1.0)]) != PackedStorage(3, [(0, 1.0)])
+
+
+def test_packed_storage_eq_false() -> None:
+    assert PackedStorage(3, [(0, 1.0), (1, 2.0)]) != PackedStorage(3, [(0, 1.0), (1, 3.0)])
+    assert PackedStorage(3, [(0, 1.0), (1, 2.0)]) != PackedStorage(3, [(0, 1.0)])
+    assert PackedStorage(3, [(0, 1.0)]) != [(0, 1.0)]
+
+
+def test_packed_storage_typecodes() -> None:
+    assert PackedStorage(3, [(0, 1.0)]).typecodes == ("q", "d")
+    assert PackedStorage(3, [(None, 1)]).typecodes == (None, "q")
+
+
+def test_packed_storage_typecodes_empty() -> None:
+    assert PackedStorage(3).typecodes == (None, None)
+
+
+def test_packed_storage_memory_usage() -> None:
+    storage = PackedStorage(100, [(i, float(i)) for i in range(100)])
+    usage = storage.memory_usage()
+    assert usage["storage"] == sys.getsizeof(storage)
+    assert usage["steps"] >= 800
+    assert usage["values"] >= 800
+
+
+def test_packed_storage_memory_usage_steps_none() -> None:
+    assert PackedStorage(5, [(None, 1.0)]).memory_usage()["steps"] == 0
+
+
+####################################
+#     Tests for create_storage     #
+####################################
+
+
+def test_create_storage_auto_packed() -> None:
+    storage = create_storage([(0, 1.0), (1, 2.0)], maxlen=5)
+    assert isinstance(storage, PackedStorage)
+    assert storage.maxlen == 5
+    assert tuple(storage) == ((0, 1.0), (1, 2.0))
+
+
+def test_create_storage_auto_object() -> None:
+    storage = create_storage([(0, 1.0), (1, "abc")], maxlen=5)
+    assert isinstance(storage, deque)
+    assert storage.maxlen == 5
+    assert tuple(storage) == ((0, 1.0), (1, "abc"))
+
+
+def test_create_storage_auto_iterator() -> None:
+    storage = create_storage(iter([(0, 1.0), (1, "abc")]), maxlen=5)
+    assert tuple(storage) == ((0, 1.0), (1, "abc"))
+
+
+def test_create_storage_object() -> None:
+    storage = create_storage([(0, 1.0), (1, 2.0)], maxlen=5, storage="object")
+    assert isinstance(storage, deque)
+    assert tuple(storage) == ((0, 1.0), (1, 2.0))
+
+
+#################################
+#     Tests for get_backend     #
+#################################
+
+
+def test_get_backend_packed() -> None:
+    assert get_backend(PackedStorage(5)) == "packed"
+
+
+def test_get_backend_object() -> None:
+    assert get_backend(deque(maxlen=5)) == "object"
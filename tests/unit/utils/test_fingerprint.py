@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from minrecord.utils.fingerprint import (
+    MODULUS,
+    append_fingerprint,
+    combine_fingerprints,
+    hash_element,
+    hash_object,
+)
+
+OBJECTS = [None, True, 1, -1, 1.5, float("inf"), "abc", b"abc", (1, 2), [1, 2], {"a": 1}]
+
+#################################
+#     Tests for hash_object     #
+#################################
+
+
+@pytest.mark.parametrize("obj", OBJECTS)
+def test_hash_object_range(obj: object) -> None:
+    assert 0 <= hash_object(obj) < MODULUS
+
+
+@pytest.mark.parametrize("obj", OBJECTS)
+def test_hash_object_deterministic(obj: object) -> None:
+    assert hash_object(obj) == hash_object(obj)
+
+
+def test_hash_object_different() -> None:
+    objects = [obj for obj in OBJECTS if obj is not True]
+    assert len({hash_object(obj) for obj in objects}) == len(objects)
+
+
+def test_hash_object_equal_numbers() -> None:
+    assert hash_object(1) == hash_object(1.0) == hash_object(True)
+
+
+def test_hash_object_nan() -> None:
+    assert hash_object(float("nan")) == hash_object(float("nan"))
+
+
+def test_hash_object_not_picklable() -> None:
+    class MyObject:
+        def __repr__(self) -> str:
+            return "MyObject()"
+
+    assert hash_object(MyObject()) == hash_object(MyObject())
+
+
+def test_hash_object_independent_of_hash_seed() -> None:
+    code = "from minrecord.utils.fingerprint import hash_object; print(hash_object(('abc', None)))"
+    outputs = {
+        subprocess.run(  # noqa: S603
+            [sys.executable, "-c", code],
+            capture_output=True,
+            check=True,
+            text=True,
+            env=os.environ | {"PYTHONHASHSEED": seed},
+        ).stdout
+        for seed in ("1", "2")
+    }
+    assert len(outputs) == 1
+
+
+##################################
+#     Tests for hash_element     #
+##################################
+
+
+@pytest.mark.parametrize(
+    "element", [(0, 1.5), (None, 1.5), (0, "abc"), (None, None), (0, float("nan"))]
+)
+def test_hash_element_deterministic(element: tuple) -> None:
+    assert hash_element(element) == hash_element(tuple(element))
+
+
+def test_hash_element_different() -> None:
+    elements = [(0, 1.5), (1, 1.5), (0, 2.5), (None, 1.5), (1.5, 0), (0, "abc"), (None, "abc")]
+    assert len({hash_element(element) for element in elements}) == len(elements)
+
+
+########################################
+#     Tests for append_fingerprint     #
+########################################
+
+
+def test_append_fingerprint() -> None:
+    assert append_fingerprint(0, 42) == 42
+
+
+def test_append_fingerprint_order() -> None:
+    assert append_fingerprint(append_fingerprint(0, 1), 2) != append_fingerprint(
+        append_fingerprint(0, 2), 1
+    )
+
+
+def test_append_fingerprint_range() -> None:
+    assert 0 <= append_fingerprint(MODULUS - 1, -5) < MODULUS
+
+
+##########################################
+#     Tests for combine_fingerprints     #
+##########################################
+
+
+def test_combine_fingerprints_empty() -> None:
+    assert combine_fingerprints({}) == 0
+
+
+def test_combine_fingerprints_order() -> None:
+    assert combine_fingerprints({"a": 1, "b": 2}) == combine_fingerprints({"b": 2, "a": 1})
+
+
+def test_combine_fingerprints_swap() -> None:
+    assert combine_fingerprints({"a": 1, "b": 2}) != combine_fingerprints({"a": 2, "b": 1})
+
+
+def test_combine_fingerprints_keys() -> None:
+    assert combine_fingerprints({"a": 1}) != combine_fingerprints({"b": 1})
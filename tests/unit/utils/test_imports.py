@@ -1,21 +1,94 @@
 from __future__ import annotations
 
-from unittest.mock import patch
+import sys
+from typing import TYPE_CHECKING
+from unittest.mock import Mock, patch
 
 import pytest
 
 from minrecord.utils.imports import (
+    check_numpy,
     check_objectory,
+    check_pyarrow,
+    is_numpy_available,
     is_objectory_available,
+    is_pyarrow_available,
+    numpy_available,
     objectory_available,
+    pyarrow_available,
+    raise_error_numpy_missing,
     raise_error_objectory_missing,
+    raise_error_pyarrow_missing,
+    when_imported,
 )
 
+if TYPE_CHECKING:
+    from pathlib import Path
+
 
 def my_function(n: int = 0) -> int:
     return 42 + n
 
 
+#################
+#     numpy     #
+#################
+
+
+def test_check_numpy_with_package() -> None:
+    with patch("minrecord.utils.imports.is_numpy_available", lambda: True):
+        check_numpy()
+
+
+def test_check_numpy_without_package() -> None:
+    with (
+        patch("minrecord.utils.imports.is_numpy_available", lambda: False),
+        pytest.raises(RuntimeError, match=r"'numpy' package is required but not installed."),
+    ):
+        check_numpy()
+
+
+def test_is_numpy_available() -> None:
+    assert isinstance(is_numpy_available(), bool)
+
+
+def test_numpy_available_with_package() -> None:
+    with patch("minrecord.utils.imports.is_numpy_available", lambda: True):
+        fn = numpy_available(my_function)
+        assert fn(2) == 44
+
+
+def test_numpy_available_without_package() -> None:
+    with patch("minrecord.utils.imports.is_numpy_available", lambda: False):
+        fn = numpy_available(my_function)
+        assert fn(2) is None
+
+
+def test_numpy_available_decorator_with_package() -> None:
+    with patch("minrecord.utils.imports.is_numpy_available", lambda: True):
+
+        @numpy_available
+        def fn(n: int = 0) -> int:
+            return 42 + n
+
+        assert fn(2) == 44
+
+
+def test_numpy_available_decorator_without_package() -> None:
+    with patch("minrecord.utils.imports.is_numpy_available", lambda: False):
+
+        @numpy_available
+        def fn(n: int = 0) -> int:
+            return 42 + n
+
+        assert fn(2) is None
+
+
+def test_raise_error_numpy_missing() -> None:
+    with pytest.raises(RuntimeError, match=r"'numpy' package is required but not installed."):
+        raise_error_numpy_missing()
+
+
 #####################
 #     objectory     #
 #####################
@@ -73,3 +146,85 @@ def test_objectory_available_decorator_without_package() -> None:
 def test_raise_error_objectory_missing() -> None:
     with pytest.raises(RuntimeError, match=r"'objectory' package is required but not installed."):
         raise_error_objectory_missing()
+
+
+###################
+#     pyarrow     #
+###################
+
+
+def test_check_pyarrow_with_package() -> None:
+    with patch("minrecord.utils.imports.is_pyarrow_available", lambda: True):
+        check_pyarrow()
+
+
+def test_check_pyarrow_without_package() -> None:
+    with (
+        patch("minrecord.utils.imports.is_pyarrow_available", lambda: False),
+        pytest.raises(RuntimeError, match=r"'pyarrow' package is required but not installed."),
+    ):
+        check_pyarrow()
+
+
+def test_is_pyarrow_available() -> None:
+    assert isinstance(is_pyarrow_available(), bool)
+
+
+def test_pyarrow_available_with_package() -> None:
+    with patch("minrecord.utils.imports.is_pyarrow_available", lambda: True):
+        fn = pyarrow_available(my_function)
+        assert fn(2) == 44
+
+
+def test_pyarrow_available_without_package() -> None:
+    with patch("minrecord.utils.imports.is_pyarrow_available", lambda: False):
+        fn = pyarrow_available(my_function)
+        assert fn(2) is None
+
+
+def test_raise_error_pyarrow_missing() -> None:
+    with pytest.raises(RuntimeError, match=r"'pyarrow' package is required but not installed."):
+        raise_error_pyarrow_missing()
+
+
+###################################
+#     Tests for when_imported     #
+###################################
+
+
+@pytest.fixture
+def module_path(tmp_path: Path) -> Path:
+    tmp_path.joinpath("minrecord_hook_module.py").write_text("VALUE = 42\n")
+    sys.path.insert(0, str(tmp_path))
+    yield tmp_path
+    sys.path.remove(str(tmp_path))
+    sys.modules.pop("minrecord_hook_module", None)
+
+
+def test_when_imported_already_imported() -> None:
+    hook = Mock()
+    when_imported("math", hook)
+    hook.assert_called_once_with()
+
+
+@pytest.mark.usefixtures("module_path")
+def test_when_imported_not_imported() -> None:
+    values = []
+    when_imported(
+        "minrecord_hook_module", lambda: values.append(sys.modules["minrecord_hook_module"].VALUE)
+    )
+    assert not values
+    import minrecord_hook_module  # noqa: F401
+
+    assert values == [42]
+
+
+@pytest.mark.usefixtures("module_path")
+def test_when_imported_multiple_hooks() -> None:
+    hook1, hook2 = Mock(), Mock()
+    when_imported("minrecord_hook_module", hook1)
+    when_imported("minrecord_hook_module", hook2)
+    import minrecord_hook_module  # noqa: F401
+
+    hook1.assert_called_once_with()
+    hook2.assert_called_once_with()
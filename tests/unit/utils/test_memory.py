@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import math
+import sys
+from collections import deque
+
+import pytest
+from coola.testing.fixtures import numpy_available
+from coola.utils.imports import is_numpy_available
+
+from minrecord.utils.memory import format_bytes, get_deep_size
+
+if is_numpy_available():
+    import numpy as np
+
+###################################
+#     Tests for get_deep_size     #
+###################################
+
+
+@pytest.mark.parametrize("obj", [None, True, False, int, math, len, format_bytes])
+def test_get_deep_size_shared_objects(obj: object) -> None:
+    assert get_deep_size(obj) == 0
+
+
+def test_get_deep_size_float() -> None:
+    assert get_deep_size(1.5) == sys.getsizeof(1.5)
+
+
+@pytest.mark.parametrize("container", [list, tuple, set, frozenset, deque])
+def test_get_deep_size_container(container: type) -> None:
+    items = ["abc", "defg"]
+    obj = container(items)
+    assert get_deep_size(obj) == sys.getsizeof(obj) + sum(map(sys.getsizeof, items))
+
+
+def test_get_deep_size_dict() -> None:
+    obj = {"key": "value"}
+    assert get_deep_size(obj) == sys.getsizeof(obj) + sys.getsizeof("key") + sys.getsizeof("value")
+
+
+def test_get_deep_size_shared_reference() -> None:
+    value = "a" * 1000
+    assert get_deep_size([value, value]) == sys.getsizeof([value, value]) + sys.getsizeof(value)
+
+
+def test_get_deep_size_cycle() -> None:
+    obj = []
+    obj.append(obj)
+    assert get_deep_size(obj) == sys.getsizeof(obj)
+
+
+class Point:
+    def __init__(self, x: float) -> None:
+        self.x = x
+
+
+class SlotPoint:
+    __slots__ = ("x", "y")
+
+    def __init__(self, x: float) -> None:
+        self.x = x
+
+
+def test_get_deep_size_object() -> None:
+    obj = Point(1.5)
+    assert get_deep_size(obj) == (
+        sys.getsizeof(obj) + sys.getsizeof(obj.__dict__) + sys.getsizeof("x") + sys.getsizeof(1.5)
+    )
+
+
+def test_get_deep_size_slots() -> None:
+    obj = SlotPoint(1.5)
+    assert get_deep_size(obj) == sys.getsizeof(obj) + sys.getsizeof(1.5)
+
+
+def test_get_deep_size_seen() -> None:
+    value = "a" * 1000
+    seen = set()
+    assert get_deep_size(value, seen) == sys.getsizeof(value)
+    assert get_deep_size([value], seen) == sys.getsizeof([value])
+    assert id(value) in seen
+
+
+@numpy_available
+def test_get_deep_size_numpy() -> None:
+    assert get_deep_size([np.zeros(1000)]) > 8000
+
+
+##################################
+#     Tests for format_bytes     #
+##################################
+
+
+@pytest.mark.parametrize(
+    ("size", "expected"),
+    [
+        (0, "0 B"),
+        (1023, "1,023 B"),
+        (1024, "1.00 KiB"),
+        (1536, "1.50 KiB"),
+        (5 * 2**20, "5.00 MiB"),
+        (2**30, "1.00 GiB"),
+        (2048 * 2**40, "2,048.00 TiB"),
+    ],
+)
+def test_format_bytes(size: int, expected: str) -> None:
+    assert format_bytes(size) == expected
@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+import re
+
+import pytest
+
+from minrecord.utils.pattern import compile_pattern, get_literal_prefix
+
+#####################################
+#     Tests for compile_pattern     #
+#####################################
+
+
+@pytest.mark.parametrize(
+    ("pattern", "key", "expected"),
+    [
+        ("*/loss", "train/loss", True),
+        ("*/loss", "val/acc/loss", True),
+        ("*/loss", "loss", False),
+        ("val/?", "val/a", True),
+        ("val/[ab]", "val/c", False),
+        ("val/loss", "val/loss/ema", False),
+    ],
+)
+def test_compile_pattern_glob(pattern: str, key: str, expected: bool) -> None:
+    assert bool(compile_pattern(pattern).fullmatch(key)) == expected
+
+
+def test_compile_pattern_regex() -> None:
+    regex = re.compile(r"val/\w+")
+    assert compile_pattern(regex) is regex
+
+
+def test_compile_pattern_cache() -> None:
+    assert compile_pattern("train/*") is compile_pattern("train/*")
+
+
+########################################
+#     Tests for get_literal_prefix     #
+########################################
+
+
+@pytest.mark.parametrize(
+    ("pattern", "expected"),
+    [("val/*", "val/"), ("val/loss", "val/loss"), ("*", ""), ("a?b", "a"), ("a[bc]", "a")],
+)
+def test_get_literal_prefix(pattern: str, expected: str) -> None:
+    assert get_literal_prefix(pattern) == expected
+
+
+def test_get_literal_prefix_regex() -> None:
+    assert get_literal_prefix(re.compile(r"val/.*")) == ""